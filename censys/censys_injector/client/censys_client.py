@@ -6,6 +6,8 @@ from typing import Dict, List, Optional, Union
 
 import requests
 
+from injector_common.rate_limiter import SharedTokenBucket
+
 
 @dataclass
 class CensysResult:
@@ -33,6 +35,7 @@ class CensysClient:
         timeout: int = 60,
         max_pages: int = 10,
         logger=None,
+        rate_limiter: Optional[SharedTokenBucket] = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.per_page = per_page
@@ -40,12 +43,17 @@ class CensysClient:
         self.max_pages = max(1, max_pages)
         self.logger = logger
         self._auth = (api_id, api_secret)
+        self.rate_limiter = rate_limiter
 
     def _log_error(self, message: str) -> None:
         if self.logger:
             self.logger.error(message)
 
     def _get(self, path: str, params: Dict) -> Dict:
+        if self.rate_limiter is not None:
+            # Every page is a call, paced by the bucket shared with the
+            # other processes using the same API account.
+            self.rate_limiter.acquire()
         response = requests.get(
             f"{self.base_url}{path}",
             params=params,
@@ -1,4 +1,4 @@
-from pydantic import Field, SecretStr
+from pydantic import Field, PositiveFloat, PositiveInt, SecretStr
 from pydantic_settings import BaseSettings
 
 
@@ -24,3 +24,19 @@ class CensysConfig(BaseSettings):
         description="Maximum number of result pages to follow via the Censys "
         "cursor before stopping (bounds API usage on broad queries).",
     )
+    api_leaky_bucket_rate: PositiveFloat = Field(
+        default=1.0,
+        description="Bucket refill rate (in requests per second) of the calls "
+        "to the Censys API, e.g. 0.4 for the free tier.",
+    )
+    api_leaky_bucket_capacity: PositiveInt = Field(
+        default=5,
+        description="Maximum bucket capacity: the number of calls that can be "
+        "made at once before they are paced at 'api_leaky_bucket_rate'.",
+    )
+    api_rate_limit_path: str = Field(
+        default=".cache/rate_limits.sqlite",
+        description="Path of the SQLite database holding the bucket. Every "
+        "process and replica using the same file shares one bucket, hence one "
+        "rate limit per API account. Empty keeps the bucket in process memory.",
+    )
@@ -12,6 +12,10 @@ from pyoaev.helpers import OpenAEVConfigHelper, OpenAEVInjectorHelper
 
 from injector_common.data_helpers import DataHelpers
 from injector_common.dump_config import intercept_dump_argument
+from injector_common.rate_limiter import (
+    SharedTokenBucket,
+    build_token_bucket_backend,
+)
 
 ICON_PATH = "censys_injector/img/icon-censys.png"
 
@@ -34,6 +38,12 @@ class OpenAEVCensys:
             per_page=censys_conf.per_page,
             max_pages=censys_conf.max_pages,
             logger=self.helper.injector_logger,
+            rate_limiter=SharedTokenBucket(
+                bucket="censys",
+                rate=censys_conf.api_leaky_bucket_rate,
+                capacity=censys_conf.api_leaky_bucket_capacity,
+                backend=build_token_bucket_backend(censys_conf.api_rate_limit_path),
+            ),
         )
 
     def process_message(self, data: Dict) -> None:
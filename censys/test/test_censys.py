@@ -125,6 +125,24 @@ class ClientParsingTest(TestCase):
         self.assertTrue(result.success)
         self.assertEqual(mock_get.call_count, 3)
 
+    @patch("censys_injector.client.censys_client.requests.get")
+    def test_every_page_goes_through_the_rate_limiter(self, mock_get):
+        response = MagicMock()
+        response.json.return_value = {
+            "result": {
+                "hits": [{"fingerprint_sha256": "abcd"}],
+                "links": {"next": "ALWAYS"},
+            }
+        }
+        mock_get.return_value = response
+        rate_limiter = MagicMock()
+
+        client = CensysClient(
+            api_id="id", api_secret="secret", max_pages=3, rate_limiter=rate_limiter
+        )
+        client.search_certificates("names: example.com")
+        self.assertEqual(rate_limiter.acquire.call_count, 3)
+
 
 class ClientErrorHandlingTest(TestCase):
     def _client(self, logger=None):
@@ -15,6 +15,8 @@ BASE_ENV = {
     "INJECTOR_ID": "censys--test",
     "CENSYS_API_ID": "api-id",
     "CENSYS_API_SECRET": "api-secret",
+    # Keep the rate limit bucket in memory rather than in a file.
+    "CENSYS_API_RATE_LIMIT_PATH": "",
 }
 
 
@@ -81,3 +83,10 @@ class ProcessMessageTest(TestCase):
         injector = make_injector()
         injector.start()
         injector.helper.listen.assert_called_once()
+
+    def test_client_is_rate_limited_by_a_shared_bucket(self):
+        injector = make_injector()
+        rate_limiter = injector.client.rate_limiter
+        self.assertEqual(rate_limiter.bucket, "censys")
+        self.assertEqual(rate_limiter.rate, 1.0)
+        self.assertEqual(rate_limiter.capacity, 5)
@@ -0,0 +1,179 @@
+"""Token-bucket rate limiting shared by every process using the same API key.
+
+Each injector process used to hold its own bucket, so replicas running on one
+API key each burst independently and together exceed the provider's limit.
+A ``SharedTokenBucket`` keeps its state in a ``TokenBucketBackend`` instead:
+
+- ``SQLiteTokenBucketBackend`` stores it in a SQLite file, updated under the
+  database write lock: every process and replica mounting that file (on one
+  node) draws from the same bucket;
+- ``MemoryTokenBucketBackend`` keeps it in process memory, as before.
+
+Wider deployments can plug in a backend of their own (a network store shared
+by several nodes, for example) by implementing ``TokenBucketBackend``.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+def _take_token(
+    state: Optional[Tuple[float, float]], rate: float, capacity: float, now: float
+) -> Tuple[float, float]:
+    """Take one token from a bucket.
+
+    Returns the tokens left in the bucket, negative when the caller has to
+    wait, and the time (in seconds) the caller has to wait for its token.
+    """
+    if state is None:
+        tokens = capacity
+    else:
+        tokens, updated_at = state
+        # A clock going backwards refills nothing.
+        tokens = min(capacity, tokens + max(now - updated_at, 0.0) * rate)
+    tokens -= 1
+    return tokens, max(-tokens / rate, 0.0)
+
+
+class TokenBucketBackend(ABC):
+    """Store of the token buckets, shared by whoever uses the same backend."""
+
+    @abstractmethod
+    def take(self, bucket: str, rate: float, capacity: float) -> float:
+        """Take one token from *bucket*, created full when missing.
+
+        The token is always taken: when the bucket is empty, it is borrowed
+        from the next refill and the time to wait for it is returned.
+
+        Returns:
+            The time (in seconds) to wait before using the token, 0 when it
+            can be used at once.
+        """
+
+
+class MemoryTokenBucketBackend(TokenBucketBackend):
+    """Buckets held in process memory, shared by the threads of one process."""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, bucket: str, rate: float, capacity: float) -> float:
+        with self._lock:
+            now = self._clock()
+            tokens, wait = _take_token(self._buckets.get(bucket), rate, capacity, now)
+            self._buckets[bucket] = (tokens, now)
+            return wait
+
+
+class SQLiteTokenBucketBackend(TokenBucketBackend):
+    """Buckets held in a SQLite file, shared by every process opening it.
+
+    Each token is taken in an immediate transaction, so the read and update of
+    a bucket are serialized by the database lock across processes. Should the
+    database fail, tokens are taken from a process-local bucket instead: the
+    requests stay paced, by this process only.
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._fallback = MemoryTokenBucketBackend(clock)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Transactions are opened explicitly, with BEGIN IMMEDIATE.
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        with self._lock:
+            self._connection.execute(_SCHEMA)
+
+    def take(self, bucket: str, rate: float, capacity: float) -> float:
+        try:
+            with self._lock:
+                return self._take(bucket, rate, capacity)
+        except sqlite3.Error:
+            return self._fallback.take(bucket, rate, capacity)
+
+    def _take(self, bucket: str, rate: float, capacity: float) -> float:
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._connection.execute(
+                "SELECT tokens, updated_at FROM buckets WHERE name = ?", (bucket,)
+            ).fetchone()
+            # Read once the database is locked, so that no process reads an older time.
+            now = self._clock()
+            tokens, wait = _take_token(row, rate, capacity, now)
+            self._connection.execute(
+                "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?)",
+                (bucket, tokens, now),
+            )
+            self._connection.execute("COMMIT")
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        return wait
+
+
+def build_token_bucket_backend(path: Optional[str]) -> TokenBucketBackend:
+    """Backend for a configured path: a SQLite file, or process memory if empty."""
+    if path:
+        return SQLiteTokenBucketBackend(path)
+    return MemoryTokenBucketBackend()
+
+
+class SharedTokenBucket:
+    """Rate limiter drawing its tokens from a bucket of a ``TokenBucketBackend``.
+
+    ``rate`` tokens are added per second, up to ``capacity``: up to
+    ``capacity`` requests start at once, the next ones at ``rate`` per second,
+    whatever the number of threads and processes sharing the bucket. Use it as
+    a context manager around each request::
+
+        with limiter:
+            session.get(url)
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        rate: float,
+        capacity: float,
+        backend: Optional[TokenBucketBackend] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.bucket = bucket
+        self.rate = rate
+        self.capacity = capacity
+        self.backend = backend or MemoryTokenBucketBackend()
+        self._sleep = sleep
+
+    def acquire(self) -> float:
+        """Wait for a token, and return the time (in seconds) waited."""
+        wait = self.backend.take(self.bucket, self.rate, self.capacity)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def __enter__(self) -> "SharedTokenBucket":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
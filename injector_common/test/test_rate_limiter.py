@@ -0,0 +1,108 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from injector_common.rate_limiter import (
+    MemoryTokenBucketBackend,
+    SharedTokenBucket,
+    SQLiteTokenBucketBackend,
+    build_token_bucket_backend,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class MemoryTokenBucketBackendTest(TestCase):
+    def test_burst_then_paced_at_the_rate(self):
+        backend = MemoryTokenBucketBackend(clock=FakeClock())
+
+        waits = [backend.take("api", rate=2, capacity=3) for _ in range(5)]
+
+        # The first 3 tokens come from the full bucket, the next ones from
+        # the refills, one every half second.
+        self.assertEqual(waits, [0, 0, 0, 0.5, 1.0])
+
+    def test_bucket_refills_up_to_its_capacity(self):
+        clock = FakeClock()
+        backend = MemoryTokenBucketBackend(clock=clock)
+        for _ in range(3):
+            backend.take("api", rate=2, capacity=3)
+
+        clock.now += 60
+
+        waits = [backend.take("api", rate=2, capacity=3) for _ in range(4)]
+        self.assertEqual(waits, [0, 0, 0, 0.5])
+
+    def test_buckets_are_independent(self):
+        backend = MemoryTokenBucketBackend(clock=FakeClock())
+        backend.take("shodan", rate=1, capacity=1)
+
+        self.assertEqual(backend.take("censys", rate=1, capacity=1), 0)
+        self.assertEqual(backend.take("shodan", rate=1, capacity=1), 1.0)
+
+
+class SQLiteTokenBucketBackendTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "limits", "buckets.sqlite")
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_backends_on_the_same_file_share_the_bucket(self):
+        # One backend per process (or replica) mounting the same file.
+        first = SQLiteTokenBucketBackend(self.path, clock=self.clock)
+        second = SQLiteTokenBucketBackend(self.path, clock=self.clock)
+
+        waits = [
+            backend.take("shodan", rate=1, capacity=2)
+            for backend in (first, second, first, second)
+        ]
+
+        self.assertEqual(waits, [0, 0, 1.0, 2.0])
+
+    def test_database_errors_fall_back_to_a_local_bucket(self):
+        backend = SQLiteTokenBucketBackend(self.path, clock=self.clock)
+        backend._connection.close()
+
+        waits = [backend.take("shodan", rate=1, capacity=1) for _ in range(2)]
+
+        self.assertEqual(waits, [0, 1.0])
+
+    def test_empty_path_builds_a_memory_backend(self):
+        self.assertIsInstance(build_token_bucket_backend(""), MemoryTokenBucketBackend)
+        self.assertIsInstance(
+            build_token_bucket_backend(self.path), SQLiteTokenBucketBackend
+        )
+
+
+class SharedTokenBucketTest(TestCase):
+    def test_requests_wait_for_their_token(self):
+        sleep = MagicMock()
+        limiter = SharedTokenBucket(
+            "shodan",
+            rate=4,
+            capacity=1,
+            backend=MemoryTokenBucketBackend(clock=FakeClock()),
+            sleep=sleep,
+        )
+
+        for _ in range(3):
+            with limiter:
+                pass
+
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [0.25, 0.5])
+
+    def test_invalid_rate_or_capacity_is_rejected(self):
+        with self.assertRaises(ValueError):
+            SharedTokenBucket("shodan", rate=0, capacity=1)
+        with self.assertRaises(ValueError):
+            SharedTokenBucket("shodan", rate=1, capacity=0)
@@ -0,0 +1,162 @@
+"""Benchmark NetExecOutputParser against the classifier and dispatch it replaced.
+
+Generates synthetic ``--users``, ``--shares`` and ``--ntds`` outputs (module
+lines interleaved with banners, auth, table headers and separators), checks
+that both parsers return the same result, and reports their timings.
+
+    python -m benchmarks.bench_output_parser --lines 100000
+"""
+
+import argparse
+import random
+import re
+import time
+
+from netexec.helpers import netexec_output_parser
+from netexec.helpers.netexec_output_parser import NetExecOutputParser
+
+
+def _legacy_is_noise(rest):
+    if not rest:
+        return True
+    if rest.startswith("[+] Found following"):
+        return True
+    if rest.startswith("[+] Dumped"):
+        return True
+    if rest.startswith("[+] Added"):
+        return True
+    if rest.startswith("[+] Enumerated"):
+        return True
+    if re.match(r"^[\s\-]+$", rest):
+        return True
+    if re.match(r"^-\w+.*-\s*$", rest):
+        return True
+    return False
+
+
+_LEGACY_AUTH_LINE = re.compile(r"\[\+\]\s+\S+\\\S+:\S+")
+
+
+def legacy_parse(stdout, ip_to_asset_id_map, family, identifier):
+    """The parser as it was before the dispatch table, kept as the baseline."""
+    finding_lines = []
+    for raw in stdout.splitlines():
+        m = netexec_output_parser._LINE_PREFIX.match(raw)
+        if not m:
+            ip, hostname, rest = "", "", raw.strip()
+        else:
+            ip, hostname = m.group("ip"), m.group("hostname")
+            rest = m.group("rest").strip()
+        if not rest:
+            continue
+        if _LEGACY_AUTH_LINE.match(rest):
+            continue
+        if rest.startswith("[*]") or rest.startswith("[-]"):
+            continue
+        if _legacy_is_noise(rest):
+            continue
+        finding_lines.append((ip, hostname, rest))
+
+    outputs, parts = {}, []
+    if stdout.strip():
+        outputs["action_output"] = stdout.strip()
+    for field_name, getter in netexec_output_parser._DISPATCHERS:
+        extractor = getter(family, identifier)
+        results = extractor(finding_lines, ip_to_asset_id_map) if extractor else []
+        if results:
+            outputs[field_name] = results
+            parts.append(f"{len(results)} {field_name}")
+    message = (
+        "NetExec completed: " + ", ".join(parts)
+        if parts
+        else "NetExec completed: no structured output extracted"
+    )
+    return {"message": message, "outputs": outputs}
+
+
+def _users_line(rng, i):
+    description = rng.choice(
+        ["", "Service account", f"Temp account (Password : Winter{i})"]
+    )
+    return f"user.{i:06d}  2025-12-11 10:33:21  {rng.randrange(3)}  {description}"
+
+
+def _shares_line(rng, i):
+    permissions = rng.choice(["READ", "READ,WRITE", ""])
+    return f"SHARE{i:06d}{rng.choice(['', '$'])}  {permissions}  Share {i}"
+
+
+def _ntds_line(rng, i):
+    nt_hash = "%032x" % rng.getrandbits(128)
+    return f"user.{i:06d}:{1000 + i}:aad3b435b51404eeaad3b435b51404ee:{nt_hash}:::"
+
+
+SCENARIOS = {
+    "users": ("option", "users", _users_line, "-Username-  -Last PW Set-"),
+    "shares": ("option", "shares", _shares_line, "Share  Permissions  Remark"),
+    "ntds": ("option", "ntds", _ntds_line, "[+] Dumping the NTDS"),
+}
+
+
+def synthetic_output(scenario, lines, hosts, seed=0):
+    _, _, module_line, header = SCENARIOS[scenario]
+    rng = random.Random(seed)
+    out = []
+    for i in range(lines):
+        ip = f"10.0.{(i % hosts) // 256}.{i % 256}"
+        prefix = f"SMB  {ip}  445  DC{i % hosts:03d}"
+        roll = rng.random()
+        if roll < 0.8:
+            out.append(f"{prefix}  {module_line(rng, i)}")
+        elif roll < 0.85:
+            out.append(f"{prefix}  [*] Windows Server 2019 (name:DC) (domain:north)")
+        elif roll < 0.9:
+            out.append(f"{prefix}  [+] north.local\\admin:P@ssw0rd (Pwn3d!)")
+        elif roll < 0.95:
+            out.append(f"{prefix}  {header}")
+        else:
+            out.append(f"{prefix}  -----  -----------")
+    return "\n".join(out) + "\n"
+
+
+def timed(parse, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parse()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--hosts", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    ip_to_asset_id_map = {
+        f"10.0.{i // 256}.{i % 256}": f"asset-{i}" for i in range(args.hosts)
+    }
+    fast_parser = NetExecOutputParser()
+    for scenario, (family, identifier, _, _) in SCENARIOS.items():
+        stdout = synthetic_output(scenario, args.lines, args.hosts)
+        legacy_time, legacy = timed(
+            lambda: legacy_parse(stdout, ip_to_asset_id_map, family, identifier),
+            args.repeat,
+        )
+        fast_time, fast = timed(
+            lambda: fast_parser.parse(stdout, ip_to_asset_id_map, family, identifier),
+            args.repeat,
+        )
+        if fast != legacy:
+            raise SystemExit(f"Parsers disagree on the --{scenario} output")
+        print(
+            f"--{scenario} ({args.lines} lines, {fast['message']}): legacy "
+            f"{legacy_time:.3f}s, fast {fast_time:.3f}s "
+            f"({legacy_time / fast_time:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,8 @@ from pydantic import Field
 from pyoaev.configuration import ConfigLoaderOAEV, Configuration, SettingsLoader
 
 from netexec.configuration.injector_config_override import InjectorConfigOverride
-from netexec.contracts import build_all_contracts
+from netexec.configuration.netexec_configs import ConfigLoaderNetExec
+from netexec.contracts.contract_manifest import load_contract_manifest
 
 
 class ConfigLoader(SettingsLoader):
@@ -13,6 +14,10 @@ class ConfigLoader(SettingsLoader):
         default_factory=InjectorConfigOverride,
         description="NetExec injector configuration",
     )
+    netexec: ConfigLoaderNetExec = Field(
+        default_factory=ConfigLoaderNetExec,
+        description="NetExec configurations",
+    )
 
     def to_daemon_config(self) -> Configuration:
         return Configuration(
@@ -25,7 +30,9 @@ class ConfigLoader(SettingsLoader):
                 "injector_id": {"data": self.injector.id},
                 "injector_name": {"data": self.injector.name},
                 "injector_type": {"data": "openaev_netexec"},
-                "injector_contracts": {"data": build_all_contracts()},
+                "injector_contracts": {
+                    "data": load_contract_manifest(self.netexec.contract_manifest_path)
+                },
                 # Optional author override; None lets the platform attribute
                 # the contracts to the injector's name.
                 "injector_author": {"data": self.injector.author},
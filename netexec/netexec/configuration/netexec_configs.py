@@ -0,0 +1,100 @@
+"""Configuration for NetExec injector."""
+
+from pydantic import Field, NonNegativeInt, PositiveInt
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ConfigLoaderNetExec(BaseSettings):
+    """NetExec configurations"""
+
+    model_config = SettingsConfigDict(extra="ignore")
+
+    workspace_extraction_enabled: bool = Field(
+        default=True,
+        description=(
+            "Run each inject in its own NetExec workspace and read the dumped "
+            "hashes, shares and groups back from its SQLite databases instead "
+            "of scraping them from stdout. The stdout parsing stays the "
+            "fallback for everything the workspace does not record."
+        ),
+    )
+
+    shards: PositiveInt = Field(
+        default=1,
+        description=(
+            "Number of NetExec processes an inject's targets are split across. "
+            "Each process runs its chunk with the inject's own threads, timeout "
+            "and jitter settings. 1 disables sharding."
+        ),
+    )
+
+    shard_min_targets: PositiveInt = Field(
+        default=20,
+        description=(
+            "Minimum number of targets per NetExec process: smaller injects use "
+            "fewer processes, down to a single one."
+        ),
+    )
+
+    contract_manifest_path: str = Field(
+        default=".cache/netexec_contract_manifest.json",
+        description=(
+            "File caching the contracts registered at startup. It is rebuilt "
+            "whenever the contract sources, the modules registry, the shared "
+            "target helpers or the pyoaev version change."
+        ),
+    )
+
+    spider_max_files_per_share: NonNegativeInt = Field(
+        default=1000,
+        description=(
+            "Maximum number of file findings reported per share by the "
+            "spider_plus module. Files over the budget are still counted in "
+            "the result message. 0 disables the cap."
+        ),
+    )
+
+    spider_max_files_per_host: NonNegativeInt = Field(
+        default=5000,
+        description=(
+            "Maximum number of file findings reported per host by the "
+            "spider_plus module. 0 disables the cap."
+        ),
+    )
+
+    spray_workers: PositiveInt = Field(
+        default=4,
+        description="Number of NetExec runs a password spray makes in parallel.",
+    )
+
+    spray_lockout_margin: NonNegativeInt = Field(
+        default=2,
+        description=(
+            "Failed logons a password spray keeps each account below the "
+            "lockout threshold, per lockout observation window."
+        ),
+    )
+
+    spray_max_duration: PositiveInt = Field(
+        default=3600,
+        description=(
+            "Seconds a password spray may last. Attempts the lockout pacing "
+            "would start later are not made, and are reported as skipped."
+        ),
+    )
+
+    spray_default_lockout_threshold: NonNegativeInt = Field(
+        default=5,
+        description=(
+            "Account lockout threshold assumed when the password policy cannot "
+            "be read before a spray. 0 assumes lockout is disabled."
+        ),
+    )
+
+    spray_default_observation_window: PositiveInt = Field(
+        default=1800,
+        description=(
+            "Lockout observation window, in seconds, assumed when the password "
+            "policy cannot be read before a spray."
+        ),
+    )
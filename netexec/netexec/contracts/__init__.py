@@ -17,6 +17,8 @@ from pyoaev.contracts.contract_config import (
 from netexec.contracts.base_contracts import build_base_contracts
 from netexec.contracts.module_contracts import build_module_contracts
 from netexec.contracts.option_contracts import build_option_contracts
+from netexec.contracts.spray_contracts import build_spray_contracts
+from netexec.contracts.sweep_contracts import SWEEP_CONTRACT_ID, build_sweep_contracts
 
 CONTRACT_TYPE = "openaev_netexec"
 
@@ -24,9 +26,9 @@ CONTRACT_TYPE = "openaev_netexec"
 class ParsedContractId(NamedTuple):
     """Result of parsing a contract ID."""
 
-    protocol: str
-    family: str  # "base", "option", or "module"
-    identifier: str | None  # option_id or safe_module_key; None for base
+    protocol: str  # "" for the sweep, which runs the protocols it selects
+    family: str  # "base", "option", "module", "spray", or "sweep"
+    identifier: str | None  # option_id or safe_module_key; None for the others
 
 
 def parse_contract_id(contract_id: str) -> ParsedContractId:
@@ -37,10 +39,15 @@ def parse_contract_id(contract_id: str) -> ParsedContractId:
         netexec_<protocol>                       -> base
         netexec_<protocol>_opt_<option_id>       -> option
         netexec_<protocol>_mod_<safe_module_key> -> module
+        netexec_<protocol>_spray                 -> spray
+        netexec_sweep                            -> sweep
 
     The split strategy uses ``maxsplit=2`` so that identifiers containing
     underscores (e.g. ``spider_plus``, ``local_auth``) are preserved intact.
     """
+    if contract_id == SWEEP_CONTRACT_ID:
+        return ParsedContractId(protocol="", family="sweep", identifier=None)
+
     parts = contract_id.split("_", 2)
 
     if len(parts) < 2 or parts[0] != "netexec":
@@ -53,6 +60,9 @@ def parse_contract_id(contract_id: str) -> ParsedContractId:
 
     rest = parts[2]
 
+    if rest == "spray":
+        return ParsedContractId(protocol=protocol, family="spray", identifier=None)
+
     if rest.startswith("opt_"):
         return ParsedContractId(protocol=protocol, family="option", identifier=rest[4:])
 
@@ -63,7 +73,7 @@ def parse_contract_id(contract_id: str) -> ParsedContractId:
 
 
 def build_all_contracts() -> list[Contract]:
-    """Build and return all NetExec contracts across the three families."""
+    """Build and return all NetExec contracts across the five families."""
     config = ContractConfig(
         type=CONTRACT_TYPE,
         label={
@@ -79,5 +89,7 @@ def build_all_contracts() -> list[Contract]:
     all_contracts.extend(build_base_contracts(config))
     all_contracts.extend(build_option_contracts(config))
     all_contracts.extend(build_module_contracts(config))
+    all_contracts.extend(build_spray_contracts(config))
+    all_contracts.extend(build_sweep_contracts(config))
 
     return prepare_contracts(all_contracts)
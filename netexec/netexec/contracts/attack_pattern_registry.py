@@ -176,6 +176,18 @@ _MODULE_ATTACK_PATTERNS: dict[str, list[str]] = {
     "zerologon": ["T1210"],
 }
 
+# ---------------------------------------------------------------------------
+# Password spray contracts -- the same techniques whatever the protocol: the
+# password policy is read first, then passwords are sprayed.
+# ---------------------------------------------------------------------------
+_SPRAY_ATTACK_PATTERNS: list[str] = ["T1110.003", "T1201"]
+
+# ---------------------------------------------------------------------------
+# Protocol sweep contract -- which services answer on the targets, and which
+# accept the credentials.
+# ---------------------------------------------------------------------------
+_SWEEP_ATTACK_PATTERNS: list[str] = ["T1046", "T1078"]
+
 
 def get_base_attack_patterns(protocol: str) -> list[str]:
     """MITRE ATT&CK technique ids for a base protocol contract."""
@@ -190,3 +202,13 @@ def get_option_attack_patterns(option_id: str) -> list[str]:
 def get_module_attack_patterns(safe_module_key: str) -> list[str]:
     """MITRE ATT&CK technique ids for a (protocol, module) contract."""
     return list(_MODULE_ATTACK_PATTERNS.get(safe_module_key, []))
+
+
+def get_spray_attack_patterns() -> list[str]:
+    """MITRE ATT&CK technique ids for a password spray contract."""
+    return list(_SPRAY_ATTACK_PATTERNS)
+
+
+def get_sweep_attack_patterns() -> list[str]:
+    """MITRE ATT&CK technique ids for the protocol sweep contract."""
+    return list(_SWEEP_ATTACK_PATTERNS)
@@ -20,7 +20,7 @@ from injector_common.constants import (
     TARGETS_KEY,
 )
 from injector_common.targets import TargetProperty, target_property_choices_dict
-from netexec.contracts.protocol_config import PROTOCOL_CONFIGS
+from netexec.contracts.protocol_config import PROTOCOL_CONFIGS, TUNING_FIELDS
 
 # Credential field definitions keyed by their field name. `argumentType` is
 # omitted for `domain` (reuses a primitive currently modeled for network/scope
@@ -39,18 +39,30 @@ _CREDENTIAL_DEFS = {
 def build_credential_fields(protocol: str) -> list[ContractElement]:
     """Return credential ContractText fields for *protocol*."""
     config = PROTOCOL_CONFIGS[protocol]
-    fields: list[ContractElement] = []
-    for cred_key in config["credentials"]:
-        defn = _CREDENTIAL_DEFS[cred_key]
-        fields.append(
-            ContractText(
-                key=cred_key,
-                label=defn["label"],
-                mandatory=False,
-                argumentType=defn.get("argumentType"),
-            )
-        )
-    return fields
+    return [_credential_field(cred_key) for cred_key in config["credentials"]]
+
+
+def build_sweep_credential_fields() -> list[ContractElement]:
+    """Return the credential fields of every protocol, each one once.
+
+    A sweep runs each protocol with the credentials it accepts among them.
+    """
+    accepted = {
+        cred_key
+        for config in PROTOCOL_CONFIGS.values()
+        for cred_key in config["credentials"]
+    }
+    return [_credential_field(key) for key in _CREDENTIAL_DEFS if key in accepted]
+
+
+def _credential_field(cred_key: str) -> ContractText:
+    defn = _CREDENTIAL_DEFS[cred_key]
+    return ContractText(
+        key=cred_key,
+        label=defn["label"],
+        mandatory=False,
+        argumentType=defn.get("argumentType"),
+    )
 
 
 def build_port_field(protocol: str) -> ContractText:
@@ -65,6 +77,14 @@ def build_port_field(protocol: str) -> ContractText:
     )
 
 
+def build_tuning_fields() -> list[ContractElement]:
+    """Return the optional tuning ContractText fields (threads, timeout, jitter)."""
+    return [
+        ContractText(key=field["key"], label=field["label"], mandatory=False)
+        for field in TUNING_FIELDS
+    ]
+
+
 def build_core_fields() -> list[ContractElement]:
     """Target selector, asset groups, manual targets, and expectations.
 
@@ -175,10 +195,12 @@ def build_core_fields() -> list[ContractElement]:
 def build_protocol_base_fields(protocol: str) -> list[ContractElement]:
     """Assemble the shared fields present in **every** contract for *protocol*.
 
-    Order: credentials -> port -> core (target selector, assets, expectations).
+    Order: credentials -> port -> tuning -> core (target selector, assets,
+    expectations).
     """
     fields: list[ContractElement] = []
     fields.extend(build_credential_fields(protocol))
     fields.append(build_port_field(protocol))
+    fields.extend(build_tuning_fields())
     fields.extend(build_core_fields())
     return fields
@@ -0,0 +1,66 @@
+"""On-disk cache of the serialised contract manifest.
+
+Building the contracts goes through pyoaev for every (protocol, option) and
+(protocol, module) pair, on every startup -- including
+``--dump-config-schema`` runs -- although the result only changes when the
+registries or the code building them do. The manifest (the JSON-ready list
+``build_all_contracts()`` returns) is therefore cached in a file keyed by a
+hash of the sources it derives from: the ``netexec.contracts`` package, the
+modules registry, the shared target helpers and the pyoaev version. Any edit
+to those invalidates the cache; an unreadable or stale cache is rebuilt, and a
+cache that cannot be written is simply not kept.
+"""
+
+import hashlib
+import json
+import os
+from importlib import metadata
+from pathlib import Path
+
+import injector_common
+from netexec.contracts import build_all_contracts
+
+_CONTRACTS_DIR = Path(__file__).parent
+_SOURCES = (
+    *sorted(_CONTRACTS_DIR.glob("*.py")),
+    _CONTRACTS_DIR.parent / "modules_registry.py",
+    Path(injector_common.__file__).parent / "constants.py",
+    Path(injector_common.__file__).parent / "targets.py",
+)
+
+
+def manifest_key() -> str:
+    """Hash of everything the contract manifest is built from."""
+    digest = hashlib.sha256()
+    try:
+        digest.update(metadata.version("pyoaev").encode())
+    except metadata.PackageNotFoundError:
+        pass
+    for source in _SOURCES:
+        digest.update(source.name.encode())
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def load_contract_manifest(path: str) -> list[dict]:
+    """Return the contract manifest, from the cache at *path* when still valid."""
+    key = manifest_key()
+    try:
+        with open(path, encoding="utf-8") as handle:
+            cached = json.load(handle)
+        if cached.get("key") == key:
+            return cached["contracts"]
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+
+    contracts = build_all_contracts()
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path + ".tmp", "w", encoding="utf-8") as handle:
+            json.dump({"key": key, "contracts": contracts}, handle)
+        os.replace(path + ".tmp", path)
+    except (OSError, TypeError, ValueError):
+        pass
+    return contracts
@@ -217,3 +217,13 @@ def get_module_output_types(safe_module_key: str) -> set[str]:
 def get_base_output_types() -> set[str]:
     """Base protocol contracts always produce the raw stdout as action_output."""
     return {ACTION_OUTPUT}
+
+
+def get_spray_output_types() -> set[str]:
+    """Password spray contracts report the credentials that logged in."""
+    return {ACTION_OUTPUT, CREDENTIALS}
+
+
+def get_sweep_output_types() -> set[str]:
+    """The protocol sweep reports the merged stdout of every protocol."""
+    return {ACTION_OUTPUT}
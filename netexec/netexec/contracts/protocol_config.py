@@ -158,6 +158,29 @@ PROTOCOL_CONFIGS: dict[str, dict] = {
 
 SUPPORTED_PROTOCOLS: list[str] = list(PROTOCOL_CONFIGS.keys())
 
+# Protocols logging in with a username and a password, which a password spray
+# can target.
+SPRAY_PROTOCOLS: list[str] = [
+    protocol
+    for protocol, config in PROTOCOL_CONFIGS.items()
+    if {"username", "password"} <= set(config["credentials"])
+]
+
+# Protocols a sweep runs unless the inject selects others: the ones answering
+# on most Windows and Linux hosts.
+SWEEP_DEFAULT_PROTOCOLS: list[str] = ["smb", "ldap", "winrm", "mssql", "ssh", "rdp"]
+
+# NetExec's generic tuning flags, offered on every contract.
+TUNING_FIELDS: list[dict] = [
+    _extra(
+        "threads", "Threads (concurrent targets, NetExec default: 256)", "--threads"
+    ),
+    _extra("timeout", "Timeout per target in seconds", "--timeout"),
+    _extra(
+        "jitter", "Jitter between connections in seconds (e.g. 3 or 1-5)", "--jitter"
+    ),
+]
+
 
 def get_option_flag(protocol: str, option_id: str) -> str:
     """Look up the CLI flag for a given protocol option ID."""
@@ -0,0 +1,100 @@
+"""Family 4 -- Password spray contracts (one per protocol with user/password login)."""
+
+from pyoaev.contracts import ContractBuilder
+from pyoaev.contracts.contract_config import (
+    Contract,
+    ContractCheckbox,
+    ContractConfig,
+    ContractElement,
+    ContractText,
+    ContractTextArea,
+    PrimitiveType,
+    SupportedLanguage,
+)
+from pyoaev.security_domain.types import SecurityDomains
+
+from netexec.contracts.attack_pattern_registry import get_spray_attack_patterns
+from netexec.contracts.base_fields import (
+    build_core_fields,
+    build_port_field,
+    build_tuning_fields,
+)
+from netexec.contracts.contract_outputs import build_outputs_for_types
+from netexec.contracts.output_registry import get_spray_output_types
+from netexec.contracts.protocol_config import PROTOCOL_CONFIGS, SPRAY_PROTOCOLS
+
+
+def _build_spray_fields(protocol: str) -> list[ContractElement]:
+    """Credential lists, lockout scope and the account reading the policy."""
+    config = PROTOCOL_CONFIGS[protocol]
+    fields: list[ContractElement] = [
+        ContractTextArea(
+            key="spray_usernames",
+            label="Usernames to spray (one per line)",
+            mandatory=True,
+        ),
+        ContractTextArea(
+            key="spray_passwords",
+            label="Passwords to spray (one per line)",
+            mandatory=True,
+        ),
+    ]
+    if "domain" in config["credentials"]:
+        fields.append(ContractText(key="domain", label="Domain", mandatory=False))
+    if any(opt["id"] == "local_auth" for opt in config["options"]):
+        fields.append(
+            ContractCheckbox(
+                key="local_auth",
+                label="Local accounts (--local-auth): lockout counted per target",
+                mandatory=False,
+            )
+        )
+    # The lockout policy is read with --pass-pol over SMB, whatever the
+    # sprayed protocol.
+    fields.append(
+        ContractText(
+            key="policy_username",
+            label="Username reading the password policy (SMB null session if empty)",
+            mandatory=False,
+            argumentType=PrimitiveType.Username,
+        )
+    )
+    fields.append(
+        ContractText(
+            key="policy_password",
+            label="Password reading the password policy",
+            mandatory=False,
+            argumentType=PrimitiveType.Password,
+        )
+    )
+    return fields
+
+
+def _build_spray_contract(protocol: str, config: ContractConfig) -> Contract:
+    builder = ContractBuilder()
+    builder.add_fields(_build_spray_fields(protocol))
+    builder.add_fields([build_port_field(protocol)])
+    builder.add_fields(build_tuning_fields())
+    builder.add_fields(build_core_fields())
+
+    contract_id = f"netexec_{protocol}_spray"
+    label_text = f"NetExec {protocol.upper()} - Password Spray"
+
+    return Contract(
+        contract_id=contract_id,
+        config=config,
+        label={
+            SupportedLanguage.en: label_text,
+            SupportedLanguage.fr: label_text,
+        },
+        fields=builder.build_fields(),
+        outputs=build_outputs_for_types(get_spray_output_types()),
+        manual=False,
+        domains=[SecurityDomains.ENDPOINT.value, SecurityDomains.NETWORK.value],
+        contract_attack_patterns_external_ids=get_spray_attack_patterns(),
+    )
+
+
+def build_spray_contracts(config: ContractConfig) -> list[Contract]:
+    """Generate one password spray contract per protocol with user/password login."""
+    return [_build_spray_contract(proto, config) for proto in SPRAY_PROTOCOLS]
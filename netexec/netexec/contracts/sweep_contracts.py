@@ -0,0 +1,68 @@
+"""Family 5 -- Protocol sweep contract (one contract, several protocols per inject)."""
+
+from pyoaev.contracts import ContractBuilder
+from pyoaev.contracts.contract_config import (
+    Contract,
+    ContractConfig,
+    ContractElement,
+    ContractSelect,
+    SupportedLanguage,
+)
+from pyoaev.contracts.contract_utils import ContractCardinality
+from pyoaev.security_domain.types import SecurityDomains
+
+from netexec.contracts.attack_pattern_registry import get_sweep_attack_patterns
+from netexec.contracts.base_fields import (
+    build_core_fields,
+    build_sweep_credential_fields,
+    build_tuning_fields,
+)
+from netexec.contracts.contract_outputs import build_outputs_for_types
+from netexec.contracts.output_registry import get_sweep_output_types
+from netexec.contracts.protocol_config import (
+    SUPPORTED_PROTOCOLS,
+    SWEEP_DEFAULT_PROTOCOLS,
+)
+
+SWEEP_CONTRACT_ID = "netexec_sweep"
+
+
+def _build_protocols_field() -> ContractElement:
+    return ContractSelect(
+        key="sweep_protocols",
+        label="Protocols",
+        cardinality=ContractCardinality.Multiple,
+        defaultValue=list(SWEEP_DEFAULT_PROTOCOLS),
+        mandatory=True,
+        choices={protocol: protocol.upper() for protocol in SUPPORTED_PROTOCOLS},
+    )
+
+
+def build_sweep_contracts(config: ContractConfig) -> list[Contract]:
+    """Generate the protocol sweep contract.
+
+    Its protocols run as concurrent NetExec processes over the same targets,
+    each on its default port and with the credentials it accepts.
+    """
+    builder = ContractBuilder()
+    builder.add_fields([_build_protocols_field()])
+    builder.add_fields(build_sweep_credential_fields())
+    builder.add_fields(build_tuning_fields())
+    builder.add_fields(build_core_fields())
+
+    label_text = "NetExec - Multi-Protocol Sweep"
+    return [
+        Contract(
+            contract_id=SWEEP_CONTRACT_ID,
+            config=config,
+            label={
+                SupportedLanguage.en: label_text,
+                SupportedLanguage.fr: label_text,
+            },
+            fields=builder.build_fields(),
+            outputs=build_outputs_for_types(get_sweep_output_types()),
+            manual=False,
+            domains=[SecurityDomains.ENDPOINT.value, SecurityDomains.NETWORK.value],
+            contract_attack_patterns_external_ids=get_sweep_attack_patterns(),
+        )
+    ]
@@ -1331,6 +1331,28 @@ _VULNERABILITY_EXTRACTORS = {
 }
 
 
+_REGISTRIES = (
+    _CREDENTIAL_EXTRACTORS,
+    _USERNAME_EXTRACTORS,
+    _SHARE_EXTRACTORS,
+    _ADMIN_USERNAME_EXTRACTORS,
+    _GROUP_EXTRACTORS,
+    _COMPUTER_EXTRACTORS,
+    _PASSWORD_POLICY_EXTRACTORS,
+    _DELEGATION_EXTRACTORS,
+    _SID_EXTRACTORS,
+    _ACCOUNT_PW_NOT_REQUIRED_EXTRACTORS,
+    _ASREPROASTABLE_EXTRACTORS,
+    _KERBEROASTABLE_EXTRACTORS,
+    _VULNERABILITY_EXTRACTORS,
+)
+
+
+def registered_contract_keys() -> set[tuple[str, str]]:
+    """Return every (family, identifier) pair that has at least one extractor."""
+    return {key for registry in _REGISTRIES for key in registry}
+
+
 def get_credential_extractor(family: str, identifier: str):
     """Return the credential extractor for a (family, identifier) pair, or None."""
     return _CREDENTIAL_EXTRACTORS.get((family, identifier))
@@ -0,0 +1,102 @@
+"""Per-host grouping of NetExec stdout while the command runs.
+
+NetExec works through its targets with a thread pool and prints each result
+line prefixed with the target's IP as soon as it has it, but never announces
+that it is done with a host. The stream groups the lines by that IP column and
+hands a host's lines over once the host has printed nothing for
+``idle_seconds`` -- or when the run ends -- so its findings and trace can be
+reported while the rest of a large sweep is still running. A host that prints
+again afterwards is handed over again, with its new lines only.
+
+Hosts are handed over from a worker thread of the stream, never from the
+thread feeding the lines: reporting a host (a platform call) must not hold up
+the draining of NetExec's stdout pipe. The worker also checks for idle hosts
+every ``check_seconds``, so the last hosts of a quiet stretch are handed over
+without waiting for another line.
+
+Lines without a host prefix (file contents appended after the run, module
+banners) are not attributed to any host; they only reach the final parse of
+the whole output.
+"""
+
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+from netexec.helpers.netexec_output_parser import line_host
+
+HOST_IDLE_SECONDS = 5
+
+
+class HostResultStream:
+    def __init__(
+        self,
+        on_host_lines,
+        idle_seconds=HOST_IDLE_SECONDS,
+        clock=None,
+        check_seconds=None,
+    ):
+        self._on_host_lines = on_host_lines
+        self._idle_seconds = idle_seconds
+        self._check_seconds = check_seconds or idle_seconds
+        self._clock = clock or time.monotonic
+        self._lock = threading.Lock()
+        # ip -> (time of its last line, lines not handed over yet), least
+        # recently active first so idle hosts are found from the front.
+        self._pending: OrderedDict[str, tuple[float, list[str]]] = OrderedDict()
+        self._hosts: set[str] = set()
+        # (ip, lines) to hand over, then None once the run is over.
+        self._ready: queue.Queue = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._hand_over, name="netexec-host-results", daemon=True
+        )
+        self._worker.start()
+
+    @property
+    def hosts(self) -> set[str]:
+        """Every host that printed at least one line so far."""
+        return set(self._hosts)
+
+    def feed(self, line: str) -> None:
+        now = self._clock()
+        ip = line_host(line)
+        with self._lock:
+            # Idle hosts first: the line may be a host printing again after
+            # its earlier lines were due.
+            self._queue_idle_hosts(now)
+            if ip:
+                _, lines = self._pending.pop(ip, (now, []))
+                lines.append(line)
+                self._pending[ip] = (now, lines)
+                self._hosts.add(ip)
+
+    def finish(self) -> None:
+        """Hand over every host still pending and wait until all are: the run is over."""
+        with self._lock:
+            for ip, (_, lines) in self._pending.items():
+                self._ready.put((ip, lines))
+            self._pending.clear()
+        self._ready.put(None)
+        self._worker.join()
+
+    def _queue_idle_hosts(self, now: float) -> None:
+        # Called with the lock held.
+        while self._pending:
+            idle_ip, (last_seen, lines) = next(iter(self._pending.items()))
+            if now - last_seen < self._idle_seconds:
+                break
+            del self._pending[idle_ip]
+            self._ready.put((idle_ip, lines))
+
+    def _hand_over(self) -> None:
+        while True:
+            try:
+                item = self._ready.get(timeout=self._check_seconds)
+            except queue.Empty:
+                with self._lock:
+                    self._queue_idle_hosts(self._clock())
+                continue
+            if item is None:
+                return
+            self._on_host_lines(*item)
@@ -2,7 +2,12 @@
 
 import uuid
 
-from netexec.contracts.protocol_config import PROTOCOL_CONFIGS, get_option_flag
+from netexec.contracts.protocol_config import (
+    PROTOCOL_CONFIGS,
+    SUPPORTED_PROTOCOLS,
+    TUNING_FIELDS,
+    get_option_flag,
+)
 from netexec.modules_registry import get_module_by_safe_key
 
 # Options that require writing their output to a file (mandatory argument).
@@ -58,6 +63,39 @@ def build_command_version() -> list[str]:
     return ["netexec", "--version"]
 
 
+def build_password_policy_command(
+    target: str, credentials: dict[str, str] | None = None
+) -> list[str]:
+    """``--pass-pol`` over SMB against *target*, with a null session by default."""
+    flag = get_option_flag("smb", "pass_pol")
+    if credentials:
+        return build_command("smb", [target], credentials=credentials, options=[flag])
+    return build_command("smb", [target], options=["-u", "", "-p", "", flag])
+
+
+def build_spray_command(
+    protocol: str,
+    target: str,
+    usernames_file: str,
+    password: str,
+    spray_data: dict,
+) -> list[str]:
+    """One spray run: *password* against every username of *usernames_file*."""
+    credentials = {"username": usernames_file, "password": password}
+    if spray_data.get("domain"):
+        credentials["domain"] = spray_data["domain"]
+    options = ["--continue-on-success"]
+    if spray_data.get("local_auth"):
+        options.append("--local-auth")
+    return build_command(
+        protocol,
+        [target],
+        credentials=credentials,
+        options=options,
+        extra_args=spray_data.get("extra_args"),
+    )
+
+
 # ---------------------------------------------------------------------------
 # Credential / port helpers shared by the three extract functions
 # ---------------------------------------------------------------------------
@@ -79,6 +117,15 @@ def _extract_port_args(content: dict) -> list[str]:
     return []
 
 
+def _extract_tuning_args(content: dict) -> list[str]:
+    args: list[str] = []
+    for tf in TUNING_FIELDS:
+        value = content.get(tf["key"])
+        if value:
+            args.extend([tf["flag"], str(value).strip()])
+    return args
+
+
 # ---------------------------------------------------------------------------
 # Family-specific data extractors
 # ---------------------------------------------------------------------------
@@ -96,7 +143,7 @@ def extract_data_base(content: dict, protocol: str) -> dict | None:
     if creds:
         data["credentials"] = creds
 
-    extra_args: list[str] = _extract_port_args(content)
+    extra_args: list[str] = _extract_port_args(content) + _extract_tuning_args(content)
     proto_config = PROTOCOL_CONFIGS[protocol]
     for ef in proto_config["base_extra_fields"]:
         value = content.get(ef["key"])
@@ -131,7 +178,7 @@ def extract_data_option(content: dict, protocol: str, option_id: str) -> dict |
     else:
         data["options"] = [flag]
 
-    extra_args = _extract_port_args(content)
+    extra_args = _extract_port_args(content) + _extract_tuning_args(content)
     if extra_args:
         data["extra_args"] = extra_args
 
@@ -149,7 +196,7 @@ def extract_data_module(content: dict, protocol: str, safe_key: str) -> dict | N
     if creds:
         data["credentials"] = creds
 
-    extra_args: list[str] = _extract_port_args(content)
+    extra_args: list[str] = _extract_port_args(content) + _extract_tuning_args(content)
 
     # Resolve module name
     mod = get_module_by_safe_key(protocol, safe_key)
@@ -191,3 +238,79 @@ def extract_data_module(content: dict, protocol: str, safe_key: str) -> dict | N
         data["extra_args"] = extra_args
 
     return data or None
+
+
+def _split_lines(value) -> list[str]:
+    """Non-blank lines of a text area, in order and without duplicates."""
+    return list(
+        dict.fromkeys(
+            line.strip() for line in str(value or "").splitlines() if line.strip()
+        )
+    )
+
+
+def extract_data_spray(content: dict, protocol: str) -> dict:
+    """Extract form data for a **password spray** contract (Family 4).
+
+    Usernames and passwords are text areas holding one entry per line. The
+    policy credentials, if any, are those reading the password policy.
+    """
+    usernames = _split_lines(content.get("spray_usernames"))
+    passwords = _split_lines(content.get("spray_passwords"))
+    if not usernames or not passwords:
+        raise ValueError(
+            "A password spray needs at least one username and one password"
+        )
+
+    data: dict = {"usernames": usernames, "passwords": passwords}
+    if content.get("domain"):
+        data["domain"] = content["domain"]
+    if content.get("local_auth"):
+        data["local_auth"] = True
+
+    if content.get("policy_username"):
+        policy_credentials = {"username": content["policy_username"]}
+        if content.get("policy_password"):
+            policy_credentials["password"] = content["policy_password"]
+        if content.get("domain"):
+            policy_credentials["domain"] = content["domain"]
+        data["policy_credentials"] = policy_credentials
+
+    extra_args = _extract_port_args(content) + _extract_tuning_args(content)
+    if extra_args:
+        data["extra_args"] = extra_args
+    return data
+
+
+def extract_sweep_protocols(content: dict) -> list[str]:
+    """Protocols selected on a **protocol sweep** contract (Family 5), in order."""
+    selected = content.get("sweep_protocols") or []
+    if isinstance(selected, str):
+        selected = [p.strip() for p in selected.split(",")]
+    protocols = list(dict.fromkeys(p.lower() for p in selected if p))
+    unknown = [p for p in protocols if p not in SUPPORTED_PROTOCOLS]
+    if unknown:
+        raise ValueError(f"Unsupported sweep protocols: {', '.join(unknown)}")
+    if not protocols:
+        raise ValueError("A protocol sweep needs at least one protocol")
+    return protocols
+
+
+def extract_data_sweep(content: dict, protocol: str) -> dict | None:
+    """Extract form data for one protocol of a **protocol sweep** (Family 5).
+
+    The sweep's credentials are shared by all its protocols: each one only
+    gets those it accepts (no hash for SSH, no domain for FTP...).
+    """
+    data: dict = {}
+    credentials = _extract_credentials(content)
+    if credentials:
+        accepted = PROTOCOL_CONFIGS[protocol]["credentials"]
+        credentials = {k: v for k, v in credentials.items() if k in accepted}
+        if credentials:
+            data["credentials"] = credentials
+
+    extra_args = _extract_tuning_args(content)
+    if extra_args:
+        data["extra_args"] = extra_args
+    return data or None
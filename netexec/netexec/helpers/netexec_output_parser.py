@@ -23,6 +23,7 @@ from netexec.helpers.credential_extractors import (
     get_sid_extractor,
     get_username_extractor,
     get_vulnerability_extractor,
+    registered_contract_keys,
 )
 
 # ---------------------------------------------------------------------------
@@ -39,70 +40,58 @@ _LINE_PREFIX = re.compile(
     r"(?P<rest>.*)$"
 )
 
-# Authentication confirmation -- must be SKIPPED everywhere.
-#   [+] domain\user:secret   or   [+] domain\user:secret (Pwn3d!)
-_AUTH_LINE = re.compile(r"\[\+\]\s+\S+\\\S+:\S+")
-
-
-def _parse_line(raw: str) -> tuple[str, str, str, str]:
-    """Return (label, ip, hostname, rest) or ("", "", "", "") if unparseable."""
-    m = _LINE_PREFIX.match(raw)
-    if not m:
-        return ("", "", "", raw.strip())
-    return (
-        m.group("label"),
-        m.group("ip"),
-        m.group("hostname"),
-        m.group("rest").strip(),
-    )
-
-
-def _is_auth_line(rest: str) -> bool:
-    return bool(_AUTH_LINE.match(rest))
-
-
-def _is_banner_line(rest: str) -> bool:
-    return rest.startswith("[*]")
-
+# Lines that are never finding material, classified in a single match on the
+# part after the prefix (which is stripped, so it starts with its first
+# significant character):
+#   - authentication confirmation -- must be SKIPPED everywhere:
+#       [+] domain\user:secret   or   [+] domain\user:secret (Pwn3d!)
+#   - banners ([*]) and errors ([-]) -- already visible in execution traces
+#   - header lines announcing a listing ("[+] Enumerated ...")
+#   - table separators (lines of dashes) and headers (-ColumnName- pattern)
+_SKIPPED_REST = re.compile(
+    r"\[\+\]\s+\S+\\\S+:\S+"
+    r"|\[\*\]"
+    r"|\[-\]"
+    r"|\[\+\] (?:Found following|Dumped|Added|Enumerated)"
+    r"|[\s\-]+$"
+    r"|-\w+.*-\s*$"
+)
 
-def _is_error_line(rest: str) -> bool:
-    """Error lines from netexec — already visible in execution traces."""
-    return rest.startswith("[-]")
 
+def line_host(line: str) -> str:
+    """IP column of a prefixed netexec line, or "" for any other line."""
+    m = _LINE_PREFIX.match(line)
+    return m.group("ip") if m else ""
 
-def _is_noise(rest: str) -> bool:
-    """Header / separator lines that carry no finding value."""
-    if not rest:
-        return True
-    if rest.startswith("[+] Found following"):
-        return True
-    if rest.startswith("[+] Dumped"):
-        return True
-    if rest.startswith("[+] Added"):
-        return True
-    if rest.startswith("[+] Enumerated"):
-        return True
-    # Table separators (lines of dashes)
-    if re.match(r"^[\s\-]+$", rest):
-        return True
-    # Table headers (lines with -ColumnName- pattern)
-    if re.match(r"^-\w+.*-\s*$", rest):
-        return True
-    return False
 
+def line_fields(line: str) -> tuple[str, str, str] | None:
+    """(ip, hostname, rest) of a prefixed netexec line, or None for any other."""
+    m = _LINE_PREFIX.match(line)
+    return (m.group("ip"), m.group("hostname"), m.group("rest").strip()) if m else None
 
-# ---------------------------------------------------------------------------
-# Generic dispatch helper
-# ---------------------------------------------------------------------------
 
+def _finding_lines(lines: list[str]) -> list[tuple[str, str, str]]:
+    """Return (ip, hostname, rest) for every line that may carry a finding.
 
-def _dispatch(getter, finding_lines, ip_to_asset_id_map, family, identifier):
-    """Run a per-contract extractor looked up via *getter*, if one exists."""
-    if family and identifier:
-        extractor = getter(family, identifier)
-        if extractor is not None:
-            return extractor(finding_lines, ip_to_asset_id_map)
-    return []
+    Each line is matched once against the prefix and, only when it starts
+    like one of the skipped kinds ("[" or "-"), once against the classifier.
+    """
+    prefix_match = _LINE_PREFIX.match
+    skipped_match = _SKIPPED_REST.match
+    finding_lines = []
+    for raw in lines:
+        m = prefix_match(raw)
+        if m:
+            ip, hostname, rest = m.group("ip", "hostname", "rest")
+            rest = rest.strip()
+        else:
+            ip, hostname, rest = "", "", raw.strip()
+        if not rest:
+            continue
+        if rest[0] in "[-" and skipped_match(rest):
+            continue
+        finding_lines.append((ip, hostname, rest))
+    return finding_lines
 
 
 # ---------------------------------------------------------------------------
@@ -125,6 +114,18 @@ _DISPATCHERS = [
 ]
 
 
+# (family, identifier) -> [(field name, extractor)], in _DISPATCHERS order,
+# precomputed so a parse only runs the one or two extractors of its contract.
+_DISPATCH_TABLE = {
+    key: [
+        (field_name, getter(*key))
+        for field_name, getter in _DISPATCHERS
+        if getter(*key) is not None
+    ]
+    for key in registered_contract_keys()
+}
+
+
 # ---------------------------------------------------------------------------
 # Public parser
 # ---------------------------------------------------------------------------
@@ -139,6 +140,7 @@ class NetExecOutputParser:
         ip_to_asset_id_map: dict = None,
         family: str = None,
         identifier: str = None,
+        workspace_findings: dict = None,
     ) -> dict:
         """Parse netexec output and extract structured findings.
 
@@ -152,6 +154,9 @@ class NetExecOutputParser:
             Contract family (``"base"``, ``"option"``, ``"module"``).
         identifier : str, optional
             Contract identifier (option_id or safe_module_key).
+        workspace_findings : dict, optional
+            Findings already read from the NetExec workspace, by field name.
+            They replace the stdout extractors of those fields.
 
         Returns ``{"message": str, "outputs": dict}`` where *outputs* maps field
         names to lists of findings, except ``"action_output"`` which is the
@@ -162,23 +167,14 @@ class NetExecOutputParser:
         if ip_to_asset_id_map is None:
             ip_to_asset_id_map = {}
 
-        lines = stdout.splitlines()
-
-        # Collect module-output lines (skip auth, banners, errors, noise)
-        finding_lines: list[tuple[str, str, str]] = []  # (ip, hostname, rest)
-        for raw in lines:
-            label, ip, hostname, rest = _parse_line(raw)
-            if not rest:
-                continue
-            if _is_auth_line(rest):
-                continue
-            if _is_banner_line(rest):
-                continue
-            if _is_error_line(rest):
-                continue
-            if _is_noise(rest):
-                continue
-            finding_lines.append((ip, hostname, rest))
+        if workspace_findings is None:
+            workspace_findings = {}
+
+        extractors = _DISPATCH_TABLE.get((family, identifier), [])
+        # Module-output lines (auth, banners, errors and noise skipped); only
+        # worth classifying when the contract has a stdout extractor to feed.
+        needs_stdout = any(f not in workspace_findings for f, _ in extractors)
+        finding_lines = _finding_lines(stdout.splitlines()) if needs_stdout else []
 
         # The stdout (trimmed of leading/trailing whitespace only -- no line filtering),
         # always routed to a single action_output entry (isFindingCompatible=False on the
@@ -190,11 +186,11 @@ class NetExecOutputParser:
         if stdout.strip():
             outputs["action_output"] = stdout.strip()
 
-        # Run all registered dispatchers
-        for field_name, getter in _DISPATCHERS:
-            results = _dispatch(
-                getter, finding_lines, ip_to_asset_id_map, family, identifier
-            )
+        for field_name, extractor in extractors:
+            if field_name in workspace_findings:
+                results = workspace_findings[field_name]
+            else:
+                results = extractor(finding_lines, ip_to_asset_id_map)
             if results:
                 outputs[field_name] = results
                 parts.append(f"{len(results)} {field_name}")
@@ -1,13 +1,22 @@
 import subprocess
+import threading
 
 DEFAULT_TIMEOUT = 300  # 5 minutes
 
+# Seconds to wait for NetExec's output pipes to drain once the process exited.
+_DRAIN_TIMEOUT = 10
+
 
 def execute_netexec(
     cmd: list[str],
     input_data: str | None = None,
     timeout: int = DEFAULT_TIMEOUT,
+    env: dict | None = None,
+    on_stdout_line=None,
 ) -> tuple[str, str, int]:
+    if on_stdout_line is not None:
+        return _execute_streaming(cmd, input_data, timeout, env, on_stdout_line)
+
     kwargs = {
         "capture_output": True,
         "check": False,
@@ -17,9 +26,79 @@ def execute_netexec(
 
     if input_data is not None:
         kwargs["input"] = input_data
+    if env is not None:
+        kwargs["env"] = env
 
     try:
         result = subprocess.run(cmd, **kwargs)
         return result.stdout, result.stderr, result.returncode
     except subprocess.TimeoutExpired:
         return "", f"NetExec timed out after {timeout}s", -1
+
+
+def _execute_streaming(
+    cmd: list[str],
+    input_data: str | None,
+    timeout: int,
+    env: dict | None,
+    on_stdout_line,
+) -> tuple[str, str, int]:
+    # Hands every stdout line to on_stdout_line as NetExec prints it, from the
+    # thread draining stdout. On timeout the process is killed, but what it
+    # printed so far is returned rather than dropped: on a large sweep that is
+    # every host it got through.
+    stdout_lines, stderr_lines = [], []
+    with subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE if input_data is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        env=env,
+    ) as process:
+
+        def feed_stdin():
+            try:
+                process.stdin.write(input_data)
+                process.stdin.close()
+            except OSError:
+                # NetExec exited (or was killed) before reading its input.
+                pass
+
+        def drain_stdout():
+            for line in process.stdout:
+                stdout_lines.append(line)
+                on_stdout_line(line)
+
+        def drain_stderr():
+            for line in process.stderr:
+                stderr_lines.append(line)
+
+        targets = [drain_stdout, drain_stderr]
+        if input_data is not None:
+            targets.append(feed_stdin)
+        threads = [threading.Thread(target=t, daemon=True) for t in targets]
+        for thread in threads:
+            thread.start()
+        timed_out = False
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            process.kill()
+            process.wait()
+        for thread in threads:
+            # Bounded: a grandchild still holding the pipes must not keep the
+            # inject from returning.
+            thread.join(timeout=_DRAIN_TIMEOUT)
+
+    stdout = "".join(stdout_lines)
+    stderr = "".join(stderr_lines)
+    if timed_out:
+        if stderr and not stderr.endswith("\n"):
+            stderr += "\n"
+        stderr += f"NetExec timed out after {timeout}s"
+        return stdout, stderr, -1
+    return stdout, stderr, process.returncode
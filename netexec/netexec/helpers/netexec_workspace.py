@@ -0,0 +1,247 @@
+"""Structured findings read back from an isolated NetExec workspace.
+
+NetExec records what it finds in the SQLite databases of its current workspace
+(``<NXC_PATH>/workspaces/default/<protocol>.db``, ``NXC_PATH`` defaulting to
+``~/.nxc``): dumped hashes in ``users``, share permissions in ``shares``,
+groups in ``groups``, each row pointing back to its row in ``hosts``. Running
+an inject with its own NetExec home keeps those databases scoped to the one
+run, so the findings can be bulk-read from them after the run instead of being
+reconstructed from stdout by the per-contract regexes of
+``credential_extractors`` -- which remain the fallback for every contract and
+field the workspace does not cover.
+
+The home is copied from a seed initialised once at startup, so NetExec never
+runs its first-time setup (and never prints its banner) during an inject.
+
+Readers follow the same rule as the stdout extractors: ONE function per
+contract, never shared between contracts. A reader that finds no database, no
+table or an unexpected schema returns nothing and the stdout extractor is used.
+Their findings carry the same keys as the stdout extractors', ``source_line``
+included: it is rebuilt from the row, in the shape of the line NetExec prints.
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextlib import closing
+
+# Workspace selected by a freshly initialised NetExec configuration.
+WORKSPACE_NAME = "default"
+
+# Empty LM hash NetExec omits when it records an NT hash alone (--ntds).
+_EMPTY_LM_HASH = "aad3b435b51404eeaad3b435b51404ee"
+
+
+# ---------------------------------------------------------------------------
+# Workspace lifecycle
+# ---------------------------------------------------------------------------
+
+
+def workspace_env(home: str) -> dict:
+    """Environment running NetExec with *home* as its home directory.
+
+    Recent NetExec versions honour ``NXC_PATH``; older ones resolve
+    ``~/.nxc``, hence ``HOME`` is pointed at the same place.
+    """
+    env = dict(os.environ)
+    env["HOME"] = home
+    env["NXC_PATH"] = os.path.join(home, ".nxc")
+    return env
+
+
+def create_workspace_home(seed_home: str | None = None) -> str:
+    """Create a fresh NetExec home, copied from *seed_home* when available."""
+    home = tempfile.mkdtemp(prefix="nxc_home_")
+    if seed_home and os.path.isdir(os.path.join(seed_home, ".nxc")):
+        shutil.copytree(
+            os.path.join(seed_home, ".nxc"),
+            os.path.join(home, ".nxc"),
+            # NetExec keeps its logs next to the workspaces: not worth copying.
+            ignore=shutil.ignore_patterns("logs"),
+        )
+    return home
+
+
+def workspace_database(home: str, protocol: str) -> str:
+    return os.path.join(home, ".nxc", "workspaces", WORKSPACE_NAME, f"{protocol}.db")
+
+
+def _query(database: str, sql: str) -> list[tuple]:
+    """Run a read-only query, or return nothing when the database can't answer."""
+    if not os.path.isfile(database):
+        return []
+    try:
+        with closing(
+            sqlite3.connect(f"file:{database}?mode=ro", uri=True, timeout=30)
+        ) as conn:
+            return conn.execute(sql).fetchall()
+    except sqlite3.Error:
+        return []
+
+
+def _with_asset_id(finding: dict, ip_to_asset_id_map: dict) -> dict:
+    asset_id = ip_to_asset_id_map.get(finding["host"], "")
+    if asset_id:
+        finding["asset_id"] = asset_id
+    return finding
+
+
+# ===================================================================
+# Per-contract readers — ONE function per contract, never shared
+# ===================================================================
+
+# Dumped hashes with the host they were pillaged from.
+_HASH_CREDENTIALS_SQL = (
+    "SELECT u.username, u.password, h.ip, h.hostname "
+    "FROM users u JOIN hosts h ON h.id = u.pillaged_from_hostid "
+    "WHERE u.credtype = 'hash' ORDER BY u.id"
+)
+
+
+def _hash_credentials(database: str, ip_to_asset_id_map: dict) -> list[dict]:
+    """Internal helper — credentials from the hashes recorded in ``users``."""
+    results: list[dict] = []
+    for username, password, ip, hostname in _query(database, _HASH_CREDENTIALS_SQL):
+        if not username or not password:
+            continue
+        # Same "LM:NT" shape as the stdout extractors, whichever NetExec stored.
+        hash_value = password if ":" in password else f"{_EMPTY_LM_HASH}:{password}"
+        credential: dict = {
+            "username": username,
+            "hash": hash_value,
+            "host": ip,
+            "hostname": hostname or "",
+            # The workspace does not record the RID printed between the two.
+            "source_line": f"{username}:{hash_value}:::",
+        }
+        results.append(_with_asset_id(credential, ip_to_asset_id_map))
+    return results
+
+
+# -------------------------------------------------------------------
+# Option: sam (smb --sam)
+# -------------------------------------------------------------------
+
+
+def read_opt_sam_credentials(database: str, ip_to_asset_id_map: dict) -> list[dict]:
+    """Local account hashes dumped by ``--sam`` (``users``, credtype hash)."""
+    return _hash_credentials(database, ip_to_asset_id_map)
+
+
+# -------------------------------------------------------------------
+# Option: ntds (smb --ntds)
+# -------------------------------------------------------------------
+
+
+def read_opt_ntds_credentials(database: str, ip_to_asset_id_map: dict) -> list[dict]:
+    """Domain account hashes dumped by ``--ntds`` (``users``, credtype hash)."""
+    return _hash_credentials(database, ip_to_asset_id_map)
+
+
+# -------------------------------------------------------------------
+# Option: shares (smb --shares)
+# -------------------------------------------------------------------
+
+_SHARES_SQL = (
+    "SELECT s.name, s.remark, s.read, s.write, h.ip, h.hostname "
+    "FROM shares s JOIN hosts h ON h.id = s.hostid ORDER BY s.id"
+)
+
+
+def read_opt_shares_shares(database: str, ip_to_asset_id_map: dict) -> list[dict]:
+    """Shares enumerated by ``--shares``.
+
+    As on stdout, administrative shares (ending with ``$``) and shares the
+    credentials have no permission on are excluded.
+    """
+    results: list[dict] = []
+    seen = set()
+    for name, remark, read, write, ip, hostname in _query(database, _SHARES_SQL):
+        permissions = ",".join(
+            p for p, granted in (("READ", read), ("WRITE", write)) if granted
+        )
+        if not name or name.endswith("$") or not permissions:
+            continue
+        # NetExec keeps one row per (share, user): report each share once.
+        if (ip, name) in seen:
+            continue
+        seen.add((ip, name))
+        finding: dict = {
+            "share_name": name,
+            "permissions": permissions,
+            "host": ip,
+            "hostname": hostname or "",
+            "source_line": f"{name:<15} {permissions:<15} {remark or ''}".rstrip(),
+        }
+        results.append(_with_asset_id(finding, ip_to_asset_id_map))
+    return results
+
+
+# -------------------------------------------------------------------
+# Option: groups (smb --groups)
+# -------------------------------------------------------------------
+
+# ``groups`` has no host column: the groups belong to the domain of the
+# hosts enumerated during the run.
+_GROUPS_SQL = (
+    "SELECT g.name, g.member_count_ad, h.ip, h.hostname "
+    "FROM groups g JOIN hosts h ON lower(h.domain) = lower(g.domain) ORDER BY g.id"
+)
+
+
+def read_opt_groups_groups(database: str, ip_to_asset_id_map: dict) -> list[dict]:
+    """Domain groups enumerated by ``--groups``, with their member count."""
+    results: list[dict] = []
+    for name, member_count, ip, hostname in _query(database, _GROUPS_SQL):
+        if not name or member_count is None:
+            continue
+        finding: dict = {
+            "group_name": name,
+            "member_count": int(member_count),
+            "host": ip,
+            "hostname": hostname or "",
+            "source_line": f"{name:<40} membercount: {int(member_count)}",
+        }
+        results.append(_with_asset_id(finding, ip_to_asset_id_map))
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Registry and public reader
+# ---------------------------------------------------------------------------
+
+# (protocol, family, identifier) -> {output field: reader}. Only SMB records
+# these tables with a link back to the host they come from.
+_WORKSPACE_READERS = {
+    ("smb", "option", "sam"): {"credentials": read_opt_sam_credentials},
+    ("smb", "option", "ntds"): {"credentials": read_opt_ntds_credentials},
+    ("smb", "option", "shares"): {"shares": read_opt_shares_shares},
+    ("smb", "option", "groups"): {"groups": read_opt_groups_groups},
+}
+
+
+def has_workspace_readers(protocol: str, family: str, identifier: str) -> bool:
+    return (protocol, family, identifier) in _WORKSPACE_READERS
+
+
+def read_workspace_findings(
+    home: str,
+    protocol: str,
+    family: str,
+    identifier: str,
+    ip_to_asset_id_map: dict,
+) -> dict[str, list[dict]]:
+    """Read the findings of a run from its workspace, by output field.
+
+    Fields the workspace recorded nothing for are left out, so the caller
+    falls back to the stdout extractors for them.
+    """
+    readers = _WORKSPACE_READERS.get((protocol, family, identifier), {})
+    database = workspace_database(home, protocol)
+    findings = {}
+    for field_name, reader in readers.items():
+        results = reader(database, ip_to_asset_id_map)
+        if results:
+            findings[field_name] = results
+    return findings
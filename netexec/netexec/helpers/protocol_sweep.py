@@ -0,0 +1,93 @@
+"""Merging the NetExec runs of a multi-protocol sweep into one result.
+
+A sweep runs one NetExec process per protocol, concurrently, over the same
+targets. Their outputs are merged per host and then per protocol, so a host's
+results read together whatever order the processes printed them in. Each host
+also gets a status per protocol, from the lines that protocol's run printed
+for it:
+
+- ``admin``: a login with administrative rights (``(Pwn3d!)``)
+- ``authenticated``: a successful login
+- ``login failed``: the service answered but refused the credentials
+- ``reachable``: the service answered (banner only, or guest session)
+
+Protocols that printed nothing for a host are reported as ``no answer``.
+"""
+
+from netexec.helpers.netexec_output_parser import line_fields
+
+# Statuses by increasing precedence: a host's status for a protocol is the
+# highest one among its lines.
+_STATUSES = ["reachable", "login failed", "authenticated", "admin"]
+NO_ANSWER = "no answer"
+
+
+def _line_status(rest: str) -> str:
+    if rest.startswith("[+]"):
+        if "(Pwn3d!)" in rest:
+            return "admin"
+        if "(Guest)" not in rest:
+            return "authenticated"
+    elif rest.startswith("[-]"):
+        return "login failed"
+    return "reachable"
+
+
+class SweepResult:
+    """Per-host, per-protocol view of the outputs of a sweep's runs."""
+
+    def __init__(self, protocols: list[str]):
+        self._protocols = protocols
+        # ip -> protocol -> lines, hosts in the order they first printed.
+        self._lines: dict[str, dict[str, list[str]]] = {}
+        self._status: dict[str, dict[str, str]] = {}
+        # protocol -> lines without a host prefix (appended files, banners).
+        self._unattributed: dict[str, list[str]] = {}
+
+    def add(self, protocol: str, stdout: str) -> None:
+        """Record the output of one run of *protocol*."""
+        for line in (stdout or "").splitlines():
+            fields = line_fields(line)
+            if fields is None:
+                if line.strip():
+                    self._unattributed.setdefault(protocol, []).append(line)
+                continue
+            ip, _, rest = fields
+            self._lines.setdefault(ip, {}).setdefault(protocol, []).append(line)
+            status = _line_status(rest)
+            statuses = self._status.setdefault(ip, {})
+            current = statuses.get(protocol)
+            if current is None or _STATUSES.index(status) > _STATUSES.index(current):
+                statuses[protocol] = status
+
+    @property
+    def hosts(self) -> list[str]:
+        return list(self._lines)
+
+    def reached(self, protocol: str) -> bool:
+        """Whether any host answered on *protocol*."""
+        return any(protocol in statuses for statuses in self._status.values())
+
+    def status(self, ip: str, protocol: str) -> str:
+        return self._status.get(ip, {}).get(protocol, NO_ANSWER)
+
+    def merged_output(self) -> str:
+        """Every line, grouped by host then protocol, unattributed lines last."""
+        lines: list[str] = []
+        for by_protocol in self._lines.values():
+            for protocol in self._protocols:
+                lines.extend(by_protocol.get(protocol, []))
+        for protocol in self._protocols:
+            lines.extend(self._unattributed.get(protocol, []))
+        return "\n".join(lines)
+
+    def summary(self) -> str:
+        """One line per host with its status on every protocol swept."""
+        return "\n".join(
+            f"{ip}: "
+            + ", ".join(
+                f"{protocol.upper()} {self.status(ip, protocol)}"
+                for protocol in self._protocols
+            )
+            for ip in self._lines
+        )
@@ -22,10 +22,53 @@ that share. The finding keeps ``file_name`` (basename) separate from ``path``
 (directory) and ``share`` so the platform can render the basename while still
 carrying the full location -- and so a share-hosted file links back to its
 ``share`` finding.
+
+A spider run over a large file server can write hundreds of megabytes of
+metadata. The files are therefore read as a stream -- one file entry at a
+time, never the whole document -- with hosts read in parallel, and the number
+of findings is capped per share and per host so the callback stays within
+platform limits. The summary returned next to the findings counts every file
+seen, including those over budget.
+
+A damaged entry (a value that cannot be decoded, or that never ends within
+``_MAX_VALUE_SIZE``) is skipped: reading resumes at the next file entry or the
+next share, and the damage is counted in the summary as a ``parse_errors``.
 """
 
 import json
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+_CHUNK_SIZE = 1 << 20
+_LOOKAHEAD = 1 << 16
+# Window a single value may take before it is deemed damaged: far beyond any
+# file's metadata, it stops a malformed value from reading the rest of the file.
+_MAX_VALUE_SIZE = 1 << 24
+_OPEN_OBJECT = re.compile(r"[ \t\n\r]*\{")
+_CLOSE_OBJECT = re.compile(r"[ \t\n\r]*\}")
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+# A key, its colon and the whitespace up to its value.
+_KEY = re.compile(rf"[ \t\n\r]*({_STRING})[ \t\n\r]*:[ \t\n\r]*")
+_SEPARATOR = re.compile(r"[ \t\n\r]*([,}])")
+# The usual file entry in one match: key, flat metadata object, separator.
+_FILE_ENTRY = re.compile(
+    rf"[ \t\n\r]*({_STRING})[ \t\n\r]*:[ \t\n\r]*"
+    rf'\{{[^{{}}\[\]"]*(?:{_STRING}[^{{}}\[\]"]*)*\}}[ \t\n\r]*([,}}])'
+)
+# Where reading resumes after a damaged entry: the "," before the next share
+# (a key opening an object whose first member opens one too, or is empty), or
+# the "," before the next file entry (a key opening a flat metadata object).
+_RESUME = re.compile(
+    rf"(?P<share>(?:\}}[ \t\n\r]*)?,(?=[ \t\n\r]*{_STRING}[ \t\n\r]*:[ \t\n\r]*\{{"
+    rf"[ \t\n\r]*(?:{_STRING}[ \t\n\r]*:[ \t\n\r]*\{{|\}})))"
+    rf"|(?P<entry>,(?=[ \t\n\r]*{_STRING}[ \t\n\r]*:[ \t\n\r]*\{{"
+    rf"[ \t\n\r]*(?:{_STRING}[ \t\n\r]*:[ \t\n\r]*[^{{ \t\n\r]|\}})))"
+)
+_DECODER = json.JSONDecoder()
+
+# Metadata files read concurrently.
+_MAX_WORKERS = 4
 
 
 def _split_path(relative_path: str) -> tuple[str, str]:
@@ -41,6 +84,21 @@ def _split_path(relative_path: str) -> tuple[str, str]:
     return directory, file_name
 
 
+def _file_finding(share: str, relative_path, ip: str, asset_id: str) -> dict | None:
+    directory, file_name = _split_path(str(relative_path))
+    if not file_name:
+        return None
+    finding: dict = {
+        "file_name": file_name,
+        "path": directory,
+        "share": share,
+        "host": ip,
+    }
+    if asset_id:
+        finding["asset_id"] = asset_id
+    return finding
+
+
 def extract_files_from_metadata(
     spider_json: dict,
     ip: str,
@@ -53,43 +111,269 @@ def extract_files_from_metadata(
         if not isinstance(files, dict):
             continue
         for relative_path in files:
-            directory, file_name = _split_path(str(relative_path))
-            if not file_name:
-                continue
-            finding: dict = {
-                "file_name": file_name,
-                "path": directory,
-                "share": share,
-                "host": ip,
-            }
-            if asset_id:
-                finding["asset_id"] = asset_id
-            results.append(finding)
+            finding = _file_finding(share, relative_path, ip, asset_id)
+            if finding:
+                results.append(finding)
     return results
 
 
-def parse_spider_output_dir(
+def _decode_key(literal: str) -> str:
+    return json.loads(literal) if "\\" in literal else literal[1:-1]
+
+
+class _JsonStream:
+    """Just enough of an incremental JSON reader for the metadata shape.
+
+    Keeps a bounded window of the file in memory: keys and the punctuation
+    around them are matched with regexes, values are decoded with the stdlib
+    decoder, each as soon as the window holds it whole.
+    """
+
+    def __init__(self, handle):
+        self._handle = handle
+        self._buffer = ""
+        self._pos = 0
+        # Damaged entries skipped so far.
+        self.errors = 0
+
+    def _fill(self) -> bool:
+        chunk = self._handle.read(_CHUNK_SIZE)
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def _match(self, pattern: re.Pattern) -> re.Match | None:
+        # Matched tokens are far shorter than the lookahead kept in the
+        # window, so a failed match is never a token cut by the window.
+        if len(self._buffer) - self._pos < _LOOKAHEAD:
+            self._fill()
+        match = pattern.match(self._buffer, self._pos)
+        if match is not None:
+            self._pos = match.end()
+        return match
+
+    def opens_object(self) -> bool:
+        return self._match(_OPEN_OBJECT) is not None
+
+    def closes_object(self) -> bool:
+        return self._match(_CLOSE_OBJECT) is not None
+
+    def key(self) -> str:
+        match = self._match(_KEY)
+        if match is None:
+            raise ValueError("Expected a key in spider_plus metadata")
+        return _decode_key(match.group(1))
+
+    def file_entry(self) -> tuple[str, bool]:
+        """Consume a file entry: (relative path, whether it closed the share)."""
+        match = self._match(_FILE_ENTRY)
+        if match is not None:
+            return _decode_key(match.group(1)), match.group(2) == "}"
+        # Nested metadata, or a damaged entry: decode it piece by piece.
+        relative_path = self.key()
+        self.value()
+        return relative_path, self.next_is_last()
+
+    def value(self):
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Most likely cut by the window: read on, unless at the end or
+                # the value is already larger than any sound one.
+                if len(self._buffer) - self._pos > _MAX_VALUE_SIZE:
+                    raise ValueError("Oversized value in spider_plus metadata")
+                if not self._fill():
+                    raise
+                continue
+            # A number ending the window may continue in the next chunk.
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def resume(self) -> str | None:
+        """Skip a damaged entry: "entry" or "share" for what reading resumes at.
+
+        None when the document holds neither any more. Only a bounded window
+        is kept while looking, as for every other read.
+        """
+        self.errors += 1
+        while True:
+            match = _RESUME.search(self._buffer, self._pos)
+            if match is not None:
+                self._pos = match.end()
+                return match.lastgroup
+            # Keep the tail: it may hold the start of a match cut by the window.
+            self._pos = max(self._pos, len(self._buffer) - _LOOKAHEAD)
+            if not self._fill():
+                return None
+
+    def next_is_last(self) -> bool:
+        """Consume the "," or "}" after a member: True when it closed the object."""
+        match = self._match(_SEPARATOR)
+        if match is None:
+            raise ValueError("Expected ',' or '}' in spider_plus metadata")
+        return match.group(1) == "}"
+
+
+def _iter_files(stream: _JsonStream, share: str):
+    """Yield (share, relative_path) for every file of an opened share listing.
+
+    Returns "end" once the listing is closed, "share" when a damaged entry was
+    skipped up to the next share, None when the document holds no more.
+    """
+    if stream.closes_object():
+        return "end"
+    while True:
+        try:
+            relative_path, last = stream.file_entry()
+        except ValueError:
+            resumed_at = stream.resume()
+            if resumed_at == "entry":
+                continue
+            return resumed_at
+        yield share, relative_path
+        if last:
+            return "end"
+
+
+def _iter_share_files(stream: _JsonStream):
+    """Yield (share, relative_path) for every file of a metadata document.
+
+    Damaged entries are skipped (see ``_JsonStream.resume``); a document cut
+    short ends the iteration.
+    """
+    if not stream.opens_object():
+        raise ValueError("spider_plus metadata is not a JSON object")
+    if stream.closes_object():
+        return
+    while True:
+        share = stream.key()
+        try:
+            if stream.opens_object():
+                # Per-file times and size are not reported: only paths are kept.
+                listing_end = yield from _iter_files(stream, share)
+                if listing_end is None:
+                    return
+                if listing_end == "share":
+                    continue
+            else:
+                stream.value()  # not a file listing: skipped
+            last = stream.next_is_last()
+        except ValueError:
+            if stream.resume() is None:
+                return
+            continue
+        if last:
+            return
+
+
+def _scan_host_metadata(
+    path: str,
+    ip: str,
+    ip_to_asset_id_map: dict,
+    max_files_per_share: int | None,
+    max_files_per_host: int | None,
+) -> tuple[list[dict], int, set, int]:
+    """Stream one ``<ip>.json``: (findings within budget, files seen, shares,
+    damaged entries skipped).
+
+    A truncated or malformed file keeps what was read before the damage.
+    """
+    results: list[dict] = []
+    per_share: dict[str, int] = {}
+    seen = 0
+    asset_id = ip_to_asset_id_map.get(ip, "")
+    stream = None
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as handle:
+            stream = _JsonStream(handle)
+            for share, relative_path in _iter_share_files(stream):
+                if not _split_path(relative_path)[1]:
+                    continue
+                seen += 1
+                share_count = per_share.get(share, 0)
+                per_share[share] = share_count + 1
+                if max_files_per_share and share_count >= max_files_per_share:
+                    continue
+                if max_files_per_host and len(results) >= max_files_per_host:
+                    continue
+                results.append(_file_finding(share, relative_path, ip, asset_id))
+    except (OSError, ValueError):
+        pass
+    return results, seen, set(per_share), stream.errors if stream else 0
+
+
+def scan_spider_output_dir(
     output_dir: str,
     ip_to_asset_id_map: dict,
-) -> list[dict]:
-    """Read every ``<ip>.json`` in *output_dir* and return all file findings.
+    max_files_per_share: int | None = None,
+    max_files_per_host: int | None = None,
+) -> tuple[list[dict], dict]:
+    """Read every ``<ip>.json`` in *output_dir* into file findings.
 
     The target IP is recovered from the JSON file name (netexec writes one file
     per target named ``<ip>.json``). Missing or malformed files are skipped --
     a spider run that reached no readable share simply yields no findings.
+
+    Returns the findings, at most *max_files_per_share* per share and
+    *max_files_per_host* per host (no cap when unset), and a summary counting
+    ``hosts``, ``shares`` and ``files`` seen, and how many of those files were
+    ``reported`` or ``skipped`` by the caps, and the damaged entries skipped
+    as ``parse_errors``.
     """
-    results: list[dict] = []
+    summary = {
+        "hosts": 0,
+        "shares": 0,
+        "files": 0,
+        "reported": 0,
+        "skipped": 0,
+        "parse_errors": 0,
+    }
     if not output_dir or not os.path.isdir(output_dir):
-        return results
-    for entry in sorted(os.listdir(output_dir)):
-        if not entry.endswith(".json"):
-            continue
-        ip = entry[: -len(".json")]
-        full_path = os.path.join(output_dir, entry)
-        try:
-            with open(full_path, "r", encoding="utf-8", errors="replace") as f:
-                spider_json = json.load(f)
-        except (OSError, ValueError):
-            continue
-        results.extend(extract_files_from_metadata(spider_json, ip, ip_to_asset_id_map))
-    return results
+        return [], summary
+    entries = [e for e in sorted(os.listdir(output_dir)) if e.endswith(".json")]
+    if not entries:
+        return [], summary
+
+    def scan(entry):
+        return _scan_host_metadata(
+            os.path.join(output_dir, entry),
+            entry[: -len(".json")],
+            ip_to_asset_id_map,
+            max_files_per_share,
+            max_files_per_host,
+        )
+
+    with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(entries))) as pool:
+        scanned = list(pool.map(scan, entries))
+
+    results: list[dict] = []
+    for findings, seen, shares, errors in scanned:
+        results.extend(findings)
+        if seen:
+            summary["hosts"] += 1
+        summary["shares"] += len(shares)
+        summary["files"] += seen
+        summary["parse_errors"] += errors
+    summary["reported"] = len(results)
+    summary["skipped"] = summary["files"] - len(results)
+    return results, summary
+
+
+def parse_spider_output_dir(
+    output_dir: str,
+    ip_to_asset_id_map: dict,
+    max_files_per_share: int | None = None,
+    max_files_per_host: int | None = None,
+) -> list[dict]:
+    """Read every ``<ip>.json`` in *output_dir* and return all file findings.
+
+    See ``scan_spider_output_dir``, which also returns the summary counts.
+    """
+    return scan_spider_output_dir(
+        output_dir, ip_to_asset_id_map, max_files_per_share, max_files_per_host
+    )[0]
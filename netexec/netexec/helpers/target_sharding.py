@@ -0,0 +1,21 @@
+"""Split an inject's targets across several NetExec processes.
+
+A single NetExec process works through its targets with one thread pool; on a
+large network the inject is bound by that one process. With sharding enabled
+the targets are dealt round-robin into chunks (so neighbouring addresses,
+which tend to behave alike, are spread evenly) and each chunk runs in its own
+NetExec process, with its own temporary output file, spider_plus folder and
+workspace.
+"""
+
+
+def plan_shards(targets: list[str], shards: int, min_targets: int) -> list[list[str]]:
+    """Return the target chunks to run, one per NetExec process.
+
+    No more than *shards* chunks, and none smaller than *min_targets*: below
+    that, an extra process costs more than it saves. A single chunk means the
+    inject is not sharded.
+    """
+    count = min(shards, len(targets) // max(1, min_targets))
+    count = max(1, count)
+    return [targets[i::count] for i in range(count)]
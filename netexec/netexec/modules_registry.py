@@ -680,25 +680,34 @@ NETEXEC_MODULES: list[dict] = [
 ]
 
 
-def get_modules_for_protocol(protocol: str) -> list[dict]:
-    """Return all modules that support the given protocol, sorted by name."""
-    return sorted(
-        [m for m in NETEXEC_MODULES if protocol in m["protocols"]],
-        key=lambda m: m["name"],
-    )
-
-
 def safe_module_key(name: str) -> str:
     """Convert module name to a safe key component for contract field keys."""
     return name.replace("-", "_").replace("+", "plus")
 
 
+# Lookup indices, built once: protocol -> its modules sorted by name, and
+# (protocol, safe_module_key) -> module (first registry entry wins).
+_MODULES_BY_PROTOCOL: dict[str, list[dict]] = {}
+for _module in sorted(NETEXEC_MODULES, key=lambda m: m["name"]):
+    for _protocol in _module["protocols"]:
+        _MODULES_BY_PROTOCOL.setdefault(_protocol, []).append(_module)
+
+_MODULES_BY_SAFE_KEY: dict[tuple[str, str], dict] = {}
+for _module in NETEXEC_MODULES:
+    for _protocol in _module["protocols"]:
+        _MODULES_BY_SAFE_KEY.setdefault(
+            (_protocol, safe_module_key(_module["name"])), _module
+        )
+
+
+def get_modules_for_protocol(protocol: str) -> list[dict]:
+    """Return all modules that support the given protocol, sorted by name."""
+    return list(_MODULES_BY_PROTOCOL.get(protocol, ()))
+
+
 def get_module_by_safe_key(protocol: str, safe_key: str) -> dict | None:
     """Look up a module by its safe_module_key for a given protocol.
 
     Returns ``None`` if no matching module is found.
     """
-    for m in NETEXEC_MODULES:
-        if protocol in m["protocols"] and safe_module_key(m["name"]) == safe_key:
-            return m
-    return None
+    return _MODULES_BY_SAFE_KEY.get((protocol, safe_key))
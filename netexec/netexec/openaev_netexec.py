@@ -1,7 +1,10 @@
+import atexit
 import json
 import os
 import shutil
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from importlib.resources import files
 
 from pyoaev.helpers import OpenAEVConfigHelper, OpenAEVInjectorHelper
@@ -19,18 +22,48 @@ from injector_common.targets import TargetProperty, Targets
 from injector_common.traces import send_per_target_traces
 from netexec.configuration.config_loader import ConfigLoader
 from netexec.contracts import parse_contract_id
+from netexec.helpers.host_result_stream import HostResultStream
 from netexec.helpers.netexec_command_builder import (
     build_command,
     build_command_version,
+    build_password_policy_command,
+    build_spray_command,
     extract_data_base,
     extract_data_module,
     extract_data_option,
+    extract_data_spray,
+    extract_data_sweep,
+    extract_sweep_protocols,
 )
 from netexec.helpers.netexec_output_parser import NetExecOutputParser
 from netexec.helpers.netexec_process import execute_netexec
-from netexec.helpers.spider_plus_parser import parse_spider_output_dir
-
-_SENSITIVE_KEYS = {"password", "hash", "key_file", "username", "domain"}
+from netexec.helpers.netexec_workspace import (
+    create_workspace_home,
+    has_workspace_readers,
+    read_workspace_findings,
+    workspace_env,
+)
+from netexec.helpers.password_spray import (
+    AccountPacer,
+    LockoutPolicy,
+    PasswordSpray,
+    lockout_policy_from_findings,
+)
+from netexec.helpers.protocol_sweep import SweepResult
+from netexec.helpers.spider_plus_parser import scan_spider_output_dir
+from netexec.helpers.target_sharding import plan_shards
+
+_SENSITIVE_KEYS = {
+    "password",
+    "hash",
+    "key_file",
+    "username",
+    "domain",
+    "spray_usernames",
+    "spray_passwords",
+    "policy_username",
+    "policy_password",
+}
 
 
 def _redact_content(content: dict) -> dict:
@@ -57,10 +90,25 @@ def _redact_cmd(cmd: list[str]) -> list[str]:
     return redacted
 
 
+def _extract_data(
+    content: dict, protocol: str, family: str, identifier: str
+) -> dict | None:
+    if family == "base":
+        return extract_data_base(content, protocol)
+    if family == "option":
+        return extract_data_option(content, protocol, identifier)
+    if family == "module":
+        return extract_data_module(content, protocol, identifier)
+    if family == "sweep":
+        return extract_data_sweep(content, protocol)
+    raise ValueError(f"Unknown contract family: '{family}'")
+
+
 class OpenAEVNetExecInjector:
     def __init__(self):
+        self.config_loader = ConfigLoader()
         self.config = OpenAEVConfigHelper.from_configuration_object(
-            ConfigLoader().to_daemon_config()
+            self.config_loader.to_daemon_config()
         )
         intercept_dump_argument(self.config.get_config_obj())
         icon_path = files("netexec").joinpath("img/icon-netexec.png")
@@ -70,11 +118,37 @@ class OpenAEVNetExecInjector:
 
         self.parser = NetExecOutputParser()
         self.sm = SignatureManager(self.helper.api)
+        self._shards = self.config_loader.netexec.shards
+        self._shard_min_targets = self.config_loader.netexec.shard_min_targets
+        self._spider_max_files_per_share = (
+            self.config_loader.netexec.spider_max_files_per_share
+        )
+        self._spider_max_files_per_host = (
+            self.config_loader.netexec.spider_max_files_per_host
+        )
+        self._spray_workers = self.config_loader.netexec.spray_workers
+        self._spray_lockout_margin = self.config_loader.netexec.spray_lockout_margin
+        self._spray_max_duration = self.config_loader.netexec.spray_max_duration
+        self._spray_default_policy = LockoutPolicy(
+            self.config_loader.netexec.spray_default_lockout_threshold,
+            self.config_loader.netexec.spray_default_observation_window,
+            read_from_target=False,
+        )
+        # NetExec home every inject workspace is copied from; the version
+        # check below is its first run, which initialises it.
+        self._workspace_seed = (
+            create_workspace_home()
+            if self.config_loader.netexec.workspace_extraction_enabled
+            else None
+        )
+        if self._workspace_seed is not None:
+            atexit.register(shutil.rmtree, self._workspace_seed, ignore_errors=True)
         self._check_netexec_version()
 
     def _check_netexec_version(self):
         cmd = build_command_version()
-        stdout, stderr, returncode = execute_netexec(cmd)
+        env = workspace_env(self._workspace_seed) if self._workspace_seed else None
+        stdout, stderr, returncode = execute_netexec(cmd, env=env)
         if returncode != 0:
             self.helper.injector_logger.warning(
                 f"Unable to determine NetExec version: {stderr}"
@@ -124,33 +198,56 @@ class OpenAEVNetExecInjector:
             self.helper,
         )
 
-        if contract_family == "base":
-            parsed_data = extract_data_base(content, protocol)
-        elif contract_family == "option":
-            parsed_data = extract_data_option(content, protocol, contract_identifier)
-        elif contract_family == "module":
-            parsed_data = extract_data_module(content, protocol, contract_identifier)
-        else:
-            raise ValueError(f"Unknown contract family: '{contract_family}'")
+        if contract_family == "spray":
+            return self._execute_spray(
+                start,
+                data,
+                content,
+                protocol,
+                targets,
+                targets_meta,
+                target_results.ip_to_asset_id_map,
+                expectation_types,
+            )
 
-        credentials = parsed_data.get("credentials") if parsed_data else None
-        options = parsed_data.get("options") if parsed_data else None
-        extra_args = parsed_data.get("extra_args") if parsed_data else None
+        # A sweep runs each of its protocols over the same targets; any other
+        # contract runs its own protocol.
+        if contract_family == "sweep":
+            protocols = extract_sweep_protocols(content)
+        else:
+            protocols = [protocol]
+
+        # One NetExec run per protocol and target chunk (a single chunk unless
+        # sharding is enabled). Data is extracted per run: each gets its own
+        # temporary output file / spider_plus folder.
+        runs = []
+        for run_protocol in protocols:
+            for shard_targets in plan_shards(
+                targets, self._shards, self._shard_min_targets
+            ):
+                shard_data = _extract_data(
+                    content, run_protocol, contract_family, contract_identifier
+                )
+                shard_cmd = build_command(
+                    protocol=run_protocol,
+                    targets=shard_targets,
+                    credentials=shard_data.get("credentials") if shard_data else None,
+                    options=shard_data.get("options") if shard_data else None,
+                    extra_args=shard_data.get("extra_args") if shard_data else None,
+                )
+                runs.append((run_protocol, shard_cmd, shard_data))
+        parsed_data = runs[0][2]
 
         self.helper.injector_logger.info("Data: " + str(_redact_content(content)))
-        cmd = build_command(
-            protocol=protocol,
-            targets=targets,
-            credentials=credentials,
-            options=options,
-            extra_args=extra_args,
-        )
 
         callback_data = {
             "execution_message": Targets.build_execution_message(
                 selector_key=selector_key,
                 data=parsed_data,
-                command_args=_redact_cmd(cmd),
+                command_args=_redact_cmd(runs[0][1]),
+            )
+            + "".join(
+                "\n" + " ".join(_redact_cmd(shard_cmd)) for _, shard_cmd, _ in runs[1:]
             ),
             "execution_status": "INFO",
             "execution_duration": int(time.time() - start),
@@ -162,24 +259,179 @@ class OpenAEVNetExecInjector:
             data=callback_data,
         )
 
-        # Per-target traces so each asset-backed endpoint's result view shows the
-        # run reached it; the batched run only sends a global callback otherwise.
+        execution_details, execution_signatures = self._pre_execution_compile(targets)
+
+        # NetExec stdout is grouped by host while it runs, so each asset-backed
+        # endpoint gets a trace with its own results as soon as NetExec is done
+        # with it, instead of everything waiting for the end of a large sweep.
+        ip_to_asset_id_map = target_results.ip_to_asset_id_map
+        host_stream = HostResultStream(
+            lambda ip, lines: self._report_host(
+                inject_id,
+                start,
+                ip,
+                lines,
+                ip_to_asset_id_map,
+                contract_family,
+                contract_identifier,
+            )
+        )
+
+        def run(shard):
+            run_protocol, shard_cmd, shard_data = shard
+            return self._run_netexec(
+                shard_cmd,
+                shard_data,
+                run_protocol,
+                contract_family,
+                contract_identifier,
+                ip_to_asset_id_map,
+                host_stream,
+            )
+
+        try:
+            if len(runs) == 1:
+                results = [run(runs[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=len(runs)) as pool:
+                    results = list(pool.map(run, runs))
+        finally:
+            # Hosts still pending are reported, and the stream's worker ends.
+            host_stream.finish()
+
+        # Shard outputs are merged as if a single process had produced them,
+        # then parsed once. A sweep's are grouped per host, then per protocol.
+        if contract_family == "sweep":
+            sweep = SweepResult(protocols)
+            for (run_protocol, _, _), (r_stdout, *_) in zip(runs, results):
+                sweep.add(run_protocol, r_stdout)
+            stdout = sweep.merged_output()
+        else:
+            stdout = "\n".join(
+                r_stdout.rstrip("\n") for r_stdout, *_ in results if r_stdout
+            )
+        stderr = "\n".join(r_stderr for _, r_stderr, *_ in results if r_stderr)
+        returncode = next((r_code for _, _, r_code, *_ in results if r_code != 0), 0)
+        spider_files: list[dict] = []
+        spider_summary: dict = {}
+        workspace_findings: dict = {}
+        for _, _, _, r_spider_files, r_spider_summary, r_workspace_findings in results:
+            spider_files.extend(r_spider_files)
+            for key, count in r_spider_summary.items():
+                spider_summary[key] = spider_summary.get(key, 0) + count
+            for field_name, findings in r_workspace_findings.items():
+                workspace_findings.setdefault(field_name, []).extend(findings)
+
+        # Asset-backed targets NetExec printed nothing for (unreachable, or
+        # reported under another address) still get a trace showing the run
+        # reached them.
         send_per_target_traces(
             self.helper,
             inject_id,
-            target_results.ip_to_asset_id_map,
+            {
+                ip: asset_id
+                for ip, asset_id in (ip_to_asset_id_map or {}).items()
+                if ip not in host_stream.hosts
+            },
             label="NetExec",
             start=start,
         )
 
+        parse_result = self.parser.parse(
+            stdout,
+            target_results.ip_to_asset_id_map,
+            family=contract_family,
+            identifier=contract_identifier,
+            workspace_findings=workspace_findings,
+        )
+
+        # File findings come from the spider_plus JSON metadata, not stdout, so
+        # merge them into the structured outputs after the stdout parse.
+        if spider_files:
+            parse_result["outputs"]["files"] = spider_files
+            parse_result["message"] += f", {len(spider_files)} files"
+        # Files over the per-share / per-host budgets are counted, not listed.
+        if spider_summary.get("skipped"):
+            parse_result["message"] += (
+                f" ({spider_summary['skipped']} of {spider_summary['files']} files"
+                f" found on {spider_summary['shares']} shares not listed)"
+            )
+        if spider_summary.get("parse_errors"):
+            parse_result["message"] += (
+                f" ({spider_summary['parse_errors']} damaged spider_plus entries"
+                " skipped)"
+            )
+
+        # A protocol succeeded when all its runs did -- and, for a sweep, when
+        # at least one host answered on it.
+        protocols_succeeded = [
+            p
+            for p in protocols
+            if all(
+                r_code == 0
+                for (r_protocol, _, _), (_, _, r_code, *_) in zip(runs, results)
+                if r_protocol == p
+            )
+        ]
+        if contract_family == "sweep":
+            protocols_succeeded = [p for p in protocols_succeeded if sweep.reached(p)]
+            summary = sweep.summary()
+            if summary:
+                stdout = f"{summary}\n\n{stdout}"
+        return {
+            "success": returncode == 0,
+            "stdout": stdout,
+            "stderr": stderr,
+            "stderr_raw": stderr,
+            "returncode": returncode,
+            "parsed": parse_result,
+            "targets": targets,
+            "targets_meta": targets_meta,
+            "execution_details": execution_details,
+            "execution_signatures": execution_signatures,
+            "protocol": protocol,
+            "protocols_tested": protocols,
+            "protocols_succeeded": protocols_succeeded,
+            "expectation_types": expectation_types,
+        }
+
+    def _run_netexec(
+        self,
+        cmd: list[str],
+        parsed_data: dict | None,
+        protocol: str,
+        family: str,
+        identifier: str,
+        ip_to_asset_id_map: dict,
+        host_stream: HostResultStream,
+    ) -> tuple[str, str, int, list[dict], dict, dict]:
+        """Run one NetExec command and collect what it produced.
+
+        Returns (stdout, stderr, returncode, spider_files, spider_summary,
+        workspace_findings), stdout including the content of the option's
+        output file, if any.
+        """
         output_file = parsed_data.get("output_file") if parsed_data else None
         spider_output_dir = (
             parsed_data.get("spider_output_dir") if parsed_data else None
         )
+        stdout, stderr, returncode = "", "", -1
         spider_files: list[dict] = []
-        execution_details, execution_signatures = self._pre_execution_compile(targets)
+        spider_summary: dict = {}
+        # Contracts whose findings NetExec records in its workspace run in an
+        # isolated one, read back after the run.
+        workspace_home = None
+        workspace_findings: dict = {}
+        if self._workspace_seed is not None and has_workspace_readers(
+            protocol, family, identifier
+        ):
+            workspace_home = create_workspace_home(self._workspace_seed)
         try:
-            stdout, stderr, returncode = execute_netexec(cmd)
+            stdout, stderr, returncode = execute_netexec(
+                cmd,
+                env=workspace_env(workspace_home) if workspace_home else None,
+                on_stdout_line=host_stream.feed,
+            )
 
             # Read and append temp output file for options that write to a file
             if output_file:
@@ -198,11 +450,24 @@ class OpenAEVNetExecInjector:
             # spider_plus writes its file list to a JSON metadata folder, not
             # stdout. Read it into `file` findings before the folder is cleaned.
             if spider_output_dir:
-                spider_files = parse_spider_output_dir(
-                    spider_output_dir, target_results.ip_to_asset_id_map
+                spider_files, spider_summary = scan_spider_output_dir(
+                    spider_output_dir,
+                    ip_to_asset_id_map,
+                    max_files_per_share=self._spider_max_files_per_share,
+                    max_files_per_host=self._spider_max_files_per_host,
+                )
+
+            if workspace_home:
+                workspace_findings = read_workspace_findings(
+                    workspace_home, protocol, family, identifier, ip_to_asset_id_map
+                )
+                self.helper.injector_logger.debug(
+                    "Findings read from the NetExec workspace: "
+                    + (", ".join(workspace_findings) or "none")
                 )
         except Exception as err:
             self.helper.injector_logger.error(f"Unable to execute NetExec: {err}")
+            stderr = stderr or f"Unable to execute NetExec: {err}"
         finally:
             if output_file:
                 try:
@@ -211,26 +476,145 @@ class OpenAEVNetExecInjector:
                     pass
             if spider_output_dir:
                 shutil.rmtree(spider_output_dir, ignore_errors=True)
-
-        parse_result = self.parser.parse(
+            if workspace_home:
+                shutil.rmtree(workspace_home, ignore_errors=True)
+        return (
             stdout,
-            target_results.ip_to_asset_id_map,
-            family=contract_family,
-            identifier=contract_identifier,
+            stderr,
+            returncode,
+            spider_files,
+            spider_summary,
+            workspace_findings,
         )
 
-        # File findings come from the spider_plus JSON metadata, not stdout, so
-        # merge them into the structured outputs after the stdout parse.
-        if spider_files:
-            parse_result["outputs"]["files"] = spider_files
-            parse_result["message"] += f", {len(spider_files)} files"
+    def _execute_spray(
+        self,
+        start: float,
+        data: dict,
+        content: dict,
+        protocol: str,
+        targets: list[str],
+        targets_meta: list[dict],
+        ip_to_asset_id_map: dict,
+        expectation_types: list[str],
+    ) -> dict:
+        """Read the lockout policy, then spray the inject's credential lists."""
+        inject_id = DataHelpers.get_inject_id(data)
+        spray_data = extract_data_spray(content, protocol)
+        self.helper.injector_logger.info("Data: " + str(_redact_content(content)))
+
+        policy_stdout, _, _ = execute_netexec(
+            build_password_policy_command(
+                targets[0], spray_data.get("policy_credentials")
+            )
+        )
+        policy = lockout_policy_from_findings(
+            self.parser.parse(
+                policy_stdout,
+                ip_to_asset_id_map,
+                family="option",
+                identifier="pass_pol",
+            )["outputs"].get("password_policy", []),
+            self._spray_default_policy.threshold,
+            self._spray_default_policy.observation_window,
+        )
+        # Raises when the policy leaves no safe attempt: nothing is sprayed.
+        pacer = AccountPacer(policy, self._spray_lockout_margin)
+
+        if not policy.threshold:
+            pacing = "no account lockout"
+        else:
+            pacing = (
+                f"lockout after {policy.threshold} failed logons, counter reset "
+                f"after {policy.observation_window // 60} min: at most "
+                f"{pacer.budget} attempts per account and window"
+            )
+        if not policy.read_from_target:
+            pacing = f"password policy not readable, assuming {pacing}"
+        sample_cmd = build_spray_command(
+            protocol, targets[0], "<usernames>", "<password>", spray_data
+        )
+        self.helper.api.inject.execution_callback(
+            inject_id=inject_id,
+            data={
+                "execution_message": Targets.build_execution_message(
+                    selector_key=content[TARGET_SELECTOR_KEY],
+                    data=data,
+                    command_args=_redact_cmd(sample_cmd),
+                )
+                + f"\nPassword spray of {len(spray_data['usernames'])} usernames"
+                f" x {len(spray_data['passwords'])} passwords over"
+                f" {len(targets)} targets ({pacing})",
+                "execution_status": "INFO",
+                "execution_duration": int(time.time() - start),
+                "execution_action": "command_execution",
+            },
+        )
+
+        execution_details, execution_signatures = self._pre_execution_compile(targets)
+
+        def attempt(target: str, password: str, usernames: list[str]):
+            with tempfile.NamedTemporaryFile(
+                "w", prefix="nxc_spray_users_", suffix=".txt", delete=False
+            ) as users_file:
+                users_file.write("\n".join(usernames) + "\n")
+            try:
+                return execute_netexec(
+                    build_spray_command(
+                        protocol, target, users_file.name, password, spray_data
+                    )
+                )
+            finally:
+                os.remove(users_file.name)
+
+        report = PasswordSpray(
+            targets,
+            spray_data["usernames"],
+            spray_data["passwords"],
+            pacer,
+            attempt,
+            local_auth=spray_data.get("local_auth", False),
+            workers=self._spray_workers,
+            max_duration=self._spray_max_duration,
+            on_success=lambda credential: self._report_credential(
+                inject_id, start, credential
+            ),
+            ip_to_asset_id_map=ip_to_asset_id_map,
+        ).run()
+
+        send_per_target_traces(
+            self.helper,
+            inject_id,
+            ip_to_asset_id_map,
+            label="NetExec",
+            start=start,
+        )
+
+        stdout = "\n".join(report.stdout)
+        stderr = "\n".join(report.stderr)
+        if report.locked_out:
+            stderr = (
+                stderr + "\n" if stderr else ""
+            ) + "Password spray stopped: NetExec reported a locked out account"
+        message = (
+            f"NetExec completed: {len(report.credentials)} credentials"
+            f" ({report.attempts} logon attempts"
+            + (f", {report.skipped_runs} runs not made" if report.skipped_runs else "")
+            + ")"
+        )
+        outputs: dict = {}
+        if stdout.strip():
+            outputs["action_output"] = stdout.strip()
+        if report.credentials:
+            outputs["credentials"] = report.credentials
+        self.helper.injector_logger.info(message)
         return {
-            "success": returncode == 0,
+            "success": report.returncode == 0 and not report.locked_out,
             "stdout": stdout,
             "stderr": stderr,
             "stderr_raw": stderr,
-            "returncode": returncode,
-            "parsed": parse_result,
+            "returncode": report.returncode or (1 if report.locked_out else 0),
+            "parsed": {"message": message, "outputs": outputs},
             "targets": targets,
             "targets_meta": targets_meta,
             "execution_details": execution_details,
@@ -239,6 +623,69 @@ class OpenAEVNetExecInjector:
             "expectation_types": expectation_types,
         }
 
+    def _report_credential(self, inject_id: str, start: float, credential: dict):
+        """Trace a credential found by a spray, on its asset when it has one."""
+        account = credential["username"]
+        if credential.get("domain"):
+            account = f"{credential['domain']}\\{account}"
+        trace = {
+            "execution_message": f"Valid credentials for {account} on "
+            f"{credential['host']}",
+            "execution_status": "INFO",
+            "execution_duration": int(time.time() - start),
+            "execution_action": "command_execution",
+        }
+        if credential.get("asset_id"):
+            trace["execution_context_identifiers"] = [credential["asset_id"]]
+        try:
+            self.helper.api.inject.execution_callback(inject_id=inject_id, data=trace)
+        except Exception as exc:  # noqa: BLE001
+            self.helper.injector_logger.error(
+                f"Failed to report a sprayed credential for inject {inject_id}: {exc}"
+            )
+
+    def _report_host(
+        self,
+        inject_id: str,
+        start: float,
+        ip: str,
+        lines: list[str],
+        ip_to_asset_id_map: dict,
+        family: str,
+        identifier: str,
+    ) -> None:
+        """Send the results NetExec printed for one host as a trace on its asset."""
+        asset_id = (ip_to_asset_id_map or {}).get(ip)
+        if not asset_id:
+            return
+        host_output = "".join(lines).strip()
+        try:
+            outputs = self.parser.parse(
+                host_output, ip_to_asset_id_map, family=family, identifier=identifier
+            )["outputs"]
+            found = ", ".join(
+                f"{len(results)} {field_name}"
+                for field_name, results in outputs.items()
+                if field_name != "action_output"
+            )
+            self.helper.api.inject.execution_callback(
+                inject_id=inject_id,
+                data={
+                    "execution_message": f"NetExec results for target {ip}"
+                    + (f" ({found})" if found else "")
+                    + f":\n{host_output}",
+                    "execution_status": "INFO",
+                    "execution_duration": int(time.time() - start),
+                    "execution_action": "command_execution",
+                    "execution_context_identifiers": [asset_id],
+                },
+            )
+        except Exception as exc:  # noqa: BLE001
+            self.helper.injector_logger.error(
+                f"Failed to send the results of target '{ip}' for inject "
+                f"{inject_id}: {exc}"
+            )
+
     def _pre_execution_compile(self, targets: list[str]) -> dict | list[dict]:
         """Compile pre-execution elements (captures start_time)."""
         execution_details = ExecutionDetails()
@@ -252,7 +699,8 @@ class OpenAEVNetExecInjector:
         execution_details: dict | list[dict],
         execution_signatures: dict | list[dict],
         returncode: int,
-        protocol: str,
+        protocols_tested: list[str],
+        protocols_succeeded: list[str],
         expectation_types: list[str],
         targets_meta: list[dict],
     ) -> None:
@@ -268,8 +716,8 @@ class OpenAEVNetExecInjector:
         )
 
         extra_data = {
-            "protocols_tested": [protocol],
-            "protocols_succeeded": [protocol] if returncode == 0 else [],
+            "protocols_tested": protocols_tested,
+            "protocols_succeeded": protocols_succeeded,
         }
         extra_signatures = ExtraSignatureData(
             detection=extra_data,
@@ -339,14 +787,21 @@ class OpenAEVNetExecInjector:
             )
 
             if targets:
-                protocol = result.get("protocol", "")
+                protocols_tested = result.get("protocols_tested") or [
+                    result.get("protocol", "")
+                ]
+                protocols_succeeded = result.get(
+                    "protocols_succeeded",
+                    protocols_tested if returncode == 0 else [],
+                )
                 expectation_types = result.get("expectation_types", ["DETECTION"])
                 self._send_signatures(
                     inject_id,
                     execution_details,
                     execution_signatures,
                     returncode,
-                    protocol,
+                    protocols_tested,
+                    protocols_succeeded,
                     expectation_types,
                     targets_meta,
                 )
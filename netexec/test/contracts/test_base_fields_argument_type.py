@@ -60,3 +60,14 @@ class PortFieldArgumentTypeTest(TestCase):
         kwargs = mock_ct.call_args.kwargs
         self.assertEqual(kwargs["key"], "port")
         self.assertIs(kwargs["argumentType"], base_fields.PrimitiveType.Port)
+
+
+class TuningFieldsTest(TestCase):
+
+    def test_every_protocol_contract_offers_threads_timeout_and_jitter(self):
+        with patch.object(base_fields, "ContractText") as mock_ct:
+            base_fields.build_protocol_base_fields("smb")
+        kwargs = _kwargs_by_key(mock_ct)
+        for key in ("threads", "timeout", "jitter"):
+            self.assertIn(key, kwargs)
+            self.assertFalse(kwargs[key]["mandatory"])
@@ -0,0 +1,59 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from netexec.contracts import contract_manifest
+
+_CONTRACTS = [{"contract_id": "netexec_smb", "contract_content": "{}"}]
+
+
+class ContractManifestTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache", "manifest.json")
+        patcher = patch.object(
+            contract_manifest, "build_all_contracts", return_value=_CONTRACTS
+        )
+        self.build = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.directory.cleanup)
+
+    def test_manifest_is_built_once_then_read_from_the_cache(self):
+        self.assertEqual(
+            contract_manifest.load_contract_manifest(self.path), _CONTRACTS
+        )
+        self.assertEqual(
+            contract_manifest.load_contract_manifest(self.path), _CONTRACTS
+        )
+        self.build.assert_called_once()
+
+    def test_cache_of_other_registries_is_rebuilt(self):
+        contract_manifest.load_contract_manifest(self.path)
+        with patch.object(contract_manifest, "manifest_key", return_value="changed"):
+            contract_manifest.load_contract_manifest(self.path)
+        self.assertEqual(self.build.call_count, 2)
+        with open(self.path) as handle:
+            self.assertEqual(json.load(handle)["key"], "changed")
+
+    def test_corrupted_cache_is_rebuilt(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as handle:
+            handle.write("{not json")
+        self.assertEqual(
+            contract_manifest.load_contract_manifest(self.path), _CONTRACTS
+        )
+        self.build.assert_called_once()
+
+    def test_unwritable_cache_still_returns_the_contracts(self):
+        path = os.path.join(self.directory.name, "file", "manifest.json")
+        with open(os.path.join(self.directory.name, "file"), "w"):
+            pass
+        self.assertEqual(contract_manifest.load_contract_manifest(path), _CONTRACTS)
+
+    def test_key_covers_the_modules_registry(self):
+        sources = {source.name for source in contract_manifest._SOURCES}
+        self.assertIn("modules_registry.py", sources)
+        self.assertIn("protocol_config.py", sources)
@@ -59,6 +59,22 @@ class ContractsTest(TestCase):
         self.assertEqual(result.identifier, "spooler")
         self.assertEqual(result.family, "module")
 
+    # -- parse_contract_id: spray --
+
+    def test_parse_spray(self):
+        result = parse_contract_id("netexec_ldap_spray")
+        self.assertEqual(
+            result, ParsedContractId(protocol="ldap", family="spray", identifier=None)
+        )
+
+    # -- parse_contract_id: sweep --
+
+    def test_parse_sweep(self):
+        result = parse_contract_id("netexec_sweep")
+        self.assertEqual(
+            result, ParsedContractId(protocol="", family="sweep", identifier=None)
+        )
+
     # -- parse_contract_id: errors --
 
     def test_parse_invalid_prefix_raises(self):
@@ -0,0 +1,109 @@
+import threading
+from unittest import TestCase
+
+from netexec.helpers.host_result_stream import HostResultStream
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _line(ip, rest="[*] Windows Server 2019"):
+    return f"SMB  {ip}  445  HOST  {rest}\n"
+
+
+class HostResultStreamTest(TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.handed_over = []
+        self.host_handed_over = threading.Event()
+        self.stream = self._stream(check_seconds=60)
+
+    def tearDown(self):
+        self.stream.finish()
+
+    def _stream(self, check_seconds):
+        def on_host_lines(ip, lines):
+            self.handed_over.append((ip, lines))
+            self.host_handed_over.set()
+
+        return HostResultStream(
+            on_host_lines,
+            idle_seconds=5,
+            clock=self.clock,
+            check_seconds=check_seconds,
+        )
+
+    def test_lines_are_grouped_by_host(self):
+        self.stream.feed(_line("10.0.0.1", "a"))
+        self.stream.feed(_line("10.0.0.2", "b"))
+        self.stream.feed(_line("10.0.0.1", "c"))
+        self.stream.finish()
+
+        self.assertEqual(
+            dict(self.handed_over),
+            {
+                "10.0.0.1": [_line("10.0.0.1", "a"), _line("10.0.0.1", "c")],
+                "10.0.0.2": [_line("10.0.0.2", "b")],
+            },
+        )
+
+    def test_idle_host_is_handed_over_while_others_run(self):
+        self.stream.feed(_line("10.0.0.1"))
+        self.clock.now = 3
+        self.stream.feed(_line("10.0.0.2"))
+        self.clock.now = 6
+        self.stream.feed(_line("10.0.0.2"))
+
+        self.assertTrue(self.host_handed_over.wait(5))
+        self.assertEqual([ip for ip, _ in self.handed_over], ["10.0.0.1"])
+
+    def test_idle_host_is_handed_over_without_another_line(self):
+        self.stream.finish()
+        self.stream = self._stream(check_seconds=0.01)
+        self.stream.feed(_line("10.0.0.1"))
+        self.clock.now = 6
+
+        self.assertTrue(self.host_handed_over.wait(5))
+        self.assertEqual([ip for ip, _ in self.handed_over], ["10.0.0.1"])
+
+    def test_hosts_are_not_handed_over_from_the_feeding_thread(self):
+        feeding_thread = threading.current_thread()
+        threads = []
+        stream = HostResultStream(
+            lambda ip, lines: threads.append(threading.current_thread()),
+            idle_seconds=5,
+            clock=self.clock,
+        )
+        stream.feed(_line("10.0.0.1"))
+        stream.finish()
+
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], feeding_thread)
+
+    def test_host_printing_again_is_handed_over_with_its_new_lines(self):
+        self.stream.feed(_line("10.0.0.1", "a"))
+        self.clock.now = 10
+        self.stream.feed(_line("10.0.0.1", "b"))
+        self.stream.finish()
+
+        self.assertEqual(
+            self.handed_over,
+            [
+                ("10.0.0.1", [_line("10.0.0.1", "a")]),
+                ("10.0.0.1", [_line("10.0.0.1", "b")]),
+            ],
+        )
+
+    def test_lines_without_host_prefix_are_not_attributed(self):
+        self.stream.feed("[*] First time use detected\n")
+        self.stream.feed(_line("10.0.0.1"))
+        self.stream.finish()
+
+        self.assertEqual([ip for ip, _ in self.handed_over], ["10.0.0.1"])
+        self.assertEqual(self.stream.hosts, {"10.0.0.1"})
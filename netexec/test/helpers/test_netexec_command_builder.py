@@ -3,9 +3,14 @@ from unittest import TestCase
 from netexec.helpers.netexec_command_builder import (
     build_command,
     build_command_version,
+    build_password_policy_command,
+    build_spray_command,
     extract_data_base,
     extract_data_module,
     extract_data_option,
+    extract_data_spray,
+    extract_data_sweep,
+    extract_sweep_protocols,
 )
 
 
@@ -134,6 +139,14 @@ class NetExecCommandBuilderTest(TestCase):
         self.assertIsNotNone(data)
         self.assertEqual(data["extra_args"], ["--port", "8445"])
 
+    def test_extract_base_with_tuning(self):
+        content = {"port": "8445", "threads": "64", "timeout": " 5 ", "jitter": "1-3"}
+        data = extract_data_base(content, "smb")
+        self.assertEqual(
+            data["extra_args"],
+            ["--port", "8445", "--threads", "64", "--timeout", "5", "--jitter", "1-3"],
+        )
+
     def test_extract_base_empty_content_returns_none(self):
         data = extract_data_base({}, "smb")
         self.assertIsNone(data)
@@ -176,6 +189,14 @@ class NetExecCommandBuilderTest(TestCase):
         self.assertIn("-M", data["extra_args"])
         self.assertIn("spooler", data["extra_args"])
 
+    def test_extract_module_tuning_precedes_module_options(self):
+        # -o takes every following argument as a module option.
+        content = {"threads": "16", "module_options": "A=1"}
+        data = extract_data_module(content, "smb", "spooler")
+        self.assertEqual(
+            data["extra_args"], ["--threads", "16", "-M", "spooler", "-o", "A=1"]
+        )
+
     def test_extract_module_with_per_module_options(self):
         content = {
             "username": "admin",
@@ -229,3 +250,105 @@ class NetExecCommandBuilderTest(TestCase):
         # user-supplied one (which we could not read back reliably).
         self.assertEqual(folders, [f"OUTPUT_FOLDER={data['spider_output_dir']}"])
         self.assertNotIn("OUTPUT_FOLDER=/home/attacker/loot", opts_after)
+
+    # ----------------------------------------------------------------
+    # Password spray
+    # ----------------------------------------------------------------
+
+    def test_extract_spray_splits_and_dedups_the_lists(self):
+        content = {
+            "spray_usernames": "jon.snow\n\n arya.stark \njon.snow",
+            "spray_passwords": "Winter2025!\r\nSummer2025!",
+            "domain": "NORTH",
+            "local_auth": True,
+            "threads": "8",
+        }
+        data = extract_data_spray(content, "smb")
+        self.assertEqual(data["usernames"], ["jon.snow", "arya.stark"])
+        self.assertEqual(data["passwords"], ["Winter2025!", "Summer2025!"])
+        self.assertEqual(data["domain"], "NORTH")
+        self.assertTrue(data["local_auth"])
+        self.assertEqual(data["extra_args"], ["--threads", "8"])
+        self.assertNotIn("policy_credentials", data)
+
+    def test_extract_spray_without_passwords_raises(self):
+        with self.assertRaises(ValueError):
+            extract_data_spray({"spray_usernames": "jon.snow"}, "smb")
+
+    def test_spray_command_tries_one_password_on_one_target(self):
+        data = extract_data_spray(
+            {
+                "spray_usernames": "jon.snow",
+                "spray_passwords": "Winter2025!",
+                "domain": "NORTH",
+                "local_auth": True,
+                "port": "4455",
+            },
+            "smb",
+        )
+        cmd = build_spray_command("smb", "10.0.0.1", "/tmp/users", "Winter2025!", data)
+        self.assertEqual(
+            cmd,
+            [
+                "netexec",
+                "smb",
+                "10.0.0.1",
+                "-u",
+                "/tmp/users",
+                "-p",
+                "Winter2025!",
+                "-d",
+                "NORTH",
+                "--continue-on-success",
+                "--local-auth",
+                "--port",
+                "4455",
+            ],
+        )
+
+    def test_password_policy_command_uses_a_null_session_by_default(self):
+        self.assertEqual(
+            build_password_policy_command("10.0.0.1"),
+            ["netexec", "smb", "10.0.0.1", "-u", "", "-p", "", "--pass-pol"],
+        )
+        self.assertEqual(
+            build_password_policy_command(
+                "10.0.0.1", {"username": "jon.snow", "password": "pw"}
+            ),
+            ["netexec", "smb", "10.0.0.1", "-u", "jon.snow", "-p", "pw", "--pass-pol"],
+        )
+
+    # ----------------------------------------------------------------
+    # Protocol sweep
+    # ----------------------------------------------------------------
+
+    def test_extract_sweep_protocols_keeps_the_selection_order(self):
+        self.assertEqual(
+            extract_sweep_protocols({"sweep_protocols": ["ssh", "SMB", "ssh"]}),
+            ["ssh", "smb"],
+        )
+        with self.assertRaises(ValueError):
+            extract_sweep_protocols({"sweep_protocols": ["smb", "telnet"]})
+        with self.assertRaises(ValueError):
+            extract_sweep_protocols({"sweep_protocols": []})
+
+    def test_extract_sweep_gives_each_protocol_the_credentials_it_accepts(self):
+        content = {
+            "username": "jon.snow",
+            "password": "Winter2025!",
+            "hash": "aad3b435b51404eeaad3b435b51404ee:31d6cfe0d16ae931b73c59d7e0c089c0",
+            "domain": "NORTH",
+            "timeout": "5",
+        }
+        self.assertEqual(
+            extract_data_sweep(content, "ssh"),
+            {
+                "credentials": {"username": "jon.snow", "password": "Winter2025!"},
+                "extra_args": ["--timeout", "5"],
+            },
+        )
+        self.assertEqual(
+            set(extract_data_sweep(content, "smb")["credentials"]),
+            {"username", "password", "hash", "domain"},
+        )
+        self.assertIsNone(extract_data_sweep({}, "rdp"))
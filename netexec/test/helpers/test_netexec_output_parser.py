@@ -207,3 +207,40 @@ class NetExecOutputParserTest(TestCase):
         )
         result = parser.parse(stdout, self.ip_map, family="option", identifier="disks")
         self.assertEqual(result["outputs"], {"action_output": stdout})
+
+    def test_parse_users_skips_table_header_and_separator(self):
+        stdout = "\n".join(
+            [
+                self._make_line("-Username-  -Last PW Set-  -BadPW-  -Description-"),
+                self._make_line("-----  -----------"),
+                self._make_line("[+] Enumerated domain user(s)"),
+                self._make_line("samwell.tarly  2025-12-11 10:33:21  0  Samwell"),
+            ]
+        )
+        result = parser.parse(stdout, self.ip_map, family="option", identifier="users")
+        self.assertEqual(
+            [u["username"] for u in result["outputs"]["usernames"]],
+            ["samwell.tarly"],
+        )
+
+    def test_parse_unregistered_contract_returns_only_action_output(self):
+        stdout = self._make_line("anything:500:aad3b435b51404eeaad3b435b51404ee:x:::")
+        result = parser.parse(
+            stdout, self.ip_map, family="option", identifier="not-a-contract"
+        )
+        self.assertEqual(result["outputs"], {"action_output": stdout})
+
+    def test_workspace_findings_replace_the_stdout_extractor(self):
+        stdout = self._make_line(
+            "Administrator:500:aad3b435b51404eeaad3b435b51404ee:dbd13e1c4e338284ac4e9874f7de6ef4:::"
+        )
+        workspace_credentials = [{"username": "Administrator", "hash": "lm:nt"}]
+        result = parser.parse(
+            stdout,
+            self.ip_map,
+            family="option",
+            identifier="sam",
+            workspace_findings={"credentials": workspace_credentials},
+        )
+        self.assertEqual(result["outputs"]["credentials"], workspace_credentials)
+        self.assertEqual(result["message"], "NetExec completed: 1 credentials")
@@ -0,0 +1,58 @@
+import sys
+from unittest import TestCase
+
+from netexec.helpers.netexec_process import execute_netexec
+
+
+def _python(code):
+    return [sys.executable, "-c", code]
+
+
+class ExecuteNetExecStreamingTest(TestCase):
+
+    def test_stdout_lines_are_handed_over_as_printed(self):
+        lines = []
+        stdout, stderr, returncode = execute_netexec(
+            _python("print('a'); print('b'); import sys; sys.stderr.write('oops')"),
+            on_stdout_line=lines.append,
+        )
+
+        self.assertEqual(lines, ["a\n", "b\n"])
+        self.assertEqual(stdout, "a\nb\n")
+        self.assertEqual(stderr, "oops")
+        self.assertEqual(returncode, 0)
+
+    def test_input_data_is_fed_to_stdin(self):
+        stdout, _, _ = execute_netexec(
+            _python("import sys; print(sys.stdin.read().upper())"),
+            input_data="targets",
+            on_stdout_line=lambda line: None,
+        )
+
+        self.assertEqual(stdout, "TARGETS\n")
+
+    def test_timeout_keeps_the_output_printed_so_far(self):
+        lines = []
+        stdout, stderr, returncode = execute_netexec(
+            _python("import time; print('host done', flush=True); time.sleep(30)"),
+            timeout=1,
+            on_stdout_line=lines.append,
+        )
+
+        self.assertEqual(stdout, "host done\n")
+        self.assertEqual(lines, ["host done\n"])
+        self.assertEqual(stderr, "NetExec timed out after 1s")
+        self.assertEqual(returncode, -1)
+
+    def test_timeout_message_starts_on_its_own_line(self):
+        _, stderr, returncode = execute_netexec(
+            _python(
+                "import sys, time; sys.stderr.write('warning'); sys.stderr.flush(); "
+                "time.sleep(30)"
+            ),
+            timeout=1,
+            on_stdout_line=lambda line: None,
+        )
+
+        self.assertEqual(stderr, "warning\nNetExec timed out after 1s")
+        self.assertEqual(returncode, -1)
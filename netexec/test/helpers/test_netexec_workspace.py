@@ -0,0 +1,160 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextlib import closing
+from unittest import TestCase
+
+from netexec.helpers.credential_extractors import (
+    extract_opt_groups_groups,
+    extract_opt_shares_shares,
+)
+from netexec.helpers.netexec_workspace import (
+    create_workspace_home,
+    has_workspace_readers,
+    read_workspace_findings,
+    workspace_database,
+    workspace_env,
+)
+
+# Subset of the SMB workspace schema NetExec creates (nxc/protocols/smb/database.py).
+_SMB_SCHEMA = """
+CREATE TABLE hosts (id INTEGER PRIMARY KEY, ip TEXT, hostname TEXT, domain TEXT, os TEXT);
+CREATE TABLE users (id INTEGER PRIMARY KEY, domain TEXT, username TEXT, password TEXT,
+                    credtype TEXT, pillaged_from_hostid INTEGER);
+CREATE TABLE shares (id INTEGER PRIMARY KEY, hostid INTEGER, userid INTEGER, name TEXT,
+                     remark TEXT, read BOOLEAN, write BOOLEAN);
+CREATE TABLE groups (id INTEGER PRIMARY KEY, domain TEXT, rid TEXT, name TEXT,
+                     member_count_ad INTEGER, last_query_time TEXT);
+"""
+
+_NT_HASH = "dbd13e1c4e338284ac4e9874f7de6ef4"
+_LM_HASH = "aad3b435b51404eeaad3b435b51404ee"
+
+
+class NetExecWorkspaceTest(TestCase):
+
+    def setUp(self):
+        self.home = create_workspace_home()
+        self.ip_map = {"10.0.0.1": "asset-001"}
+        self.database = workspace_database(self.home, "smb")
+        os.makedirs(os.path.dirname(self.database))
+        with closing(sqlite3.connect(self.database)) as conn, conn:
+            conn.executescript(_SMB_SCHEMA)
+            conn.execute(
+                "INSERT INTO hosts VALUES (1, '10.0.0.1', 'WINTERFELL', 'north.local', '')"
+            )
+
+    def tearDown(self):
+        shutil.rmtree(self.home, ignore_errors=True)
+
+    def _insert(self, sql, *rows):
+        with closing(sqlite3.connect(self.database)) as conn, conn:
+            conn.executemany(sql, rows)
+
+    def _read(self, identifier):
+        return read_workspace_findings(
+            self.home, "smb", "option", identifier, self.ip_map
+        )
+
+    def test_env_points_netexec_at_the_workspace_home(self):
+        env = workspace_env(self.home)
+        self.assertEqual(env["HOME"], self.home)
+        self.assertEqual(env["NXC_PATH"], os.path.join(self.home, ".nxc"))
+
+    def test_home_is_copied_from_the_seed(self):
+        home = create_workspace_home(self.home)
+        try:
+            self.assertTrue(os.path.isfile(workspace_database(home, "smb")))
+        finally:
+            shutil.rmtree(home)
+
+    def test_readers_are_registered_per_protocol_and_contract(self):
+        self.assertTrue(has_workspace_readers("smb", "option", "ntds"))
+        self.assertFalse(has_workspace_readers("ldap", "option", "groups"))
+        self.assertFalse(has_workspace_readers("smb", "option", "users"))
+
+    def test_ntds_hashes_get_the_lm_half_back(self):
+        self._insert(
+            "INSERT INTO users VALUES (?, ?, ?, ?, ?, ?)",
+            (1, "north.local", "eddard.stark", _NT_HASH, "hash", 1),
+            (2, "north.local", "robb.stark", "Winter!", "plaintext", 1),
+        )
+        self.assertEqual(
+            self._read("ntds"),
+            {
+                "credentials": [
+                    {
+                        "username": "eddard.stark",
+                        "hash": f"{_LM_HASH}:{_NT_HASH}",
+                        "host": "10.0.0.1",
+                        "hostname": "WINTERFELL",
+                        "source_line": f"eddard.stark:{_LM_HASH}:{_NT_HASH}:::",
+                        "asset_id": "asset-001",
+                    }
+                ]
+            },
+        )
+
+    def test_sam_hashes_are_kept_as_recorded(self):
+        self._insert(
+            "INSERT INTO users VALUES (?, ?, ?, ?, ?, ?)",
+            (1, "WINTERFELL", "Administrator", f"{_LM_HASH}:{_NT_HASH}", "hash", 1),
+        )
+        credentials = self._read("sam")["credentials"]
+        self.assertEqual(credentials[0]["hash"], f"{_LM_HASH}:{_NT_HASH}")
+
+    def test_shares_skip_admin_and_unreadable_shares_and_duplicates(self):
+        self._insert(
+            "INSERT INTO shares VALUES (?, 1, ?, ?, '', ?, ?)",
+            (1, 1, "NETLOGON", 1, 1),
+            (2, 2, "NETLOGON", 1, 0),
+            (3, 1, "ADMIN$", 1, 1),
+            (4, 1, "private", 0, 0),
+            (5, 1, "upload", 0, 1),
+        )
+        shares = self._read("shares")["shares"]
+        self.assertEqual(
+            [(s["share_name"], s["permissions"]) for s in shares],
+            [("NETLOGON", "READ,WRITE"), ("upload", "WRITE")],
+        )
+
+    def test_findings_have_the_keys_of_the_stdout_extractors(self):
+        self._insert(
+            "INSERT INTO shares VALUES (?, 1, ?, ?, ?, ?, ?)",
+            (1, 1, "NETLOGON", "Logon server share", 1, 1),
+        )
+        self._insert(
+            "INSERT INTO groups VALUES (?, ?, ?, ?, ?, '')",
+            (1, "north.local", "512", "Domain Admins", 3),
+        )
+        for field_name, extractor, option in (
+            ("shares", extract_opt_shares_shares, "shares"),
+            ("groups", extract_opt_groups_groups, "groups"),
+        ):
+            finding = self._read(option)[field_name][0]
+            from_stdout = extractor(
+                [("10.0.0.1", "WINTERFELL", finding["source_line"])],
+                {"10.0.0.1": "asset-001"},
+            )
+            self.assertEqual(from_stdout, [finding])
+
+    def test_groups_are_attached_to_the_hosts_of_their_domain(self):
+        self._insert(
+            "INSERT INTO groups VALUES (?, ?, ?, ?, ?, '')",
+            (1, "NORTH.LOCAL", "512", "Domain Admins", 3),
+            (2, "essos.local", "512", "Domain Admins", 1),
+        )
+        groups = self._read("groups")["groups"]
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(groups[0]["member_count"], 3)
+        self.assertEqual(groups[0]["hostname"], "WINTERFELL")
+
+    def test_missing_database_or_table_yields_nothing(self):
+        self.assertEqual(
+            read_workspace_findings(tempfile.gettempdir(), "smb", "option", "sam", {}),
+            {},
+        )
+        with closing(sqlite3.connect(self.database)) as conn, conn:
+            conn.execute("DROP TABLE shares")
+        self.assertEqual(self._read("shares"), {})
@@ -0,0 +1,207 @@
+import threading
+from unittest import TestCase
+
+from netexec.helpers.password_spray import (
+    AccountPacer,
+    LockoutPolicy,
+    PasswordSpray,
+    lockout_policy_from_findings,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _policy_findings(**settings):
+    return [{"key": key, "value": value} for key, value in settings.items()]
+
+
+class LockoutPolicyTest(TestCase):
+
+    def test_policy_read_from_pass_pol_findings(self):
+        findings = [
+            {"key": "Minimum password length", "value": "7"},
+            {"key": "Reset Account Lockout Counter", "value": "1 hour 30 minutes"},
+            {"key": "Locked Account Duration", "value": "30 minutes"},
+            {"key": "Account Lockout Threshold", "value": "5"},
+        ]
+        self.assertEqual(
+            lockout_policy_from_findings(findings, 3, 600),
+            LockoutPolicy(threshold=5, observation_window=5400),
+        )
+
+    def test_lockout_disabled(self):
+        findings = _policy_findings(**{"Account Lockout Threshold": "None"})
+        self.assertEqual(lockout_policy_from_findings(findings, 3, 600).threshold, 0)
+
+    def test_defaults_when_the_policy_was_not_read(self):
+        self.assertEqual(
+            lockout_policy_from_findings([], 3, 600),
+            LockoutPolicy(3, 600, read_from_target=False),
+        )
+
+
+class AccountPacerTest(TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_budget_keeps_the_margin_under_the_threshold(self):
+        pacer = AccountPacer(LockoutPolicy(5, 600), margin=2, clock=self.clock)
+        self.assertEqual(pacer.budget, 3)
+        for _ in range(3):
+            self.assertEqual(pacer.reserve(["jon"]), 0)
+        wait = pacer.reserve(["jon"])
+        self.assertGreater(wait, 600)
+        # Another account is not held back.
+        self.assertEqual(pacer.reserve(["arya"]), 0)
+
+        self.clock.sleep(wait)
+        self.assertEqual(pacer.reserve(["jon"]), 0)
+
+    def test_nothing_recorded_while_one_account_must_wait(self):
+        pacer = AccountPacer(LockoutPolicy(2, 600), margin=1, clock=self.clock)
+        pacer.reserve(["jon"])
+        self.assertGreater(pacer.reserve(["arya", "jon"]), 0)
+        self.assertEqual(pacer.reserve(["arya"]), 0)
+
+    def test_no_lockout_means_no_pacing(self):
+        pacer = AccountPacer(LockoutPolicy(0, 600), margin=2, clock=self.clock)
+        self.assertIsNone(pacer.budget)
+        for _ in range(50):
+            self.assertEqual(pacer.reserve(["jon"]), 0)
+
+    def test_threshold_within_the_margin_refuses_to_spray(self):
+        with self.assertRaises(ValueError):
+            AccountPacer(LockoutPolicy(2, 600), margin=2)
+
+
+class PasswordSprayTest(TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.runs = []
+        self.lock = threading.Lock()
+
+    def _attempt(self, responses):
+        def attempt(target, password, usernames):
+            with self.lock:
+                self.runs.append((target, password, list(usernames)))
+            return responses.get((target, password), ""), "", 0
+
+        return attempt
+
+    def _spray(self, targets, usernames, passwords, responses, policy, **kwargs):
+        return PasswordSpray(
+            targets,
+            usernames,
+            passwords,
+            AccountPacer(policy, margin=1, clock=self.clock),
+            self._attempt(responses),
+            clock=self.clock,
+            sleep=self.clock.sleep,
+            **kwargs,
+        ).run()
+
+    def test_found_accounts_are_reported_and_not_tried_again(self):
+        found = []
+        responses = {
+            ("10.0.0.1", "Winter2025!"): (
+                "SMB  10.0.0.1  445  DC01  [+] NORTH\\jon.snow:Winter2025! (Pwn3d!)\n"
+                "SMB  10.0.0.1  445  DC01  [-] NORTH\\arya.stark:Winter2025! "
+                "STATUS_LOGON_FAILURE\n"
+            )
+        }
+        report = self._spray(
+            ["10.0.0.1"],
+            ["jon.snow", "arya.stark"],
+            ["Winter2025!", "Summer2025!"],
+            responses,
+            LockoutPolicy(0, 600),
+            on_success=found.append,
+            ip_to_asset_id_map={"10.0.0.1": "asset-1"},
+        )
+        self.assertEqual(
+            report.credentials,
+            [
+                {
+                    "username": "jon.snow",
+                    "password": "Winter2025!",
+                    "host": "10.0.0.1",
+                    "hostname": "DC01",
+                    "source_line": "[+] NORTH\\jon.snow:Winter2025! (Pwn3d!)",
+                    "domain": "NORTH",
+                    "asset_id": "asset-1",
+                }
+            ],
+        )
+        self.assertEqual(found, report.credentials)
+        self.assertEqual(self.runs[-1], ("10.0.0.1", "Summer2025!", ["arya.stark"]))
+        self.assertEqual(report.attempts, 3)
+
+    def test_guest_sessions_are_not_credentials(self):
+        responses = {
+            ("10.0.0.1", "x"): "SMB  10.0.0.1  445  DC01  [+] NORTH\\jon:x (Guest)\n"
+        }
+        report = self._spray(
+            ["10.0.0.1"], ["jon"], ["x"], responses, LockoutPolicy(0, 600)
+        )
+        self.assertEqual(report.credentials, [])
+
+    def test_domain_accounts_are_paced_across_targets(self):
+        # Budget of 2 per window: the third run waits for the window.
+        self._spray(
+            ["10.0.0.1", "10.0.0.2"],
+            ["jon"],
+            ["a", "b"],
+            {},
+            LockoutPolicy(3, 600),
+            workers=1,
+        )
+        self.assertEqual(len(self.runs), 4)
+        self.assertGreater(self.clock.now, 1000.0 + 600)
+
+    def test_local_accounts_are_paced_per_target(self):
+        self._spray(
+            ["10.0.0.1", "10.0.0.2"],
+            ["jon"],
+            ["a", "b"],
+            {},
+            LockoutPolicy(3, 600),
+            workers=1,
+            local_auth=True,
+        )
+        self.assertEqual(len(self.runs), 4)
+        self.assertEqual(self.clock.now, 1000.0)
+
+    def test_runs_past_the_deadline_are_skipped(self):
+        report = self._spray(
+            ["10.0.0.1"],
+            ["jon"],
+            ["a", "b", "c", "d"],
+            {},
+            LockoutPolicy(3, 600),
+            max_duration=300,
+        )
+        self.assertEqual([password for _, password, _ in self.runs], ["a", "b"])
+        self.assertEqual(report.skipped_runs, 2)
+
+    def test_lockout_stops_the_spray(self):
+        responses = {
+            ("10.0.0.1", "a"): "SMB  10.0.0.1  445  DC01  [-] NORTH\\jon:a "
+            "STATUS_ACCOUNT_LOCKED_OUT\n"
+        }
+        report = self._spray(
+            ["10.0.0.1"], ["jon"], ["a", "b", "c"], responses, LockoutPolicy(0, 600)
+        )
+        self.assertTrue(report.locked_out)
+        self.assertEqual(len(self.runs), 1)
+        self.assertEqual(report.skipped_runs, 2)
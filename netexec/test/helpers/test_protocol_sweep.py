@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+from netexec.helpers.protocol_sweep import SweepResult
+
+SMB_OUTPUT = (
+    "SMB  10.0.0.2  445  CASTELBLACK  [*] Windows Server 2019 (name:CASTELBLACK)\n"
+    "SMB  10.0.0.1  445  WINTERFELL  [*] Windows Server 2019 (name:WINTERFELL)\n"
+    "SMB  10.0.0.1  445  WINTERFELL  [+] NORTH\\jon.snow:Winter2025! (Pwn3d!)\n"
+    "SMB  10.0.0.2  445  CASTELBLACK  [-] NORTH\\jon.snow:Winter2025! "
+    "STATUS_LOGON_FAILURE\n"
+)
+WINRM_OUTPUT = (
+    "WINRM  10.0.0.1  5985  WINTERFELL  [*] Windows Server 2019\n"
+    "WINRM  10.0.0.1  5985  WINTERFELL  [+] NORTH\\jon.snow:Winter2025!\n"
+    "Some module banner\n"
+)
+
+
+class SweepResultTest(TestCase):
+
+    def _sweep(self):
+        sweep = SweepResult(["smb", "winrm", "ssh"])
+        # Runs end in any order: the merge follows the protocol selection.
+        sweep.add("winrm", WINRM_OUTPUT)
+        sweep.add("smb", SMB_OUTPUT)
+        sweep.add("ssh", "")
+        return sweep
+
+    def test_output_is_grouped_by_host_then_protocol(self):
+        lines = self._sweep().merged_output().splitlines()
+        self.assertEqual(
+            [" ".join(line.split()[:2]) for line in lines[:-1]],
+            [
+                "SMB 10.0.0.1",
+                "SMB 10.0.0.1",
+                "WINRM 10.0.0.1",
+                "WINRM 10.0.0.1",
+                "SMB 10.0.0.2",
+                "SMB 10.0.0.2",
+            ],
+        )
+        self.assertEqual(lines[-1], "Some module banner")
+
+    def test_each_host_gets_its_best_status_per_protocol(self):
+        sweep = self._sweep()
+        self.assertEqual(sweep.status("10.0.0.1", "smb"), "admin")
+        self.assertEqual(sweep.status("10.0.0.1", "winrm"), "authenticated")
+        self.assertEqual(sweep.status("10.0.0.2", "smb"), "login failed")
+        self.assertEqual(sweep.status("10.0.0.2", "winrm"), "no answer")
+        self.assertTrue(sweep.reached("winrm"))
+        self.assertFalse(sweep.reached("ssh"))
+
+    def test_summary_has_one_line_per_host(self):
+        self.assertEqual(
+            self._sweep().summary().splitlines(),
+            [
+                "10.0.0.1: SMB admin, WINRM authenticated, SSH no answer",
+                "10.0.0.2: SMB login failed, WINRM no answer, SSH no answer",
+            ],
+        )
@@ -2,10 +2,13 @@ import json
 import os
 import tempfile
 from unittest import TestCase
+from unittest.mock import patch
 
+from netexec.helpers import spider_plus_parser
 from netexec.helpers.spider_plus_parser import (
     extract_files_from_metadata,
     parse_spider_output_dir,
+    scan_spider_output_dir,
 )
 
 # Trimmed real spider_plus metadata: a top-level file on NETLOGON and a
@@ -86,3 +89,134 @@ class SpiderPlusParserTest(TestCase):
             with open(os.path.join(d, "10.0.0.1.json"), "w", encoding="utf-8") as f:
                 f.write("{ not valid json")
             self.assertEqual(parse_spider_output_dir(d, self.ip_map), [])
+
+    def _write(self, d, ip, metadata):
+        with open(os.path.join(d, f"{ip}.json"), "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=4)
+
+    def test_streamed_file_matches_in_memory_extraction(self):
+        # Larger than a read chunk, with keys and values straddling chunks.
+        metadata = {
+            f"SHARE{s}": {
+                f'dir{i % 7}/sub dir/\u00e9t\u00e9 \\"{i}".txt': {
+                    "atime_epoch": "2024-01-01 00:00:00",
+                    "size": f"{i * 1.5} KB",
+                }
+                for i in range(6000)
+            }
+            for s in range(3)
+        }
+        metadata["IPC"] = "not-a-dict"
+        with tempfile.TemporaryDirectory() as d:
+            self._write(d, self.ip, metadata)
+            self.assertGreater(
+                os.path.getsize(os.path.join(d, f"{self.ip}.json")), 1 << 20
+            )
+            findings = parse_spider_output_dir(d, self.ip_map)
+        self.assertEqual(
+            findings, extract_files_from_metadata(metadata, self.ip, self.ip_map)
+        )
+
+    def test_budgets_cap_findings_and_summary_counts_everything(self):
+        metadata = {
+            "A": {f"a{i}.txt": {} for i in range(5)},
+            "B": {f"b{i}.txt": {} for i in range(5)},
+            "C": {f"c{i}.txt": {} for i in range(5)},
+        }
+        with tempfile.TemporaryDirectory() as d:
+            self._write(d, self.ip, metadata)
+            self._write(d, "10.0.0.2", {"A": {"x.txt": {}}})
+            findings, summary = scan_spider_output_dir(
+                d, self.ip_map, max_files_per_share=3, max_files_per_host=7
+            )
+        host_findings = [f for f in findings if f["host"] == self.ip]
+        self.assertEqual(len(host_findings), 7)
+        self.assertEqual(
+            [f["file_name"] for f in host_findings],
+            ["a0.txt", "a1.txt", "a2.txt", "b0.txt", "b1.txt", "b2.txt", "c0.txt"],
+        )
+        self.assertEqual(
+            summary,
+            {
+                "hosts": 2,
+                "shares": 4,
+                "files": 16,
+                "reported": 8,
+                "skipped": 8,
+                "parse_errors": 0,
+            },
+        )
+
+    def test_no_budget_reports_every_file(self):
+        with tempfile.TemporaryDirectory() as d:
+            self._write(d, self.ip, _SAMPLE)
+            findings, summary = scan_spider_output_dir(d, self.ip_map)
+        self.assertEqual(len(findings), 3)
+        self.assertEqual(summary["skipped"], 0)
+
+    def test_truncated_file_keeps_entries_read_before_the_cut(self):
+        with tempfile.TemporaryDirectory() as d:
+            with open(os.path.join(d, f"{self.ip}.json"), "w", encoding="utf-8") as f:
+                f.write(json.dumps(_SAMPLE)[:-40])
+            findings, summary = scan_spider_output_dir(d, self.ip_map)
+        self.assertEqual({f["share"] for f in findings}, {"NETLOGON"})
+        self.assertEqual(summary["files"], 2)
+
+    def test_damaged_entry_is_skipped_up_to_the_next_entry(self):
+        document = json.dumps(_SAMPLE).replace(
+            '"script.ps1": {"size": "165 B"}', '"script.ps1": {"size": [165 B}'
+        )
+        with tempfile.TemporaryDirectory() as d:
+            with open(os.path.join(d, f"{self.ip}.json"), "w", encoding="utf-8") as f:
+                f.write(document)
+            findings, summary = scan_spider_output_dir(d, self.ip_map)
+        self.assertEqual(
+            [(f["share"], f["file_name"]) for f in findings],
+            [("NETLOGON", "secret.ps1"), ("SYSVOL", "secret.ps1")],
+        )
+        self.assertEqual(summary["parse_errors"], 1)
+
+    def test_damaged_last_entry_is_skipped_up_to_the_next_share(self):
+        document = json.dumps(_SAMPLE).replace(
+            '"secret.ps1": {"size": "869 B"}', '"secret.ps1": {"size": [869 B}'
+        )
+        with tempfile.TemporaryDirectory() as d:
+            with open(os.path.join(d, f"{self.ip}.json"), "w", encoding="utf-8") as f:
+                f.write(document)
+            findings, summary = scan_spider_output_dir(d, self.ip_map)
+        self.assertEqual(
+            [(f["share"], f["file_name"]) for f in findings],
+            [("NETLOGON", "script.ps1"), ("SYSVOL", "secret.ps1")],
+        )
+        self.assertEqual(summary["parse_errors"], 1)
+
+    def test_unterminated_value_stops_growing_the_window(self):
+        # A string that never ends: without a cap the whole file would be
+        # buffered looking for its end.
+        entries = ",".join(f'"f{i}.txt": {{"size": "{i} B"}}' for i in range(200000))
+        document = (
+            '{"NETLOGON": {"a.txt": {"size": "1 B"}, "broken.txt": {"size": "x'
+            + "y" * 100
+            + '}, "SYSVOL": {'
+            + entries
+            + "}}"
+        )
+        with tempfile.TemporaryDirectory() as d:
+            with open(os.path.join(d, f"{self.ip}.json"), "w", encoding="utf-8") as f:
+                f.write(document)
+            windows = []
+            fill = spider_plus_parser._JsonStream._fill
+
+            def recording_fill(stream):
+                filled = fill(stream)
+                windows.append(len(stream._buffer))
+                return filled
+
+            with patch.object(
+                spider_plus_parser, "_MAX_VALUE_SIZE", 1 << 20
+            ), patch.object(spider_plus_parser._JsonStream, "_fill", recording_fill):
+                findings, summary = scan_spider_output_dir(d, self.ip_map)
+        self.assertLess(max(windows), (1 << 20) + 2 * spider_plus_parser._CHUNK_SIZE)
+        self.assertEqual(summary["parse_errors"], 1)
+        self.assertEqual(findings[0]["file_name"], "a.txt")
+        self.assertEqual(summary["files"], 1 + 200000)
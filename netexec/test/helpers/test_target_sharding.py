@@ -0,0 +1,28 @@
+from unittest import TestCase
+
+from netexec.helpers.target_sharding import plan_shards
+
+
+class PlanShardsTest(TestCase):
+
+    def test_targets_are_dealt_round_robin(self):
+        targets = [f"10.0.0.{i}" for i in range(6)]
+        self.assertEqual(
+            plan_shards(targets, shards=3, min_targets=2),
+            [
+                ["10.0.0.0", "10.0.0.3"],
+                ["10.0.0.1", "10.0.0.4"],
+                ["10.0.0.2", "10.0.0.5"],
+            ],
+        )
+
+    def test_small_injects_use_fewer_processes(self):
+        targets = [f"10.0.0.{i}" for i in range(30)]
+        self.assertEqual(len(plan_shards(targets, shards=4, min_targets=10)), 3)
+        self.assertEqual(
+            plan_shards(targets[:5], shards=4, min_targets=10), [targets[:5]]
+        )
+
+    def test_single_shard_keeps_the_target_order(self):
+        targets = ["b", "a", "c"]
+        self.assertEqual(plan_shards(targets, shards=1, min_targets=1), [targets])
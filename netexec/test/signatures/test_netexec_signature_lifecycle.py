@@ -8,6 +8,7 @@ pyoaev is mocked by test/conftest.py — SignatureManager and build_network_conf
 are both MagicMocks in this context, which lets us assert on their call signatures.
 """
 
+import json
 from types import SimpleNamespace
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
@@ -15,6 +16,7 @@ from unittest.mock import MagicMock, patch
 # Import the production module to register it in sys.modules BEFORE any patch() call,
 # so that patch("netexec.openaev_netexec.SignatureManager") can resolve successfully.
 import netexec.openaev_netexec  # noqa: F401
+from netexec.helpers.password_spray import LockoutPolicy
 from netexec.helpers.signature_helper import NETEXEC_SIGNATURE_TYPES
 
 
@@ -83,6 +85,15 @@ class SignatureLifecycleTest(TestCase):
             injector.parser.parse.return_value = {"outputs": {}}
             injector.config = MagicMock()
             injector.sm = self.mock_sm
+            injector._workspace_seed = None
+            injector._shards = 1
+            injector._shard_min_targets = 20
+            injector._spider_max_files_per_share = 1000
+            injector._spider_max_files_per_host = 5000
+            injector._spray_workers = 4
+            injector._spray_lockout_margin = 2
+            injector._spray_max_duration = 3600
+            injector._spray_default_policy = LockoutPolicy(5, 1800, False)
             return injector
 
     def _run_process_message(self, injector, data: dict, returncode: int = 0):
@@ -244,6 +255,243 @@ class SignatureLifecycleTest(TestCase):
         for c in target_calls:
             self.assertEqual(c.kwargs["data"]["execution_action"], "command_execution")
 
+    def test_process_message_reports_each_host_results_on_its_asset(self):
+        """
+        Given an inject targeting two asset-backed endpoints
+        When NetExec prints results for the first one only
+        Then the first endpoint's trace carries its own output, and the second
+        still gets a trace showing the run reached it.
+        """
+        injector = self._make_injector()
+        data, _ = _build_data(["10.0.0.1", "10.0.0.2"])
+        extraction = SimpleNamespace(
+            targets=["10.0.0.1", "10.0.0.2"],
+            ip_to_asset_id_map={"10.0.0.1": "asset-1", "10.0.0.2": "asset-2"},
+        )
+        host_line = "SMB  10.0.0.1  445  WINTERFELL  [*] Windows Server 2019\n"
+
+        def stream(cmd, env=None, on_stdout_line=None):
+            on_stdout_line(host_line)
+            return host_line, "", 0
+
+        with patch(
+            "netexec.openaev_netexec.build_network_configs",
+            return_value=["cfg-1", "cfg-2"],
+        ), patch(
+            "netexec.openaev_netexec.Targets.extract_targets",
+            return_value=extraction,
+        ), patch(
+            "netexec.openaev_netexec.Targets.extract_target_meta",
+            return_value=[],
+        ), patch(
+            "netexec.openaev_netexec.execute_netexec", side_effect=stream
+        ):
+            injector.process_message(data)
+
+        calls = injector.helper.api.inject.execution_callback.call_args_list
+        messages = {
+            c.kwargs["data"]["execution_context_identifiers"][0]: c.kwargs["data"][
+                "execution_message"
+            ]
+            for c in calls
+            if c.kwargs["data"].get("execution_context_identifiers")
+        }
+        self.assertEqual(
+            messages["asset-1"],
+            "NetExec results for target 10.0.0.1:\n" + host_line.strip(),
+        )
+        self.assertEqual(
+            messages["asset-2"], "NetExec executed against target 10.0.0.2"
+        )
+
+    # -- Scenario: Sharded injects run one NetExec process per target chunk --
+
+    def test_sharded_inject_merges_every_process_output_into_one_parse(self):
+        """
+        Given sharding over 2 processes and an inject targeting two endpoints
+        When process_message runs
+        Then one NetExec command runs per target chunk
+        And the parser receives the output of both, merged
+        """
+        injector = self._make_injector()
+        injector._shards = 2
+        injector._shard_min_targets = 1
+        data, _ = _build_data(["10.0.0.1", "10.0.0.2"])
+        extraction = SimpleNamespace(
+            targets=["10.0.0.1", "10.0.0.2"],
+            ip_to_asset_id_map={"10.0.0.1": "asset-1", "10.0.0.2": "asset-2"},
+        )
+
+        def run(cmd, env=None, on_stdout_line=None):
+            return f"output of {cmd[2]}\n", "", 0
+
+        with patch(
+            "netexec.openaev_netexec.build_network_configs",
+            return_value=["cfg-1", "cfg-2"],
+        ), patch(
+            "netexec.openaev_netexec.Targets.extract_targets",
+            return_value=extraction,
+        ), patch(
+            "netexec.openaev_netexec.Targets.extract_target_meta",
+            return_value=[],
+        ), patch(
+            "netexec.openaev_netexec.execute_netexec", side_effect=run
+        ) as mock_execute:
+            injector.process_message(data)
+
+        self.assertEqual(
+            sorted(c.args[0][2:] for c in mock_execute.call_args_list),
+            [["10.0.0.1"], ["10.0.0.2"]],
+        )
+        merged_stdout = injector.parser.parse.call_args.args[0]
+        self.assertEqual(
+            sorted(merged_stdout.splitlines()),
+            ["output of 10.0.0.1", "output of 10.0.0.2"],
+        )
+
+    # -- Scenario: A password spray reports the credentials that logged in --
+
+    def test_spray_reads_the_policy_then_reports_found_credentials(self):
+        """
+        Given a spray contract with two usernames and two passwords
+        When process_message runs
+        Then the password policy is read before any attempt
+        And the credential that logged in is traced on its asset and output
+        And the account found is not tried with the next password
+        """
+        injector = self._make_injector()
+        data, _ = _build_data(["10.0.0.1"], contract_id="netexec_smb_spray")
+        data["injection"]["inject_content"].update(
+            spray_usernames="jon.snow\narya.stark",
+            spray_passwords="Winter2025!\nSummer2025!",
+            domain="NORTH",
+        )
+        extraction = SimpleNamespace(
+            targets=["10.0.0.1"], ip_to_asset_id_map={"10.0.0.1": "asset-1"}
+        )
+        tried = []
+
+        def run(cmd, env=None, on_stdout_line=None):
+            if "--pass-pol" in cmd:
+                return "", "", 0
+            password = cmd[cmd.index("-p") + 1]
+            with open(cmd[cmd.index("-u") + 1]) as users_file:
+                usernames = users_file.read().split()
+            tried.append((password, usernames))
+            if password == "Winter2025!":
+                return (
+                    "SMB  10.0.0.1  445  WINTERFELL  [+] NORTH\\jon.snow:Winter2025!\n"
+                    "SMB  10.0.0.1  445  WINTERFELL  [-] NORTH\\arya.stark:Winter2025! "
+                    "STATUS_LOGON_FAILURE\n",
+                    "",
+                    0,
+                )
+            return "", "", 0
+
+        with patch(
+            "netexec.openaev_netexec.build_network_configs",
+            return_value=["cfg-1"],
+        ), patch(
+            "netexec.openaev_netexec.Targets.extract_targets",
+            return_value=extraction,
+        ), patch(
+            "netexec.openaev_netexec.Targets.extract_target_meta",
+            return_value=[],
+        ), patch(
+            "netexec.openaev_netexec.execute_netexec", side_effect=run
+        ) as mock_execute:
+            injector.process_message(data)
+
+        self.assertIn("--pass-pol", mock_execute.call_args_list[0].args[0])
+        self.assertEqual(
+            tried,
+            [
+                ("Winter2025!", ["jon.snow", "arya.stark"]),
+                ("Summer2025!", ["arya.stark"]),
+            ],
+        )
+        calls = injector.helper.api.inject.execution_callback.call_args_list
+        self.assertIn(
+            "Valid credentials for NORTH\\jon.snow on 10.0.0.1",
+            [c.kwargs["data"]["execution_message"] for c in calls],
+        )
+        final = calls[-1].kwargs["data"]
+        self.assertEqual(final["execution_status"], "SUCCESS")
+        credentials = json.loads(final["execution_output_structured"])["credentials"]
+        self.assertEqual(
+            [(c["username"], c["password"], c["asset_id"]) for c in credentials],
+            [("jon.snow", "Winter2025!", "asset-1")],
+        )
+
+    # -- Scenario: A protocol sweep runs every selected protocol concurrently --
+
+    def test_sweep_runs_each_protocol_and_reports_them_in_the_signatures(self):
+        """
+        Given a sweep contract selecting SMB, WINRM and SSH
+        When process_message runs
+        Then one NetExec command runs per protocol over the same targets
+        And their outputs are merged per host under a per-protocol summary
+        And the signatures list every protocol tested and those that answered
+        """
+        injector = self._make_injector()
+        data, _ = _build_data(["10.0.0.1"], contract_id="netexec_sweep")
+        data["injection"]["inject_content"].update(
+            sweep_protocols=["smb", "winrm", "ssh"],
+            username="jon.snow",
+            password="Winter2025!",
+            hash="aad3b435b51404eeaad3b435b51404ee:31d6cfe0d16ae931b73c59d7e0c089c0",
+        )
+        extraction = SimpleNamespace(
+            targets=["10.0.0.1"], ip_to_asset_id_map={"10.0.0.1": "asset-1"}
+        )
+        outputs = {
+            "smb": "SMB  10.0.0.1  445  WINTERFELL  [+] NORTH\\jon.snow:Winter2025! "
+            "(Pwn3d!)\n",
+            "winrm": "WINRM  10.0.0.1  5985  WINTERFELL  [-] NORTH\\jon.snow:"
+            "Winter2025!\n",
+            "ssh": "",
+        }
+
+        def run(cmd, env=None, on_stdout_line=None):
+            return outputs[cmd[1]], "", 0
+
+        with patch(
+            "netexec.openaev_netexec.build_network_configs",
+            return_value=["cfg-1"],
+        ), patch(
+            "netexec.openaev_netexec.Targets.extract_targets",
+            return_value=extraction,
+        ), patch(
+            "netexec.openaev_netexec.Targets.extract_target_meta",
+            return_value=[],
+        ), patch(
+            "netexec.openaev_netexec.ExtraSignatureData"
+        ) as mock_extra, patch(
+            "netexec.openaev_netexec.execute_netexec", side_effect=run
+        ) as mock_execute:
+            injector.process_message(data)
+
+        commands = {c.args[0][1]: c.args[0] for c in mock_execute.call_args_list}
+        self.assertEqual(set(commands), {"smb", "winrm", "ssh"})
+        self.assertTrue(all(cmd[2] == "10.0.0.1" for cmd in commands.values()))
+        self.assertIn("-H", commands["smb"])
+        self.assertNotIn("-H", commands["ssh"])
+
+        final = injector.helper.api.inject.execution_callback.call_args_list[-1]
+        self.assertTrue(
+            final.kwargs["data"]["execution_message"].startswith(
+                "NetExec succeeded:\n10.0.0.1: SMB admin, WINRM login failed,"
+                " SSH no answer\n\nSMB  10.0.0.1"
+            )
+        )
+        self.assertEqual(
+            mock_extra.call_args.kwargs["detection"],
+            {
+                "protocols_tested": ["smb", "winrm", "ssh"],
+                "protocols_succeeded": ["smb", "winrm"],
+            },
+        )
+
 
 class NetexecSignatureTypesTest(TestCase):
     """
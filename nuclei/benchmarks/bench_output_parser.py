@@ -0,0 +1,174 @@
+"""Benchmark NucleiOutputParser against the parser it replaced.
+
+Generates a synthetic Nuclei stdout (JSONL results interleaved with ANSI
+coloured progress and plain-text findings), checks that both parsers return
+the same result, and reports their timings.
+
+    python -m benchmarks.bench_output_parser --lines 1000000
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+from collections import defaultdict
+
+from nuclei.helpers.nuclei_output_parser import NucleiOutputParser
+
+
+class LegacyNucleiOutputParser:
+    """The parser as it was before the fast path, kept as the baseline."""
+
+    def parse(self, stdout, ip_to_asset_id_map, cached_lines=None):
+        grouped = defaultdict(
+            lambda: {"asset_id": set(), "host": set(), "severity": None}
+        )
+        others = []
+        seen = set()
+        live_cves = set()
+        lines = [(line, False) for line in stdout.splitlines()]
+        lines += [(line, True) for line in cached_lines or []]
+
+        for line, cached in lines:
+            try:
+                j = json.loads(line)
+                if j.get("matcher-status"):
+                    cve_ids = (
+                        j.get("info", {})
+                        .get("classification", {})
+                        .get("cve-id", ["Unknown CVE"])
+                    )
+                    severity = j.get("info", {}).get("severity", "Unknown Severity")
+                    host = j.get("host", j.get("url", ""))
+                    cve_str = (
+                        ", ".join(c.upper() for c in cve_ids)
+                        if isinstance(cve_ids, list)
+                        else cve_ids.upper()
+                    )
+                    key = (host, cve_str, severity)
+                    if key not in seen:
+                        seen.add(key)
+                        asset_id = ip_to_asset_id_map.get(host, "")
+                        for cve_id in cve_str.split(", "):
+                            if not cached:
+                                live_cves.add(cve_id)
+                            group = grouped[cve_id]
+                            group["asset_id"].add(asset_id)
+                            group["host"].add(host)
+                            group["severity"] = severity
+            except json.JSONDecodeError:
+                if cached:
+                    continue
+                clean_line = re.sub(r"\x1b\[[0-9;]*m", "", line)
+                if clean_line.strip():
+                    others.append(clean_line)
+
+        grouped_findings = [
+            {
+                "id": cve_id,
+                "asset_id": sorted(list(data["asset_id"])),
+                "host": sorted(list(data["host"])),
+                "severity": data["severity"],
+            }
+            for cve_id, data in grouped.items()
+        ]
+        cached_count = 0
+        for finding in grouped_findings:
+            if finding["id"] not in live_cves:
+                finding["cached"] = True
+                cached_count += 1
+
+        message_parts = []
+        if grouped_findings:
+            message_parts.append(f"{len(grouped_findings)} CVE(S)")
+        if cached_count:
+            message_parts.append(f"({cached_count} from cache)")
+        if others:
+            message_parts.append(f"{len(others)} Vulnerabilities(s)")
+        if not grouped_findings and not others:
+            message_parts.append("Good News: Nothing Found !")
+
+        outputs = {"cve": grouped_findings, "others": others}
+        if stdout.strip():
+            outputs["action_output"] = stdout.strip()
+
+        return {
+            "message": "Nuclei completed: " + " ".join(message_parts),
+            "outputs": outputs,
+        }
+
+
+def synthetic_output(lines, hosts, seed=0):
+    rng = random.Random(seed)
+    severities = ["info", "low", "medium", "high", "critical"]
+    out = []
+    for i in range(lines):
+        host = f"10.0.{rng.randrange(hosts) // 256}.{rng.randrange(hosts) % 256}"
+        roll = rng.random()
+        if roll < 0.6:
+            out.append(
+                json.dumps(
+                    {
+                        "template-id": f"CVE-2024-{rng.randrange(2000):04d}",
+                        "template-path": "/root/nuclei-templates/http/cves/x.yaml",
+                        "info": {
+                            "name": "Synthetic finding",
+                            "severity": rng.choice(severities),
+                            "classification": {
+                                "cve-id": [f"cve-2024-{rng.randrange(2000):04d}"]
+                            },
+                        },
+                        "type": "http",
+                        "host": host,
+                        "matched-at": f"http://{host}/path",
+                        "timestamp": "2026-01-01T00:00:00Z",
+                        "matcher-status": rng.random() < 0.9,
+                    }
+                )
+            )
+        elif roll < 0.9:
+            out.append(f"\x1b[34m[INF]\x1b[0m [{i}] Templates clustered, requests sent")
+        else:
+            out.append(f"[medium] [tech-detect] [http] http://{host}/")
+    return "\n".join(out) + "\n"
+
+
+def timed(parse, stdout, ip_to_asset_id_map, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parse(stdout, ip_to_asset_id_map)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--hosts", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    stdout = synthetic_output(args.lines, args.hosts)
+    ip_to_asset_id_map = {
+        f"10.0.{i // 256}.{i % 256}": f"asset-{i}" for i in range(args.hosts)
+    }
+
+    legacy_time, legacy = timed(
+        LegacyNucleiOutputParser().parse, stdout, ip_to_asset_id_map, args.repeat
+    )
+    fast_time, fast = timed(
+        NucleiOutputParser().parse, stdout, ip_to_asset_id_map, args.repeat
+    )
+    if fast != legacy:
+        raise SystemExit("Parsers disagree on the synthetic output")
+
+    print(f"{args.lines} lines, {len(fast['outputs']['cve'])} CVEs")
+    print(f"legacy parser: {legacy_time:.3f}s")
+    print(f"fast parser:   {fast_time:.3f}s ({legacy_time / fast_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -86,6 +86,134 @@ class ConfigLoaderNuclei(BaseSettings):
         ),
     )
 
+    scan_progress_enabled: bool = Field(
+        default=True,
+        description=(
+            "Run Nuclei with live JSON statistics and report the scan progress "
+            "(percent done, requests per second, errors) as intermediate traces "
+            "and structured log metrics while it runs. "
+            "Nuclei Flags: -stats, -stats-json"
+        ),
+    )
+
+    scan_progress_interval: PositiveInt = Field(
+        default=30,
+        description=(
+            "Minimum number of seconds between two progress traces of a scan. "
+            "Not a Nuclei flag."
+        ),
+    )
+
+    scan_shards: PositiveInt = Field(
+        default=1,
+        description=(
+            "Maximum number of Nuclei processes a single scan's targets are "
+            "split across (1 disables sharding). Targets are dealt round-robin "
+            "so a slow host only holds up its own shard, and "
+            "max_requests_per_second is split between the processes so the scan "
+            "as a whole keeps to it. Not a Nuclei flag."
+        ),
+    )
+
+    scan_shard_min_targets: PositiveInt = Field(
+        default=20,
+        description=(
+            "Minimum number of targets per shard: smaller scans use fewer "
+            "processes, down to a single one, since every process loads the "
+            "whole template set. Not a Nuclei flag."
+        ),
+    )
+
+    scan_resume_enabled: bool = Field(
+        default=False,
+        description=(
+            "When a scan reaches scan_timeout, interrupt Nuclei so it writes a "
+            "resume file, keep it with the results found so far in a per-inject "
+            "work directory, and report the partial results. Playing the same "
+            "inject again continues the scan from that point (-resume) instead "
+            "of starting over. Nuclei Flags: -resume"
+        ),
+    )
+
+    scan_resume_max_attempts: PositiveInt = Field(
+        default=3,
+        description=(
+            "Maximum number of attempts (first run included) for one inject's "
+            "scan; once reached, an interrupted scan is not resumed any more and "
+            "the next play starts from scratch. Not a Nuclei flag."
+        ),
+    )
+
+    scan_resume_state_ttl: PositiveInt = Field(
+        default=86400,
+        description=(
+            "Seconds after which the resume state of an inject that was not "
+            "played again is deleted. Not a Nuclei flag."
+        ),
+    )
+
+    scan_interrupt_grace_seconds: PositiveInt = Field(
+        default=30,
+        description=(
+            "Seconds given to an interrupted Nuclei scan to flush its results and "
+            "write its resume file before it is killed. Keep scan_timeout plus "
+            "this below the platform's inject execution threshold. Not a Nuclei "
+            "flag."
+        ),
+    )
+
+    work_directory: str = Field(
+        default=".cache/scans",
+        description=(
+            "Directory holding the per-inject work directories of resumable "
+            "scans. Not a Nuclei flag."
+        ),
+    )
+
+    scan_queue_aging_seconds: PositiveInt = Field(
+        default=300,
+        description=(
+            "Scans waiting for a slot are served smallest first and shared fairly "
+            "between scenarios; a scan that has waited longer than this many "
+            "seconds is served before any newer one, so a large scan is delayed "
+            "but never starved. Not a Nuclei flag."
+        ),
+    )
+
+    result_cache_enabled: bool = Field(
+        default=False,
+        description=(
+            "Remember, per (template, host), what recent scans concluded and "
+            "leave those checks out of the next scan within result_cache_ttl. "
+            "Cached matches are merged back into the results and marked as "
+            "cached; hosts without a match are only remembered for scans running "
+            "a single explicit template. Not a Nuclei flag."
+        ),
+    )
+
+    result_cache_ttl: PositiveInt = Field(
+        default=3600,
+        description=(
+            "How long, in seconds, a cached (template, host) verdict is reused. "
+            "Verdicts are also dropped as soon as the template file changes. "
+            "Not a Nuclei flag."
+        ),
+    )
+
+    result_cache_path: str = Field(
+        default=".cache/nuclei_result_cache.sqlite",
+        description="SQLite file holding the result cache. Not a Nuclei flag.",
+    )
+
+    templates_directory: str = Field(
+        default="~/nuclei-templates",
+        description=(
+            "Directory Nuclei installs its templates into, used to resolve "
+            "relative template paths when hashing templates for the result "
+            "cache. Not a Nuclei flag."
+        ),
+    )
+
     disable_interactsh: bool = Field(
         default=False,
         description=(
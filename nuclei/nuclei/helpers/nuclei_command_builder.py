@@ -1,3 +1,4 @@
+import json
 import shlex
 
 from nuclei.nuclei_contracts.nuclei_constants import (
@@ -26,6 +27,25 @@ class NucleiCommandBuilder:
         HTTP_SCAN_CONTRACT: "http",
     }
 
+    # Rough order of magnitude of the templates each selection runs, used only
+    # to rank waiting scans by cost (a "-templates /" scan dwarfs a single CVE
+    # check). Taken from the projectdiscovery/nuclei-templates catalog by
+    # counting the templates listed for each tag (nuclei -tl -tags <tag>) and
+    # rounding; ALL_TEMPLATES_ESTIMATE is the size of the whole catalog. Not
+    # meant to be exact: the catalog changes every day, only the ratios
+    # between selections matter, so refresh them when those drift.
+    TEMPLATE_COUNT_ESTIMATE = {
+        "cve": 3500,
+        "cloud": 600,
+        "misconfiguration": 900,
+        "exposure": 800,
+        "panel": 1300,
+        "xss": 150,
+        "wordpress": 1200,
+        "http": 9000,
+    }
+    ALL_TEMPLATES_ESTIMATE = 12000
+
     def __init__(
         self, nuclei_configs, contract_id: str, content: dict, targets: list[str]
     ):
@@ -34,6 +54,24 @@ class NucleiCommandBuilder:
         self.contract_id = contract_id
         self.content = content
         self.targets = targets
+        self.excluded_template_ids = []
+        self.resume_file = None
+        self.rate_limit = None
+
+    def resume_from(self, resume_file: str | None):
+        """Continue an interrupted scan from its resume file (-resume)."""
+        self.resume_file = resume_file
+        return self
+
+    def limit_rate(self, rate_limit: int | None):
+        """Override max_requests_per_second, e.g. with a shard's share of it."""
+        self.rate_limit = rate_limit
+        return self
+
+    def exclude_template_ids(self, template_ids: list[str]):
+        """Leave these template ids out of the scan (-exclude-id)."""
+        self.excluded_template_ids = list(template_ids)
+        return self
 
     def build(self):
         self.args = []
@@ -43,7 +81,10 @@ class NucleiCommandBuilder:
             ._with_configs()
             ._with_tags()
             ._with_templates()
+            ._with_excluded_templates()
             ._with_options()
+            ._with_resume()
+            ._with_stats()
             ._with_jsonl_output()
         )
         return build._to_args()
@@ -93,6 +134,13 @@ class NucleiCommandBuilder:
                 self.args += ["-templates", "/"]
         return self
 
+    def _with_excluded_templates(self):
+        # Templates already answered by the result cache for every target.
+        # Nuclei Flags: -eid, -exclude-id
+        if self.excluded_template_ids:
+            self.args += ["-exclude-id", ",".join(self.excluded_template_ids)]
+        return self
+
     def _with_options(self):
         options = self.content.get("options")
         if options:
@@ -100,6 +148,68 @@ class NucleiCommandBuilder:
             self.args += options_parsed
         return self
 
+    def _with_resume(self):
+        # Resume scan using a resume file left by an interrupted run.
+        # Nuclei Flags: -resume
+        if self.resume_file:
+            self.args += ["-resume", self.resume_file]
+        return self
+
+    def _with_stats(self):
+        # Live statistics, as JSON lines on stderr, for progress reporting.
+        # Nuclei Flags: -stats, -sj, -stats-json
+        if self.nuclei_configs.scan_progress_enabled:
+            self.args += ["-stats", "-stats-json"]
+        return self
+
+    def selection_key(self) -> str:
+        """Stable identity of the templates this scan selects.
+
+        Two scans with the same key run the same templates, so the result cache
+        scopes its verdicts by it.
+        """
+        return json.dumps(
+            [
+                self.TAG_MAP.get(self.contract_id),
+                self.content.get("template"),
+                self.content.get("template_path"),
+                self.content.get("options"),
+            ]
+        )
+
+    def estimated_cost(self, targets: list[str] | None = None) -> int:
+        """Estimated scan size: targets x templates selected.
+
+        Pass the targets left to scan once the result cache answered some of
+        them; templates left out with exclude_template_ids are not counted.
+        """
+        if targets is None:
+            targets = self.targets
+        if self.single_template() is not None:
+            templates = 1
+        elif self.contract_id in self.TAG_MAP:
+            templates = self.TEMPLATE_COUNT_ESTIMATE[self.TAG_MAP[self.contract_id]]
+        else:
+            templates = self.ALL_TEMPLATES_ESTIMATE
+        templates = max(1, templates - len(self.excluded_template_ids))
+        return max(1, len(targets)) * templates
+
+    def single_template(self) -> str | None:
+        """The one template this scan runs, when it is known before running.
+
+        Only an explicit template with no tag filter and no raw options: a tag
+        or an option could silently skip the template, and a "no match" would
+        then be recorded for a check that never ran.
+        """
+        if self.contract_id in self.TAG_MAP or self.content.get("options"):
+            return None
+        templates = [
+            t
+            for t in (self.content.get("template"), self.content.get("template_path"))
+            if t
+        ]
+        return templates[0] if len(templates) == 1 else None
+
     def _with_jsonl_output(self):
         # Write output in JSONL(ines) format.
         # Nuclei Flags: -j, -jsonl
@@ -143,7 +253,7 @@ class NucleiCommandBuilder:
         # Nuclei Flags: -rl, -rate-limit
         self.args += [
             "-rate-limit",
-            str(self.nuclei_configs.max_requests_per_second),
+            str(self.rate_limit or self.nuclei_configs.max_requests_per_second),
         ]
         return self
 
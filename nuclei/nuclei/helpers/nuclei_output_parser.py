@@ -1,61 +1,119 @@
 import json
 import re
-from collections import defaultdict
-from typing import Dict
+from typing import Dict, Optional
+
+try:
+    # Decodes the JSONL of large scans several times faster than json.
+    import orjson
+
+    _fast_loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    _fast_loads = json.loads
+
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def _decode(line: str):
+    # Returns the decoded JSON object, or None when the line is not one.
+    # Only lines starting with "{" (after whitespace) can be a Nuclei result,
+    # so progress, banner and plain-text finding lines never reach a decoder.
+    # orjson is stricter than json on a few inputs (NaN, huge integers), so
+    # json still has the final say before a line is classified as text.
+    if line[:1] != "{":
+        if not line[:1].isspace() or not line.lstrip().startswith("{"):
+            return None
+    try:
+        j = _fast_loads(line)
+    except ValueError:
+        try:
+            j = json.loads(line)
+        except ValueError:
+            return None
+    return j if isinstance(j, dict) else None
 
 
 class NucleiOutputParser:
-    def parse(self, stdout: str, ip_to_asset_id_map: dict) -> Dict:
-        grouped = defaultdict(
-            lambda: {"asset_id": set(), "host": set(), "severity": None}
-        )
+    def parse(
+        self,
+        stdout: str,
+        ip_to_asset_id_map: dict,
+        cached_lines: Optional[list[str]] = None,
+    ) -> Dict:
+        # cached_lines are JSONL matches remembered by the result cache for
+        # checks this scan left out. They are grouped like live matches, but
+        # never reach "others"/"action_output", and a CVE only seen through
+        # them is marked "cached".
+        grouped = {}
         others = []
         seen = set()
+        live_cves = set()
+
+        for lines, cached in ((stdout.splitlines(), False), (cached_lines or (), True)):
+            for line in lines:
+                j = _decode(line)
+                if j is None:
+                    if cached:
+                        continue
+                    if "\x1b" in line:
+                        line = _ANSI_ESCAPE.sub("", line)
+                    if line.strip():
+                        others.append(line)
+                    continue
+                if not j.get("matcher-status"):
+                    continue
 
-        for line in stdout.splitlines():
-            try:
-                j = json.loads(line)
-                if j.get("matcher-status"):
-                    cve_ids = (
-                        j.get("info", {})
-                        .get("classification", {})
-                        .get("cve-id", ["Unknown CVE"])
-                    )
-                    severity = j.get("info", {}).get("severity", "Unknown Severity")
-                    host = j.get("host", j.get("url", ""))
-                    cve_str = (
-                        ", ".join(c.upper() for c in cve_ids)
-                        if isinstance(cve_ids, list)
-                        else cve_ids.upper()
-                    )
-                    key = (host, cve_str, severity)
-                    if key not in seen:
-                        seen.add(key)
-                        asset_id = ip_to_asset_id_map.get(host, "")
-                        # Group by each individual CVE inside the joined string
-                        for cve_id in cve_str.split(", "):
-                            group = grouped[cve_id]
-                            group["asset_id"].add(asset_id)
-                            group["host"].add(host)
-                            group["severity"] = severity
-            except json.JSONDecodeError:
-                clean_line = re.sub(r"\x1b\[[0-9;]*m", "", line)
-                if clean_line.strip():
-                    others.append(clean_line)
+                info = j.get("info", {})
+                cve_ids = info.get("classification", {}).get("cve-id", ["Unknown CVE"])
+                severity = info.get("severity", "Unknown Severity")
+                host = j.get("host", j.get("url", ""))
+                # A finding lists one or more CVE ids; an id may itself be a
+                # comma-separated list, which is split into separate CVEs (and
+                # an empty list stands for one CVE with an empty id).
+                if isinstance(cve_ids, list):
+                    upper_ids = [c.upper() for c in cve_ids]
+                else:
+                    upper_ids = [cve_ids.upper()]
+                if not upper_ids or any(", " in c for c in upper_ids):
+                    upper_ids = ", ".join(upper_ids).split(", ")
+                key = (host, tuple(upper_ids), severity)
+                if key in seen:
+                    continue
+                seen.add(key)
+                asset_id = ip_to_asset_id_map.get(host, "")
+                for cve_id in upper_ids:
+                    if not cached:
+                        live_cves.add(cve_id)
+                    group = grouped.get(cve_id)
+                    if group is None:
+                        group = grouped[cve_id] = {
+                            "asset_id": set(),
+                            "host": set(),
+                            "severity": None,
+                        }
+                    group["asset_id"].add(asset_id)
+                    group["host"].add(host)
+                    group["severity"] = severity
 
         grouped_findings = [
             {
                 "id": cve_id,
-                "asset_id": sorted(list(data["asset_id"])),
-                "host": sorted(list(data["host"])),
+                "asset_id": sorted(data["asset_id"]),
+                "host": sorted(data["host"]),
                 "severity": data["severity"],
             }
             for cve_id, data in grouped.items()
         ]
+        cached_count = 0
+        for finding in grouped_findings:
+            if finding["id"] not in live_cves:
+                finding["cached"] = True
+                cached_count += 1
 
         message_parts = []
         if grouped_findings:
             message_parts.append(f"{len(grouped_findings)} CVE(S)")
+        if cached_count:
+            message_parts.append(f"({cached_count} from cache)")
         if others:
             message_parts.append(f"{len(others)} Vulnerabilities(s)")
         if not grouped_findings and not others:
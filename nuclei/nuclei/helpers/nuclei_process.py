@@ -1,4 +1,10 @@
+import signal
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Seconds to wait for Nuclei's output pipes to drain once the process exited.
+_DRAIN_TIMEOUT = 10
 
 
 class NucleiProcess:
@@ -18,12 +24,17 @@ class NucleiProcess:
         subprocess.run(["nuclei", "-version"], capture_output=True, check=True)
 
     @staticmethod
-    def nuclei_execute(args, input_data, timeout=None):
+    def nuclei_execute(args, input_data, timeout=None, on_stderr_line=None):
         # timeout is a hard ceiling for the whole scan: when it fires,
         # subprocess.run kills the process and raises TimeoutExpired (carrying
         # the partial stdout/stderr). Without it a hung Nuclei run blocks the
         # single-threaded consumer forever and the inject never gets a terminal
-        # trace.
+        # trace. With on_stderr_line, stderr is read while the scan runs (see
+        # _execute_streaming).
+        if on_stderr_line is not None:
+            return NucleiProcess._execute_streaming(
+                args, input_data, timeout, on_stderr_line
+            )
         return subprocess.run(
             args,
             input=input_data,
@@ -31,3 +42,123 @@ class NucleiProcess:
             check=True,
             timeout=timeout,
         )
+
+    @staticmethod
+    def nuclei_execute_interruptible(
+        args, input_data, timeout, grace, on_stderr_line=None
+    ):
+        # Same contract as nuclei_execute, but when the scan ceiling fires Nuclei
+        # is sent SIGINT rather than killed, and given `grace` seconds to flush
+        # its results and write its resume file (it only does so on interrupt).
+        # It is killed if it does not exit in time. TimeoutExpired then carries
+        # everything Nuclei wrote, for the resume store.
+        return NucleiProcess._execute_streaming(
+            args, input_data, timeout, on_stderr_line, interrupt_grace=grace
+        )
+
+    @staticmethod
+    def _execute_streaming(
+        args, input_data, timeout, on_stderr_line=None, interrupt_grace=None
+    ):
+        # Feeds stdin and drains stdout/stderr from threads so stderr can be
+        # handed to on_stderr_line line by line while Nuclei runs (its live
+        # -stats-json statistics). Lines the callback returns True for are left
+        # out of the captured stderr. On timeout, the process is killed - or
+        # interrupted first when interrupt_grace is set.
+        stdout_chunks, stderr_lines = [], []
+        with subprocess.Popen(
+            args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        ) as process:
+
+            def feed_stdin():
+                try:
+                    process.stdin.write(input_data)
+                    process.stdin.close()
+                except OSError:
+                    # Nuclei exited (or was killed) before reading its input.
+                    pass
+
+            def drain_stdout():
+                for chunk in iter(lambda: process.stdout.read1(65536), b""):
+                    stdout_chunks.append(chunk)
+
+            def drain_stderr():
+                for line in iter(process.stderr.readline, b""):
+                    if on_stderr_line is None or not on_stderr_line(line):
+                        stderr_lines.append(line)
+
+            threads = [
+                threading.Thread(target=target, daemon=True)
+                for target in (feed_stdin, drain_stdout, drain_stderr)
+            ]
+            for thread in threads:
+                thread.start()
+            timed_out = False
+            try:
+                process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                timed_out = True
+                if interrupt_grace is not None:
+                    process.send_signal(signal.SIGINT)
+                    try:
+                        process.wait(timeout=interrupt_grace)
+                    except subprocess.TimeoutExpired:
+                        process.kill()
+                else:
+                    process.kill()
+                process.wait()
+            for thread in threads:
+                # Bounded: a grandchild still holding the pipes must not keep
+                # the scan from returning.
+                thread.join(timeout=_DRAIN_TIMEOUT)
+
+        stdout = b"".join(stdout_chunks)
+        stderr = b"".join(stderr_lines)
+        if timed_out:
+            raise subprocess.TimeoutExpired(args, timeout, output=stdout, stderr=stderr)
+        if process.returncode:
+            raise subprocess.CalledProcessError(
+                process.returncode, args, output=stdout, stderr=stderr
+            )
+        return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
+
+    @staticmethod
+    def nuclei_execute_sharded(
+        args_list, input_list, timeout=None, stderr_handlers=None
+    ):
+        # Runs one Nuclei process per shard concurrently and merges their JSONL
+        # streams (and stderr) as if a single process had produced them. Each
+        # process gets the same hard ceiling; if any shard fails, the first
+        # failure is raised once every shard is done, carrying the output of
+        # all of them. stderr_handlers, when given, holds one on_stderr_line
+        # callback per shard.
+        stderr_handlers = stderr_handlers or [None] * len(args_list)
+        with ThreadPoolExecutor(max_workers=len(args_list)) as pool:
+            futures = [
+                pool.submit(
+                    NucleiProcess.nuclei_execute, args, input_data, timeout, handler
+                )
+                for args, input_data, handler in zip(
+                    args_list, input_list, stderr_handlers
+                )
+            ]
+        stdouts, stderrs, error = [], [], None
+        for future in futures:
+            try:
+                result = future.result()
+            except (subprocess.TimeoutExpired, subprocess.CalledProcessError) as exc:
+                result = exc
+                error = error or exc
+            stdouts.append(result.stdout or b"")
+            stderrs.append(result.stderr or b"")
+        stdout = b"".join(
+            out if out.endswith(b"\n") else out + b"\n" for out in stdouts if out
+        )
+        stderr = b"\n".join(err.rstrip(b"\n") for err in stderrs if err)
+        if error is not None:
+            error.output, error.stderr = stdout, stderr
+            raise error
+        return subprocess.CompletedProcess(args_list, 0, stdout, stderr)
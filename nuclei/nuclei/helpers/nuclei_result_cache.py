@@ -0,0 +1,289 @@
+"""Local cache of recent Nuclei verdicts per (template, host).
+
+Recurring scans against the same asset group re-run every template against
+every host even when nothing changed in hours. The cache remembers, for a
+configurable TTL, what each template concluded on each host - a match
+(positive, with its JSONL line) or, when the scan ran exactly one known
+template, the absence of a match (negative) - so the next scan can leave those
+checks out and merge the remembered findings back into its results.
+
+Entries are keyed by template id and host, and carry a hash of the template
+file they were produced with: once the template refresh rewrites a template,
+its old verdicts no longer apply and are ignored. They are also scoped to the
+template selection of the scan that produced them (tags, templates, options),
+so a finding is only ever merged into a scan that would have run its template.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field
+from typing import Optional
+
+# Hosts per lookup query, to stay under SQLite's bound-parameter limit on
+# large asset groups.
+_LOOKUP_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nuclei_results (
+    scope TEXT NOT NULL,
+    template_id TEXT NOT NULL,
+    host TEXT NOT NULL,
+    template_path TEXT NOT NULL,
+    template_hash TEXT NOT NULL,
+    matched INTEGER NOT NULL,
+    line TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (scope, template_id, host, line)
+)
+"""
+
+
+@dataclass
+class CachePlan:
+    """What a scan can leave out, and what it gets back from the cache."""
+
+    # Template selection the verdicts are valid for (see the module docstring).
+    scope: str
+    # Targets still to scan: all of them, unless a single-template scan has
+    # fresh verdicts for some hosts.
+    targets: list[str]
+    # Template ids with a fresh positive for every target: passed to Nuclei as
+    # -exclude-id since re-running them cannot teach anything new.
+    excluded_template_ids: list[str] = field(default_factory=list)
+    # JSONL lines of the cached positives to merge into the parsed output.
+    cached_lines: list[str] = field(default_factory=list)
+    # Set for single-template scans: (template id, path, hash) of the template,
+    # used to record negatives for the hosts that did not match.
+    single_template: Optional[tuple[str, str, str]] = None
+
+    @property
+    def skips_scan(self) -> bool:
+        """Every target is answered from the cache: no Nuclei run needed."""
+        return not self.targets
+
+
+class NucleiResultCache:
+    """SQLite-backed (template id, host) -> verdict cache with a TTL.
+
+    One short-lived connection per operation under a process-wide lock: scans
+    run in consumer threads and only touch the cache before and after the
+    Nuclei subprocess, so contention is negligible.
+    """
+
+    def __init__(self, path: str, ttl: int, templates_directory: str, clock=None):
+        self._path = path
+        self._ttl = ttl
+        self._templates_directory = os.path.expanduser(templates_directory)
+        self._clock = clock or time.time
+        self._lock = threading.Lock()
+        # (path, mtime_ns, size) -> sha256, so a scan with many matches on the
+        # same template hashes the file once.
+        self._hashes: dict[tuple, str] = {}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._transaction() as conn:
+            conn.execute(_SCHEMA)
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock, closing(sqlite3.connect(self._path, timeout=30)) as conn:
+            with conn:
+                yield conn
+
+    # -- template identity ----------------------------------------------------
+
+    def resolve_template_path(self, template: Optional[str]) -> Optional[str]:
+        """Absolute path of a single template file, or None for dirs / unknown."""
+        if not template:
+            return None
+        path = os.path.expanduser(template)
+        if not os.path.isabs(path):
+            path = os.path.join(self._templates_directory, path)
+        return path if os.path.isfile(path) else None
+
+    def template_hash(self, template_path: Optional[str]) -> Optional[str]:
+        try:
+            stat = os.stat(template_path)
+        except (OSError, TypeError):
+            return None
+        key = (template_path, stat.st_mtime_ns, stat.st_size)
+        digest = self._hashes.get(key)
+        if digest is None:
+            with open(template_path, "rb") as handle:
+                digest = hashlib.sha256(handle.read()).hexdigest()
+            self._hashes[key] = digest
+        return digest
+
+    @staticmethod
+    def template_id(template_path: str) -> str:
+        # Nuclei templates declare their id on a top-level "id:" line; fall
+        # back to the file stem, which is the convention for official ones.
+        with open(template_path, encoding="utf-8", errors="replace") as handle:
+            for line in handle:
+                if line.startswith("id:"):
+                    return line[3:].strip().strip("'\"")
+        return os.path.splitext(os.path.basename(template_path))[0]
+
+    # -- lookup ---------------------------------------------------------------
+
+    def plan(
+        self, targets: list[str], scope: str, template: Optional[str] = None
+    ) -> CachePlan:
+        """Split a scan into what is still to run and what the cache answers.
+
+        With a single known template file, every target with a fresh verdict
+        (positive or negative) is dropped from the scan. Otherwise the set of
+        templates is only known to Nuclei, so only templates with a fresh
+        positive on every target are excluded.
+        """
+        template_path = self.resolve_template_path(template)
+        rows = self._fresh_rows(scope, targets)
+
+        if template_path is not None:
+            template_hash = self.template_hash(template_path)
+            template_id = self.template_id(template_path)
+            answered = set()
+            cached_lines = []
+            for row_id, host, _, row_hash, matched, line in rows:
+                if row_id != template_id or row_hash != template_hash:
+                    continue
+                answered.add(host)
+                if matched:
+                    cached_lines.append(line)
+            return CachePlan(
+                scope=scope,
+                targets=[t for t in targets if t not in answered],
+                cached_lines=cached_lines,
+                single_template=(template_id, template_path, template_hash),
+            )
+
+        hosts_by_template: dict[str, set] = {}
+        lines_by_template: dict[str, list] = {}
+        for row_id, host, row_path, row_hash, matched, line in rows:
+            if not matched or self.template_hash(row_path) != row_hash:
+                continue
+            hosts_by_template.setdefault(row_id, set()).add(host)
+            lines_by_template.setdefault(row_id, []).append(line)
+        wanted = set(targets)
+        excluded = sorted(
+            template_id
+            for template_id, hosts in hosts_by_template.items()
+            if wanted <= hosts
+        )
+        return CachePlan(
+            scope=scope,
+            targets=list(targets),
+            excluded_template_ids=excluded,
+            cached_lines=[
+                line
+                for template_id in excluded
+                for line in lines_by_template[template_id]
+            ],
+        )
+
+    def _fresh_rows(self, scope: str, hosts: list[str]) -> list[tuple]:
+        cutoff = self._clock() - self._ttl
+        rows = []
+        with self._transaction() as conn:
+            for i in range(0, len(hosts), _LOOKUP_CHUNK):
+                chunk = hosts[i : i + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows += conn.execute(
+                    "SELECT template_id, host, template_path, template_hash, "
+                    "matched, line FROM nuclei_results WHERE scope = ? "
+                    f"AND host IN ({placeholders}) AND stored_at >= ?",
+                    [scope, *chunk, cutoff],
+                ).fetchall()
+        return rows
+
+    # -- recording ------------------------------------------------------------
+
+    def record(self, stdout: str, plan: CachePlan) -> None:
+        """Remember the verdicts of a completed scan and drop expired ones.
+
+        The verdicts of the scanned targets replace the cached ones: a target
+        whose earlier match is gone loses it, even when the scan ran a whole
+        tag selection and no negative can be recorded for it.
+        """
+        now = self._clock()
+        scanned = set(plan.targets)
+        rows = []
+        matched_hosts = set()
+        unmapped_match = False
+        for line in stdout.splitlines():
+            if not line.startswith("{"):
+                continue
+            try:
+                j = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not j.get("matcher-status"):
+                continue
+            template_id = j.get("template-id")
+            template_path = j.get("template-path")
+            template_hash = self.template_hash(template_path)
+            if not template_id or template_hash is None:
+                continue
+            host = j.get("host", j.get("url", ""))
+            matched_hosts.add((template_id, host))
+            if host not in scanned:
+                unmapped_match = True
+            rows.append(
+                (plan.scope, template_id, host, template_path, template_hash, 1)
+                + (line, now)
+            )
+
+        # Negatives are only known when the scan ran exactly one template, and
+        # only trustworthy when every match maps back to a scanned target:
+        # otherwise a target may have matched under another host spelling.
+        if plan.single_template is not None and not unmapped_match:
+            template_id, template_path, template_hash = plan.single_template
+            rows.extend(
+                (plan.scope, template_id, host, template_path, template_hash, 0)
+                + ("", now)
+                for host in plan.targets
+                if (template_id, host) not in matched_hosts
+            )
+
+        with self._transaction() as conn:
+            # The scan re-ran its templates on every scanned target: what the
+            # cache knew about those pairs is replaced, clean results included,
+            # so a finding that went away does not come back from the cache.
+            # Templates left out with -exclude-id were not re-run: kept.
+            if plan.single_template is not None:
+                conn.executemany(
+                    "DELETE FROM nuclei_results "
+                    "WHERE scope = ? AND template_id = ? AND host = ?",
+                    [
+                        (plan.scope, plan.single_template[0], host)
+                        for host in plan.targets
+                    ],
+                )
+            else:
+                excluded = plan.excluded_template_ids
+                placeholders = ",".join("?" * len(excluded))
+                conn.executemany(
+                    "DELETE FROM nuclei_results WHERE scope = ? AND host = ? "
+                    f"AND template_id NOT IN ({placeholders})",
+                    [(plan.scope, host, *excluded) for host in plan.targets],
+                )
+            # A fresh verdict replaces whatever the cache knew about the pair.
+            conn.executemany(
+                "DELETE FROM nuclei_results "
+                "WHERE scope = ? AND template_id = ? AND host = ?",
+                {row[:3] for row in rows},
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO nuclei_results "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "DELETE FROM nuclei_results WHERE stored_at < ?", (now - self._ttl,)
+            )
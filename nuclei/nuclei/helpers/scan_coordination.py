@@ -1,52 +1,59 @@
 """Coordination primitives between Nuclei scans and template maintenance.
 
-The injector runs scans in consumer threads of the main process, while the
-periodic template refresh (``nuclei -update-templates``) runs in a forked
-child process and rewrites the shared templates directory in place. Without
+The injector runs scans in consumer threads, while the periodic template
+refresh (``nuclei -update-templates``) runs in the external contracts
+maintenance worker thread of the same process and rewrites the shared
+templates directory in place. Without
 coordination, a scan that overlaps a refresh reads a half-written template
 tree and errors out, returns empty results, or hangs - the root cause of the
 "same asset: sometimes green in a minute, sometimes red on timeout" pattern.
+
+Scans also compete with each other for a bounded number of scan slots; the
+``ScanScheduler`` decides which waiting scan gets the next one.
 """
 
-import multiprocessing
+import itertools
+import threading
+import time
 from contextlib import contextmanager
+from dataclasses import dataclass
 
 
 class TemplateAccessLock:
-    """Cross-process readers-writer lock for the shared templates directory.
+    """Readers-writer lock for the shared templates directory.
 
     Scans are readers: any number of them may run concurrently. The template
     refresh is the writer: it waits for in-flight scans to finish, blocks new
     scans while it rewrites the directory, and releases them once the tree is
     complete again.
 
-    Built on ``multiprocessing`` primitives so it works across the boundary
-    the injector actually has: reader threads live in the main process, the
-    writer runs in a child process forked from it (the primitives are shared
-    through fork inheritance, which is the default start method on Linux
-    where the injector container runs).
+    Readers and the writer are threads of the injector process: the scans
+    run in consumer threads, the refresh in the long-lived external contracts
+    maintenance worker. The resource lock is a plain ``threading.Lock`` since
+    the last reader out may release it from another thread than the first
+    reader in, which an ``RLock`` would refuse.
     """
 
     def __init__(self):
-        self._readers = multiprocessing.Value("i", 0)
-        self._readers_lock = multiprocessing.Lock()
+        self._readers = 0
+        self._readers_lock = threading.Lock()
         # Held by the writer, or by the group of readers (acquired by the
         # first reader in, released by the last reader out).
-        self._resource_lock = multiprocessing.Lock()
+        self._resource_lock = threading.Lock()
 
     @contextmanager
     def read(self):
         """Shared access: scans hold this while a Nuclei subprocess runs."""
         with self._readers_lock:
-            self._readers.value += 1
-            if self._readers.value == 1:
+            self._readers += 1
+            if self._readers == 1:
                 self._resource_lock.acquire()
         try:
             yield
         finally:
             with self._readers_lock:
-                self._readers.value -= 1
-                if self._readers.value == 0:
+                self._readers -= 1
+                if self._readers == 0:
                     self._resource_lock.release()
 
     @contextmanager
@@ -57,3 +64,116 @@ class TemplateAccessLock:
             yield
         finally:
             self._resource_lock.release()
+
+
+@dataclass
+class ScanQueueStats:
+    """Point-in-time view of the scan queue, for logs and monitoring."""
+
+    slots: int
+    running: int
+    queue_depth: int
+    running_per_group: dict
+    granted: int
+    last_wait_seconds: float
+    max_wait_seconds: float
+    average_wait_seconds: float
+
+    @property
+    def occupancy(self) -> float:
+        return self.running / self.slots
+
+
+@dataclass
+class _Waiter:
+    seq: int
+    cost: int
+    group: str
+    enqueued_at: float
+
+
+class ScanScheduler:
+    """Priority and fair-share queue for the Nuclei scan slots.
+
+    Replaces a plain semaphore, under which waiting scans were served in
+    arbitrary thread-wakeup order and one huge scan could hold back many small
+    ones. When a slot frees up, the waiting scan served next is, in order:
+
+    1. one that has waited longer than ``aging_seconds`` (oldest first), so a
+       large scan is delayed but never starved;
+    2. one from the group (scenario / simulation) with the fewest running
+       scans, so a single group cannot take every slot while others wait;
+    3. the cheapest one by estimated cost (targets x templates);
+    4. the earliest arrival.
+
+    Scans run in consumer threads of the injector process, so plain
+    ``threading`` primitives are enough here.
+    """
+
+    def __init__(self, slots: int, aging_seconds: float, clock=None):
+        self._slots = slots
+        self._aging_seconds = aging_seconds
+        self._clock = clock or time.monotonic
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiting: list[_Waiter] = []
+        self._running: dict[str, int] = {}
+        self._granted = 0
+        self._total_wait = 0.0
+        self._last_wait = 0.0
+        self._max_wait = 0.0
+
+    @contextmanager
+    def slot(self, cost: int, group: str):
+        """Wait for a scan slot; yields the seconds spent waiting."""
+        with self._cond:
+            waiter = _Waiter(next(self._seq), cost, group, self._clock())
+            self._waiting.append(waiter)
+            while not (
+                sum(self._running.values()) < self._slots
+                and self._next_waiter() is waiter
+            ):
+                self._cond.wait()
+            self._waiting.remove(waiter)
+            self._running[group] = self._running.get(group, 0) + 1
+            waited = self._clock() - waiter.enqueued_at
+            self._granted += 1
+            self._total_wait += waited
+            self._last_wait = waited
+            self._max_wait = max(self._max_wait, waited)
+            # Another slot may still be free for the next waiter in line.
+            self._cond.notify_all()
+        try:
+            yield waited
+        finally:
+            with self._cond:
+                self._running[group] -= 1
+                if not self._running[group]:
+                    del self._running[group]
+                self._cond.notify_all()
+
+    def _next_waiter(self) -> _Waiter:
+        now = self._clock()
+
+        def priority(waiter: _Waiter):
+            starving = now - waiter.enqueued_at >= self._aging_seconds
+            if starving:
+                return (0, 0, 0, waiter.seq)
+            return (1, self._running.get(waiter.group, 0), waiter.cost, waiter.seq)
+
+        return min(self._waiting, key=priority)
+
+    def stats(self) -> ScanQueueStats:
+        with self._cond:
+            return ScanQueueStats(
+                slots=self._slots,
+                running=sum(self._running.values()),
+                queue_depth=len(self._waiting),
+                running_per_group=dict(self._running),
+                granted=self._granted,
+                last_wait_seconds=self._last_wait,
+                max_wait_seconds=self._max_wait,
+                average_wait_seconds=(
+                    self._total_wait / self._granted if self._granted else 0.0
+                ),
+            )
@@ -0,0 +1,142 @@
+"""Live progress of running Nuclei scans, from their -stats-json output.
+
+With ``-stats -stats-json``, Nuclei prints a JSON statistics line to stderr
+every few seconds (requests sent / total, requests per second, errors,
+matches). ``ScanProgress`` picks those lines out of the stderr stream while
+the scan runs, aggregates them across the processes of a sharded scan, and
+hands a snapshot to a reporter at most once per interval - enough to tell a
+slow scan (requests keep going up) from a hung one (they do not).
+"""
+
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass
+class ScanStats:
+    percent: int
+    requests: int
+    total: int
+    rps: int
+    errors: int
+    matched: int
+    hosts: int
+    templates: int
+    elapsed_seconds: int
+
+
+def _int(value) -> int:
+    # Nuclei reports its counters as strings ("42") in some versions and as
+    # numbers in others.
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _seconds(duration) -> int:
+    # "h:mm:ss", as printed by Nuclei.
+    try:
+        seconds = 0
+        for part in str(duration).split(":"):
+            seconds = seconds * 60 + int(part)
+        return seconds
+    except ValueError:
+        return 0
+
+
+def parse_stats_line(line: bytes) -> Optional[ScanStats]:
+    """The statistics of a -stats-json line, or None for any other line."""
+    if not line.startswith(b"{") or b'"percent"' not in line:
+        return None
+    try:
+        j = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(j, dict):
+        return None
+    return ScanStats(
+        percent=_int(j.get("percent")),
+        requests=_int(j.get("requests")),
+        total=_int(j.get("total")),
+        rps=_int(j.get("rps")),
+        errors=_int(j.get("errors")),
+        matched=_int(j.get("matched")),
+        hosts=_int(j.get("hosts")),
+        templates=_int(j.get("templates")),
+        elapsed_seconds=_seconds(j.get("duration")),
+    )
+
+
+class ScanProgress:
+    """Aggregates the statistics of one scan and reports them, rate-limited.
+
+    ``handler(shard)`` returns the stderr line callback for one Nuclei process
+    of the scan. It returns True for the statistics lines it consumes, so they
+    stay out of the captured stderr (and of the stderr tail in logs and
+    errors). The first statistics are reported straight away, later ones at
+    most every ``interval`` seconds.
+    """
+
+    def __init__(
+        self, report: Callable[[ScanStats], None], interval: float, clock=None
+    ):
+        self._report = report
+        self._interval = interval
+        self._clock = clock or time.monotonic
+        self._lock = threading.Lock()
+        self._latest: dict[int, ScanStats] = {}
+        self._last_report = None
+
+    def handler(self, shard: int = 0) -> Callable[[bytes], bool]:
+        def on_stderr_line(line: bytes) -> bool:
+            stats = parse_stats_line(line)
+            if stats is None:
+                return False
+            self._update(shard, stats)
+            return True
+
+        return on_stderr_line
+
+    def summary(self) -> Optional[ScanStats]:
+        """Latest statistics of the whole scan, None if Nuclei sent none."""
+        with self._lock:
+            return self._aggregate() if self._latest else None
+
+    def _update(self, shard: int, stats: ScanStats) -> None:
+        with self._lock:
+            self._latest[shard] = stats
+            now = self._clock()
+            if (
+                self._last_report is not None
+                and now - self._last_report < self._interval
+            ):
+                return
+            self._last_report = now
+            snapshot = self._aggregate()
+        # Outside the lock: reporting calls the platform API, and the other
+        # shards keep reading their stderr meanwhile.
+        self._report(snapshot)
+
+    def _aggregate(self) -> ScanStats:
+        latest = list(self._latest.values())
+        if len(latest) == 1:
+            return latest[0]
+        requests = sum(s.requests for s in latest)
+        total = sum(s.total for s in latest)
+        return ScanStats(
+            percent=(
+                requests * 100 // total if total else min(s.percent for s in latest)
+            ),
+            requests=requests,
+            total=total,
+            rps=sum(s.rps for s in latest),
+            errors=sum(s.errors for s in latest),
+            matched=sum(s.matched for s in latest),
+            hosts=sum(s.hosts for s in latest),
+            templates=max(s.templates for s in latest),
+            elapsed_seconds=max(s.elapsed_seconds for s in latest),
+        )
@@ -0,0 +1,157 @@
+"""Per-inject work directories that let an interrupted scan be resumed.
+
+When a scan hits ``scan_timeout``, Nuclei is interrupted (SIGINT) instead of
+killed, which makes it write a resume file recording how far it got. The
+store keeps that file and the JSONL produced so far in a work directory named
+after the inject, so replaying the same inject - or the platform requeuing it -
+continues from the resume point (``-resume``) instead of starting over, and
+the final results include what the earlier attempts found.
+
+A scan is resumed at most ``max_attempts - 1`` times; state nobody came back
+for is removed after ``state_ttl`` seconds.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+# Nuclei logs the path of the resume file it writes when interrupted.
+_RESUME_FILE_LOG = re.compile(r"Creating resume file: (\S+)")
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+@dataclass
+class ResumeState:
+    """Where an inject's scan stands before the current attempt."""
+
+    directory: str
+    fingerprint: str
+    # 1-based number of the attempt about to run.
+    attempt: int
+    # Resume point left by the previous attempt, if any.
+    resume_file: Optional[str]
+    # JSONL collected by the previous attempts.
+    previous_stdout: str
+
+
+class ScanResumeStore:
+    RESUME_FILE = "resume.cfg"
+    OUTPUT_FILE = "output.jsonl"
+    STATE_FILE = "state.json"
+
+    def __init__(
+        self, work_directory: str, max_attempts: int, state_ttl: int, clock=None
+    ):
+        self._work_directory = work_directory
+        self._max_attempts = max_attempts
+        self._state_ttl = state_ttl
+        self._clock = clock or time.time
+        os.makedirs(work_directory, exist_ok=True)
+
+    @property
+    def max_attempts(self) -> int:
+        return self._max_attempts
+
+    @staticmethod
+    def fingerprint(*parts) -> str:
+        """Identity of a scan: resuming is only valid for the very same scan."""
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    def prepare(self, inject_id: str, fingerprint: str) -> ResumeState:
+        self.cleanup_stale()
+        directory = os.path.join(
+            self._work_directory, _SAFE_NAME.sub("_", str(inject_id))
+        )
+        state = self._read_state(directory)
+        if state is None or state.get("fingerprint") != fingerprint:
+            # First attempt, or the inject changed since (targets, templates,
+            # options): an old resume point would skip the wrong work.
+            shutil.rmtree(directory, ignore_errors=True)
+            os.makedirs(directory)
+            return ResumeState(directory, fingerprint, 1, None, "")
+
+        resume_file = os.path.join(directory, self.RESUME_FILE)
+        try:
+            with open(os.path.join(directory, self.OUTPUT_FILE)) as handle:
+                previous_stdout = handle.read()
+        except FileNotFoundError:
+            previous_stdout = ""
+        return ResumeState(
+            directory,
+            fingerprint,
+            state["attempts"] + 1,
+            resume_file if os.path.isfile(resume_file) else None,
+            previous_stdout,
+        )
+
+    def interrupted(self, state: ResumeState, stdout: str, stderr: str) -> bool:
+        """Keep what an interrupted attempt produced.
+
+        Returns True when a resume point was kept for a next attempt, False
+        when the scan cannot be resumed (no resume file was written, or the
+        attempts cap is reached) - its state is then dropped.
+        """
+        written_files = _RESUME_FILE_LOG.findall(stderr or "")
+        written = written_files[-1] if written_files else None
+
+        if (
+            written is None
+            or not os.path.isfile(written)
+            or state.attempt >= self._max_attempts
+        ):
+            if written is not None and os.path.isfile(written):
+                os.remove(written)
+            self.completed(state)
+            return False
+
+        os.replace(written, os.path.join(state.directory, self.RESUME_FILE))
+        with open(os.path.join(state.directory, self.OUTPUT_FILE), "a") as handle:
+            if stdout and not stdout.endswith("\n"):
+                stdout += "\n"
+            handle.write(stdout or "")
+        self._write_state(
+            state.directory,
+            {
+                "fingerprint": state.fingerprint,
+                "attempts": state.attempt,
+                "updated_at": self._clock(),
+            },
+        )
+        return True
+
+    def completed(self, state: ResumeState) -> None:
+        shutil.rmtree(state.directory, ignore_errors=True)
+
+    def cleanup_stale(self) -> None:
+        cutoff = self._clock() - self._state_ttl
+        for name in os.listdir(self._work_directory):
+            directory = os.path.join(self._work_directory, name)
+            if not os.path.isdir(directory):
+                continue
+            state = self._read_state(directory)
+            updated_at = (
+                state.get("updated_at", 0)
+                if state is not None
+                else os.path.getmtime(directory)
+            )
+            if updated_at < cutoff:
+                shutil.rmtree(directory, ignore_errors=True)
+
+    def _read_state(self, directory: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(directory, self.STATE_FILE)) as handle:
+                return json.load(handle)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_state(self, directory: str, state: dict) -> None:
+        path = os.path.join(directory, self.STATE_FILE)
+        with open(path + ".tmp", "w") as handle:
+            json.dump(state, handle)
+        os.replace(path + ".tmp", path)
@@ -0,0 +1,37 @@
+"""Split one scan's targets across several Nuclei processes.
+
+A single Nuclei process scans at most ``templates_parallelism`` templates x
+``hosts_parallelism_per_template`` hosts at a time, and a few slow hosts can
+hold up the whole run. In sharded mode the targets are dealt round-robin to up
+to ``scan_shards`` processes, each with its own JSONL stream, and
+``max_requests_per_second`` is split between them so the scan as a whole never
+sends more requests than configured.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass
+class Shard:
+    targets: list[str]
+    # Share of the scan's request-rate budget (-rate-limit) for this process.
+    rate_limit: int
+
+
+def plan_shards(
+    targets: list[str], shards: int, min_targets: int, rate_limit: int
+) -> list[Shard]:
+    """Deal the targets to at most ``shards`` shards of ``min_targets`` or more.
+
+    Small scans stay in one process: every process loads the whole template
+    set, which is not worth it for a handful of targets. Every shard gets at
+    least one request per second, so the rate budget also bounds the count.
+    """
+    count = max(1, min(shards, len(targets) // max(1, min_targets), rate_limit))
+    # Round-robin rather than contiguous slices: neighbouring targets (same
+    # subnet, same slow appliance) end up in different processes.
+    base_rate, extra_rate = divmod(rate_limit, count)
+    return [
+        Shard(targets[i::count], base_rate + (1 if i < extra_rate else 0))
+        for i in range(count)
+    ]
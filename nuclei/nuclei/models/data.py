@@ -28,6 +28,15 @@ class MessageData:
             if expectation.get("expectation_type")
         ]
 
+        # Scans are shared fairly between the simulations / scenarios the
+        # injects belong to; an inject played on its own is its own group.
+        injection = data["injection"]
+        self.scenario_key = (
+            injection.get("inject_exercise")
+            or injection.get("inject_scenario")
+            or self.inject_id
+        )
+
         # fallback
         self.raw_data = data
 
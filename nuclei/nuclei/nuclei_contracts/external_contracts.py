@@ -1,9 +1,10 @@
 import json
-import sched
 import subprocess
+import threading
 import time
 import uuid
-from multiprocessing import Process
+from dataclasses import dataclass
+from typing import Optional
 
 import requests
 from pyoaev.apis.inputs.search import (
@@ -14,13 +15,38 @@ from pyoaev.apis.inputs.search import (
 from pyoaev.client import OpenAEV
 from pyoaev.contracts.contract_config import ContractText
 from pyoaev.security_domain.types import SecurityDomains
-from pyoaev.utils import setup_logging_config
 
 from nuclei.helpers.nuclei_process import NucleiProcess
 from nuclei.nuclei_contracts.nuclei_contracts import NucleiContracts
 
+CVE_TEMPLATES_CATALOGUE_URL = "https://raw.githubusercontent.com/projectdiscovery/nuclei-templates/refs/heads/main/cves.json"
+
+
+@dataclass
+class MaintenanceRunReport:
+    """Outcome of one external contracts maintenance run."""
+
+    duration_seconds: float = 0.0
+    # Reconciled against every contract of the platform (first run, or after a
+    # failed / cancelled one) rather than applying the catalogue changes only.
+    full_sync: bool = False
+    catalogue_changed: bool = True
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    failed: int = 0
+    cancelled: bool = False
+
 
 class ExternalContractsScheduler:
+    """Runs the external contracts maintenance every ``period`` seconds.
+
+    The maintenance runs in the long-lived worker calling ``start()``, so the
+    manager keeps the CVE catalogue and the contract index warm between runs
+    and only applies what changed. ``stop()`` cancels the current run and
+    makes ``start()`` return.
+    """
+
     def __init__(
         self,
         api_client: OpenAEV,
@@ -30,33 +56,33 @@ class ExternalContractsScheduler:
         templates_lock=None,
         template_update_timeout=None,
     ):
-        self.scheduler = sched.scheduler(time.time, time.sleep)
+        self._stopped = threading.Event()
+        self._logger = logger
         self.manager = ExternalContractsManager(
             api_client,
             injector_id,
             logger,
             templates_lock=templates_lock,
             template_update_timeout=template_update_timeout,
+            cancel_event=self._stopped,
         )
         self._period = period
 
+    @property
+    def last_run(self) -> Optional[MaintenanceRunReport]:
+        return self.manager.last_run
+
     def start(self):
-        self.scheduler.enter(
-            delay=0,
-            priority=1,
-            action=self.__schedule,
-            argument=(self.scheduler, self.manager.spawn_process, self._period),
-        )
-        self.scheduler.run()
-
-    def __schedule(self, scheduler, callback, delay):
-        callback()
-        scheduler.enter(
-            delay=delay,
-            priority=1,
-            action=self.__schedule,
-            argument=(scheduler, callback, delay),
-        )
+        while not self._stopped.is_set():
+            try:
+                self.manager.manage_contracts()
+            except Exception as e:
+                # e.g. the catalogue cannot be downloaded: try again next period.
+                self._logger.error(f"External contracts maintenance failed: {e}")
+            self._stopped.wait(self._period)
+
+    def stop(self):
+        self._stopped.set()
 
 
 class ExternalContractsManager:
@@ -67,89 +93,144 @@ class ExternalContractsManager:
         logger,
         templates_lock=None,
         template_update_timeout=None,
+        cancel_event: Optional[threading.Event] = None,
     ):
         self._api_client = api_client
         self._injector_id = injector_id
         self._logger = logger
-        # TemplateAccessLock shared with the scan path (fork-inherited by the
-        # child process spawn_process creates). None means "no coordination"
-        # (unit tests / standalone use).
+        # TemplateAccessLock shared with the scan path. None means "no
+        # coordination" (unit tests / standalone use).
         self._templates_lock = templates_lock
         # Hard ceiling for the update subprocess so a hung refresh cannot hold
         # the writer lock (and block every scan) forever. None means no ceiling.
         self._template_update_timeout = template_update_timeout
+        self._cancel_event = cancel_event or threading.Event()
+        self._session = requests.Session()
+        # Warm state between runs: the catalogue as last applied (external id
+        # -> template metadata) with its ETag, and this injector's contracts on
+        # the platform (external id -> contract). A None index forces a full
+        # reconciliation on the next run.
+        self._catalogue: dict[str, dict] = {}
+        self._catalogue_etag = None
+        self._contracts: Optional[dict[str, dict]] = None
+        self.last_run: Optional[MaintenanceRunReport] = None
 
-    def spawn_process(self):
-        process = Process(target=self.manage_contracts)
-        process.start()
-        process.join()
-
-    def manage_contracts(self):
-        # unfortunately, need to reenable module-level configs in spawned process
-        setup_logging_config(self._logger.log_level, self._logger.json_logging)
-
+    def manage_contracts(self) -> MaintenanceRunReport:
+        started = time.monotonic()
+        report = MaintenanceRunReport(full_sync=self._contracts is None)
         self._logger.info("Start maintaining external contracts in the background...")
         self._update_templates()
-        cve_templates_metadata = self.fetch_nuclei_cve_templates_list()
-        current_contracts = self.fetch_all_current_contracts()
-
-        for template in cve_templates_metadata:
-            found = False
-            for contract in current_contracts:
-                if contract[
-                    "injector_contract_external_id"
-                ] == self.theoretical_external_id(template):
-                    current_contracts.remove(contract)
-                    try:
-                        self._logger.info(
-                            "Updating external contract: {}".format(
-                                contract["injector_contract_external_id"]
-                            )
-                        )
-                        self._api_client.injector_contract.update(
-                            contract["injector_contract_external_id"],
-                            self.make_contract_update(
-                                contract["injector_contract_id"], template
-                            ),
-                        )
-                    except Exception as e:
-                        self._logger.error(e)
-                    finally:
-                        # we found a match and updated it (or an error occurred)
-                        # therefore we should exit the inner loop
-                        found = True
-                        break
-            # when we exit the above inner loop, we need to check
-            # whether we had a match or not
-            if not found:
-                try:
-                    self._logger.info(
-                        "Creating external contract: {}".format(
-                            self.theoretical_external_id(template)
-                        )
-                    )
-                    self._api_client.injector_contract.create(
-                        self.make_contract_create(str(uuid.uuid4()), template)
-                    )
-                except Exception as e:
-                    self._logger.error(e)
-        contracts_to_delete = current_contracts
+        templates, etag = self.fetch_nuclei_cve_templates_list(
+            None if report.full_sync else self._catalogue_etag
+        )
+        if templates is None:
+            # Not modified since the last applied catalogue.
+            report.catalogue_changed = False
+            catalogue = self._catalogue
+        else:
+            catalogue = {
+                self.theoretical_external_id(template): template
+                for template in templates
+            }
 
-        for contract in contracts_to_delete:
-            try:
-                self._logger.info(
-                    "Deleting external contract: {}".format(
-                        contract["injector_contract_external_id"]
-                    )
+        if report.full_sync:
+            # Built aside so a failed fetch leaves the index None and the next
+            # run reconciles fully instead of recreating every contract.
+            contracts = {}
+            to_upsert = list(catalogue.values())
+            to_delete = []
+            for contract in self.fetch_all_current_contracts():
+                external_id = contract["injector_contract_external_id"]
+                if external_id in catalogue and external_id not in contracts:
+                    contracts[external_id] = contract
+                else:
+                    to_delete.append(external_id)
+            self._contracts = contracts
+        else:
+            # Only what changed since the last run: the contracts of unchanged
+            # templates are already up to date on the platform.
+            to_upsert = [
+                template
+                for external_id, template in catalogue.items()
+                if self._catalogue.get(external_id) != template
+            ]
+            to_delete = [
+                external_id
+                for external_id in self._contracts
+                if external_id not in catalogue
+            ]
+
+        for template in to_upsert:
+            if self._cancelled(report):
+                break
+            self._upsert_contract(template, report)
+        for external_id in to_delete:
+            if self._cancelled(report):
+                break
+            self._delete_contract(external_id, report)
+
+        if report.failed or report.cancelled:
+            # The platform may not match the index any more: reconcile fully
+            # next time.
+            self._contracts = None
+        else:
+            self._catalogue = catalogue
+            self._catalogue_etag = etag
+        report.duration_seconds = time.monotonic() - started
+        self.last_run = report
+        self._logger.info(
+            "Done maintaining external contracts in the background in "
+            f"{report.duration_seconds:.1f}s "
+            f"({'full sync' if report.full_sync else 'incremental'}, catalogue "
+            f"{'changed' if report.catalogue_changed else 'unchanged'}): "
+            f"{report.created} created, {report.updated} updated, "
+            f"{report.deleted} deleted, {report.failed} failed"
+            + (", cancelled" if report.cancelled else "")
+            + "."
+        )
+        return report
+
+    def _cancelled(self, report: MaintenanceRunReport) -> bool:
+        report.cancelled = self._cancel_event.is_set()
+        return report.cancelled
+
+    def _upsert_contract(self, template, report: MaintenanceRunReport):
+        external_id = self.theoretical_external_id(template)
+        contract = self._contracts.get(external_id)
+        try:
+            if contract is not None:
+                self._logger.info("Updating external contract: {}".format(external_id))
+                self._api_client.injector_contract.update(
+                    external_id,
+                    self.make_contract_update(
+                        contract["injector_contract_id"], template
+                    ),
                 )
-                self._api_client.injector_contract.delete(
-                    contract["injector_contract_external_id"]
+                report.updated += 1
+            else:
+                self._logger.info("Creating external contract: {}".format(external_id))
+                contract_id = str(uuid.uuid4())
+                self._api_client.injector_contract.create(
+                    self.make_contract_create(contract_id, template)
                 )
-            except Exception as e:
-                self._logger.error(e)
-                continue
+                self._contracts[external_id] = {
+                    "injector_contract_id": contract_id,
+                    "injector_contract_external_id": external_id,
+                }
+                report.created += 1
+        except Exception as e:
+            self._logger.error(e)
+            report.failed += 1
 
-        self._logger.info("Done maintaining external contracts in the background.")
+    def _delete_contract(self, external_id, report: MaintenanceRunReport):
+        try:
+            self._logger.info("Deleting external contract: {}".format(external_id))
+            self._api_client.injector_contract.delete(external_id)
+            self._contracts.pop(external_id, None)
+            report.deleted += 1
+        except Exception as e:
+            self._logger.error(e)
+            report.failed += 1
 
     def make_contract_create(self, contract_id, template):
         return self._make_contract(contract_id, template).to_contract_add_input(
@@ -199,13 +280,24 @@ class ExternalContractsManager:
     def theoretical_external_id(self, cve_template_metadata):
         return "{}_{}".format(self.external_id_prefix(), cve_template_metadata["ID"])
 
-    def fetch_nuclei_cve_templates_list(self):
-        response = requests.Session().get(
-            "https://raw.githubusercontent.com/projectdiscovery/nuclei-templates/refs/heads/main/cves.json"
+    def fetch_nuclei_cve_templates_list(self, etag=None):
+        """The CVE templates catalogue and its ETag.
+
+        With the ETag of the catalogue already held, the download is
+        conditional and (None, etag) is returned when it did not change.
+        """
+        response = self._session.get(
+            CVE_TEMPLATES_CATALOGUE_URL,
+            headers={"If-None-Match": etag} if etag else None,
+            timeout=60,
         )
+        if etag and response.status_code == 304:
+            return None, etag
         response.raise_for_status()
         # response is not json, but a file with one serialised json object per line
-        return [json.loads(line) for line in response.iter_lines()]
+        return [json.loads(line) for line in response.iter_lines()], (
+            response.headers.get("ETag")
+        )
 
     def fetch_all_current_contracts(self):
         contracts = []
@@ -1,7 +1,9 @@
 import json
+import os
+import signal
 import subprocess
-import threading
 import time
+from dataclasses import asdict
 from typing import Dict, Optional
 
 from pyoaev.helpers import OpenAEVConfigHelper, OpenAEVInjectorHelper
@@ -19,7 +21,11 @@ from nuclei.configuration.config_loader import ConfigLoader
 from nuclei.helpers.nuclei_command_builder import NucleiCommandBuilder
 from nuclei.helpers.nuclei_output_parser import NucleiOutputParser
 from nuclei.helpers.nuclei_process import NucleiProcess
-from nuclei.helpers.scan_coordination import TemplateAccessLock
+from nuclei.helpers.nuclei_result_cache import NucleiResultCache
+from nuclei.helpers.scan_coordination import ScanScheduler, TemplateAccessLock
+from nuclei.helpers.scan_progress import ScanProgress, ScanStats
+from nuclei.helpers.scan_resume import ScanResumeStore
+from nuclei.helpers.scan_sharding import plan_shards
 from nuclei.models.data import MessageData
 from nuclei.nuclei_contracts.external_contracts import ExternalContractsScheduler
 
@@ -42,6 +48,11 @@ SECURITY_PLATFORM_LOGO_PATH = "nuclei/img/nuclei.jpg"
 _STDERR_LOG_TAIL = 2000
 
 
+def _targets_input(targets: list[str]) -> bytes:
+    """Targets as fed to Nuclei on stdin, one per line."""
+    return ("\n".join(targets) + "\n").encode("utf-8")
+
+
 def _decode(raw: Optional[bytes]) -> str:
     """Best-effort decode of captured subprocess output for logging/errors."""
     return (raw or b"").decode("utf-8", "replace").strip()
@@ -66,12 +77,36 @@ class OpenAEVNuclei:
 
         # The consumer spawns one thread per inject, so a burst of injects would
         # otherwise start an unbounded number of Nuclei subprocesses at once.
-        # Extra scans wait for a slot instead.
+        # Extra scans wait for a slot instead, served by cost and fair share.
         max_scans = max(1, int(self.config_loader.nuclei.max_concurrent_scans))
-        self._scan_slots = threading.BoundedSemaphore(max_scans)
+        self._scan_scheduler = ScanScheduler(
+            max_scans,
+            aging_seconds=int(self.config_loader.nuclei.scan_queue_aging_seconds),
+        )
         # Readers-writer lock shared with the template refresh: scans read the
         # templates directory, the refresh rewrites it. See scan_coordination.
         self._templates_lock = TemplateAccessLock()
+        # Optional (template, host) verdict cache so recurring scans skip the
+        # checks recently answered. See nuclei_result_cache.
+        self._result_cache = None
+        if self.config_loader.nuclei.result_cache_enabled:
+            self._result_cache = NucleiResultCache(
+                path=self.config_loader.nuclei.result_cache_path,
+                ttl=self.config_loader.nuclei.result_cache_ttl,
+                templates_directory=self.config_loader.nuclei.templates_directory,
+            )
+        # Optional per-inject work directories so a scan interrupted by
+        # scan_timeout is resumed instead of restarted. See scan_resume.
+        self._resume_store = None
+        if self.config_loader.nuclei.scan_resume_enabled:
+            self._resume_store = ScanResumeStore(
+                work_directory=self.config_loader.nuclei.work_directory,
+                max_attempts=self.config_loader.nuclei.scan_resume_max_attempts,
+                state_ttl=self.config_loader.nuclei.scan_resume_state_ttl,
+            )
+        # Long-lived worker running the external contracts maintenance, set by
+        # start() and cancelled by stop().
+        self._contracts_scheduler: Optional[ExternalContractsScheduler] = None
 
     def nuclei_execution(
         self,
@@ -86,11 +121,31 @@ class OpenAEVNuclei:
             content=msg_data.inject_content,
             targets=targets,
         )
+        cache_plan = self._plan_from_cache(msg_data, nuclei_builder, targets)
+        if cache_plan is not None:
+            nuclei_builder.exclude_template_ids(cache_plan.excluded_template_ids)
+            targets = cache_plan.targets
+        resume = None
+        if self._resume_store is not None and targets:
+            resume = self._resume_store.prepare(
+                msg_data.inject_id,
+                ScanResumeStore.fingerprint(nuclei_builder.selection_key(), targets),
+            )
+            nuclei_builder.resume_from(resume.resume_file)
         nuclei_args = nuclei_builder.build()
+        # A resumable scan stays in one process: Nuclei's resume file only
+        # covers the process that wrote it.
+        shards = self._plan_shards(targets) if resume is None else []
 
         self.helper.injector_logger.info(
             "Executing nuclei with: " + " ".join(nuclei_args)
         )
+        if len(shards) > 1:
+            self.helper.injector_logger.info(
+                f"Nuclei scan for inject {msg_data.inject_id} split across "
+                f"{len(shards)} processes (up to {len(shards[0].targets)} targets "
+                f"and {shards[0].rate_limit} requests/s each)"
+            )
 
         callback_data = {
             "execution_message": Targets.build_execution_message(
@@ -118,16 +173,58 @@ class OpenAEVNuclei:
             start=start,
         )
 
-        input_data = ("\n".join(targets) + "\n").encode("utf-8")
+        if cache_plan is not None and cache_plan.skips_scan:
+            self.helper.injector_logger.info(
+                f"Every target of inject {msg_data.inject_id} was answered by the "
+                "result cache; Nuclei was not run."
+            )
+            return self.parser.parse(
+                "",
+                msg_data.target_results.ip_to_asset_id_map,
+                cached_lines=cache_plan.cached_lines,
+            )
+
+        input_data = _targets_input(targets)
         scan_timeout = self.config_loader.nuclei.scan_timeout
+        progress = self._scan_progress(msg_data, start)
+        on_stderr_line = progress.handler() if progress else None
         try:
             # Bound concurrency (one slot per running Nuclei subprocess) and take
             # the reader side of the templates lock so a scan never overlaps the
             # periodic refresh rewriting the templates directory.
-            with self._scan_slots, self._templates_lock.read():
-                result = NucleiProcess.nuclei_execute(
-                    nuclei_args, input_data, timeout=scan_timeout
-                )
+            with self._scan_scheduler.slot(
+                cost=nuclei_builder.estimated_cost(targets), group=msg_data.scenario_key
+            ) as waited, self._templates_lock.read():
+                self._log_scan_queue(msg_data, waited)
+                if resume is not None:
+                    result = NucleiProcess.nuclei_execute_interruptible(
+                        nuclei_args,
+                        input_data,
+                        timeout=scan_timeout,
+                        grace=self.config_loader.nuclei.scan_interrupt_grace_seconds,
+                        on_stderr_line=on_stderr_line,
+                    )
+                elif len(shards) > 1:
+                    result = NucleiProcess.nuclei_execute_sharded(
+                        [
+                            nuclei_builder.limit_rate(shard.rate_limit).build()
+                            for shard in shards
+                        ],
+                        [_targets_input(shard.targets) for shard in shards],
+                        timeout=scan_timeout,
+                        stderr_handlers=(
+                            [progress.handler(i) for i in range(len(shards))]
+                            if progress
+                            else None
+                        ),
+                    )
+                else:
+                    result = NucleiProcess.nuclei_execute(
+                        nuclei_args,
+                        input_data,
+                        timeout=scan_timeout,
+                        on_stderr_line=on_stderr_line,
+                    )
         except subprocess.TimeoutExpired as exc:
             # A hung scan must not block the consumer forever: Nuclei's own
             # -timeout is per-request, so only this ceiling bounds the whole run.
@@ -140,6 +237,8 @@ class OpenAEVNuclei:
                 f"{msg_data.inject_id} and was terminated. Nuclei stderr tail: "
                 f"{stderr_tail[-_STDERR_LOG_TAIL:] or '<none>'}"
             )
+            if resume is not None:
+                return self._interrupted_result(msg_data, resume, exc, cache_plan)
             raise RuntimeError(
                 f"Nuclei scan timed out after {scan_timeout} seconds and was "
                 "terminated before completion. Reduce the scan scope (tags / "
@@ -158,6 +257,8 @@ class OpenAEVNuclei:
                 f"Nuclei exited with code {exc.returncode}: "
                 f"{stderr_tail[-_STDERR_LOG_TAIL:] or 'no stderr output'}"
             ) from exc
+        finally:
+            self._log_scan_statistics(msg_data, progress)
 
         # Nuclei writes its runtime progress and warnings to stderr; log it so a
         # completed scan is no longer silent between "Executing nuclei with ..."
@@ -170,10 +271,152 @@ class OpenAEVNuclei:
                 f"{stderr_tail[-_STDERR_LOG_TAIL:]}"
             )
 
+        stdout = result.stdout.decode("utf-8")
+        if resume is not None:
+            # Earlier attempts' findings are part of this scan's results.
+            stdout = resume.previous_stdout + stdout
+            self._resume_store.completed(resume)
+        if cache_plan is not None:
+            self._record_in_cache(msg_data, stdout, cache_plan)
+
         return self.parser.parse(
-            result.stdout.decode("utf-8"), msg_data.target_results.ip_to_asset_id_map
+            stdout,
+            msg_data.target_results.ip_to_asset_id_map,
+            cached_lines=cache_plan.cached_lines if cache_plan else None,
+        )
+
+    def _interrupted_result(self, msg_data, resume, exc, cache_plan) -> Dict:
+        # Keep what the interrupted scan found: report it as a partial result
+        # and leave a resume point for the next attempt when allowed. Partial
+        # runs are never recorded in the result cache: a template that did not
+        # get to run would be remembered as "no match".
+        stdout = (exc.stdout or b"").decode("utf-8", "replace")
+        resumable = self._resume_store.interrupted(
+            resume, stdout, (exc.stderr or b"").decode("utf-8", "replace")
+        )
+        result = self.parser.parse(
+            resume.previous_stdout + stdout,
+            msg_data.target_results.ip_to_asset_id_map,
+            cached_lines=cache_plan.cached_lines if cache_plan else None,
+        )
+        attempts = f"attempt {resume.attempt}/{self._resume_store.max_attempts}"
+        if resumable:
+            outcome = (
+                f"interrupted at scan_timeout ({attempts}); partial results kept. "
+                "Play the inject again to resume the scan where it stopped."
+            )
+        else:
+            outcome = (
+                f"interrupted at scan_timeout ({attempts}) and cannot be resumed; "
+                "partial results kept. Reduce the scan scope or raise "
+                "NUCLEI_SCAN_TIMEOUT."
+            )
+        result["message"] = f"Nuclei scan {outcome} {result['message']}"
+        result["partial"] = True
+        return result
+
+    def _scan_progress(self, msg_data, start) -> Optional[ScanProgress]:
+        # Live progress from Nuclei's -stats-json output (see scan_progress).
+        if not self.config_loader.nuclei.scan_progress_enabled:
+            return None
+        return ScanProgress(
+            lambda stats: self._report_progress(msg_data, start, stats),
+            interval=int(self.config_loader.nuclei.scan_progress_interval),
+        )
+
+    def _report_progress(self, msg_data, start, stats: ScanStats) -> None:
+        message = (
+            f"Nuclei scan in progress: {stats.percent}% done ({stats.requests}/"
+            f"{stats.total} requests, {stats.rps} requests/s, {stats.errors} "
+            f"errors, {stats.matched} matched)"
+        )
+        # Logged with the statistics as attributes: the JSON logs double as
+        # metrics to tune the rate limits from.
+        self.helper.injector_logger.info(
+            f"{message} for inject {msg_data.inject_id}",
+            meta={"inject_id": msg_data.inject_id, **asdict(stats)},
+        )
+        try:
+            self.helper.api.inject.execution_callback(
+                inject_id=msg_data.inject_id,
+                data={
+                    "execution_message": message,
+                    "execution_status": "INFO",
+                    "execution_duration": int(time.time() - start),
+                    "execution_action": "command_execution",
+                },
+            )
+        except Exception as exc:  # noqa: BLE001
+            # Progress is best-effort: never fail (or stall) the scan for it.
+            self.helper.injector_logger.error(
+                f"Failed to send progress trace for inject {msg_data.inject_id}: "
+                f"{exc}"
+            )
+
+    def _log_scan_statistics(self, msg_data, progress) -> None:
+        stats = progress.summary() if progress else None
+        if stats is None:
+            return
+        self.helper.injector_logger.info(
+            f"Nuclei scan statistics for inject {msg_data.inject_id}: "
+            f"{stats.requests}/{stats.total} requests in {stats.elapsed_seconds}s "
+            f"({stats.rps} requests/s), {stats.errors} errors, "
+            f"{stats.matched} matched",
+            meta={"inject_id": msg_data.inject_id, **asdict(stats)},
+        )
+
+    def _plan_shards(self, targets):
+        nuclei_config = self.config_loader.nuclei
+        return plan_shards(
+            targets,
+            shards=int(nuclei_config.scan_shards),
+            min_targets=int(nuclei_config.scan_shard_min_targets),
+            rate_limit=int(nuclei_config.max_requests_per_second),
         )
 
+    def _log_scan_queue(self, msg_data, waited) -> None:
+        stats = self._scan_scheduler.stats()
+        self.helper.injector_logger.info(
+            f"Nuclei scan for inject {msg_data.inject_id} got a slot after "
+            f"{waited:.1f}s (slots used {stats.running}/{stats.slots}, "
+            f"{stats.queue_depth} scan(s) waiting, average wait "
+            f"{stats.average_wait_seconds:.1f}s, max wait "
+            f"{stats.max_wait_seconds:.1f}s)"
+        )
+
+    def _plan_from_cache(self, msg_data, nuclei_builder, targets):
+        # The cache is an optimisation: if it cannot be read, scan everything.
+        if self._result_cache is None:
+            return None
+        try:
+            cache_plan = self._result_cache.plan(
+                targets,
+                scope=nuclei_builder.selection_key(),
+                template=nuclei_builder.single_template(),
+            )
+        except Exception as err:
+            self.helper.injector_logger.warning(
+                f"Nuclei result cache unavailable for inject {msg_data.inject_id}, "
+                "scanning every check: " + str(err)
+            )
+            return None
+        self.helper.injector_logger.info(
+            f"Nuclei result cache for inject {msg_data.inject_id}: "
+            f"{len(targets) - len(cache_plan.targets)} target(s) and "
+            f"{len(cache_plan.excluded_template_ids)} template(s) answered, "
+            f"{len(cache_plan.cached_lines)} cached finding(s) merged."
+        )
+        return cache_plan
+
+    def _record_in_cache(self, msg_data, stdout, cache_plan) -> None:
+        try:
+            self._result_cache.record(stdout, cache_plan)
+        except Exception as err:
+            self.helper.injector_logger.warning(
+                f"Could not store Nuclei results of inject {msg_data.inject_id} "
+                "in the result cache: " + str(err)
+            )
+
     def _report_pre_execution_failure(
         self, data: Dict, start: float, err: Exception
     ) -> None:
@@ -268,7 +511,9 @@ class OpenAEVNuclei:
                 execution_result = self.nuclei_execution(start, msg_data)
                 execution_message = execution_result.get("message")
                 execution_result_outputs = execution_result.get("outputs")
-                execution_status = "SUCCESS"
+                execution_status = (
+                    "PARTIAL" if execution_result.get("partial") else "SUCCESS"
+                )
             except Exception as e:
                 execution_message = str(e)
                 execution_status = "ERROR"
@@ -394,7 +639,7 @@ class OpenAEVNuclei:
         self._register_security_platform()
         self._ensure_templates_ready()
         self.helper.listen(message_callback=self.process_message)
-        ExternalContractsScheduler(
+        self._contracts_scheduler = ExternalContractsScheduler(
             self.helper.api,
             self.config.get_conf("injector_id"),
             self.config.get_conf(
@@ -403,8 +648,26 @@ class OpenAEVNuclei:
             self.helper.injector_logger,
             templates_lock=self._templates_lock,
             template_update_timeout=self.config_loader.nuclei.template_update_timeout,
-        ).start()
+        )
+        # The container is stopped with SIGTERM: the maintenance run in
+        # progress is cancelled between two contract changes rather than
+        # killed in the middle of one, and start() returns.
+        previous_handler = signal.signal(
+            signal.SIGTERM, lambda signum, frame: self.stop()
+        )
+        try:
+            self._contracts_scheduler.start()
+        finally:
+            self.stop()
+            signal.signal(signal.SIGTERM, previous_handler)
+
+    def stop(self) -> None:
+        """Cancel the external contracts maintenance and make start() return."""
+        if self._contracts_scheduler is not None:
+            self._contracts_scheduler.stop()
 
 
 if __name__ == "__main__":
     OpenAEVNuclei().start()
+    # Stopped: end the consumer threads too, as SIGTERM used to.
+    os._exit(0)
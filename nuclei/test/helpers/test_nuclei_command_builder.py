@@ -31,6 +31,7 @@ def nuclei_configs():
     config.exclude_type = ["headless"]
     config.exclude_severity = ["info"]
     config.disable_interactsh = False
+    config.scan_progress_enabled = False
     return config
 
 
@@ -149,3 +150,151 @@ def test_nuclei_builder_omits_no_interactsh_by_default(nuclei_configs):
     ).build()
 
     assert "-no-interactsh" not in nuclei_args
+
+
+def test_nuclei_builder_excludes_cached_template_ids(nuclei_configs):
+    nuclei_args = (
+        NucleiCommandBuilder(
+            nuclei_configs=nuclei_configs,
+            contract_id=CVE_SCAN_CONTRACT,
+            content={},
+            targets=["http://example.com"],
+        )
+        .exclude_template_ids(["tpl-a", "tpl-b"])
+        .build()
+    )
+
+    assert nuclei_args == BASE_ARGS + [
+        "-tags",
+        "cve",
+        "-exclude-id",
+        "tpl-a,tpl-b",
+        "-jsonl",
+    ]
+
+
+@pytest.mark.parametrize(
+    "contract_id, content, expected",
+    [
+        (TEMPLATE_SCAN_CONTRACT, {"template": "cves/1.yaml"}, "cves/1.yaml"),
+        ("external-contract", {"template": "cves/1.yaml"}, "cves/1.yaml"),
+        (TEMPLATE_SCAN_CONTRACT, {}, None),
+        (HTTP_SCAN_CONTRACT, {"template": "cves/1.yaml"}, None),
+        (
+            TEMPLATE_SCAN_CONTRACT,
+            {"template": "cves/1.yaml", "options": "-severity high"},
+            None,
+        ),
+        (
+            TEMPLATE_SCAN_CONTRACT,
+            {"template": "cves/1.yaml", "template_path": "cves/2.yaml"},
+            None,
+        ),
+    ],
+)
+def test_nuclei_builder_single_template(nuclei_configs, contract_id, content, expected):
+    # Only a scan whose template is known up front may record "no match"
+    # verdicts in the result cache.
+    builder = NucleiCommandBuilder(
+        nuclei_configs=nuclei_configs,
+        contract_id=contract_id,
+        content=content,
+        targets=["http://example.com"],
+    )
+
+    assert builder.single_template() == expected
+
+
+def test_nuclei_builder_selection_key_depends_on_selection(nuclei_configs):
+    def key(contract_id, content):
+        return NucleiCommandBuilder(
+            nuclei_configs=nuclei_configs,
+            contract_id=contract_id,
+            content=content,
+            targets=[],
+        ).selection_key()
+
+    assert key(CVE_SCAN_CONTRACT, {}) == key(CVE_SCAN_CONTRACT, {})
+    assert key(CVE_SCAN_CONTRACT, {}) != key(PANEL_SCAN_CONTRACT, {})
+    assert key(CVE_SCAN_CONTRACT, {}) != key(CVE_SCAN_CONTRACT, {"options": "-s"})
+
+
+def test_nuclei_builder_estimated_cost(nuclei_configs):
+    def cost(contract_id, content, targets):
+        return NucleiCommandBuilder(
+            nuclei_configs=nuclei_configs,
+            contract_id=contract_id,
+            content=content,
+            targets=targets,
+        ).estimated_cost()
+
+    single = cost(TEMPLATE_SCAN_CONTRACT, {"template": "cves/1.yaml"}, ["a", "b"])
+    tagged = cost(XSS_SCAN_CONTRACT, {}, ["a", "b"])
+    everything = cost(TEMPLATE_SCAN_CONTRACT, {}, ["a", "b"])
+
+    assert single == 2
+    assert single < tagged < everything
+    assert cost(XSS_SCAN_CONTRACT, {}, ["a"]) * 2 == tagged
+
+
+def test_nuclei_builder_estimated_cost_counts_what_is_left_to_scan(nuclei_configs):
+    builder = NucleiCommandBuilder(
+        nuclei_configs=nuclei_configs,
+        contract_id=XSS_SCAN_CONTRACT,
+        content={},
+        targets=["a", "b", "c"],
+    )
+    full = builder.estimated_cost()
+
+    builder.exclude_template_ids(["xss-1", "xss-2"])
+
+    per_target = NucleiCommandBuilder.TEMPLATE_COUNT_ESTIMATE["xss"] - 2
+    assert builder.estimated_cost(["a"]) == per_target
+    assert builder.estimated_cost() == 3 * per_target < full
+
+
+def test_nuclei_builder_resumes_from_resume_file(nuclei_configs):
+    nuclei_args = (
+        NucleiCommandBuilder(
+            nuclei_configs=nuclei_configs,
+            contract_id=CVE_SCAN_CONTRACT,
+            content={},
+            targets=["http://example.com"],
+        )
+        .resume_from("/work/inject/resume.cfg")
+        .build()
+    )
+
+    assert nuclei_args == BASE_ARGS + [
+        "-tags",
+        "cve",
+        "-resume",
+        "/work/inject/resume.cfg",
+        "-jsonl",
+    ]
+
+
+def test_nuclei_builder_limit_rate_overrides_configured_rate(nuclei_configs):
+    builder = NucleiCommandBuilder(
+        nuclei_configs=nuclei_configs,
+        contract_id=CVE_SCAN_CONTRACT,
+        content={},
+        targets=["http://example.com"],
+    )
+
+    nuclei_args = builder.limit_rate(7).build()
+
+    assert nuclei_args[nuclei_args.index("-rate-limit") + 1] == "7"
+
+
+def test_nuclei_builder_adds_stats_flags_when_progress_enabled(nuclei_configs):
+    nuclei_configs.scan_progress_enabled = True
+
+    nuclei_args = NucleiCommandBuilder(
+        nuclei_configs=nuclei_configs,
+        contract_id=CVE_SCAN_CONTRACT,
+        content={},
+        targets=["http://example.com"],
+    ).build()
+
+    assert nuclei_args[-3:] == ["-stats", "-stats-json", "-jsonl"]
@@ -132,3 +132,69 @@ class NucleiOutputParserTest(TestCase):
     def test_action_output_absent_for_blank_stdout(self):
         result = parser.parse("   \n  ", {})
         self.assertNotIn("action_output", result["outputs"])
+
+    # ----------------------------------------------------------------
+    # cached_lines: matches remembered by the result cache are merged into
+    # "cve" and marked, without touching "others" or "action_output".
+    # ----------------------------------------------------------------
+
+    def test_cached_lines_are_merged_and_marked(self):
+        live = json.dumps(
+            {
+                "matcher-status": True,
+                "info": {
+                    "classification": {"cve-id": ["CVE-2021-1234"]},
+                    "severity": "high",
+                },
+                "host": "host1",
+            }
+        )
+        cached = json.dumps(
+            {
+                "matcher-status": True,
+                "info": {
+                    "classification": {"cve-id": ["CVE-2020-0001"]},
+                    "severity": "low",
+                },
+                "host": "host2",
+            }
+        )
+        result = parser.parse(live, {"host2": "asset2"}, cached_lines=[cached])
+
+        self.assertEqual(
+            result["outputs"]["cve"],
+            [
+                {
+                    "id": "CVE-2021-1234",
+                    "asset_id": [""],
+                    "host": ["host1"],
+                    "severity": "high",
+                },
+                {
+                    "id": "CVE-2020-0001",
+                    "asset_id": ["asset2"],
+                    "host": ["host2"],
+                    "severity": "low",
+                    "cached": True,
+                },
+            ],
+        )
+        self.assertEqual(result["outputs"]["action_output"], live)
+        self.assertEqual(result["outputs"]["others"], [])
+        self.assertIn("(1 from cache)", result["message"])
+
+    def test_cached_only_results_without_stdout(self):
+        cached = json.dumps(
+            {
+                "matcher-status": True,
+                "info": {
+                    "classification": {"cve-id": ["CVE-2020-0001"]},
+                    "severity": "low",
+                },
+                "host": "host2",
+            }
+        )
+        result = parser.parse("", {}, cached_lines=[cached])
+
+        self.assertTrue(result["outputs"]["cve"][0]["cached"])
+        self.assertNotIn("action_output", result["outputs"])
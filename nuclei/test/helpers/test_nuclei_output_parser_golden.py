@@ -0,0 +1,46 @@
+"""Golden outputs of NucleiOutputParser.
+
+Each file under golden/ holds a Nuclei stdout (and result-cache lines) with the
+exact result the parser returned for it before its fast path was introduced.
+The parser must keep producing them byte for byte: message, ordering of the
+grouped CVEs and of "others", and action_output included.
+"""
+
+import json
+import pathlib
+
+import pytest
+
+from nuclei.helpers.nuclei_output_parser import NucleiOutputParser
+
+GOLDEN_DIR = pathlib.Path(__file__).parent / "golden"
+
+
+@pytest.mark.parametrize(
+    "golden", sorted(GOLDEN_DIR.glob("*.json")), ids=lambda path: path.stem
+)
+def test_parser_matches_golden_output(golden):
+    case = json.loads(golden.read_text())
+    kwargs = {}
+    if "cached_lines" in case:
+        kwargs["cached_lines"] = case["cached_lines"]
+
+    result = NucleiOutputParser().parse(
+        case["stdout"], case["ip_to_asset_id_map"], **kwargs
+    )
+
+    assert json.dumps(result, sort_keys=False) == json.dumps(
+        case["expected"], sort_keys=False
+    )
+
+
+def test_parser_handles_lines_without_orjson(monkeypatch):
+    # The json fallback decoder must agree with orjson.
+    from nuclei.helpers import nuclei_output_parser
+
+    monkeypatch.setattr(nuclei_output_parser, "_fast_loads", json.loads)
+    case = json.loads((GOLDEN_DIR / "mixed_scan.json").read_text())
+
+    result = NucleiOutputParser().parse(case["stdout"], case["ip_to_asset_id_map"])
+
+    assert result == case["expected"]
@@ -1,5 +1,9 @@
+import subprocess
+import sys
 from unittest import mock
 
+import pytest
+
 from nuclei.helpers.nuclei_process import NucleiProcess
 
 
@@ -36,3 +40,128 @@ def test_nuclei_execute_passes_timeout(m_run):
         check=True,
         timeout=540,
     )
+
+
+# A stand-in for Nuclei that, like Nuclei, only flushes on SIGINT.
+_INTERRUPTIBLE_SCAN = """
+import signal, sys, time
+def on_interrupt(*_):
+    print("partial")
+    print("Creating resume file: /tmp/resume.cfg", file=sys.stderr)
+    sys.exit(0)
+signal.signal(signal.SIGINT, on_interrupt)
+sys.stdin.read()
+print("started", flush=True)
+time.sleep(30)
+"""
+
+
+def test_nuclei_execute_interruptible_interrupts_on_timeout():
+    with pytest.raises(subprocess.TimeoutExpired) as excinfo:
+        NucleiProcess.nuclei_execute_interruptible(
+            [sys.executable, "-c", _INTERRUPTIBLE_SCAN], b"", timeout=1, grace=10
+        )
+
+    assert excinfo.value.stdout == b"started\npartial\n"
+    assert b"Creating resume file: /tmp/resume.cfg" in excinfo.value.stderr
+
+
+def test_nuclei_execute_interruptible_kills_after_grace():
+    script = "import signal, time; signal.signal(signal.SIGINT, signal.SIG_IGN); time.sleep(30)"
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        NucleiProcess.nuclei_execute_interruptible(
+            [sys.executable, "-c", script], b"", timeout=1, grace=1
+        )
+
+
+def test_nuclei_execute_interruptible_reports_exit_code():
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        NucleiProcess.nuclei_execute_interruptible(
+            [sys.executable, "-c", "import sys; sys.exit(3)"], b"", timeout=10, grace=1
+        )
+
+    assert excinfo.value.returncode == 3
+
+
+def test_nuclei_execute_interruptible_returns_output():
+    result = NucleiProcess.nuclei_execute_interruptible(
+        [sys.executable, "-c", "import sys; print(sys.stdin.read().strip())"],
+        b"1.1.1.1\n",
+        timeout=10,
+        grace=1,
+    )
+
+    assert result.stdout == b"1.1.1.1\n"
+
+
+def _echo_targets(prefix):
+    # Prints one JSONL line per target read on stdin (no trailing newline).
+    return [
+        sys.executable,
+        "-c",
+        "import sys; targets = sys.stdin.read().split();"
+        f" sys.stderr.write('{prefix} done');"
+        f" sys.stdout.write('\\n'.join('{{\"host\": \"%s\"}}' % t for t in targets))",
+    ]
+
+
+def test_nuclei_execute_sharded_merges_shard_outputs():
+    result = NucleiProcess.nuclei_execute_sharded(
+        [_echo_targets("a"), _echo_targets("b")],
+        [b"1.1.1.1\n2.2.2.2\n", b"3.3.3.3\n"],
+        timeout=10,
+    )
+
+    assert result.stdout.splitlines() == [
+        b'{"host": "1.1.1.1"}',
+        b'{"host": "2.2.2.2"}',
+        b'{"host": "3.3.3.3"}',
+    ]
+    assert result.stderr == b"a done\nb done"
+
+
+def test_nuclei_execute_sharded_raises_with_every_shard_output():
+    failing = [sys.executable, "-c", "import sys; print('partial'); sys.exit(2)"]
+
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        NucleiProcess.nuclei_execute_sharded(
+            [_echo_targets("a"), failing], [b"1.1.1.1\n", b""], timeout=10
+        )
+
+    assert excinfo.value.returncode == 2
+    assert excinfo.value.stdout == b'{"host": "1.1.1.1"}\npartial\n'
+
+
+def test_nuclei_execute_streams_stderr_lines():
+    script = (
+        "import sys; sys.stderr.write('stats 1\\nwarning\\nstats 2\\n');"
+        " print(sys.stdin.read().strip())"
+    )
+    seen = []
+
+    def on_stderr_line(line):
+        seen.append(line)
+        return line.startswith(b"stats")
+
+    result = NucleiProcess.nuclei_execute(
+        [sys.executable, "-c", script],
+        b"1.1.1.1\n",
+        timeout=10,
+        on_stderr_line=on_stderr_line,
+    )
+
+    assert seen == [b"stats 1\n", b"warning\n", b"stats 2\n"]
+    # Consumed lines stay out of the captured stderr.
+    assert result.stderr == b"warning\n"
+    assert result.stdout == b"1.1.1.1\n"
+
+
+def test_nuclei_execute_streaming_kills_on_timeout():
+    with pytest.raises(subprocess.TimeoutExpired):
+        NucleiProcess.nuclei_execute(
+            [sys.executable, "-c", "import time; time.sleep(30)"],
+            b"",
+            timeout=1,
+            on_stderr_line=lambda line: False,
+        )
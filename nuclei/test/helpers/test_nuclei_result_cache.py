@@ -0,0 +1,170 @@
+import json
+
+import pytest
+
+from nuclei.helpers.nuclei_result_cache import NucleiResultCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def templates_dir(tmp_path):
+    directory = tmp_path / "templates"
+    (directory / "http" / "cves").mkdir(parents=True)
+    (directory / "http" / "cves" / "CVE-2024-0001.yaml").write_text(
+        "id: CVE-2024-0001\ninfo:\n  name: test\n"
+    )
+    return directory
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path, templates_dir, clock):
+    return NucleiResultCache(
+        path=str(tmp_path / "cache" / "results.sqlite"),
+        ttl=60,
+        templates_directory=str(templates_dir),
+        clock=clock,
+    )
+
+
+def _match(templates_dir, host, template_id="CVE-2024-0001"):
+    return json.dumps(
+        {
+            "template-id": template_id,
+            "template-path": str(
+                templates_dir / "http" / "cves" / f"{template_id}.yaml"
+            ),
+            "matcher-status": True,
+            "host": host,
+            "info": {"classification": {"cve-id": [template_id]}},
+        }
+    )
+
+
+TEMPLATE = "http/cves/CVE-2024-0001.yaml"
+
+
+def test_single_template_scan_skips_answered_hosts(cache, templates_dir):
+    plan = cache.plan(["a", "b"], scope="s", template=TEMPLATE)
+    assert plan.targets == ["a", "b"]
+    cache.record(_match(templates_dir, "a"), plan)
+
+    # "a" matched (positive), "b" did not (negative): both are answered.
+    plan = cache.plan(["a", "b", "c"], scope="s", template=TEMPLATE)
+    assert plan.targets == ["c"]
+    assert plan.cached_lines == [_match(templates_dir, "a")]
+
+
+def test_fully_cached_scan_is_skipped(cache, templates_dir):
+    cache.record("", cache.plan(["a"], scope="s", template=TEMPLATE))
+
+    plan = cache.plan(["a"], scope="s", template=TEMPLATE)
+    assert plan.skips_scan
+    assert plan.cached_lines == []
+
+
+def test_entries_expire_after_ttl(cache, templates_dir, clock):
+    cache.record("", cache.plan(["a"], scope="s", template=TEMPLATE))
+    clock.now += 61
+
+    assert cache.plan(["a"], scope="s", template=TEMPLATE).targets == ["a"]
+
+
+def test_template_change_invalidates_entries(cache, templates_dir):
+    cache.record("", cache.plan(["a"], scope="s", template=TEMPLATE))
+    (templates_dir / TEMPLATE).write_text("id: CVE-2024-0001\ninfo:\n  name: v2\n")
+
+    assert cache.plan(["a"], scope="s", template=TEMPLATE).targets == ["a"]
+
+
+def test_verdicts_are_scoped_to_the_template_selection(cache, templates_dir):
+    cache.record("", cache.plan(["a"], scope="s", template=TEMPLATE))
+
+    assert cache.plan(["a"], scope="other", template=TEMPLATE).targets == ["a"]
+
+
+def test_no_negative_when_a_match_does_not_map_to_a_target(cache, templates_dir):
+    # The match is reported under another host spelling: "a" may well have
+    # matched, so it must not be remembered as clean.
+    plan = cache.plan(["a"], scope="s", template=TEMPLATE)
+    cache.record(_match(templates_dir, "https://a:443"), plan)
+
+    assert cache.plan(["a"], scope="s", template=TEMPLATE).targets == ["a"]
+
+
+def test_tag_scan_excludes_templates_positive_on_every_target(cache, templates_dir):
+    plan = cache.plan(["a", "b"], scope="tags")
+    assert plan.single_template is None
+    cache.record(
+        "\n".join([_match(templates_dir, "a"), _match(templates_dir, "b")]), plan
+    )
+
+    plan = cache.plan(["a", "b"], scope="tags")
+    assert plan.targets == ["a", "b"]
+    assert plan.excluded_template_ids == ["CVE-2024-0001"]
+    assert len(plan.cached_lines) == 2
+
+    # One target without a cached positive: the template must run again.
+    plan = cache.plan(["a", "b", "c"], scope="tags")
+    assert plan.excluded_template_ids == []
+    assert plan.cached_lines == []
+
+
+def test_tag_scan_rescan_overwrites_the_cached_findings(cache, templates_dir):
+    plan = cache.plan(["a", "b"], scope="tags")
+    cache.record(
+        "\n".join([_match(templates_dir, "a"), _match(templates_dir, "b")]), plan
+    )
+
+    # "a" is re-scanned alone and comes back clean: its finding is gone.
+    cache.record("", cache.plan(["c", "a"], scope="tags"))
+
+    plan = cache.plan(["a", "b"], scope="tags")
+    assert plan.excluded_template_ids == []
+    assert plan.cached_lines == []
+    assert cache.plan(["b"], scope="tags").cached_lines == [_match(templates_dir, "b")]
+
+
+def test_tag_scan_keeps_the_findings_of_excluded_templates(cache, templates_dir):
+    plan = cache.plan(["a"], scope="tags")
+    cache.record(_match(templates_dir, "a"), plan)
+
+    # The template is excluded from the next scan: its finding still holds.
+    plan = cache.plan(["a"], scope="tags")
+    assert plan.excluded_template_ids == ["CVE-2024-0001"]
+    cache.record("", plan)
+
+    assert cache.plan(["a"], scope="tags").cached_lines == [_match(templates_dir, "a")]
+
+
+def test_single_template_rescan_drops_a_finding_that_went_away(
+    cache, templates_dir, clock
+):
+    cache.record(
+        _match(templates_dir, "a"), cache.plan(["a"], scope="s", template=TEMPLATE)
+    )
+    # Re-scanned (e.g. the inject bypassing the cache) with a match that does
+    # not map back to "a": no negative is recorded, the old positive must go.
+    plan = cache.plan(["b"], scope="s", template=TEMPLATE)
+    plan.targets = ["a"]
+    cache.record(_match(templates_dir, "https://a:443"), plan)
+
+    assert cache.plan(["a"], scope="s", template=TEMPLATE).targets == ["a"]
+
+
+def test_record_ignores_non_json_and_unmatched_lines(cache, templates_dir):
+    plan = cache.plan(["a"], scope="tags")
+    cache.record("[INF] progress\n" + json.dumps({"matcher-status": False}), plan)
+
+    assert cache.plan(["a"], scope="tags").excluded_template_ids == []
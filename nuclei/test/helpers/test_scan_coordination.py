@@ -1,7 +1,7 @@
 import threading
 import time
 
-from nuclei.helpers.scan_coordination import TemplateAccessLock
+from nuclei.helpers.scan_coordination import ScanScheduler, TemplateAccessLock
 
 
 def test_multiple_readers_can_hold_the_lock_at_once():
@@ -48,3 +48,123 @@ def test_writer_waits_for_an_active_reader_then_runs():
     t_writer.join(2)
 
     assert events == ["read-start", "read-end", "write"]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _queue_scans(scheduler, scans):
+    """Start each (name, cost, group) scan in a thread while the single slot
+    is held, release it, and return the order in which they got the slot."""
+    order = []
+    started = []
+
+    def scan(name, cost, group):
+        with scheduler.slot(cost=cost, group=group):
+            order.append(name)
+
+    threads = []
+    with scheduler.slot(cost=1, group="holder"):
+        for name, cost, group in scans:
+            thread = threading.Thread(target=scan, args=(name, cost, group))
+            thread.start()
+            threads.append(thread)
+            started.append(name)
+            # Wait until the scan is queued so arrival order is deterministic.
+            while scheduler.stats().queue_depth < len(started):
+                time.sleep(0.01)
+    for thread in threads:
+        thread.join(2)
+    return order
+
+
+def test_scheduler_serves_cheapest_scan_first():
+    # A full "-templates /" scan must not hold back small targeted scans.
+    scheduler = ScanScheduler(1, aging_seconds=300)
+
+    order = _queue_scans(
+        scheduler,
+        [("huge", 12000, "a"), ("small", 1, "b"), ("medium", 500, "c")],
+    )
+
+    assert order == ["small", "medium", "huge"]
+
+
+def test_scheduler_shares_slots_fairly_between_groups():
+    # With two slots, a scenario already running a scan yields the next slot
+    # to a scenario that has none, even if its own queued scan is cheaper.
+    scheduler = ScanScheduler(2, aging_seconds=300)
+    order = []
+    release_first = threading.Event()
+
+    def long_scan():
+        with scheduler.slot(cost=1, group="busy"):
+            release_first.wait(2)
+
+    def scan(name, cost, group):
+        with scheduler.slot(cost=cost, group=group):
+            order.append(name)
+
+    first = threading.Thread(target=long_scan)
+    first.start()
+    threads = []
+    with scheduler.slot(cost=1, group="holder"):
+        for args in [("busy-2", 1, "busy"), ("other", 100, "other")]:
+            threads.append(threading.Thread(target=scan, args=args))
+            threads[-1].start()
+            while scheduler.stats().queue_depth < len(threads):
+                time.sleep(0.01)
+    for thread in threads:
+        thread.join(2)
+    release_first.set()
+    first.join(2)
+
+    assert order == ["other", "busy-2"]
+
+
+def test_scheduler_ages_waiting_scans_to_avoid_starvation():
+    clock = FakeClock()
+    scheduler = ScanScheduler(1, aging_seconds=60, clock=clock)
+    order = []
+
+    def scan(name, cost):
+        with scheduler.slot(cost=cost, group=name):
+            order.append(name)
+
+    with scheduler.slot(cost=1, group="holder"):
+        huge = threading.Thread(target=scan, args=("huge", 12000))
+        huge.start()
+        while scheduler.stats().queue_depth < 1:
+            time.sleep(0.01)
+        clock.now = 61
+        small = threading.Thread(target=scan, args=("small", 1))
+        small.start()
+        while scheduler.stats().queue_depth < 2:
+            time.sleep(0.01)
+    huge.join(2)
+    small.join(2)
+
+    assert order == ["huge", "small"]
+
+
+def test_scheduler_reports_queue_stats():
+    clock = FakeClock()
+    scheduler = ScanScheduler(2, aging_seconds=60, clock=clock)
+
+    with scheduler.slot(cost=1, group="g") as waited:
+        stats = scheduler.stats()
+        assert waited == 0
+        assert stats.running == 1
+        assert stats.occupancy == 0.5
+        assert stats.queue_depth == 0
+        assert stats.running_per_group == {"g": 1}
+
+    stats = scheduler.stats()
+    assert stats.running == 0
+    assert stats.granted == 1
+    assert stats.running_per_group == {}
@@ -0,0 +1,85 @@
+import json
+
+from nuclei.helpers.scan_progress import ScanProgress, ScanStats, parse_stats_line
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _stats_line(**values):
+    line = {
+        "duration": "0:01:05",
+        "errors": "0",
+        "hosts": "2",
+        "matched": "0",
+        "percent": "10",
+        "requests": "100",
+        "rps": "5",
+        "startedAt": "2026-01-01T00:00:00Z",
+        "templates": "3500",
+        "total": "1000",
+    }
+    line.update(values)
+    return (json.dumps(line) + "\n").encode()
+
+
+def test_parse_stats_line():
+    assert parse_stats_line(_stats_line(rps=12, errors="3")) == ScanStats(
+        percent=10,
+        requests=100,
+        total=1000,
+        rps=12,
+        errors=3,
+        matched=0,
+        hosts=2,
+        templates=3500,
+        elapsed_seconds=65,
+    )
+
+
+def test_parse_stats_line_ignores_other_lines():
+    assert parse_stats_line(b"[INF] Creating resume file: /tmp/r.cfg\n") is None
+    assert parse_stats_line(b'{"template-id": "x", "host": "a"}\n') is None
+    assert parse_stats_line(b'{"percent": broken\n') is None
+
+
+def test_progress_reports_are_rate_limited():
+    clock = FakeClock()
+    reports = []
+    progress = ScanProgress(reports.append, interval=30, clock=clock)
+    on_stderr_line = progress.handler()
+
+    assert on_stderr_line(_stats_line(percent="10"))
+    clock.now += 10
+    assert on_stderr_line(_stats_line(percent="20"))
+    clock.now += 25
+    assert on_stderr_line(_stats_line(percent="30"))
+    assert not on_stderr_line(b"[WRN] something\n")
+
+    assert [stats.percent for stats in reports] == [10, 30]
+    assert progress.summary().percent == 30
+
+
+def test_progress_aggregates_shards():
+    progress = ScanProgress(lambda stats: None, interval=30, clock=FakeClock())
+
+    progress.handler(0)(_stats_line(requests="100", total="1000", rps="5"))
+    progress.handler(1)(
+        _stats_line(requests="500", total="1000", rps="7", duration="0:02:00")
+    )
+
+    summary = progress.summary()
+    assert summary.percent == 30
+    assert summary.requests == 600
+    assert summary.total == 2000
+    assert summary.rps == 12
+    assert summary.elapsed_seconds == 120
+
+
+def test_summary_without_statistics():
+    assert ScanProgress(lambda stats: None, interval=30).summary() is None
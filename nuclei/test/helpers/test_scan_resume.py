@@ -0,0 +1,124 @@
+import os
+
+import pytest
+
+from nuclei.helpers.scan_resume import ScanResumeStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    return ScanResumeStore(
+        work_directory=str(tmp_path / "scans"),
+        max_attempts=3,
+        state_ttl=60,
+        clock=clock,
+    )
+
+
+def _nuclei_resume_file(tmp_path, name="resume-123.cfg"):
+    # Where Nuclei writes its resume file on SIGINT, as logged on stderr.
+    path = tmp_path / name
+    path.write_text("resume point")
+    return str(path), f"[INF] Creating resume file: {path}\n"
+
+
+FINGERPRINT = ScanResumeStore.fingerprint("tags", ["a", "b"])
+
+
+def test_first_attempt_starts_from_scratch(store):
+    state = store.prepare("inject-1", FINGERPRINT)
+
+    assert state.attempt == 1
+    assert state.resume_file is None
+    assert state.previous_stdout == ""
+    assert os.path.isdir(state.directory)
+
+
+def test_interrupted_scan_resumes_with_previous_output(store, tmp_path):
+    state = store.prepare("inject-1", FINGERPRINT)
+    written, stderr = _nuclei_resume_file(tmp_path)
+
+    assert store.interrupted(state, '{"a": 1}', stderr)
+    assert not os.path.exists(written)
+
+    state = store.prepare("inject-1", FINGERPRINT)
+    assert state.attempt == 2
+    assert state.resume_file == os.path.join(state.directory, "resume.cfg")
+    assert open(state.resume_file).read() == "resume point"
+    assert state.previous_stdout == '{"a": 1}\n'
+
+    written, stderr = _nuclei_resume_file(tmp_path)
+    assert store.interrupted(state, '{"b": 2}\n', stderr)
+    assert store.prepare("inject-1", FINGERPRINT).previous_stdout == (
+        '{"a": 1}\n{"b": 2}\n'
+    )
+
+
+def test_interrupted_without_resume_file_is_not_resumable(store):
+    state = store.prepare("inject-1", FINGERPRINT)
+
+    assert not store.interrupted(state, "", "[ERR] killed")
+    assert not os.path.exists(state.directory)
+
+
+def test_attempts_cap_drops_the_resume_point(store, tmp_path):
+    for attempt in (1, 2):
+        state = store.prepare("inject-1", FINGERPRINT)
+        assert state.attempt == attempt
+        assert store.interrupted(state, "", _nuclei_resume_file(tmp_path)[1])
+
+    state = store.prepare("inject-1", FINGERPRINT)
+    written, stderr = _nuclei_resume_file(tmp_path)
+    assert state.attempt == 3
+    assert not store.interrupted(state, "", stderr)
+    assert not os.path.exists(written)
+    assert store.prepare("inject-1", FINGERPRINT).attempt == 1
+
+
+def test_changed_scan_does_not_resume(store, tmp_path):
+    state = store.prepare("inject-1", FINGERPRINT)
+    store.interrupted(state, "old", _nuclei_resume_file(tmp_path)[1])
+
+    state = store.prepare("inject-1", ScanResumeStore.fingerprint("tags", ["a"]))
+    assert state.attempt == 1
+    assert state.resume_file is None
+    assert state.previous_stdout == ""
+
+
+def test_completed_scan_removes_its_state(store, tmp_path):
+    state = store.prepare("inject-1", FINGERPRINT)
+    store.interrupted(state, "", _nuclei_resume_file(tmp_path)[1])
+    state = store.prepare("inject-1", FINGERPRINT)
+
+    store.completed(state)
+
+    assert store.prepare("inject-1", FINGERPRINT).attempt == 1
+
+
+def test_stale_state_is_cleaned_up(store, tmp_path, clock):
+    state = store.prepare("inject-1", FINGERPRINT)
+    store.interrupted(state, "", _nuclei_resume_file(tmp_path)[1])
+    clock.now += 61
+
+    store.cleanup_stale()
+
+    assert not os.path.exists(state.directory)
+
+
+def test_inject_id_cannot_escape_the_work_directory(store, tmp_path):
+    state = store.prepare("../../etc", FINGERPRINT)
+
+    assert os.path.dirname(state.directory) == str(tmp_path / "scans")
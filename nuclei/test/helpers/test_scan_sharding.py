@@ -0,0 +1,39 @@
+from nuclei.helpers.scan_sharding import plan_shards
+
+TARGETS = [f"10.0.0.{i}" for i in range(10)]
+
+
+def test_small_scan_stays_in_one_process():
+    shards = plan_shards(TARGETS, shards=4, min_targets=20, rate_limit=50)
+
+    assert len(shards) == 1
+    assert shards[0].targets == TARGETS
+    assert shards[0].rate_limit == 50
+
+
+def test_targets_are_dealt_round_robin():
+    shards = plan_shards(TARGETS, shards=3, min_targets=2, rate_limit=50)
+
+    assert [shard.targets for shard in shards] == [
+        ["10.0.0.0", "10.0.0.3", "10.0.0.6", "10.0.0.9"],
+        ["10.0.0.1", "10.0.0.4", "10.0.0.7"],
+        ["10.0.0.2", "10.0.0.5", "10.0.0.8"],
+    ]
+
+
+def test_rate_budget_is_split_between_shards():
+    shards = plan_shards(TARGETS, shards=3, min_targets=1, rate_limit=50)
+
+    assert [shard.rate_limit for shard in shards] == [17, 17, 16]
+
+
+def test_rate_budget_bounds_the_number_of_shards():
+    shards = plan_shards(TARGETS, shards=8, min_targets=1, rate_limit=2)
+
+    assert len(shards) == 2
+    assert [shard.rate_limit for shard in shards] == [1, 1]
+    assert sorted(sum((shard.targets for shard in shards), [])) == TARGETS
+
+
+def test_no_targets_gives_one_empty_shard():
+    assert len(plan_shards([], shards=4, min_targets=1, rate_limit=50)) == 1
@@ -39,6 +39,8 @@ class TestMessageData(unittest.TestCase):
             [sentinel.expectation_type_one, sentinel.expectation_type_two],
         )
         self.assertEqual(message_data.raw_data, data)
+        # No simulation / scenario in the payload: the inject is its own group.
+        self.assertEqual(message_data.scenario_key, sentinel.inject_id)
         m_extract_targets.assert_called_once_with(
             sentinel.selector_key,
             sentinel.selector_property,
@@ -52,6 +54,36 @@ class TestMessageData(unittest.TestCase):
             helper,
         )
 
+    @patch.object(module.Targets, "extract_target_meta")
+    @patch.object(module.Targets, "extract_targets")
+    def test_messagedata_scenario_key(self, m_extract_targets, m_extract_target_meta):
+        # Scan slots are shared fairly per simulation, then per scenario.
+        def payload(**extra):
+            return {
+                "injection": {
+                    "inject_id": "inject-1",
+                    "inject_injector_contract": {"injector_contract_id": "c"},
+                    "inject_content": {
+                        module.TARGET_SELECTOR_KEY: "manual",
+                        module.TARGET_PROPERTY_SELECTOR_KEY: "automatic",
+                    },
+                    **extra,
+                }
+            }
+
+        self.assertEqual(
+            module.MessageData(
+                payload(inject_exercise="sim-1", inject_scenario="sc-1"), MagicMock()
+            ).scenario_key,
+            "sim-1",
+        )
+        self.assertEqual(
+            module.MessageData(
+                payload(inject_scenario="sc-1"), MagicMock()
+            ).scenario_key,
+            "sc-1",
+        )
+
     @patch.object(module.Targets, "extract_target_meta")
     @patch.object(module.Targets, "extract_targets")
     def test_messagedata_get_targets(self, m_extract_targets, m_extract_target_meta):
@@ -0,0 +1,151 @@
+import json
+import threading
+import unittest
+from unittest import mock
+from unittest.mock import MagicMock
+
+from nuclei.helpers.nuclei_process import NucleiProcess
+from nuclei.nuclei_contracts.external_contracts import (
+    ExternalContractsManager,
+    ExternalContractsScheduler,
+)
+
+INJECTOR_ID = "injector-id"
+
+
+def _external_id(template_id):
+    return f"external-injector-contract_{INJECTOR_ID}_{template_id}"
+
+
+def _catalogue_response(*templates, etag="etag-1", status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {"ETag": etag}
+    response.iter_lines.return_value = [json.dumps(t) for t in templates]
+    return response
+
+
+CVE_1 = {"ID": "CVE-0001-0001", "file_path": "path_1"}
+CVE_2 = {"ID": "CVE-0002-0002", "file_path": "path_2"}
+CVE_3 = {"ID": "CVE-0003-0003", "file_path": "path_3"}
+
+
+@mock.patch.object(NucleiProcess, "nuclei_update_templates", MagicMock())
+@mock.patch("requests.Session.get")
+class ExternalContractsWorkerTest(unittest.TestCase):
+    """The manager stays warm between runs: after a first full reconciliation,
+    a run only touches the contracts whose templates changed."""
+
+    def setUp(self):
+        self.api = MagicMock()
+        self.api.injector_contract.search.return_value = {
+            "content": [
+                {
+                    "injector_contract_id": "contract-1",
+                    "injector_contract_external_id": _external_id(CVE_1["ID"]),
+                }
+            ],
+            "last": True,
+        }
+        self.manager = ExternalContractsManager(self.api, INJECTOR_ID, MagicMock())
+
+    def _first_run(self, m_get):
+        m_get.return_value = _catalogue_response(CVE_1, CVE_2)
+        report = self.manager.manage_contracts()
+        self.assertTrue(report.full_sync)
+        self.assertEqual((report.created, report.updated), (1, 1))
+        self.api.reset_mock()
+
+    def test_unchanged_catalogue_costs_one_conditional_request(self, m_get):
+        self._first_run(m_get)
+        m_get.return_value = _catalogue_response(status_code=304)
+
+        report = self.manager.manage_contracts()
+
+        self.assertEqual(m_get.call_args.kwargs["headers"], {"If-None-Match": "etag-1"})
+        self.assertFalse(report.full_sync)
+        self.assertFalse(report.catalogue_changed)
+        self.assertEqual((report.created, report.updated, report.deleted), (0, 0, 0))
+        self.api.injector_contract.search.assert_not_called()
+        self.api.injector_contract.update.assert_not_called()
+
+    def test_changed_catalogue_only_applies_the_changes(self, m_get):
+        self._first_run(m_get)
+        changed_cve_2 = dict(CVE_2, file_path="path_2_moved")
+        m_get.return_value = _catalogue_response(changed_cve_2, CVE_3, etag="etag-2")
+
+        report = self.manager.manage_contracts()
+
+        self.assertEqual((report.created, report.updated, report.deleted), (1, 1, 1))
+        self.api.injector_contract.search.assert_not_called()
+        self.assertEqual(
+            self.api.injector_contract.update.call_args.args[0],
+            _external_id(CVE_2["ID"]),
+        )
+        self.api.injector_contract.delete.assert_called_once_with(
+            _external_id(CVE_1["ID"])
+        )
+        self.assertEqual(self.manager.last_run, report)
+
+    def test_failed_run_forces_a_full_sync(self, m_get):
+        self._first_run(m_get)
+        self.api.injector_contract.create.side_effect = Exception("platform down")
+        m_get.return_value = _catalogue_response(CVE_1, CVE_2, CVE_3, etag="etag-2")
+
+        self.assertEqual(self.manager.manage_contracts().failed, 1)
+
+        self.api.injector_contract.create.side_effect = None
+        report = self.manager.manage_contracts()
+        self.assertTrue(report.full_sync)
+        self.api.injector_contract.search.assert_called()
+        self.assertEqual(report.created, 2)
+
+    def test_failed_contracts_fetch_forces_a_full_sync(self, m_get):
+        m_get.return_value = _catalogue_response(CVE_1, CVE_2)
+        self.api.injector_contract.search.side_effect = Exception("platform down")
+
+        with self.assertRaises(Exception):
+            self.manager.manage_contracts()
+
+        self.api.injector_contract.search.side_effect = None
+        report = self.manager.manage_contracts()
+        self.assertTrue(report.full_sync)
+        self.assertEqual((report.created, report.updated), (1, 1))
+
+    def test_cancelled_run_stops_and_forces_a_full_sync(self, m_get):
+        cancel = threading.Event()
+        cancel.set()
+        manager = ExternalContractsManager(
+            self.api, INJECTOR_ID, MagicMock(), cancel_event=cancel
+        )
+        m_get.return_value = _catalogue_response(CVE_1, CVE_2)
+
+        report = manager.manage_contracts()
+
+        self.assertTrue(report.cancelled)
+        self.api.injector_contract.create.assert_not_called()
+        self.assertTrue(manager.manage_contracts().full_sync)
+
+
+class ExternalContractsSchedulerTest(unittest.TestCase):
+    def test_start_runs_until_stopped_and_survives_failures(self):
+        logger = MagicMock()
+        scheduler = ExternalContractsScheduler(MagicMock(), INJECTOR_ID, 0, logger)
+        runs = []
+
+        def manage_contracts():
+            runs.append(1)
+            if len(runs) == 1:
+                raise RuntimeError("catalogue unavailable")
+            scheduler.stop()
+
+        scheduler.manager.manage_contracts = manage_contracts
+
+        scheduler.start()
+
+        self.assertEqual(len(runs), 2)
+        logger.error.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,10 @@
 import json
+import signal
 import unittest
-from unittest.mock import ANY, MagicMock, patch
+from unittest.mock import ANY, MagicMock, call, patch
 
 import nuclei.openaev_nuclei as module
+from nuclei.helpers.nuclei_result_cache import CachePlan
 
 
 @patch.object(module, "intercept_dump_argument")
@@ -11,7 +13,15 @@ import nuclei.openaev_nuclei as module
 @patch.object(module, "NucleiProcess")
 @patch.object(module, "OpenAEVInjectorHelper", autospec=True)
 @patch.object(module, "OpenAEVConfigHelper")
-@patch.object(module, "ConfigLoader")
+@patch.object(
+    module,
+    "ConfigLoader",
+    **{
+        "return_value.nuclei.result_cache_enabled": False,
+        "return_value.nuclei.scan_resume_enabled": False,
+        "return_value.nuclei.scan_progress_enabled": False,
+    },
+)
 class TestOpenAEVNuclei(unittest.TestCase):
     def test_openaev_nuclei_init(
         self,
@@ -82,13 +92,100 @@ class TestOpenAEVNuclei(unittest.TestCase):
             m_builder.return_value.build.return_value,
             b"1.1.1.1\n",
             timeout=injector.config_loader.nuclei.scan_timeout,
+            on_stderr_line=None,
         )
         m_parser.return_value.parse.assert_called_once_with(
             m_nucleiprocess.nuclei_execute.return_value.stdout.decode.return_value,
             message_data.target_results.ip_to_asset_id_map,
+            cached_lines=None,
         )
         self.assertEqual(nuclei_output, m_parser.return_value.parse.return_value)
 
+    @patch.object(module.Targets, "build_execution_message")
+    @patch.object(module, "NucleiCommandBuilder")
+    def test_openaev_nuclei_execution_uses_result_cache(
+        self,
+        m_builder,
+        m_build_execution_message,
+        m_configloader,
+        m_confighelper,
+        m_helper,
+        m_nucleiprocess,
+        m_parser,
+        m_msgdata,
+        _,
+    ):
+        # Targets answered by the cache are not scanned again, cache-excluded
+        # templates reach the command line, and cached findings are merged.
+        m_helper.return_value.api = MagicMock()
+        m_helper.return_value.injector_logger = MagicMock()
+        injector = module.OpenAEVNuclei()
+        injector._result_cache = MagicMock()
+        injector._result_cache.plan.return_value = CachePlan(
+            scope="scope",
+            targets=["10.0.0.2"],
+            excluded_template_ids=["tpl-a"],
+            cached_lines=['{"cached": true}'],
+        )
+
+        message_data = MagicMock()
+        message_data.get_targets.return_value = ["10.0.0.1", "10.0.0.2"]
+        message_data.target_results.ip_to_asset_id_map = {}
+        m_builder.return_value.build.return_value = ["nuclei", "-jsonl"]
+
+        injector.nuclei_execution(1, message_data)
+
+        m_builder.return_value.exclude_template_ids.assert_called_once_with(["tpl-a"])
+        m_nucleiprocess.nuclei_execute.assert_called_once_with(
+            ["nuclei", "-jsonl"], b"10.0.0.2\n", timeout=ANY, on_stderr_line=None
+        )
+        # The scan slot is priced on the targets left to scan.
+        m_builder.return_value.estimated_cost.assert_called_once_with(["10.0.0.2"])
+        stdout = m_nucleiprocess.nuclei_execute.return_value.stdout.decode.return_value
+        injector._result_cache.record.assert_called_once_with(
+            stdout, injector._result_cache.plan.return_value
+        )
+        m_parser.return_value.parse.assert_called_once_with(
+            stdout,
+            message_data.target_results.ip_to_asset_id_map,
+            cached_lines=['{"cached": true}'],
+        )
+
+    @patch.object(module.Targets, "build_execution_message")
+    @patch.object(module, "NucleiCommandBuilder")
+    def test_openaev_nuclei_execution_skips_scan_fully_cached(
+        self,
+        m_builder,
+        m_build_execution_message,
+        m_configloader,
+        m_confighelper,
+        m_helper,
+        m_nucleiprocess,
+        m_parser,
+        m_msgdata,
+        _,
+    ):
+        m_helper.return_value.api = MagicMock()
+        m_helper.return_value.injector_logger = MagicMock()
+        injector = module.OpenAEVNuclei()
+        injector._result_cache = MagicMock()
+        injector._result_cache.plan.return_value = CachePlan(
+            scope="scope", targets=[], cached_lines=['{"cached": true}']
+        )
+
+        message_data = MagicMock()
+        message_data.get_targets.return_value = ["10.0.0.1"]
+        message_data.target_results.ip_to_asset_id_map = {}
+        m_builder.return_value.build.return_value = ["nuclei", "-jsonl"]
+
+        injector.nuclei_execution(1, message_data)
+
+        m_nucleiprocess.nuclei_execute.assert_not_called()
+        injector._result_cache.record.assert_not_called()
+        m_parser.return_value.parse.assert_called_once_with(
+            "", {}, cached_lines=['{"cached": true}']
+        )
+
     @patch.object(module.Targets, "build_execution_message")
     @patch.object(module, "NucleiCommandBuilder")
     def test_openaev_nuclei_execution_emits_per_target_traces(
@@ -208,6 +305,202 @@ class TestOpenAEVNuclei(unittest.TestCase):
         m_parser.return_value.parse.assert_not_called()
         injector.helper.injector_logger.error.assert_called()
 
+    @patch.object(module.Targets, "build_execution_message")
+    @patch.object(module, "NucleiCommandBuilder")
+    def test_openaev_nuclei_execution_timeout_keeps_partial_results_for_resume(
+        self,
+        m_builder,
+        m_build_execution_message,
+        m_configloader,
+        m_confighelper,
+        m_helper,
+        m_nucleiprocess,
+        m_parser,
+        m_msgdata,
+        _,
+    ):
+        # With resume enabled, a timed-out scan is interrupted rather than
+        # failed: its findings (and the earlier attempts') are reported as a
+        # partial result and a resume point is kept for the next play.
+        m_helper.return_value.api = MagicMock()
+        m_helper.return_value.injector_logger = MagicMock()
+        injector = module.OpenAEVNuclei()
+        injector._resume_store = MagicMock()
+        injector._resume_store.max_attempts = 3
+        resume = injector._resume_store.prepare.return_value
+        resume.attempt = 2
+        resume.resume_file = "/work/inject-id/resume.cfg"
+        resume.previous_stdout = "earlier\n"
+        injector._resume_store.interrupted.return_value = True
+        m_parser.return_value.parse.return_value = {"message": "1 CVE(S)"}
+
+        message_data = MagicMock()
+        message_data.inject_id = "inject-id"
+        message_data.get_targets.return_value = ["1.1.1.1"]
+        message_data.target_results.ip_to_asset_id_map = {}
+        m_builder.return_value.build.return_value = ["nuclei", "-jsonl"]
+        m_builder.return_value.selection_key.return_value = "selection"
+        m_nucleiprocess.nuclei_execute_interruptible.side_effect = (
+            module.subprocess.TimeoutExpired(
+                cmd="nuclei", timeout=5, output=b"partial", stderr=b"resume"
+            )
+        )
+
+        result = injector.nuclei_execution(1, message_data)
+
+        m_builder.return_value.resume_from.assert_called_once_with(
+            "/work/inject-id/resume.cfg"
+        )
+        m_nucleiprocess.nuclei_execute.assert_not_called()
+        injector._resume_store.interrupted.assert_called_once_with(
+            resume, "partial", "resume"
+        )
+        m_parser.return_value.parse.assert_called_once_with(
+            "earlier\npartial", {}, cached_lines=None
+        )
+        self.assertTrue(result["partial"])
+        self.assertIn("attempt 2/3", result["message"])
+        self.assertIn("resume", result["message"])
+
+    @patch.object(module.Targets, "build_execution_message")
+    @patch.object(module, "NucleiCommandBuilder")
+    def test_openaev_nuclei_execution_reports_live_progress(
+        self,
+        m_builder,
+        m_build_execution_message,
+        m_configloader,
+        m_confighelper,
+        m_helper,
+        m_nucleiprocess,
+        m_parser,
+        m_msgdata,
+        _,
+    ):
+        m_helper.return_value.api = MagicMock()
+        m_helper.return_value.injector_logger = MagicMock()
+        nuclei_config = m_configloader.return_value.nuclei
+        nuclei_config.scan_progress_enabled = True
+        nuclei_config.scan_progress_interval = 30
+        injector = module.OpenAEVNuclei()
+
+        message_data = MagicMock()
+        message_data.inject_id = "inject-id"
+        message_data.get_targets.return_value = ["1.1.1.1"]
+        message_data.target_results.ip_to_asset_id_map = {}
+        m_builder.return_value.build.return_value = ["nuclei", "-jsonl"]
+
+        def run_nuclei(args, input_data, timeout, on_stderr_line):
+            # Nuclei's statistics are consumed; other stderr lines are not.
+            self.assertTrue(
+                on_stderr_line(
+                    b'{"percent":"40","requests":"400","total":"1000",'
+                    b'"rps":"20","errors":"1","matched":"2"}\n'
+                )
+            )
+            self.assertFalse(on_stderr_line(b"[INF] Templates loaded\n"))
+            return MagicMock(stdout=b"", stderr=b"")
+
+        m_nucleiprocess.nuclei_execute.side_effect = run_nuclei
+
+        injector.nuclei_execution(1, message_data)
+
+        progress_trace = injector.helper.api.inject.execution_callback.call_args_list[
+            -1
+        ].kwargs["data"]
+        self.assertEqual(progress_trace["execution_status"], "INFO")
+        self.assertEqual(progress_trace["execution_action"], "command_execution")
+        self.assertEqual(
+            progress_trace["execution_message"],
+            "Nuclei scan in progress: 40% done (400/1000 requests, 20 requests/s, "
+            "1 errors, 2 matched)",
+        )
+        statistics_log = injector.helper.injector_logger.info.call_args_list[-1]
+        self.assertIn("Nuclei scan statistics", statistics_log.args[0])
+        self.assertEqual(statistics_log.kwargs["meta"]["rps"], 20)
+
+    @patch.object(module.Targets, "build_execution_message")
+    @patch.object(module, "NucleiCommandBuilder")
+    def test_openaev_nuclei_execution_shards_large_scans(
+        self,
+        m_builder,
+        m_build_execution_message,
+        m_configloader,
+        m_confighelper,
+        m_helper,
+        m_nucleiprocess,
+        m_parser,
+        m_msgdata,
+        _,
+    ):
+        m_helper.return_value.api = MagicMock()
+        m_helper.return_value.injector_logger = MagicMock()
+        nuclei_config = m_configloader.return_value.nuclei
+        nuclei_config.scan_shards = 2
+        nuclei_config.scan_shard_min_targets = 2
+        nuclei_config.max_requests_per_second = 50
+        injector = module.OpenAEVNuclei()
+
+        message_data = MagicMock()
+        message_data.get_targets.return_value = ["a", "b", "c", "d"]
+        message_data.target_results.ip_to_asset_id_map = {}
+        m_builder.return_value.build.return_value = ["nuclei", "-jsonl"]
+        m_builder.return_value.limit_rate.return_value.build.return_value = [
+            "nuclei",
+            "-rate-limit",
+            "25",
+        ]
+        m_nucleiprocess.nuclei_execute_sharded.return_value.stdout = b"merged"
+        m_nucleiprocess.nuclei_execute_sharded.return_value.stderr = b""
+
+        injector.nuclei_execution(1, message_data)
+
+        m_nucleiprocess.nuclei_execute.assert_not_called()
+        self.assertEqual(
+            m_builder.return_value.limit_rate.call_args_list, [call(25), call(25)]
+        )
+        args_list, input_list = m_nucleiprocess.nuclei_execute_sharded.call_args.args
+        self.assertEqual(len(args_list), 2)
+        self.assertEqual(input_list, [b"a\nc\n", b"b\nd\n"])
+        m_parser.return_value.parse.assert_called_once_with(
+            "merged", {}, cached_lines=None
+        )
+
+    @patch.object(module.Targets, "build_execution_message")
+    @patch.object(module, "NucleiCommandBuilder")
+    def test_openaev_nuclei_execution_resumed_scan_merges_earlier_attempts(
+        self,
+        m_builder,
+        m_build_execution_message,
+        m_configloader,
+        m_confighelper,
+        m_helper,
+        m_nucleiprocess,
+        m_parser,
+        m_msgdata,
+        _,
+    ):
+        m_helper.return_value.api = MagicMock()
+        m_helper.return_value.injector_logger = MagicMock()
+        injector = module.OpenAEVNuclei()
+        injector._resume_store = MagicMock()
+        resume = injector._resume_store.prepare.return_value
+        resume.previous_stdout = "earlier\n"
+
+        message_data = MagicMock()
+        message_data.get_targets.return_value = ["1.1.1.1"]
+        message_data.target_results.ip_to_asset_id_map = {}
+        m_builder.return_value.build.return_value = ["nuclei", "-jsonl"]
+        m_builder.return_value.selection_key.return_value = "selection"
+        m_nucleiprocess.nuclei_execute_interruptible.return_value.stdout = b"rest"
+        m_nucleiprocess.nuclei_execute_interruptible.return_value.stderr = b""
+
+        injector.nuclei_execution(1, message_data)
+
+        injector._resume_store.completed.assert_called_once_with(resume)
+        m_parser.return_value.parse.assert_called_once_with(
+            "earlier\nrest", {}, cached_lines=None
+        )
+
     @patch.object(module.OpenAEVNuclei, "nuclei_execution")
     @patch.object(module, "ExecutionDetails")
     @patch.object(module, "SignatureManager")
@@ -287,6 +580,42 @@ class TestOpenAEVNuclei(unittest.TestCase):
             signatures=m_signaturemanager.return_value.build_payload.return_value,
         )
 
+    @patch.object(module.OpenAEVNuclei, "nuclei_execution")
+    @patch.object(module, "ExecutionDetails")
+    @patch.object(module, "SignatureManager")
+    @patch.object(module, "build_network_configs")
+    def test_openaev_nuclei_process_message_partial_result(
+        self,
+        m_build_network_configs,
+        m_signaturemanager,
+        m_executiondetails,
+        m_nuclei_execution,
+        m_configloader,
+        m_confighelper,
+        m_helper,
+        m_nucleiprocess,
+        m_parser,
+        m_msgdata,
+        _,
+    ):
+        m_helper.return_value.injector_logger = MagicMock()
+        m_helper.return_value.api = MagicMock()
+        injector = module.OpenAEVNuclei()
+        m_msgdata.return_value = MagicMock()
+        m_nuclei_execution.return_value = {
+            "message": "interrupted",
+            "outputs": {"cve": []},
+            "partial": True,
+        }
+
+        injector.process_message(MagicMock())
+
+        callback_data = injector.helper.api.inject.execution_callback.call_args.kwargs[
+            "data"
+        ]
+        self.assertEqual(callback_data["execution_status"], "PARTIAL")
+        self.assertEqual(callback_data["execution_action"], "complete")
+
     @patch.object(module.OpenAEVNuclei, "nuclei_execution")
     @patch.object(module, "ExecutionDetails")
     @patch.object(module, "SignatureManager")
@@ -420,12 +749,12 @@ class TestOpenAEVNuclei(unittest.TestCase):
         m_msgdata,
         _,
     ):
-        # The concurrency semaphore and the templates readers-writer lock must be
+        # The scan scheduler and the templates readers-writer lock must be
         # created at construction so scans are bounded and never race the refresh.
         m_helper.return_value.api = MagicMock()
         injector = module.OpenAEVNuclei()
 
-        self.assertIsNotNone(injector._scan_slots)
+        self.assertIsNotNone(injector._scan_scheduler)
         self.assertIsNotNone(injector._templates_lock)
 
     def test_openaev_nuclei_start(
@@ -580,6 +909,32 @@ class TestOpenAEVNuclei(unittest.TestCase):
             message_callback=injector.process_message
         )
 
+    def test_openaev_nuclei_sigterm_stops_external_contracts_maintenance(
+        self,
+        m_configloader,
+        m_confighelper,
+        m_helper,
+        m_nucleiprocess,
+        m_parser,
+        m_msgdata,
+        _,
+    ):
+        # SIGTERM must cancel the maintenance worker and make start() return,
+        # leaving the previous SIGTERM handler in place afterwards.
+        m_helper.return_value.api = MagicMock()
+        m_helper.return_value.injector_logger = MagicMock()
+        injector = module.OpenAEVNuclei()
+        previous_handler = signal.getsignal(signal.SIGTERM)
+
+        with patch.object(module, "ExternalContractsScheduler") as m_scheduler:
+            m_scheduler.return_value.start.side_effect = lambda: signal.getsignal(
+                signal.SIGTERM
+            )(signal.SIGTERM, None)
+            injector.start()
+
+        m_scheduler.return_value.stop.assert_called()
+        self.assertEqual(signal.getsignal(signal.SIGTERM), previous_handler)
+
 
 if __name__ == "__main__":
     unittest.main()
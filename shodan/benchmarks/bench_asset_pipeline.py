@@ -0,0 +1,206 @@
+"""Benchmark target normalisation and asset aggregation against the previous pipeline.
+
+Builds an asset group of ``--assets`` assets (with duplicate IPs and
+hostnames) and a search response of ``--matches`` matches, then times
+``ShodanInjector`` target building, deduplication and asset aggregation
+against the list-based, per-match ``model_dump()`` pipeline they replaced
+(kept below as the baseline), checking both produce the same assets.
+
+    python -m benchmarks.bench_asset_pipeline --assets 50000 --matches 10000
+"""
+
+import argparse
+import logging
+import time
+from unittest.mock import Mock
+from urllib.parse import urlparse
+
+from shodan.injector.openaev_shodan import ShodanInjector
+from shodan.models import Asset, AssetExtendedAttributes
+
+
+def build_assets(count):
+    return [
+        {
+            "asset_id": f"asset-{i}",
+            "asset_hostname": f"host{i % (count // 2 or 1)}.example.com",
+            "asset_ips": [f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}"],
+            "asset_seen_ip": f"192.168.{i // 256 % 64}.{i % 256}",
+        }
+        for i in range(count)
+    ]
+
+
+def build_results(matches):
+    return [
+        {
+            "target": "example.com",
+            "url": "GET https://api.shodan.io/shodan/host/search?query=hostname:example.com",
+            "result": {
+                "matches": [
+                    {
+                        "ip_str": f"10.0.{m // 256 % 256}.{m % 256}",
+                        "hostnames": [
+                            f"www{m % 2000}.example.com",
+                            f"api{m % 500}.example.com",
+                        ],
+                        "os": "Linux" if m % 3 else None,
+                    }
+                    for m in range(matches)
+                ],
+                "total": matches,
+            },
+        }
+    ]
+
+
+# Baseline: the pipeline before the single-pass rewrite.
+def legacy_targets(assets):
+    targets = {"asset_ids": [], "hostnames": [], "ips": [], "seen_ips": []}
+    targets["asset_ids"] = [asset.get("asset_id") for asset in assets]
+    targets["hostnames"] = [
+        a.get("asset_hostname") for a in assets if a and a.get("asset_hostname")
+    ]
+    targets["ips"] = [ip for a in assets for ip in (a.get("asset_ips") or [])]
+    targets["seen_ips"] = [
+        a.get("asset_seen_ip") for a in assets if a and a.get("asset_seen_ip")
+    ]
+    targets["assets"] = [
+        {
+            "asset_id": a.get("asset_id"),
+            "asset_hostname": a.get("asset_hostname") or None,
+            "asset_ips": a.get("asset_ips") or [],
+            "asset_seen_ip": a.get("asset_seen_ip"),
+        }
+        for a in assets
+    ]
+    for key in ("hostnames", "ips", "seen_ips"):
+        deduplicated = []
+        for value in targets[key]:
+            if value not in deduplicated:
+                deduplicated.append(value)
+        targets[key] = deduplicated
+    return targets
+
+
+def legacy_aggregate(results):
+    found = []
+    for item in results:
+        query = urlparse(item["url"].split(maxsplit=1)[1]).query
+        origin_url = f"https://www.shodan.io/search?{query}"
+        for element in item["result"]["matches"]:
+            for hostname in element.get("hostnames", []):
+                found.append(
+                    Asset(
+                        name=hostname,
+                        description=f"Asset automatically created by Shodan Injector. (Source: {origin_url})",
+                        tags=["source:shodan.io"],
+                        extended_attributes=AssetExtendedAttributes(
+                            ip_addresses=[element["ip_str"]],
+                            platform=element.get("os", "Unknown"),
+                            hostname=hostname,
+                        ),
+                    ).model_dump()
+                )
+    merged = {}
+    for asset in found:
+        attributes = asset["extended_attributes"]
+        key = (asset["name"], attributes["platform"], attributes["arch"])
+        if key not in merged:
+            merged[key] = asset
+            attributes["ip_addresses"] = set(attributes["ip_addresses"])
+        else:
+            merged[key]["extended_attributes"]["ip_addresses"].update(
+                attributes["ip_addresses"]
+            )
+    for asset in merged.values():
+        attributes = asset["extended_attributes"]
+        attributes["ip_addresses"] = list(attributes["ip_addresses"])
+    return list(merged.values())
+
+
+def current_targets(injector, assets):
+    targets = {
+        "asset_ids": [],
+        "hostnames": [],
+        "ips": [],
+        "seen_ips": [],
+        "assets": [],
+    }
+    injector._build_targets_from_assets("automatic", targets, assets)
+    for key in ("hostnames", "ips", "seen_ips"):
+        targets[key] = injector._deduplicate(key=key, values=targets[key])
+    return targets
+
+
+def timed(run, repeat):
+    best, output = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = run()
+        best = min(best, time.perf_counter() - start)
+    return best, output
+
+
+def normalized(assets):
+    return sorted(
+        (
+            asset["name"],
+            asset["extended_attributes"]["platform"],
+            sorted(asset["extended_attributes"]["ip_addresses"]),
+            asset["description"],
+        )
+        for asset in assets
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assets", type=int, default=50_000)
+    parser.add_argument("--matches", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    config = Mock()
+    config.shodan.api_leaky_bucket_rate = 10
+    config.shodan.api_leaky_bucket_capacity = 10
+    config.shodan.api_max_concurrent_requests = 1
+    config.shodan.cache_enabled = False
+    config.shodan.quota_snapshot_ttl.total_seconds.return_value = 0
+    config.shodan.api_rate_limit_path = ""
+    # A real (silent) logger: a Mock one would record every debug call and be what is measured.
+    helper = Mock()
+    helper.injector_logger = logging.getLogger("bench_asset_pipeline")
+    injector = ShodanInjector(config=config, helper=helper)
+    assets = build_assets(args.assets)
+    results = build_results(args.matches)
+
+    legacy_targets_time, legacy_targets_output = timed(
+        lambda: legacy_targets(assets), args.repeat
+    )
+    targets_time, targets_output = timed(
+        lambda: current_targets(injector, assets), args.repeat
+    )
+    assert targets_output == legacy_targets_output
+
+    legacy_assets_time, legacy_assets_output = timed(
+        lambda: legacy_aggregate(results), args.repeat
+    )
+    assets_time, assets_output = timed(
+        lambda: injector._aggregate_assets(results), args.repeat
+    )
+    assert normalized(assets_output) == normalized(legacy_assets_output)
+
+    print(
+        f"{args.assets} assets: targets {legacy_targets_time:.3f}s -> "
+        f"{targets_time:.3f}s ({legacy_targets_time / targets_time:.1f}x)"
+    )
+    print(
+        f"{args.matches} matches ({len(assets_output)} assets): aggregation "
+        f"{legacy_assets_time:.3f}s -> {assets_time:.3f}s "
+        f"({legacy_assets_time / assets_time:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
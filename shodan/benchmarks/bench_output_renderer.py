@@ -0,0 +1,87 @@
+"""Benchmark the plain-text renderer of execution messages against the Rich one.
+
+Renders the Domain Discovery message of ``--targets`` targets with
+``--matches`` matches each, with the Rich renderer and with the plain-text
+one, and reports both timings and message sizes. ``--json`` also dumps every
+API response, as the ``show_json`` option does.
+
+    python -m benchmarks.bench_output_renderer --targets 20 --matches 500
+"""
+
+import argparse
+import copy
+import time
+
+from shodan.contracts import DomainDiscovery
+from shodan.services.utils import Utils
+
+
+def build_results(targets, matches):
+    return [
+        {
+            "target": f"host{t}.example.com",
+            "url": f"GET https://api.shodan.io/shodan/host/search?query=hostname:host{t}.example.com",
+            "result": {
+                "matches": [
+                    {
+                        "hostnames": [f"www{m}.host{t}.example.com"],
+                        "ip_str": f"10.{t % 256}.{m // 256 % 256}.{m % 256}",
+                        "port": 443,
+                        "vulns": {
+                            f"CVE-2024-{v:04d}": {"cvss": 7.5} for v in range(m % 15)
+                        },
+                    }
+                    for m in range(matches)
+                ],
+                "total": matches,
+            },
+        }
+        for t in range(targets)
+    ]
+
+
+def timed(run, repeat):
+    best, output = float("inf"), ""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = run()
+        best = min(best, time.perf_counter() - start)
+    return best, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", type=int, default=20)
+    parser.add_argument("--matches", type=int, default=500)
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    output_trace_config = copy.deepcopy(DomainDiscovery.output_trace_config())
+    output_trace_config["options"]["show_json"]["is_active"] = args.json
+    results = build_results(args.targets, args.matches)
+    utils = Utils()
+
+    def render(renderer):
+        return utils.generate_output_message(
+            output_trace_config=output_trace_config,
+            data_sections_config=[{"contract": "domain_discovery"}],
+            data_sections_info=[{"plan": "basic"}],
+            data_sections_external_api=results,
+            auto_create_assets=False,
+            renderer=renderer,
+        )
+
+    rich_time, rich_output = timed(lambda: render("rich"), args.repeat)
+    plain_time, plain_output = timed(lambda: render("plain"), args.repeat)
+
+    print(
+        f"{args.targets} targets x {args.matches} matches: "
+        f"rich {rich_time:.3f}s ({len(rich_output)} chars), "
+        f"plain {plain_time:.3f}s ({len(plain_output)} chars) "
+        f"({rich_time / plain_time:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
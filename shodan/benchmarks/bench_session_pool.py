@@ -0,0 +1,163 @@
+"""Benchmark the pooled Shodan session against a new connection per request.
+
+Starts a local stub of the Shodan API, then runs the same search over
+``--targets`` hostnames with ``ShodanClientAPI`` (one keep-alive session) and
+with the per-request ``requests.request`` it replaced, and reports both
+timings. ``--setup-delay`` is slept on every new connection, standing in for
+the DNS, TCP and TLS setup a request to api.shodan.io pays.
+
+    python -m benchmarks.bench_session_pool --targets 200 --setup-delay 0.02
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import requests
+
+from shodan.models.normalize_input_data import (
+    DomainDiscovery,
+    NormalizeInputData,
+    TargetsType,
+)
+from shodan.services.client_api import ShodanClientAPI
+
+
+def stub_server(setup_delay):
+    connections = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # One segment per response: no delayed ACK on kept-alive connections.
+        wbufsize = 1 << 16
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            connections.append(self.client_address)
+            time.sleep(setup_delay)
+
+        def do_GET(self):
+            body = json.dumps(
+                {"plan": "basic"}
+                if self.path.startswith("/api-info")
+                else {"matches": [], "total": 0}
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, connections
+
+
+def build_client(base_url, concurrency):
+    config = Mock()
+    config.shodan.base_url = base_url
+    config.shodan.api_key.get_secret_value.return_value = "bench"
+    config.shodan.api_retry = 1
+    config.shodan.api_backoff.total_seconds.return_value = 1
+    config.shodan.api_connect_timeout.total_seconds.return_value = 10
+    config.shodan.api_read_timeout.total_seconds.return_value = 60
+    # Wide enough not to be what is measured.
+    config.shodan.api_leaky_bucket_rate = 100_000
+    config.shodan.api_leaky_bucket_capacity = 100_000
+    config.shodan.api_max_concurrent_requests = concurrency
+    config.shodan.api_max_targets_per_query = 1
+    config.shodan.api_max_query_url_length = 2000
+    config.shodan.search_page_budget = 10
+    config.shodan.search_credit_budget = 10
+    config.shodan.cache_enabled = False
+    config.shodan.quota_snapshot_ttl.total_seconds.return_value = 0
+    config.shodan.api_rate_limit_path = ""
+    return ShodanClientAPI(config=config, helper=Mock())
+
+
+def build_input(targets):
+    return NormalizeInputData(
+        contract_name="domain_discovery",
+        contract_id="bench",
+        inject_content=DomainDiscovery(
+            contract="domain_discovery",
+            expectations=[],
+            target_selector="manual",
+            target_property_selector="automatic",
+            auto_create_assets=False,
+            hostname=",".join(f"host{i}.example.com" for i in range(targets)),
+            organization=None,
+        ),
+        targets=TargetsType(
+            selector_key="manual",
+            asset_ids=[],
+            hostnames=[],
+            ips=[],
+            seen_ips=[],
+            assets=[],
+        ),
+    )
+
+
+def timed(run, connections, repeat):
+    best, opened = float("inf"), 0
+    for _ in range(repeat):
+        connections.clear()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+        opened = len(connections)
+    return best, opened
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--setup-delay", type=float, default=0.02)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    server, connections = stub_server(args.setup_delay)
+    try:
+        base_url = f"http://127.0.0.1:{server.server_port}/"
+        normalize_input_data = build_input(args.targets)
+
+        # A fresh client per run for the baseline: it never reuses anything.
+        def legacy():
+            client = build_client(base_url, args.concurrency)
+            with patch.object(client.session, "request", side_effect=requests.request):
+                client.process_shodan_search(normalize_input_data)
+
+        pooled_client = build_client(base_url, args.concurrency)
+        # Warm-up: the pool is opened once per injector, not per inject.
+        pooled_client.process_shodan_search(normalize_input_data)
+
+        legacy_time, legacy_opened = timed(legacy, connections, args.repeat)
+        pooled_time, pooled_opened = timed(
+            lambda: pooled_client.process_shodan_search(normalize_input_data),
+            connections,
+            args.repeat,
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(
+        f"{args.targets} targets, {args.concurrency} concurrent searches: "
+        f"per-request {legacy_time:.3f}s ({legacy_opened} connections), "
+        f"pooled session {pooled_time:.3f}s ({pooled_opened} connections) "
+        f"({legacy_time / pooled_time:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
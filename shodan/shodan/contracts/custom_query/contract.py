@@ -67,7 +67,10 @@ class CustomQuery:
                 }
             ],
             "options": {
-                # "split_output": False,
+                "split_output": {
+                    "is_active": True,
+                    "max_size": 100_000,
+                },
                 "show_header": {
                     "is_active": True,
                     "show_subtitle": True,
@@ -82,6 +85,8 @@ class CustomQuery:
                     "is_active": False,
                     "show_lines": True,
                     "max_display_by_cell": 10,
+                    "max_cell_length": 200,
+                    "max_rows_by_table": 100,
                     "show_index": {
                         "is_active": False,
                         "index_start": 1,
@@ -94,6 +99,7 @@ class CustomQuery:
                     "is_active": True,
                     "indent": 2,
                     "sort_keys": False,
+                    "max_size": 100_000,
                 },
             },
         }
@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING
 from pyoaev.contracts import ContractBuilder
 from pyoaev.contracts.contract_config import (
     Contract,
+    ContractCheckbox,
     ContractConfig,
     ContractElement,
     ContractOutputElement,
@@ -93,7 +94,10 @@ class CVEEnumeration:
                 }
             ],
             "options": {
-                # "split_output": False,
+                "split_output": {
+                    "is_active": True,
+                    "max_size": 100_000,
+                },
                 "show_header": {
                     "is_active": True,
                     "show_subtitle": True,
@@ -108,6 +112,8 @@ class CVEEnumeration:
                     "is_active": True,
                     "show_lines": True,
                     "max_display_by_cell": 10,
+                    "max_cell_length": 200,
+                    "max_rows_by_table": 100,
                     "show_index": {
                         "is_active": False,
                         "index_start": 1,
@@ -120,6 +126,7 @@ class CVEEnumeration:
                     "is_active": False,
                     "indent": 2,
                     "sort_keys": False,
+                    "max_size": 100_000,
                 },
             },
         }
@@ -173,6 +180,12 @@ class CVEEnumeration:
                     mandatory=False,
                 ),
             ),
+            ContractCheckbox(
+                key="resolve_hostnames",
+                label="Resolve hostnames first (IP-level results)",
+                defaultValue=False,
+                mandatory=False,
+            ),
         ]
 
         contract_fields = (
@@ -37,6 +37,7 @@ class InjectorKey(StrEnum):
     TARGET_SELECTOR_KEY = "target_selector"
     TARGET_PROPERTY_SELECTOR_KEY = "target_property_selector"
     AUTO_CREATE_ASSETS = "auto_create_assets"
+    BYPASS_CACHE = "bypass_cache"
     EXPECTATIONS_KEY = "expectations"
 
 
@@ -201,6 +202,15 @@ class ShodanContracts:
             mandatory=False,
         )
 
+    @staticmethod
+    def _build_bypass_cache_checkbox() -> ContractElement:
+        return ContractCheckbox(
+            key=InjectorKey.BYPASS_CACHE,
+            label="Bypass the response cache",
+            defaultValue=False,
+            mandatory=False,
+        )
+
     @staticmethod
     def _build_expectations():
         expectation_items = [
@@ -234,6 +244,9 @@ class ShodanContracts:
         # Build Checkbox Auto-Create Assets
         checkbox_auto_create_assets = self._build_auto_create_assets_checkbox()
 
+        # Build Checkbox Bypass Cache
+        checkbox_bypass_cache = self._build_bypass_cache_checkbox()
+
         # Build expectations
         expectations = self._build_expectations()
 
@@ -243,6 +256,7 @@ class ShodanContracts:
             target_asset_groups,
             target_assets_property,
             checkbox_auto_create_assets,
+            checkbox_bypass_cache,
             expectations,
         ]
 
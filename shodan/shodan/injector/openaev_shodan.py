@@ -23,6 +23,7 @@ from shodan.models import (
     ConfigLoader,
     ContractType,
     NormalizeInputData,
+    PlatformType,
 )
 from shodan.services import ShodanClientAPI, Utils
 
@@ -76,6 +77,35 @@ class ShodanInjector:
             "scan_credits_remaining": f"{user_info.get('scan_credits')} / {usage_limits.get('scan_credits')}",
             "query_credits_remaining": f"{user_info.get('query_credits')} / {usage_limits.get('query_credits')}",
         }
+        quota = results.get("quota")
+        if quota is not None:
+            # 0s: the quota was just retrieved from Shodan, otherwise it comes from the snapshot.
+            data_sections_info["quota_snapshot_age"] = f"{quota.get('snapshot_age')}s"
+        cache_stats = results.get("cache")
+        if cache_stats is not None:
+            # Every search answered from the cache is a query credit saved.
+            data_sections_info["cache_hits"] = (
+                f"{cache_stats.get('hits')} / "
+                f"{cache_stats.get('hits') + cache_stats.get('misses')}"
+            )
+            data_sections_info["query_credits_saved"] = cache_stats.get("hits")
+        pagination = results.get("pagination")
+        if pagination is not None:
+            data_sections_info["additional_pages_read"] = (
+                f"{pagination.get('additional_pages')} "
+                f"({pagination.get('credits')} query credits)"
+            )
+            if pagination.get("truncated_targets"):
+                data_sections_info["searches_truncated"] = pagination.get(
+                    "truncated_targets"
+                )
+
+        dns = results.get("dns")
+        if dns is not None:
+            data_sections_info["hostnames_resolved"] = (
+                f"{dns.get('resolved')} / {dns.get('resolved') + dns.get('unresolved')} "
+                f"({dns.get('calls')} DNS calls, {dns.get('cached')} cached)"
+            )
 
         # Data Section External API
         results_data = results.get("data")
@@ -86,66 +116,36 @@ class ShodanInjector:
             data_sections_info=[data_sections_info],
             data_sections_external_api=results_data,
             auto_create_assets=inject_content.get("auto_create_assets", None),
+            renderer=self.config.shodan.output_renderer,
+        )
+        output_messages = self.utils.split_output_message(
+            contract_output_trace_config, rendering_output_message
         )
         self.helper.injector_logger.info(
             f"{LOG_PREFIX} - Message output preparation rendering completed successfully.",
+            {"traces": len(output_messages)},
         )
-        return rendering_output_message
-
-    def _aggregate_assets(self, found_assets_list: list[dict]):
-        merged = {}
-
-        for asset_dict in found_assets_list:
-            extended_attributes = asset_dict.get("extended_attributes", {})
-
-            hostname = asset_dict.get("name")
-            platform = extended_attributes.get("platform")
-            arch = extended_attributes.get("arch")
-
-            key = (hostname, platform, arch)
-            ips = set(extended_attributes.get("ip_addresses", []))
-
-            if key not in merged:
-                merged[key] = asset_dict
-                merged[key]["extended_attributes"]["ip_addresses"] = ips
-            else:
-                merged[key]["extended_attributes"]["ip_addresses"].update(ips)
-
-        for asset in merged.values():
-            asset_extended_attributes = asset.get("extended_attributes", {})
-            asset_hostname = asset_extended_attributes.get("hostname", "")
-            asset_ip_addresses = asset_extended_attributes.get("ip_addresses", set())
-
-            asset["extended_attributes"]["ip_addresses"] = list(asset_ip_addresses)
-
-            self.helper.injector_logger.debug(
-                f"{LOG_PREFIX} - Asset generated.",
-                {"hostname": asset_hostname, "ip_addresses": list(asset_ip_addresses)},
-            )
-
-        return list(merged.values())
-
-    def _prepare_output_structured(self, shodan_results: dict):
-
-        self.helper.injector_logger.info(
-            f"{LOG_PREFIX} - Initiating structured output preparation and asset generation.",
+        return output_messages
+
+    @staticmethod
+    def _origin_url(raw_api_url: str | None) -> str:
+        url = raw_api_url.split(maxsplit=1)[1] if raw_api_url else ""
+        parsed_url_query = urlparse(url).query
+        return (
+            f"https://www.shodan.io/search?{parsed_url_query}"
+            if parsed_url_query and "key=" not in parsed_url_query
+            else ""
         )
 
-        results = shodan_results.get("data", [])
-        found_assets_list = []
+    def _aggregate_assets(self, results: list[dict]) -> list[dict]:
+        # One pass over the matches, into one compact record per asset: (hostname, platform) -> (origin url of its
+        # first match, its IPs in order). The asset models are only built once per asset, at the end.
+        merged: dict[tuple[str, PlatformType], tuple[str, dict[str, None]]] = {}
+        platforms: dict[str, PlatformType] = {}
 
         for item in results:
             result = item.get("result", {})
-
-            raw_api_url = item.get("url")
-            url = raw_api_url.split(maxsplit=1)[1] if raw_api_url else ""
-            parsed_url = urlparse(url)
-            parsed_url_query = parsed_url.query
-            origin_url = (
-                f"https://www.shodan.io/search?{parsed_url_query}"
-                if parsed_url_query and "key=" not in parsed_url_query
-                else ""
-            )
+            origin_url = None
 
             if "matches" in result:
                 elements = result.get("matches", [])
@@ -158,29 +158,53 @@ class ShodanInjector:
 
                 ip_str = element.get("ip_str")
                 hostnames = element.get("hostnames", [])
-                os = element.get("os", "Unknown")
 
                 if not ip_str or not hostnames:
                     continue
 
+                os = element.get("os", "Unknown")
+                platform = platforms.get(os)
+                if platform is None:
+                    platform = platforms[os] = PlatformType.from_string(os)
                 for hostname in hostnames:
+                    record = merged.get((hostname, platform))
+                    if record is None:
+                        if origin_url is None:
+                            origin_url = self._origin_url(item.get("url"))
+                        merged[(hostname, platform)] = (origin_url, {ip_str: None})
+                    else:
+                        record[1][ip_str] = None
+
+        assets = []
+        for (hostname, platform), (origin_url, ips) in merged.items():
+            ip_addresses = list(ips)
+            asset = Asset(
+                name=hostname,
+                description=f"Asset automatically created by Shodan Injector. (Source: {origin_url})",
+                tags=["source:shodan.io"],
+                extended_attributes=AssetExtendedAttributes(
+                    ip_addresses=ip_addresses,
+                    platform=platform,
+                    hostname=hostname,
+                ),
+            )
+            assets.append(asset.model_dump())
 
-                    asset_extended_attributes = AssetExtendedAttributes(
-                        ip_addresses=[ip_str],
-                        platform=os,
-                        hostname=hostname,
-                    )
+            self.helper.injector_logger.debug(
+                f"{LOG_PREFIX} - Asset generated.",
+                {"hostname": hostname, "ip_addresses": ip_addresses},
+            )
 
-                    asset = Asset(
-                        name=hostname,
-                        description=f"Asset automatically created by Shodan Injector. (Source: {origin_url})",
-                        tags=["source:shodan.io"],
-                        extended_attributes=asset_extended_attributes,
-                    )
+        return assets
 
-                    found_assets_list.append(asset.model_dump())
+    def _prepare_output_structured(self, shodan_results: dict):
+
+        self.helper.injector_logger.info(
+            f"{LOG_PREFIX} - Initiating structured output preparation and asset generation.",
+        )
 
-        aggregate_assets = self._aggregate_assets(found_assets_list)
+        results = shodan_results.get("data", [])
+        aggregate_assets = self._aggregate_assets(results)
 
         self.helper.injector_logger.info(
             f"{LOG_PREFIX} - Structured output preparation and asset generation completed successfully.",
@@ -211,12 +235,14 @@ class ShodanInjector:
         if not values:
             return values
 
+        seen_values = set()
         deduplicate_values = []
         removed_values = []
         for value in values:
-            if value in deduplicate_values:
+            if value in seen_values:
                 removed_values.append(value)
             else:
+                seen_values.add(value)
                 deduplicate_values.append(value)
 
         if removed_values:
@@ -233,33 +259,25 @@ class ShodanInjector:
 
         match selector_property:
             case "automatic":
-                targets["asset_ids"] = [asset.get("asset_id") for asset in assets]
-
-                targets["hostnames"] = [
-                    asset.get("asset_hostname")
-                    for asset in assets
-                    if asset and asset.get("asset_hostname")
-                ]
-
-                targets["ips"] = [
-                    asset_ip
-                    for asset in assets
-                    for asset_ip in (asset.get("asset_ips") or [])
-                ]
-
-                targets["seen_ips"] = [
-                    asset.get("asset_seen_ip")
-                    for asset in assets
-                    if asset and asset.get("asset_seen_ip")
-                ]
-
+                # A single pass over the assets fills every target list.
                 for asset in assets:
+                    asset_hostname = asset.get("asset_hostname")
+                    asset_ips = asset.get("asset_ips") or []
+                    asset_seen_ip = asset.get("asset_seen_ip")
+
+                    targets["asset_ids"].append(asset.get("asset_id"))
+                    if asset_hostname:
+                        targets["hostnames"].append(asset_hostname)
+                    targets["ips"].extend(asset_ips)
+                    if asset_seen_ip:
+                        targets["seen_ips"].append(asset_seen_ip)
+
                     targets["assets"].append(
                         {
                             "asset_id": asset.get("asset_id"),
-                            "asset_hostname": asset.get("asset_hostname") or None,
-                            "asset_ips": asset.get("asset_ips") or [],
-                            "asset_seen_ip": asset.get("asset_seen_ip"),
+                            "asset_hostname": asset_hostname or None,
+                            "asset_ips": asset_ips,
+                            "asset_seen_ip": asset_seen_ip,
                         }
                     )
 
@@ -446,11 +464,11 @@ class ShodanInjector:
         if normalize_input_data.inject_content.auto_create_assets:
             output_structured = self._prepare_output_structured(shodan_results)
 
-        # Preparation and creation of output_message
-        output_message = self._prepare_output_message(
+        # Preparation and creation of output_messages (several ones in split mode)
+        output_messages = self._prepare_output_message(
             normalize_input_data, shodan_results, shodan_credit_user
         )
-        return output_structured, output_message
+        return output_structured, output_messages
 
     def process_message(self, data: dict) -> None:
         # Initialization to get the current start utc iso format.
@@ -472,10 +490,21 @@ class ShodanInjector:
 
         # Execute inject
         try:
-            output_structured, output_message = self._shodan_execution(data)
+            output_structured, output_messages = self._shodan_execution(data)
+            # In split mode, the first parts of the message are sent as intermediate traces.
+            for output_message_part in output_messages[:-1]:
+                self.helper.api.inject.execution_callback(
+                    inject_id=inject_id,
+                    data={
+                        "execution_message": output_message_part,
+                        "execution_status": "INFO",
+                        "execution_duration": int(time.time() - start),
+                        "execution_action": "command_execution",
+                    },
+                )
             execution_duration = int(time.time() - start)
             callback_data = {
-                "execution_message": output_message,
+                "execution_message": output_messages[-1],
                 "execution_output_structured": json.dumps(output_structured),
                 "execution_status": "SUCCESS",
                 "execution_duration": execution_duration,
@@ -21,6 +21,7 @@ from shodan.models.normalize_input_data import (
 from shodan.models.output_structured import (
     Asset,
     AssetExtendedAttributes,
+    PlatformType,
 )
 
 __all__ = [
@@ -40,4 +41,5 @@ __all__ = [
     "Operator",
     "Asset",
     "AssetExtendedAttributes",
+    "PlatformType",
 ]
@@ -16,6 +16,10 @@ class ShodanRestAPI(Enum):
         http_method="GET",
         endpoint="shodan/host/search",
     )
+    DNS_RESOLVE = ShodanRestAPIDefinition(
+        http_method="GET",
+        endpoint="dns/resolve",
+    )
     API_PLAN_INFORMATION = ShodanRestAPIDefinition(
         http_method="GET",
         endpoint="api-info",
@@ -1,8 +1,9 @@
 """Configuration for Shodan injector."""
 
 from datetime import timedelta
+from typing import Literal
 
-from pydantic import Field, PositiveInt, SecretStr
+from pydantic import Field, NonNegativeInt, PositiveInt, SecretStr
 from pydantic_settings import BaseSettings
 
 
@@ -26,6 +27,90 @@ class _ConfigLoaderShodan(BaseSettings):
         description="Maximum bucket capacity (in tokens). Defines the number of calls that can be made immediately in a "
         "burst. Once the bucket is empty, it refills at the rate defined by 'api_leaky_bucket_rate'.",
     )
+    api_rate_limit_path: str = Field(
+        default=".cache/rate_limits.sqlite",
+        description="Path of the SQLite database holding the leaky bucket. Every process and replica using the same "
+        "file (e.g. on a shared volume) shares one bucket, hence one rate limit per API key. Empty keeps the bucket "
+        "in process memory.",
+    )
+    api_max_concurrent_requests: PositiveInt = Field(
+        default=5,
+        description="Maximum number of targets searched concurrently. All searches still go through the leaky bucket, "
+        "so at most 'api_leaky_bucket_capacity' of them start at once. 1 searches the targets one after the other.",
+    )
+    api_max_targets_per_query: PositiveInt = Field(
+        default=10,
+        description="Maximum number of targets combined into one search, their values comma-separated in the contract "
+        "filters. The matches are split back to each target. 1 searches every target on its own.",
+    )
+    api_max_query_url_length: PositiveInt = Field(
+        default=2000,
+        description="Maximum length (in characters) of the URL of a combined search. Targets are no longer added to a "
+        "search once its URL would exceed it.",
+    )
+    search_page_budget: NonNegativeInt = Field(
+        default=10,
+        description="Maximum number of result pages read per inject beyond the first page of each search. A search with "
+        "more matches than one page reads its next pages while the budget allows. 0 reads first pages only.",
+    )
+    search_credit_budget: NonNegativeInt = Field(
+        default=10,
+        description="Maximum number of query credits spent per inject on result pages beyond the first page of each "
+        "search. Pages answered from the response cache spend none.",
+    )
+    api_connect_timeout: timedelta = Field(
+        default="PT10S",
+        description="Maximum time to establish a connection to the Shodan API (ISO 8601 duration format).",
+    )
+    api_read_timeout: timedelta = Field(
+        default="PT60S",
+        description="Maximum time to wait for the Shodan API to send a response (ISO 8601 duration format).",
+    )
+    cache_enabled: bool = Field(
+        default=False,
+        description="Whether search responses are cached on disk, so that a query run again within its TTL is answered "
+        "without spending Shodan query credits. Off by default: a cached response does not show what changed on the "
+        "targets since it was received.",
+    )
+    cache_path: str = Field(
+        default=".cache/shodan_responses.sqlite",
+        description="Path of the SQLite database holding the cached search responses.",
+    )
+    cache_max_size_mb: PositiveInt = Field(
+        default=100,
+        description="Maximum size of the cached responses (in MB). The least recently used ones are evicted beyond it.",
+    )
+    cache_default_ttl: timedelta = Field(
+        default="PT1H",
+        description="How long a cached search response is served (ISO 8601 duration format), for contracts without a "
+        "TTL of their own in 'cache_ttls'.",
+    )
+    cache_ttls: dict[str, timedelta] = Field(
+        default_factory=dict,
+        description='TTL of the cached search responses per contract name, e.g. {"cve_enumeration": "PT6H"} '
+        "(ISO 8601 duration format). A zero TTL disables the cache for the contract.",
+    )
+    dns_resolve_batch_size: PositiveInt = Field(
+        default=100,
+        description="Maximum number of hostnames resolved per call to the Shodan DNS resolve endpoint, for injects "
+        "resolving their hostnames before searching their IPs.",
+    )
+    dns_cache_ttl: timedelta = Field(
+        default="PT1H",
+        description="How long a hostname resolution is kept in the response cache (ISO 8601 duration format).",
+    )
+    quota_snapshot_ttl: timedelta = Field(
+        default="PT5M",
+        description="How long the account quota retrieved from Shodan ('api-info') is reused (ISO 8601 duration format), "
+        "the query credits spent by each inject deducted, before it is retrieved again. A zero TTL retrieves it at the "
+        "end of every inject.",
+    )
+    output_renderer: Literal["rich", "plain"] = Field(
+        default="rich",
+        description="Renderer of the execution message: 'rich' (trees and tables, drawn on a 150-column console) or "
+        "'plain' (lightweight plain text, rendered line by line, with tables and JSON capped by the contract's "
+        "output options).",
+    )
     api_retry: PositiveInt = Field(
         default=5,
         description="Maximum number of attempts (including the initial request) in case of API failure.",
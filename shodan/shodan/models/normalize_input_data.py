@@ -22,11 +22,13 @@ class InjectContent(BaseModel):
     target_selector: str
     target_property_selector: str
     auto_create_assets: EmptyStrToFalse
+    bypass_cache: EmptyStrToFalse = False
 
 
 class ContractFieldsCommon(InjectContent):
     hostname: list[str]
     organization: list[str] | None
+    resolve_hostnames: EmptyStrToFalse = False
 
     @field_validator("hostname", "organization", mode="before")
     def parse_hostname_and_organization(cls, values):
@@ -1,7 +1,14 @@
 from shodan.services.client_api import ShodanClientAPI
+from shodan.services.quota_snapshot import ShodanQuotaSnapshot
+from shodan.services.response_cache import ShodanResponseCache
+from shodan.services.search_pages import MatchFolder, SearchPageBudget
 from shodan.services.utils import Utils
 
 __all__ = [
     "ShodanClientAPI",
+    "MatchFolder",
+    "SearchPageBudget",
+    "ShodanQuotaSnapshot",
+    "ShodanResponseCache",
     "Utils",
 ]
@@ -1,11 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Union
 from urllib.parse import quote_plus, urljoin
 
 import requests
-from limiter import Limiter
 from pyoaev.helpers import OpenAEVInjectorHelper
+from requests.adapters import HTTPAdapter
 from tenacity import RetryError, retry, stop_after_attempt, wait_exponential_jitter
 
+from injector_common.rate_limiter import (
+    SharedTokenBucket,
+    build_token_bucket_backend,
+)
 from shodan.models import (
     ConfigLoader,
     ContractHTTPDefinition,
@@ -21,6 +26,9 @@ from shodan.models import (
     ShodanRestAPI,
     TargetsType,
 )
+from shodan.services.quota_snapshot import ShodanQuotaSnapshot
+from shodan.services.response_cache import ShodanResponseCache
+from shodan.services.search_pages import MatchFolder, SearchPageBudget
 
 LOG_PREFIX = "[SHODAN_CLIENT_API]"
 
@@ -39,13 +47,68 @@ class ShodanClientAPI:
         self.api_retry = self.config.shodan.api_retry
         self.api_backoff = self.config.shodan.api_backoff.total_seconds()
 
-        # Limiter config
-        self.rate_limiter = Limiter(
+        # Limiter config, its bucket shared by every process using the same store
+        self.rate_limiter = SharedTokenBucket(
+            bucket="shodan",
             rate=self.config.shodan.api_leaky_bucket_rate,
             capacity=self.config.shodan.api_leaky_bucket_capacity,
-            bucket="shodan",
+            backend=build_token_bucket_backend(self.config.shodan.api_rate_limit_path),
+        )
+        self.api_max_concurrent_requests = (
+            self.config.shodan.api_max_concurrent_requests
+        )
+
+        # Query coalescing config
+        self.api_max_targets_per_query = self.config.shodan.api_max_targets_per_query
+        self.api_max_query_url_length = self.config.shodan.api_max_query_url_length
+
+        # Pagination budget, per inject
+        self.search_page_budget = self.config.shodan.search_page_budget
+        self.search_credit_budget = self.config.shodan.search_credit_budget
+
+        # HTTP session shared by every request of every inject
+        self.api_timeout = (
+            self.config.shodan.api_connect_timeout.total_seconds(),
+            self.config.shodan.api_read_timeout.total_seconds(),
+        )
+        self.session = self._build_session(self.api_max_concurrent_requests)
+
+        # Search responses cache, shared by every inject
+        self.response_cache = (
+            ShodanResponseCache(
+                path=self.config.shodan.cache_path,
+                max_size_bytes=self.config.shodan.cache_max_size_mb * 1024 * 1024,
+            )
+            if self.config.shodan.cache_enabled
+            else None
+        )
+
+        # Account quota snapshot, shared by every inject
+        self.quota_snapshot = ShodanQuotaSnapshot(
+            ttl_seconds=self.config.shodan.quota_snapshot_ttl.total_seconds()
         )
 
+    @staticmethod
+    def _build_session(pool_size: int) -> requests.Session:
+        """Builds the HTTP session the client sends all its requests through.
+        Its connections to the Shodan API are kept alive and reused across targets and injects, instead of paying the
+        DNS, TCP and TLS setup again on every request. The pool keeps one connection per concurrent search.
+
+        Args:
+            pool_size (int): Number of connections kept open to the Shodan API.
+
+        Returns:
+            requests.Session: The session, with a sized connection pool mounted for HTTP and HTTPS.
+        """
+
+        session = requests.Session()
+        # Retries are handled by tenacity, not by urllib3.
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Connection": "keep-alive"})
+        return session
+
     @staticmethod
     def _secure_url(url: str) -> str:
         """Removes the API key from a URL for logging or display purposes.
@@ -112,20 +175,64 @@ class ShodanClientAPI:
         return f"{url}?{query_params}&{api_key}"
 
     # SECTION INFO
-    def _get_user_info(self) -> dict[str, Any]:
+    def _get_user_info(
+        self, query_credits_spent: int = 0
+    ) -> tuple[dict[str, Any], float]:
         """Retrieves the user's Shodan account information and quota.
+        The quota snapshot is served while younger than `quota_snapshot_ttl`, the query credits spent by the inject
+        deducted, so that the rate-limited API calls go to searches. Otherwise, it is retrieved from Shodan again.
+
+        Args:
+            query_credits_spent (int): Number of query credits spent by the searches of the inject.
 
         Returns:
-            dict[str, Any]: Dictionary containing user account information from Shodan.
+            tuple[dict[str, Any], float]: Dictionary containing user account information from Shodan, and its age (in
+                seconds).
         """
+        self.quota_snapshot.spend_query_credits(query_credits_spent)
+        snapshot = self.quota_snapshot.get()
+        if snapshot is not None:
+            self.helper.injector_logger.info(
+                f"{LOG_PREFIX} - User quota served from the snapshot.",
+                {"snapshot_age": round(snapshot[1])},
+            )
+            return snapshot
+
         self.helper.injector_logger.info(
             f"{LOG_PREFIX} - Preparation for user quota recovery...",
         )
 
-        return self._process_request(
+        user_info = self._process_request(
             raw_input=["user_info"],
             request_api=ShodanRestAPI.API_PLAN_INFORMATION,
         )
+        self.quota_snapshot.update(user_info)
+        return user_info, 0.0
+
+    @staticmethod
+    def _count_query_credits_spent(results: dict[str, Any]) -> int:
+        """Counts the query credits spent by the searches of an inject: one per search sent to Shodan (the targets of
+        a combined search share its URL), failed or cached searches excepted, plus one per additional result page.
+        A combined search discarded for the searches of its targets on their own was spent all the same.
+
+        Args:
+            results (dict[str, Any]): The results of the inject, as returned by "_process_request".
+
+        Returns:
+            int: The number of query credits spent.
+        """
+
+        searches = {
+            entry.get("url")
+            for entry in results.get("data", [])
+            if not entry.get("is_error") and not entry.get("cached")
+        }
+        searches.update(
+            entry["discarded_search"]["url"]
+            for entry in results.get("data", [])
+            if "discarded_search" in entry and not entry["discarded_search"]["cached"]
+        )
+        return len(searches) + results.get("pagination", {}).get("credits", 0)
 
     def _process_request(
         self,
@@ -133,15 +240,28 @@ class ShodanClientAPI:
         request_api: ShodanRestAPI | None,
         filters_template: dict[str, FilterDefinition] | None = None,
         is_custom_query: bool = False,
+        contract: str | None = None,
+        cache_ttl: float | None = None,
+        target_field: str = "hostname",
+        page_budget: SearchPageBudget | None = None,
     ) -> Union[dict[str, Any], Any]:
         """Sends a request to Shodan for the given targets and filters, handling retries and errors.
-        This method constructs the query URL, applies optional filters, encodes it, and calls "_request_data".
+        The targets are first packed into as few searches as the query limits allow (see "_plan_batches"), then the
+        searches are sent concurrently, by up to `api_max_concurrent_requests` workers, each one through
+        "_process_batch". The additional result pages of all the searches share one budget (see "SearchPageBudget").
 
         Args:
             raw_input (list[str] | str): List of targets or a single target string.
             request_api (ShodanRestAPI | None): The API endpoint definition to use.
             filters_template (dict[str, FilterDefinition] | None): Optional filters to apply to the query.
             is_custom_query (bool): Whether this is a custom query bypassing standard contract endpoints.
+            contract (str | None): Name of the contract the searches are made for.
+            cache_ttl (float | None): Age (in seconds) up to which a cached response is served, or None to skip the
+                cache.
+            target_field (str): Kind of the targets, "hostname" or "ip", used to split the matches of a combined
+                search back to each target.
+            page_budget (SearchPageBudget | None): The budget of additional result pages, when shared with other
+                searches of the inject, otherwise a budget of its own is used.
 
         Returns:
              Union[dict[str, Any], Any]: Either a structured dictionary with targets and results, or the raw API
@@ -152,85 +272,618 @@ class ShodanClientAPI:
         http_method = request_api.value.http_method
 
         endpoint_template = request_api.value.endpoint
+        if page_budget is None:
+            page_budget = SearchPageBudget(
+                max_pages=self.search_page_budget,
+                max_credits=self.search_credit_budget,
+            )
 
-        result = None
-        results = []
-        for target in targets:
-            new_endpoint = endpoint_template
-            query_params = target if is_custom_query else None
-            encoded_for_shodan = None
-
-            if filters_template:
-                filters_dict = {}
-                for key, filter_definition in filters_template.items():
-                    if isinstance(filter_definition.value, list):
-                        value_resolved = ",".join(
-                            str(v) for v in filter_definition.value
-                        )
-                    elif (
-                        isinstance(filter_definition.value, str)
-                        and "{target}" in filter_definition.value
-                    ):
-                        value_resolved = filter_definition.value.format(target=target)
-                    else:
-                        value_resolved = filter_definition.value
-
-                    filters_dict[key] = (value_resolved, filter_definition.operator)
-
-                query_params = self._build_query(filters_dict)
-                encoded_for_shodan = quote_plus(query_params, safe="=:,*.")
-
-            target_url = self._build_url(
-                endpoint=new_endpoint,
-                query_params=encoded_for_shodan if filters_template else query_params,
+        def search(batch: list[str]) -> list[dict[str, Any]]:
+            return self._process_batch(
+                targets=batch,
+                http_method=http_method,
+                endpoint=endpoint_template,
+                filters_template=filters_template,
                 is_custom_query=is_custom_query,
+                contract=contract,
+                cache_ttl=cache_ttl,
+                target_field=target_field,
+                page_budget=page_budget,
+            )
+
+        if is_custom_query or not filters_template:
+            batches = [[target] for target in targets]
+        else:
+            batches = self._plan_batches(targets, endpoint_template, filters_template)
+
+        # Searches are sent by a pool of workers, all of them going through the same limiter: up to
+        # `api_leaky_bucket_capacity` requests start at once, the next ones at the bucket rate. `map` gives the
+        # results back in batch order, and batches are runs of consecutive targets.
+        max_workers = min(self.api_max_concurrent_requests, len(batches))
+        if max_workers <= 1:
+            batch_results = [search(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="shodan-search"
+            ) as executor:
+                batch_results = list(executor.map(search, batches))
+        results = [entry for entries in batch_results for entry in entries]
+
+        if targets == ["user_info"]:
+            return results[0].get("result")
+        # Each cache hit is a search, hence a query credit, not spent. The targets of a combined search share its URL.
+        searches = {
+            result.get("url") or result["request"]["url"]: result.get("cached", False)
+            for result in results
+        }
+        searches.update(
+            (result["discarded_search"]["url"], result["discarded_search"]["cached"])
+            for result in results
+            if "discarded_search" in result
+        )
+        cache_hits = sum(searches.values())
+        return {
+            "targets": targets,
+            "data": results,
+            "cache": {"hits": cache_hits, "misses": len(searches) - cache_hits},
+            "pagination": page_budget.summary(),
+        }
+
+    def _resolve_hostnames(
+        self, hostnames: list[str], use_cache: bool = True
+    ) -> tuple[dict[str, str | None], dict[str, int]]:
+        """Resolves hostnames to their IP through the Shodan DNS resolve endpoint, which costs no query credit.
+        Up to `dns_resolve_batch_size` hostnames are resolved per call. Resolutions are kept in the response cache for
+        `dns_cache_ttl`, so the hostnames of the next injects are not resolved again. A call that fails leaves its
+        hostnames unresolved.
+
+        Args:
+            hostnames (list[str]): The hostnames to resolve.
+            use_cache (bool): Whether cached resolutions are served (and new ones cached).
+
+        Returns:
+            tuple[dict[str, str | None], dict[str, int]]: The IP of each hostname (None when unresolved), and the
+                number of resolve `calls` sent and of resolutions served from the cache (`cached`).
+        """
+
+        request_api = ShodanRestAPI.DNS_RESOLVE
+        dns_cache_ttl = (
+            self.config.shodan.dns_cache_ttl.total_seconds()
+            if self.response_cache is not None and use_cache
+            else 0
+        )
+        ip_by_hostname: dict[str, str | None] = {}
+        stats = {"calls": 0, "cached": 0}
+
+        to_resolve = []
+        for hostname in dict.fromkeys(hostnames):
+            if dns_cache_ttl:
+                cached = self.response_cache.get(
+                    ShodanResponseCache.build_key(request_api.endpoint, hostname),
+                    ttl_seconds=dns_cache_ttl,
+                )
+                if cached is not None:
+                    ip_by_hostname[hostname] = cached.get("ip")
+                    stats["cached"] += 1
+                    continue
+            to_resolve.append(hostname)
+
+        batch_size = self.config.shodan.dns_resolve_batch_size
+        for start in range(0, len(to_resolve), batch_size):
+            batch = to_resolve[start : start + batch_size]
+            url = self._build_url(
+                endpoint=request_api.endpoint,
+                query_params=f"hostnames={quote_plus(','.join(batch), safe=',')}",
+            )
+            stats["calls"] += 1
+            try:
+                answer = self._request_data(method=request_api.http_method, url=url)
+            except RetryError:
+                self.helper.injector_logger.warning(
+                    f"{LOG_PREFIX} - The hostnames could not be resolved, they are searched as hostnames.",
+                    {"hostnames": batch},
+                )
+                continue
+            for hostname in batch:
+                ip = answer.get(hostname)
+                ip_by_hostname[hostname] = ip
+                # Only resolutions are cached: a hostname unresolved now may resolve on the next inject.
+                if dns_cache_ttl and ip:
+                    self.response_cache.put(
+                        ShodanResponseCache.build_key(request_api.endpoint, hostname),
+                        "dns_resolve",
+                        {"ip": ip},
+                    )
+
+        return {hostname: ip_by_hostname.get(hostname) for hostname in hostnames}, stats
+
+    def _process_resolved_hostnames(
+        self,
+        hostnames: list[str],
+        filters_template: dict[str, FilterDefinition],
+        contract: str,
+        cache_ttl: float | None,
+        use_dns_cache: bool = True,
+    ) -> dict[str, Any]:
+        """Searches hostnames by the IP they resolve to, rather than by hostname and organization.
+        The hostnames are first resolved in bulk (see "_resolve_hostnames"). Their IPs are then searched with the
+        contract filters, the "ip" filter replacing those holding the "{target}" placeholder: hostnames sharing an IP
+        share its search, and IP searches combine many more targets per query. The hostnames left unresolved are
+        searched as hostnames. Each hostname gets the entry of its IP, its `resolved_ip` added.
+        This trades the subdomain and organization matching of hostname searches for IP-level results.
+
+        Args:
+            hostnames (list[str]): The hostnames to search for.
+            filters_template (dict[str, FilterDefinition]): The filters of the contract.
+            contract (str): Name of the contract the searches are made for.
+            cache_ttl (float | None): Age (in seconds) up to which a cached response is served, or None to skip the
+                cache.
+            use_dns_cache (bool): Whether cached resolutions are served.
+
+        Returns:
+            dict[str, Any]: The results, as "_process_request" returns them, with the resolution summary in `dns`.
+        """
+
+        ip_by_hostname, dns_stats = self._resolve_hostnames(
+            hostnames, use_cache=use_dns_cache
+        )
+        ips = list(dict.fromkeys(ip for ip in ip_by_hostname.values() if ip))
+        unresolved = [
+            hostname for hostname in hostnames if not ip_by_hostname[hostname]
+        ]
+
+        # "_build_query" stops at the first filter without an operator: the kept filters are joined with AND, and the
+        # "ip" filter comes last.
+        ip_filters = {
+            key: (
+                filter_definition
+                if filter_definition.operator
+                else FilterDefinition(
+                    value=filter_definition.value, operator=Operator.AND
+                )
+            )
+            for key, filter_definition in filters_template.items()
+            if not (
+                isinstance(filter_definition.value, str)
+                and "{target}" in filter_definition.value
+            )
+        }
+        ip_filters["ip"] = FilterDefinition(value="{target}")
+
+        # The IP and hostname searches share the page budget of the inject.
+        page_budget = SearchPageBudget(
+            max_pages=self.search_page_budget, max_credits=self.search_credit_budget
+        )
+        searches = []
+        if ips:
+            searches.append(
+                self._process_request(
+                    raw_input=ips,
+                    request_api=ShodanRestAPI.SEARCH_SHODAN,
+                    filters_template=ip_filters,
+                    contract=contract,
+                    cache_ttl=cache_ttl,
+                    target_field="ip",
+                    page_budget=page_budget,
+                )
+            )
+        if unresolved:
+            searches.append(
+                self._process_request(
+                    raw_input=unresolved,
+                    request_api=ShodanRestAPI.SEARCH_SHODAN,
+                    filters_template=filters_template,
+                    contract=contract,
+                    cache_ttl=cache_ttl,
+                    page_budget=page_budget,
+                )
+            )
+
+        entries = {
+            entry["target"]: entry for results in searches for entry in results["data"]
+        }
+        data = []
+        for hostname in hostnames:
+            ip = ip_by_hostname[hostname]
+            if ip:
+                data.append({**entries[ip], "target": hostname, "resolved_ip": ip})
+            else:
+                data.append(entries[hostname])
+
+        return {
+            "targets": hostnames,
+            "data": data,
+            "cache": {
+                key: sum(results["cache"][key] for results in searches)
+                for key in ("hits", "misses")
+            },
+            "pagination": page_budget.summary(),
+            "dns": {
+                "resolved": len(hostnames) - len(unresolved),
+                "unresolved": len(unresolved),
+                **dns_stats,
+            },
+        }
+
+    @staticmethod
+    def _resolve_filters(
+        filters_template: dict[str, FilterDefinition], targets: list[str]
+    ) -> dict[str, tuple[str, Operator]]:
+        """Resolves the filters of a search for one or several targets.
+        A filter holding the "{target}" placeholder gets the values of every target, comma-separated (Shodan filters
+        accept several values this way); the other filters are the same for all the targets.
+
+        Args:
+            filters_template (dict[str, FilterDefinition]): The filters of the contract.
+            targets (list[str]): The targets searched together.
+
+        Returns:
+            dict[str, tuple[str, Operator]]: Dictionary mapping filter keys to (value, operator), for "_build_query".
+        """
+
+        filters_dict = {}
+        for key, filter_definition in filters_template.items():
+            if isinstance(filter_definition.value, list):
+                value_resolved = ",".join(str(v) for v in filter_definition.value)
+            elif (
+                isinstance(filter_definition.value, str)
+                and "{target}" in filter_definition.value
+            ):
+                value_resolved = ",".join(
+                    dict.fromkeys(
+                        filter_definition.value.format(target=target)
+                        for target in targets
+                    )
+                )
+            else:
+                value_resolved = filter_definition.value
+
+            filters_dict[key] = (value_resolved, filter_definition.operator)
+        return filters_dict
+
+    def _plan_batches(
+        self,
+        targets: list[str],
+        endpoint: str,
+        filters_template: dict[str, FilterDefinition],
+    ) -> list[list[str]]:
+        """Packs consecutive targets into as few searches as possible.
+        A search takes up to `api_max_targets_per_query` targets, as long as its URL stays within
+        `api_max_query_url_length` characters. A target too long to share a search gets one of its own.
+
+        Args:
+            targets (list[str]): The targets, in order.
+            endpoint (str): The API endpoint (relative path).
+            filters_template (dict[str, FilterDefinition]): The filters of the contract.
+
+        Returns:
+            list[list[str]]: The targets of each search, in target order.
+        """
+
+        batches: list[list[str]] = []
+        for target in targets:
+            if batches and len(batches[-1]) < self.api_max_targets_per_query:
+                candidate = batches[-1] + [target]
+                query_params = self._build_query(
+                    self._resolve_filters(filters_template, candidate)
+                )
+                url = self._build_url(
+                    endpoint=endpoint,
+                    query_params=quote_plus(query_params, safe="=:,*."),
+                )
+                if len(url) <= self.api_max_query_url_length:
+                    batches[-1] = candidate
+                    continue
+            batches.append([target])
+        return batches
+
+    @staticmethod
+    def _split_matches(
+        result: dict[str, Any],
+        targets: list[str],
+        filters_template: dict[str, FilterDefinition],
+        target_field: str,
+    ) -> dict[str, dict[str, Any]] | None:
+        """Splits the response of a combined search into the response each target would have got on its own.
+        A match goes to the targets it was found for:
+        - for IP targets, the target equal to its `ip_str`;
+        - for hostname targets, the targets its `hostnames` or `domains` are, or are subdomains of, otherwise the
+          targets whose organization filter equals its `org`.
+        A match none of these rules attributes (Shodan organization matching is looser) cannot be split back: the
+        response is then not split at all.
+
+        Args:
+            result (dict[str, Any]): The response of the combined search.
+            targets (list[str]): The targets searched together.
+            filters_template (dict[str, FilterDefinition]): The filters of the contract.
+            target_field (str): Kind of the targets, "hostname" or "ip".
+
+        Returns:
+            dict[str, dict[str, Any]] | None: The response of each target, with its own matches and total, or None when
+                a match cannot be attributed to any target.
+        """
+
+        org_filter = filters_template.get("org")
+        organizations = {
+            target: (
+                org_filter.value.format(target=target)
+                if org_filter and isinstance(org_filter.value, str)
+                else ""
+            ).lower()
+            for target in targets
+        }
+        matches_by_target = {target: [] for target in targets}
+        for match in result.get("matches", []):
+            if target_field == "ip":
+                owners = [target for target in targets if match.get("ip_str") == target]
+            else:
+                names = [
+                    name.lower()
+                    for name in match.get("hostnames", []) + match.get("domains", [])
+                ]
+                owners = [
+                    target
+                    for target in targets
+                    if any(
+                        name == target.lower() or name.endswith(f".{target.lower()}")
+                        for name in names
+                    )
+                ]
+                if not owners:
+                    org = (match.get("org") or "").lower()
+                    owners = [
+                        target
+                        for target in targets
+                        if org and organizations[target] == org
+                    ]
+            if not owners:
+                return None
+            for owner in owners:
+                matches_by_target[owner].append(match)
+
+        return {
+            target: {**result, "matches": matches, "total": len(matches)}
+            for target, matches in matches_by_target.items()
+        }
+
+    def _process_batch(
+        self,
+        targets: list[str],
+        http_method: str,
+        endpoint: str,
+        filters_template: dict[str, FilterDefinition] | None,
+        is_custom_query: bool,
+        contract: str | None = None,
+        cache_ttl: float | None = None,
+        target_field: str = "hostname",
+        page_budget: SearchPageBudget | None = None,
+    ) -> list[dict[str, Any]]:
+        """Sends the search of one or several targets and returns their entries in the results.
+        When `cache_ttl` is set, a response cached for the same query within the TTL is returned instead, and a
+        successful response is cached. Errors are never cached.
+        The matches of a combined search are split back to each target. When the combined search has more matches
+        than its first page holds, or a match that cannot be attributed to any target, its targets are searched one by
+        one instead, so that none of them loses matches or gets those of another.
+        The search of a single target reads its next pages within `page_budget` (see "_fetch_remaining_pages").
+
+        Args:
+            targets (list[str]): The targets (or custom query) to search for.
+            http_method (str): The HTTP method of the API endpoint.
+            endpoint (str): The API endpoint (relative path).
+            filters_template (dict[str, FilterDefinition] | None): Optional filters to apply to the query.
+            is_custom_query (bool): Whether this is a custom query bypassing standard contract endpoints.
+            contract (str | None): Name of the contract the search is made for.
+            cache_ttl (float | None): Age (in seconds) up to which a cached response is served, or None to skip the
+                cache.
+            target_field (str): Kind of the targets, "hostname" or "ip".
+            page_budget (SearchPageBudget | None): The budget of additional result pages, or None to read the first
+                page only.
+
+        Returns:
+            list[dict[str, Any]]: For each target, in order, the target with either its result, or the request and
+                response that failed.
+        """
+        query_params = targets[0] if is_custom_query else None
+        encoded_for_shodan = None
+
+        if filters_template:
+            query_params = self._build_query(
+                self._resolve_filters(filters_template, targets)
             )
+            encoded_for_shodan = quote_plus(query_params, safe="=:,*.")
 
+        target_url = self._build_url(
+            endpoint=endpoint,
+            query_params=encoded_for_shodan if filters_template else query_params,
+            is_custom_query=is_custom_query,
+        )
+        target_entry_url = f"{http_method} {self._secure_url(target_url)}"
+
+        cached = None
+        use_cache = self.response_cache is not None and cache_ttl
+        if use_cache:
+            # Keyed by the query itself, never by the URL and its API key.
+            cache_key = ShodanResponseCache.build_key(endpoint, query_params or "")
+            cached = self.response_cache.get(cache_key, ttl_seconds=cache_ttl)
+
+        if cached is not None:
+            result = cached
+        else:
             try:
                 result = self._request_data(
                     method=http_method,
                     url=target_url,
                 )
-                results.append(
-                    {
-                        "target": target,
-                        "url": f"{http_method} {self._secure_url(target_url)}",
-                        "result": result,
-                    }
-                )
             except RetryError as retry_exc:
                 inner_exception = retry_exc.last_attempt.exception()
 
-                request = inner_exception.request
                 request_filtered = {
-                    "method": request.method,
-                    "url": f"{http_method} {self._secure_url(target_url)}",
+                    "method": http_method,
+                    "url": target_entry_url,
                 }
 
-                response = inner_exception.response
-                response_filtered = {
-                    "status_code": response.status_code,
-                    "reason": response.reason,
-                    "error": response.text,
-                }
+                # A timeout or a connection error carries no response.
+                response = getattr(inner_exception, "response", None)
+                if response is None:
+                    response_filtered = {
+                        "status_code": None,
+                        "reason": type(inner_exception).__name__,
+                        "error": str(inner_exception),
+                    }
+                else:
+                    response_filtered = {
+                        "status_code": response.status_code,
+                        "reason": response.reason,
+                        "error": response.text,
+                    }
 
-                results.append(
+                return [
                     {
                         "target": target,
                         "is_error": True,
                         "request": request_filtered,
                         "response": response_filtered,
                     }
+                    for target in targets
+                ]
+            if use_cache:
+                self.response_cache.put(cache_key, contract or "", result)
+
+        if len(targets) == 1:
+            if page_budget and result.get("total", 0) > len(result.get("matches", [])):
+                result = self._fetch_remaining_pages(
+                    first_page=result,
+                    http_method=http_method,
+                    target_url=target_url,
+                    endpoint=endpoint,
+                    query_params=query_params or "",
+                    contract=contract,
+                    cache_ttl=cache_ttl,
+                    page_budget=page_budget,
                 )
-        return (
-            result
-            if targets == ["user_info"]
-            else {"targets": targets, "data": results}
-        )
+            results_by_target = {targets[0]: result}
+        elif result.get("total", 0) > len(result.get("matches", [])):
+            results_by_target = None
+        else:
+            results_by_target = self._split_matches(
+                result, targets, filters_template, target_field
+            )
+
+        if results_by_target is None:
+            # The combined search is discarded, but it was sent: its entries keep track of it, for the credit count.
+            discarded_search = {"url": target_entry_url, "cached": cached is not None}
+            return [
+                {**entry, "discarded_search": discarded_search}
+                for target in targets
+                for entry in self._process_batch(
+                    targets=[target],
+                    http_method=http_method,
+                    endpoint=endpoint,
+                    filters_template=filters_template,
+                    is_custom_query=is_custom_query,
+                    contract=contract,
+                    cache_ttl=cache_ttl,
+                    target_field=target_field,
+                    page_budget=page_budget,
+                )
+            ]
+
+        entries = []
+        for target in targets:
+            entry = {
+                "target": target,
+                "url": target_entry_url,
+                "result": results_by_target[target],
+            }
+            if cached is not None:
+                entry["cached"] = True
+            entries.append(entry)
+        return entries
+
+    def _fetch_remaining_pages(
+        self,
+        first_page: dict[str, Any],
+        http_method: str,
+        target_url: str,
+        endpoint: str,
+        query_params: str,
+        contract: str | None,
+        cache_ttl: float | None,
+        page_budget: SearchPageBudget,
+    ) -> dict[str, Any]:
+        """Reads the pages of a search after its first one, as long as `page_budget` allows.
+        Each page is folded into the matches already read as soon as it is received (see "MatchFolder"), so a search
+        with many pages is held as one match per service, in the shape of a Shodan page, rather than as all its pages. Pages are cached like first pages.
+        A page that fails ends the reading, keeping the matches already read. When no page could be read, the first
+        page is returned as is.
+
+        Args:
+            first_page (dict[str, Any]): The response of the first page of the search.
+            http_method (str): The HTTP method of the API endpoint.
+            target_url (str): The URL of the first page of the search.
+            endpoint (str): The API endpoint (relative path).
+            query_params (str): The query of the search, for the cache keys of its pages.
+            contract (str | None): Name of the contract the search is made for.
+            cache_ttl (float | None): Age (in seconds) up to which a cached page is served, or None to skip the cache.
+            page_budget (SearchPageBudget): The budget of additional result pages of the inject.
+
+        Returns:
+            dict[str, Any]: The response of the search, with the folded matches of every page read and their count in
+                `pages`.
+        """
+
+        total = first_page.get("total", 0)
+        folder = MatchFolder()
+        folder.add(first_page.get("matches", []))
+        use_cache = self.response_cache is not None and cache_ttl
+        page = 1
+        while folder.read < total:
+            if not page_budget.reserve():
+                page_budget.record_truncated()
+                self.helper.injector_logger.warning(
+                    f"{LOG_PREFIX} - The page budget of the inject is spent, the remaining pages are not read.",
+                    {"url": self._secure_url(target_url), "pages_read": page},
+                )
+                break
+            page += 1
+            cache_key = ShodanResponseCache.build_key(
+                endpoint, f"{query_params}&page={page}"
+            )
+            cached = (
+                self.response_cache.get(cache_key, ttl_seconds=cache_ttl)
+                if use_cache
+                else None
+            )
+            if cached is not None:
+                page_budget.refund_credit()
+                page_result = cached
+            else:
+                try:
+                    page_result = self._request_data(
+                        method=http_method, url=f"{target_url}&page={page}"
+                    )
+                except RetryError:
+                    page_budget.record_truncated()
+                    self.helper.injector_logger.warning(
+                        f"{LOG_PREFIX} - A result page could not be read, the remaining pages are not read.",
+                        {"url": self._secure_url(target_url), "page": page},
+                    )
+                    break
+                if use_cache:
+                    self.response_cache.put(cache_key, contract or "", page_result)
+
+            matches = page_result.get("matches", [])
+            if not matches:
+                break
+            folder.add(matches)
+
+        if page == 1:
+            return first_page
+        return {**first_page, "matches": folder.matches, "pages": page}
 
     def _request_data(self, method: str, url: str) -> dict[str, Any]:
         """Sends an HTTP request to the given URL using the specified method, with built-in retry and rate limiting
-        mechanisms.
+        mechanisms. The request goes through the client's pooled session, with its connect and read timeouts.
 
         Args:
             method (str): The HTTP method to use for the request.
@@ -250,7 +903,9 @@ class ShodanClientAPI:
             ),
         )
         def _retry_wrapped():
-            response = requests.request(method=method, url=url)
+            response = self.session.request(
+                method=method, url=url, timeout=self.api_timeout
+            )
             response.raise_for_status()
             return response.json()
 
@@ -271,7 +926,8 @@ class ShodanClientAPI:
         - If `automatic`, it selects the targets based on the `target_property_selector` and `target_field`.
 
         Once targets are resolved, the method invokes `_process_request` to query Shodan
-        and return the structured results.
+        and return the structured results. Hostnames the inject asks to resolve first are searched by IP instead
+        (see "_process_resolved_hostnames").
 
         Args:
             inject_content (InjectContentType): Object containing information injected by the user.
@@ -282,6 +938,7 @@ class ShodanClientAPI:
             dict[str, Any]: Dictionary containing the results of the Shodan search.
         """
         target_selector = inject_content.target_selector
+        cache_ttl = self._get_cache_ttl(inject_content)
         target_field = contract_http_definition.target_field
         required_fields = contract_http_definition.required_fields
 
@@ -306,6 +963,8 @@ class ShodanClientAPI:
                     raw_input=resolved_targets,
                     request_api=ShodanRestAPI.SEARCH_SHODAN,
                     is_custom_query=True,
+                    contract=inject_content.contract,
+                    cache_ttl=cache_ttl,
                 )
         else:
             target_property_selector = inject_content.target_property_selector
@@ -348,12 +1007,44 @@ class ShodanClientAPI:
                 f"{LOG_PREFIX} - No targets were recovered for the contract."
             )
 
+        if target_field == "hostname" and getattr(
+            inject_content, "resolve_hostnames", False
+        ):
+            return self._process_resolved_hostnames(
+                hostnames=resolved_targets,
+                filters_template=contract_http_definition.filters,
+                contract=inject_content.contract,
+                cache_ttl=cache_ttl,
+                use_dns_cache=not inject_content.bypass_cache,
+            )
+
         return self._process_request(
             raw_input=resolved_targets,
             request_api=ShodanRestAPI.SEARCH_SHODAN,
             filters_template=contract_http_definition.filters,
+            contract=inject_content.contract,
+            cache_ttl=cache_ttl,
+            target_field=target_field,
         )
 
+    def _get_cache_ttl(self, inject_content: InjectContentType) -> float | None:
+        """Returns how long the cached responses of the inject's contract are served, in seconds.
+
+        Args:
+            inject_content (InjectContentType): Object containing information injected by the user.
+
+        Returns:
+            float | None: The TTL of the contract, or None when the cache is disabled, bypassed by the inject, or
+                disabled for the contract (zero TTL).
+        """
+
+        if self.response_cache is None or inject_content.bypass_cache:
+            return None
+        ttl = self.config.shodan.cache_ttls.get(
+            inject_content.contract, self.config.shodan.cache_default_ttl
+        ).total_seconds()
+        return ttl or None
+
     def _get_contract_http_definition(
         self, inject_content: InjectContentType
     ) -> ContractHTTPDefinition:
@@ -458,7 +1149,7 @@ class ShodanClientAPI:
 
         It begins by retrieving all the information provided by the user (inject_content and targets), then retrieves
         the definition of the corresponding contract, executes the Shodan search for these targets, and finally
-        retrieves the user's quota information.
+        retrieves the user's quota information (from the quota snapshot while it is fresh, see "_get_user_info").
 
         Args:
             normalize_input_data (NormalizeInputData): Object containing all information about the content injected by
@@ -488,7 +1179,10 @@ class ShodanClientAPI:
             inject_content, targets, contract_http_definition
         )
 
-        shodan_credit_user = self._get_user_info()
+        shodan_credit_user, quota_snapshot_age = self._get_user_info(
+            query_credits_spent=self._count_query_credits_spent(results)
+        )
+        results["quota"] = {"snapshot_age": round(quota_snapshot_age)}
 
         self.helper.injector_logger.info(
             f"{LOG_PREFIX} - Finalization of the Shodan search process.",
@@ -0,0 +1,367 @@
+import json
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+    from shodan.services.utils import Utils
+
+INDENT = "  "
+
+
+class PlainTextRenderer:
+    def __init__(self, utils: "Utils"):
+        """Lightweight renderer of the execution message, as plain text.
+        It renders the same sections as the Rich renderer of `Utils`, line by line and lazily: no tree, table or console
+        is built, and each line is produced only when the previous ones have been consumed. The tables and the JSON
+        dump are capped by the `output_trace_config` options:
+        - `show_tables.max_rows_by_table`: rows shown per table;
+        - `show_tables.max_display_by_cell`: values shown per cell, and `show_tables.max_cell_length`: characters shown
+          per cell;
+        - `show_json.max_size`: characters of the JSON dump.
+
+        Args:
+            utils (Utils): The utils holding the trace config and call details helpers.
+        """
+
+        self.utils = utils
+
+    def _option(self, output_trace_config: dict, path: str, default=None):
+        return self.utils._get_trace_config(output_trace_config, path, default)
+
+    def _title(self, output_trace_config: dict, path: str, icon: str, title: str):
+        icon = self.utils._get_output_icon(
+            self._option(output_trace_config, f"{path}.header.icon", default=icon)
+        )
+        title = self._option(output_trace_config, f"{path}.header.title", title)
+        return f"{icon} {title}".strip()
+
+    def _section_is_shown(self, output_trace_config: dict, section: str) -> bool:
+        return self._option(
+            output_trace_config, "options.show_sections.is_active", default=True
+        ) and self._option(
+            output_trace_config, f"options.show_sections.{section}", default=True
+        )
+
+    # HEADER
+    def _iter_header(self, output_trace_config: dict) -> Iterator[str]:
+        options = output_trace_config.get("options", {})
+        show_header = options.get("show_header", {})
+        if not show_header.get("is_active", True):
+            return
+
+        header = output_trace_config.get("header", {})
+        now = datetime.now().isoformat(sep=" ", timespec="seconds")
+        yield f"===== {header.get('title', '')} ====="
+        if show_header.get("show_subtitle", True):
+            yield header.get("subtitle", now) or now
+
+    # SECTIONS CONFIG AND INFO
+    def _iter_value(self, key: str, value: Any, depth: int) -> Iterator[str]:
+        indent = INDENT * depth
+        if isinstance(value, (list, dict)):
+            yield f"{indent}{key}:"
+            items = value if isinstance(value, list) else [value]
+            for item in items:
+                if isinstance(item, dict):
+                    for sub_key, sub_value in item.items():
+                        if sub_value is None or sub_value == "":
+                            continue
+                        yield from self._iter_value(sub_key, sub_value, depth + 1)
+                else:
+                    yield f"{indent}{INDENT}{item}"
+        else:
+            yield f"{indent}{key}: {value}"
+
+    def _iter_section(
+        self, output_trace_config: dict, section: str, data: list[dict], title: str
+    ) -> Iterator[str]:
+        keys_list_to_string = self._option(
+            output_trace_config, f"{section}.keys_list_to_string", default=[]
+        )
+        keys_to_exclude = (
+            self._option(output_trace_config, f"{section}.keys_to_exclude") or []
+        )
+
+        yield title
+        for data_section in data:
+            if not isinstance(data_section, dict):
+                continue
+            for key, value in data_section.items():
+                if key in keys_to_exclude or value is None or not value:
+                    continue
+                if key in keys_list_to_string and isinstance(value, list):
+                    value = ", ".join(
+                        (
+                            ", ".join(f"{k}:{v}" for k, v in item.items())
+                            if isinstance(item, dict)
+                            else str(item)
+                        )
+                        for item in value
+                    )
+                yield from self._iter_value(key, value, 1)
+
+    # SECTION EXTERNAL API
+    def _iter_section_external_api(
+        self, output_trace_config: dict, call_details: tuple
+    ) -> Iterator[str]:
+        (results_success, total_success), (results_failed, total_failed) = call_details
+        count_at_path = self._option(
+            output_trace_config,
+            "sections_external_api.call_success.count_at_path",
+            default="",
+        )
+
+        yield self._title(
+            output_trace_config,
+            "sections_external_api",
+            "API",
+            "[INJECTOR] Call API completed",
+        )
+        success_icon = self.utils._get_output_icon(
+            self._option(
+                output_trace_config,
+                "sections_external_api.call_success.icon",
+                default="SUCCESS",
+            )
+        )
+        success_title = self._option(
+            output_trace_config,
+            "sections_external_api.call_success.title",
+            default="Call Success",
+        )
+        yield f"{INDENT}{success_icon} {success_title}".rstrip()
+        yield f"{INDENT * 2}Total results: {total_success}"
+        yield f"{INDENT * 2}Details:"
+        for result_detail in results_success:
+            count = (
+                self.utils._count_at_path(result_detail.get("result"), count_at_path)
+                if count_at_path
+                else 0
+            )
+            yield f"{INDENT * 3}• {result_detail.get('data_target')} → {count} results"
+            yield f"{INDENT * 4}Request: {result_detail.get('request')}"
+
+        failed_icon = self.utils._get_output_icon(
+            self._option(
+                output_trace_config,
+                "sections_external_api.call_failed.icon",
+                default="FAILED",
+            )
+        )
+        failed_title = self._option(
+            output_trace_config,
+            "sections_external_api.call_failed.title",
+            default="Call Failed",
+        )
+        yield f"{INDENT}{failed_icon} {failed_title}".rstrip()
+        yield f"{INDENT * 2}Total results: {total_failed}"
+        yield f"{INDENT * 2}Details:"
+        for result_detail in results_failed:
+            yield f"{INDENT * 3}• {result_detail.get('data_target')}"
+            yield f"{INDENT * 4}Error: {result_detail.get('error')}"
+            yield f"{INDENT * 4}Request: {result_detail.get('request')}"
+
+    # TABLES
+    @staticmethod
+    def _cap_cell(cell: str, max_values: int | None, max_length: int | None) -> str:
+        if max_values is not None and "," in cell:
+            values = [value.strip() for value in cell.split(",") if value.strip()]
+            if len(values) > max_values:
+                cell = (
+                    f"{', '.join(values[:max_values])} "
+                    f"...(+{len(values) - max_values} hidden)"
+                )
+        if max_length is not None and len(cell) > max_length:
+            cell = f"{cell[:max_length]}…"
+        return cell
+
+    def _iter_tables(
+        self,
+        output_trace_config: dict,
+        data_tables: list[dict],
+        auto_create_assets: bool | None,
+    ) -> Iterator[str]:
+        if not self._option(
+            output_trace_config, "options.show_tables.is_active", default=True
+        ):
+            return
+
+        show_index = self._option(
+            output_trace_config, "options.show_tables.show_index.is_active", False
+        )
+        index_start = self._option(
+            output_trace_config, "options.show_tables.show_index.index_start", 0
+        )
+        max_rows = self._option(
+            output_trace_config, "options.show_tables.max_rows_by_table", 100
+        )
+        max_values = self._option(
+            output_trace_config, "options.show_tables.max_display_by_cell", 10
+        )
+        max_length = self._option(
+            output_trace_config, "options.show_tables.max_cell_length", 200
+        )
+
+        first = True
+        for table_config in self._option(output_trace_config, "tables", default=[]):
+            header_icon = self.utils._get_output_icon(
+                self._option(table_config, "header.icon", default="SEARCH")
+            )
+            header_title = self._option(table_config, "header.title", default="")
+            search_entity = self._option(table_config, "config.search_entity")
+            columns = self._option(table_config, "config.columns") or []
+
+            for data_table in data_tables:
+                if not first:
+                    yield ""
+                first = False
+                result = data_table.get("result")
+                entity = result.get(search_entity) or data_table.get("data_target")
+                if header_title:
+                    table_title = header_title.format(**result)
+                else:
+                    table_title = (
+                        f"Asset(s) {'Created' if auto_create_assets else 'Not Created'} "
+                        f"for {entity}"
+                    )
+
+                column_values = []
+                column_extras = []
+                for column in columns:
+                    column_values.append(
+                        self.utils._extractor(
+                            result, column.get("path"), column.get("use_key", False)
+                        )[0]
+                    )
+                    extra_path = column.get("extra")
+                    column_extras.append(
+                        self.utils._extractor(result, extra_path)[0]
+                        if extra_path
+                        else None
+                    )
+
+                row_count = max((len(values) for values in column_values), default=0)
+                if not row_count:
+                    yield f"Result for {entity}: No data found"
+                    continue
+
+                yield f"{header_icon} {table_title}".strip()
+                header = [column.get("title", "-") for column in columns]
+                yield " | ".join((["#"] if show_index else []) + header)
+                shown_rows = row_count if max_rows is None else min(row_count, max_rows)
+                for row_index in range(shown_rows):
+                    cells = [str(index_start + row_index)] if show_index else []
+                    for values, extras in zip(column_values, column_extras):
+                        value = values[row_index] if row_index < len(values) else None
+                        extra = (
+                            extras[row_index]
+                            if extras and row_index < len(extras)
+                            else None
+                        )
+                        cells.append(
+                            self._cap_cell(
+                                self.utils._format_cell(value, extra),
+                                max_values,
+                                max_length,
+                            )
+                        )
+                    yield " | ".join(cells)
+                if shown_rows < row_count:
+                    yield f"...(+{row_count - shown_rows} rows hidden)"
+
+    # JSON
+    def _iter_json(self, output_trace_config: dict, data) -> Iterator[str]:
+        if not self._option(output_trace_config, "options.show_json.is_active", False):
+            return
+
+        max_size = self._option(
+            output_trace_config, "options.show_json.max_size", 100_000
+        )
+        encoder = json.JSONEncoder(
+            indent=self._option(output_trace_config, "options.show_json.indent", 2),
+            sort_keys=self._option(
+                output_trace_config, "options.show_json.sort_keys", False
+            ),
+            ensure_ascii=False,
+            default=str,
+        )
+
+        # The JSON is encoded piece by piece, and no further than its size cap.
+        chunks = []
+        size = 0
+        for chunk in encoder.iterencode(data):
+            if max_size is not None and size + len(chunk) > max_size:
+                chunks.append(chunk[: max_size - size])
+                yield from "".join(chunks).splitlines()
+                yield f"...(JSON truncated to {max_size} characters)"
+                return
+            chunks.append(chunk)
+            size += len(chunk)
+        yield from "".join(chunks).splitlines()
+
+    def iter_output_lines(
+        self,
+        output_trace_config: dict,
+        data_sections_config: list[dict],
+        data_sections_info: list[dict],
+        data_sections_external_api: list[dict],
+        auto_create_assets: bool | None,
+    ) -> Iterator[str]:
+        """Renders the execution message, one line at a time."""
+
+        sections = [self._iter_header(output_trace_config)]
+        if self._section_is_shown(output_trace_config, "sec_config"):
+            sections.append(
+                self._iter_section(
+                    output_trace_config,
+                    "sections_config",
+                    data_sections_config,
+                    self._title(
+                        output_trace_config,
+                        "sections_config",
+                        "CONFIG",
+                        "[CONFIG] Summary of all configurations used for the contract.",
+                    ),
+                )
+            )
+        if self._section_is_shown(output_trace_config, "sec_info"):
+            sections.append(
+                self._iter_section(
+                    output_trace_config,
+                    "sections_info",
+                    data_sections_info,
+                    self._title(
+                        output_trace_config,
+                        "sections_info",
+                        "INFO",
+                        "[INFO] The Injector information",
+                    ),
+                )
+            )
+
+        call_details = self.utils._prepare_call_details(
+            output_trace_config, data_sections_external_api
+        )
+        if self._section_is_shown(output_trace_config, "sec_external_api"):
+            sections.append(
+                self._iter_section_external_api(output_trace_config, call_details)
+            )
+            results_success = call_details[0][0]
+            if results_success:
+                sections.append(
+                    self._iter_tables(
+                        output_trace_config, results_success, auto_create_assets
+                    )
+                )
+        sections.append(
+            self._iter_json(output_trace_config, data_sections_external_api)
+        )
+
+        for section in sections:
+            first = True
+            for line in section:
+                if first:
+                    # Sections are separated by a blank line.
+                    yield ""
+                    first = False
+                yield line
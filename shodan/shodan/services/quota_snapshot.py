@@ -0,0 +1,53 @@
+import copy
+import threading
+import time
+from typing import Any
+
+
+class ShodanQuotaSnapshot:
+    def __init__(self, ttl_seconds: float, clock=time.monotonic):
+        """Last known quota of the Shodan account (its "api-info"), shared by every inject.
+        It is served while younger than `ttl_seconds`, instead of calling "api-info" at the end of every inject. In the
+        meantime, the query credits spent by each inject's searches are deducted from it. The snapshot thus follows the
+        spending of this injector, not that of other clients of the same API key, until it is refreshed.
+
+        Args:
+            ttl_seconds (float): Age (in seconds) up to which the snapshot is served. 0 disables the snapshot.
+            clock: Time source, in seconds.
+        """
+
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._user_info: dict[str, Any] | None = None
+        self._taken_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> tuple[dict[str, Any], float] | None:
+        """Returns a copy of the snapshot and its age (in seconds), or None when there is none younger than the TTL."""
+
+        with self._lock:
+            if self._user_info is None:
+                return None
+            age = self._clock() - self._taken_at
+            if age >= self.ttl_seconds:
+                return None
+            return copy.deepcopy(self._user_info), age
+
+    def update(self, user_info: dict[str, Any] | None) -> None:
+        """Replaces the snapshot with the account information just retrieved from Shodan."""
+
+        if not self.ttl_seconds or not isinstance(user_info, dict):
+            return
+        with self._lock:
+            self._user_info = copy.deepcopy(user_info)
+            self._taken_at = self._clock()
+
+    def spend_query_credits(self, credits: int) -> None:
+        """Deducts the query credits spent by a search from the snapshot."""
+
+        with self._lock:
+            if not credits or self._user_info is None:
+                return
+            query_credits = self._user_info.get("query_credits")
+            if isinstance(query_credits, int):
+                self._user_info["query_credits"] = max(query_credits - credits, 0)
@@ -0,0 +1,111 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    contract TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    last_used REAL NOT NULL
+)
+"""
+
+
+class ShodanResponseCache:
+    def __init__(self, path: str, max_size_bytes: int, clock=time.time):
+        """Persistent cache of Shodan search responses, stored in a SQLite database.
+
+        Responses are keyed by the normalized query they answer (never the API key) and are only served while younger
+        than the TTL of the lookup. Once the stored responses exceed `max_size_bytes`, the least recently used ones are
+        evicted. The cache never fails a search: any database error behaves as a miss.
+
+        Args:
+            path (str): Path of the SQLite database, created if missing.
+            max_size_bytes (int): Maximum total size of the stored responses.
+            clock: Time source, in seconds.
+        """
+
+        self.max_size_bytes = max_size_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(_SCHEMA)
+
+    @staticmethod
+    def build_key(endpoint: str, query: str) -> str:
+        """Builds the cache key of a query: the endpoint and the query, whitespace-normalized.
+
+        Args:
+            endpoint (str): The API endpoint (relative path).
+            query (str): The query string, as built by `_build_query` (or the raw custom query).
+
+        Returns:
+            str: The cache key.
+        """
+
+        return f"{endpoint.strip('/')}?{' '.join(query.split())}"
+
+    def get(self, key: str, ttl_seconds: float) -> dict[str, Any] | None:
+        """Returns the response stored for `key` if it is younger than `ttl_seconds`, otherwise None."""
+
+        now = self._clock()
+        try:
+            with self._lock, self._connection:
+                row = self._connection.execute(
+                    "SELECT response, stored_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                response, stored_at = row
+                if now - stored_at >= ttl_seconds:
+                    return None
+                self._connection.execute(
+                    "UPDATE responses SET last_used = ? WHERE key = ?", (now, key)
+                )
+            return json.loads(response)
+        except (sqlite3.Error, ValueError):
+            return None
+
+    def put(self, key: str, contract: str, response: dict[str, Any]) -> None:
+        """Stores the response of `key`, then evicts the least recently used responses over the size budget."""
+
+        now = self._clock()
+        payload = json.dumps(response, separators=(",", ":"))
+        size = len(payload.encode())
+        if size > self.max_size_bytes:
+            return
+        try:
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, contract, payload, size, now, now),
+                )
+                self._evict()
+        except sqlite3.Error:
+            pass
+
+    def _evict(self) -> None:
+        (total,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        if total <= self.max_size_bytes:
+            return
+        evicted = []
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY last_used"
+        ):
+            evicted.append((key,))
+            total -= size
+            if total <= self.max_size_bytes:
+                break
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
@@ -0,0 +1,93 @@
+import threading
+from typing import Any
+
+# Fields of a match listing several values, merged when matches of the same service are folded.
+_LIST_FIELDS = ("hostnames", "domains")
+
+
+class SearchPageBudget:
+    def __init__(self, max_pages: int, max_credits: int):
+        """Budget of the additional result pages an inject may fetch, shared by all its searches.
+        The first page of every search is always fetched: the budget only bounds the pages after it. A page counts
+        against `max_pages`, and against `max_credits` too unless it comes from the response cache.
+
+        Args:
+            max_pages (int): Maximum number of additional pages fetched by the inject.
+            max_credits (int): Maximum number of query credits spent on additional pages by the inject.
+        """
+
+        self.max_pages = max_pages
+        self.max_credits = max_credits
+        self.pages = 0
+        self.credits = 0
+        self.truncated_targets = 0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> bool:
+        """Reserves one more page (and one credit), or returns False when the budget is spent."""
+
+        with self._lock:
+            if self.pages >= self.max_pages or self.credits >= self.max_credits:
+                return False
+            self.pages += 1
+            self.credits += 1
+            return True
+
+    def refund_credit(self) -> None:
+        """Gives back the credit of a reserved page answered from the response cache."""
+
+        with self._lock:
+            self.credits -= 1
+
+    def record_truncated(self) -> None:
+        """Records a search whose remaining pages were not fetched."""
+
+        with self._lock:
+            self.truncated_targets += 1
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "additional_pages": self.pages,
+            "credits": self.credits,
+            "truncated_targets": self.truncated_targets,
+        }
+
+
+class MatchFolder:
+    def __init__(self):
+        """Folds the matches of a search, page after page, into one match per service, in the shape of a Shodan page.
+        A service is a port of a host (`ip_str`, `port` and `transport`): Shodan may list it again on a later page,
+        in which case its hostnames and domains are united and its vulnerabilities merged into the match read first,
+        whose other fields (banner, product, http...) are kept. Memory thus grows with the services found, not with the
+        matches read, and each page can be dropped once folded.
+        """
+
+        self._services: dict[Any, dict[str, Any]] = {}
+        self.read = 0
+
+    def add(self, matches: list[dict[str, Any]]) -> None:
+        for match in matches:
+            self.read += 1
+            ip_str = match.get("ip_str")
+            key = (
+                (ip_str, match.get("port"), match.get("transport"))
+                if ip_str
+                else ("no_ip", self.read)
+            )
+            folded = self._services.get(key)
+            if folded is None:
+                self._services[key] = dict(match)
+                continue
+            for field in _LIST_FIELDS:
+                values = folded.get(field) or []
+                new_values = [
+                    value for value in match.get(field) or [] if value not in values
+                ]
+                if new_values:
+                    folded[field] = [*values, *new_values]
+            if match.get("vulns"):
+                folded["vulns"] = {**(folded.get("vulns") or {}), **match["vulns"]}
+
+    @property
+    def matches(self) -> list[dict[str, Any]]:
+        return list(self._services.values())
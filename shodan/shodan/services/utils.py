@@ -13,6 +13,8 @@ from rich.table import Table
 from rich.text import Text
 from rich.tree import Tree
 
+from shodan.services.plain_renderer import PlainTextRenderer
+
 
 class OutputIcons(Enum):
     SUCCESS = "✅"
@@ -268,10 +270,16 @@ class Utils:
                 else:
                     error_message = raw_error
 
+                if response.get("status_code") is None:
+                    error_status = response.get("reason")
+                else:
+                    error_status = (
+                        f"{response.get('status_code')} - {response.get('reason')}"
+                    )
                 call_failed_details = {
                     "data_target": result.get("target"),
                     "request": request.get("url"),
-                    "error": f"{error_message} ({response.get('status_code')} - {response.get('reason')})",
+                    "error": f"{error_message} ({error_status})",
                 }
                 total_call_failed_count += 1
                 results_failed.append(call_failed_details)
@@ -281,6 +289,8 @@ class Utils:
                     "request": result.get("url"),
                     "result": result.get("result"),
                 }
+                if result.get("cached"):
+                    call_success_details["cached"] = True
                 results_success.append(call_success_details)
                 count_at_path = self._get_trace_config(
                     output_trace_config,
@@ -670,8 +680,18 @@ class Utils:
         data_sections_info: list[dict],
         data_sections_external_api: list[dict],
         auto_create_assets: bool | None,
+        renderer: str = "rich",
     ):
-        # Todo: Make split mode
+        if renderer == "plain":
+            return "\n".join(
+                PlainTextRenderer(self).iter_output_lines(
+                    output_trace_config=output_trace_config,
+                    data_sections_config=data_sections_config,
+                    data_sections_info=data_sections_info,
+                    data_sections_external_api=data_sections_external_api,
+                    auto_create_assets=auto_create_assets,
+                )
+            )
 
         renderables = []
 
@@ -762,3 +782,51 @@ class Utils:
             console.print(group)
         output_str = capture.get()
         return output_str
+
+    def split_output_message(
+        self, output_trace_config: dict, output_message: str
+    ) -> list[str]:
+        """Splits a long execution message into several traces, on line boundaries.
+        Split mode is set by the `options.split_output` of `output_trace_config`: when active, each trace holds at most
+        `max_size` characters (a longer line is cut). Otherwise, or when the message fits, it is sent as a single trace.
+
+        Args:
+            output_trace_config (dict): The output trace config of the contract.
+            output_message (str): The rendered execution message.
+
+        Returns:
+            list[str]: The messages of the traces, in order.
+        """
+
+        if not self._get_trace_config(
+            output_trace_config, "options.split_output.is_active", default=False
+        ):
+            return [output_message]
+        max_size = self._get_trace_config(
+            output_trace_config, "options.split_output.max_size", default=100_000
+        )
+        if len(output_message) <= max_size:
+            return [output_message]
+
+        chunks = []
+        current = []
+        current_size = 0
+        for line in output_message.split("\n"):
+            if len(line) > max_size:
+                if current:
+                    chunks.append("\n".join(current))
+                    current, current_size = [], 0
+                chunks.extend(
+                    line[start : start + max_size]
+                    for start in range(0, len(line) - max_size, max_size)
+                )
+                line = line[(len(line) - 1) // max_size * max_size :]
+            # The size of a chunk counts the line breaks between its lines.
+            if current and current_size + 1 + len(line) > max_size:
+                chunks.append("\n".join(current))
+                current, current_size = [], 0
+            current_size += len(line) + (1 if current else 0)
+            current.append(line)
+        if current:
+            chunks.append("\n".join(current))
+        return chunks
@@ -1,7 +1,10 @@
 """Conftest file for Pytest fixtures."""
 
+from datetime import timedelta
+from typing import Callable
 from unittest.mock import Mock, patch
 
+from pydantic import SecretStr
 from pytest import fixture
 
 from shodan.injector.openaev_shodan import ShodanInjector
@@ -40,33 +43,64 @@ def disable_config_yml():
     patcher.stop()
 
 
-@fixture
-def shodan_client_api() -> ShodanClientAPI:
-    """Provide a ShodanClientAPI with mocked config and helper."""
+# Shodan configuration of the mocked clients, each test overriding only the keys it is about.
+SHODAN_TEST_CONFIG = {
+    "base_url": "https://api.shodan.io",
+    "api_key": SecretStr("test-api-key"),
+    "api_retry": 1,
+    "api_backoff": timedelta(seconds=1),
+    "api_connect_timeout": timedelta(seconds=10),
+    "api_read_timeout": timedelta(seconds=60),
+    "api_leaky_bucket_rate": 100,
+    "api_leaky_bucket_capacity": 100,
+    "api_rate_limit_path": "",
+    # Contract tests serve their mocked responses in call order.
+    "api_max_concurrent_requests": 1,
+    # They also check the query sent for each target.
+    "api_max_targets_per_query": 1,
+    "api_max_query_url_length": 2000,
+    # They mock the first page of each search only.
+    "search_page_budget": 0,
+    "search_credit_budget": 0,
+    "cache_enabled": False,
+    "cache_path": "",
+    "cache_max_size_mb": 1,
+    "cache_default_ttl": timedelta(hours=1),
+    "cache_ttls": {},
+    # They mock the api-info response of every inject.
+    "quota_snapshot_ttl": timedelta(0),
+    "dns_resolve_batch_size": 100,
+    "dns_cache_ttl": timedelta(hours=1),
+    "output_renderer": "rich",
+}
+
+
+def build_mock_config(**shodan_overrides) -> Mock:
+    """Build a mocked ConfigLoader with SHODAN_TEST_CONFIG, updated with shodan_overrides."""
     mock_config = Mock()
-    mock_config.shodan.base_url = "https://api.shodan.io"
-    mock_config.shodan.api_key.get_secret_value.return_value = "test-api-key"
-    mock_config.shodan.api_retry = 1
-    mock_config.shodan.api_backoff.total_seconds.return_value = 1
-    mock_config.shodan.api_leaky_bucket_rate = 10
-    mock_config.shodan.api_leaky_bucket_capacity = 10
+    mock_config.shodan.configure_mock(**{**SHODAN_TEST_CONFIG, **shodan_overrides})
+    return mock_config
 
-    mock_helper = Mock()
 
-    return ShodanClientAPI(config=mock_config, helper=mock_helper)
+@fixture
+def shodan_client_factory() -> Callable[..., ShodanClientAPI]:
+    """Provide a factory of ShodanClientAPI with mocked helper, its config keys given as keyword arguments."""
+
+    def factory(**shodan_overrides) -> ShodanClientAPI:
+        return ShodanClientAPI(
+            config=build_mock_config(**shodan_overrides), helper=Mock()
+        )
+
+    return factory
 
 
 @fixture
-def shodan_injector() -> ShodanInjector:
-    """Provide a ShodanInjector with mocked config and helper."""
-    mock_config = Mock()
-    mock_config.shodan.base_url = "https://api.shodan.io"
-    mock_config.shodan.api_key.get_secret_value.return_value = "test-api-key"
-    mock_config.shodan.api_retry = 1
-    mock_config.shodan.api_backoff.total_seconds.return_value = 1
-    mock_config.shodan.api_leaky_bucket_rate = 10
-    mock_config.shodan.api_leaky_bucket_capacity = 10
+def shodan_client_api(shodan_client_factory) -> ShodanClientAPI:
+    """Provide a ShodanClientAPI with mocked config and helper."""
+    return shodan_client_factory()
 
-    mock_helper = Mock()
 
-    return ShodanInjector(config=mock_config, helper=mock_helper)
+@fixture
+def shodan_injector() -> ShodanInjector:
+    """Provide a ShodanInjector with mocked config and helper."""
+    return ShodanInjector(config=build_mock_config(), helper=Mock())
@@ -0,0 +1,25 @@
+Feature: Connections to the Shodan API reused
+    As a Security Analyst
+    I want the Shodan Injector to keep its connections to the Shodan API alive
+    So that each search does not pay the connection setup again
+
+    Scenario: Successive searches share one connection
+        Given a Shodan API answering with keep-alive
+            And I have a valid inject_content with 5 hostnames
+        When I execute process_shodan_search twice
+        Then every search and quota request is answered
+            And the Shodan API saw a single connection
+
+
+    Scenario: Every request is bounded by the connect and read timeouts
+        Given a client with a 10 seconds connect timeout and a 60 seconds read timeout
+        When I execute a request
+        Then the request is sent through the client session with both timeouts
+
+
+    Scenario: A search timing out is reported as a failed call of its own target
+        Given I have a valid inject_content with 5 hostnames
+            And a Shodan API timing out on the search of one hostname
+        When I execute process_shodan_search
+        Then the timed-out hostname is reported as a failed call with no status code
+            And the other hostnames keep their results
@@ -0,0 +1,42 @@
+Feature: Hostnames resolved before the search
+    As a Security Analyst
+    I want the Shodan Injector to resolve many hostnames at once and search their IPs
+    So that large hostname lists spend fewer query credits when IP-level results are enough
+
+    Scenario: Hostnames are resolved in bulk and searched by IP
+        Given a client combining up to 10 targets per search
+            And I have a valid inject_content with 4 hostnames to resolve first, 2 of them on the same IP
+        When I execute process_shodan_search
+        Then the hostnames are resolved in one DNS call
+            And their 3 IPs are searched in one search, with the ip filter instead of the hostname and org filters
+            And each hostname gets the matches of its IP, in target order
+
+
+    Scenario: Unresolved hostnames are searched as hostnames
+        Given a client combining up to 10 targets per search
+            And I have a valid inject_content with 2 hostnames to resolve first, 1 of them unresolved
+        When I execute process_shodan_search
+        Then the resolved hostname is searched by IP
+            And the unresolved hostname is searched by hostname
+
+
+    Scenario: The contract filters are kept in the IP searches
+        Given a client combining up to 10 targets per search
+            And I have a valid cve_enumeration inject_content with 2 hostnames to resolve first
+        When I execute process_shodan_search
+        Then their IPs are searched with the has_vuln filter of the contract
+
+
+    Scenario: A given organization is kept in the IP searches
+        Given a client combining up to 10 targets per search
+            And I have a valid critical_ports inject_content with an organization and 2 hostnames to resolve first
+        When I execute process_shodan_search
+        Then their IPs are searched with the port and organization filters
+
+
+    Scenario: Resolutions are cached between injects
+        Given a client combining up to 10 targets per search, with the response cache enabled
+            And I have a valid inject_content with 4 hostnames to resolve first, 2 of them on the same IP
+        When I execute process_shodan_search twice
+        Then the hostnames are resolved in one DNS call
+            And the second run reports 4 resolutions served from the cache
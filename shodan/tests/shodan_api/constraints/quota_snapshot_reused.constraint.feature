@@ -0,0 +1,20 @@
+Feature: Shodan quota snapshot reused
+    As a Security Analyst
+    I want the Shodan Injector to reuse the account quota it retrieved recently
+    So that the rate-limited API calls go to searches rather than to the quota
+
+    Scenario: The quota is retrieved once within its TTL
+        Given a client with a quota snapshot TTL of 5 minutes
+            And I have a valid inject_content with 3 hostnames
+        When I execute process_shodan_search twice
+        Then the Shodan account information is retrieved once
+            And the second run deducts the 3 query credits spent by the first one
+            And the second run reports the age of the quota snapshot
+
+
+    Scenario: A zero TTL retrieves the quota on every inject
+        Given a client with a quota snapshot TTL of 0
+            And I have a valid inject_content with 3 hostnames
+        When I execute process_shodan_search twice
+        Then the Shodan account information is retrieved twice
+            And no run deducts query credits
@@ -0,0 +1,27 @@
+Feature: Shodan responses cached
+    As a Security Analyst
+    I want the Shodan Injector to reuse the responses of searches it already made
+    So that running the same inject again does not spend query credits
+
+    Scenario: A repeated search is answered from the cache
+        Given a client with the response cache enabled
+            And I have a valid inject_content with 3 hostnames
+        When I execute process_shodan_search twice
+        Then the Shodan API is searched once per hostname
+            And the second run reports 3 cache hits and no miss
+            And the API key is not part of any cache key
+
+
+    Scenario: The inject bypasses the cache
+        Given a client with the response cache enabled
+            And I have a valid inject_content with 3 hostnames bypassing the cache
+        When I execute process_shodan_search twice
+        Then the Shodan API is searched twice per hostname
+            And no run reports a cache hit
+
+
+    Scenario: A zero TTL disables the cache for the contract
+        Given a client with a zero TTL for the domain_discovery contract
+            And I have a valid inject_content with 3 hostnames
+        When I execute process_shodan_search twice
+        Then the Shodan API is searched twice per hostname
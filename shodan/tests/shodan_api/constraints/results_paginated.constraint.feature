@@ -0,0 +1,39 @@
+Feature: Search results paginated within a budget
+    As a Security Analyst
+    I want the Shodan Injector to read every result page of a search
+    So that large organizations are not truncated to their first page
+
+    Scenario: Every page of a search is read and folded per service
+        Given a client with a budget of 10 pages and 10 credits
+            And I have a valid inject_content with 1 hostname
+            And its search has 3 pages
+        When I execute process_shodan_search
+        Then the Shodan API is searched for pages 1, 2 and 3
+            And a service listed on several pages is folded into one match of Shodan's shape
+            And 2 additional pages and 2 query credits are reported
+
+
+    Scenario: The page budget ends the reading
+        Given a client with a budget of 1 page and 10 credits
+            And I have a valid inject_content with 1 hostname
+            And its search has 3 pages
+        When I execute process_shodan_search
+        Then the Shodan API is searched for pages 1 and 2
+            And the search is reported as truncated
+
+
+    Scenario: Cached pages spend no credit
+        Given a client with the response cache enabled and a budget of 10 pages and 1 credit
+            And I have a valid inject_content with 1 hostname
+            And its search has 2 pages
+        When I execute process_shodan_search twice
+        Then the Shodan API is searched for pages 1 and 2 once
+            And the second run reports 1 additional page and no query credit
+
+
+    Scenario: Assets are aggregated from every page
+        Given a client with a budget of 10 pages and 10 credits
+            And I have a valid inject_content with 1 hostname
+            And its search has 3 pages
+        When I prepare the structured output of the search
+        Then one asset per hostname is created, with the IPs of every page
@@ -0,0 +1,59 @@
+Feature: Targets coalesced into combined searches
+    As a Security Analyst
+    I want the Shodan Injector to search several targets with one query
+    So that an inject spends far fewer calls and query credits
+
+    Scenario: Hostnames are searched with one combined query
+        Given a client combining up to 10 targets per query
+            And I have a valid inject_content with 3 hostnames
+        When I execute process_shodan_search
+        Then the Shodan API is searched once, for every hostname
+            And each hostname gets the matches of its own domain
+
+
+    Scenario: IPs are split back by ip_str
+        Given a client combining up to 10 targets per query
+            And I have a valid inject_content with 2 IPs
+        When I execute process_shodan_search
+        Then the Shodan API is searched once, for every IP
+            And each IP gets the matches of its own address
+
+
+    Scenario Outline: Combined searches stay within the query limits
+        Given a client combining up to <max_targets> targets per query in URLs of up to <max_url_length> characters
+            And I have a valid inject_content with 5 hostnames
+        When I execute process_shodan_search
+        Then the Shodan API is searched <searches> times
+
+        Examples:
+            | max_targets | max_url_length | searches |
+            | 2           | 2000           | 3        |
+            | 10          | 2000           | 1        |
+            | 10          | 160            | 5        |
+
+
+    Scenario: A combined search with more matches than one page falls back to one search per target
+        Given a client combining up to 10 targets per query
+            And I have a valid inject_content with 3 hostnames
+            And the combined search has more matches than its first page
+        When I execute process_shodan_search
+        Then the Shodan API is searched once combined, then once per hostname
+            And each hostname gets the matches of its own search
+            And the combined search is counted with the searches of the hostnames
+
+
+    Scenario: A combined search with a match of no known target falls back to one search per target
+        Given a client combining up to 10 targets per query
+            And I have a valid inject_content with 3 hostnames
+            And the combined search has a match of none of the hostnames
+        When I execute process_shodan_search
+        Then the Shodan API is searched once combined, then once per hostname
+            And each hostname gets the matches of its own search only
+
+
+    Scenario: A failed combined search fails every target
+        Given a client combining up to 10 targets per query
+            And I have a valid inject_content with 3 hostnames
+            And the Shodan API fails the search
+        When I execute process_shodan_search
+        Then every hostname is reported as an error of the same request
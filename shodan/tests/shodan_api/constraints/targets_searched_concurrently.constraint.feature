@@ -0,0 +1,18 @@
+Feature: Targets searched concurrently
+    As a Security Analyst
+    I want the targets of an inject to be searched concurrently
+    So that large asset groups complete quickly without exceeding the Shodan rate limits
+
+    Scenario: Results are reported in target order whatever order the searches complete in
+        Given I have a valid inject_content with 8 hostnames
+            And the client searches up to 4 targets concurrently
+        When I execute process_shodan_search
+        Then several searches are in flight at once, never more than 4
+            And each result is reported under its own target, in target order
+
+
+    Scenario: Every concurrent search goes through the rate limiter
+        Given I have a valid inject_content with 8 hostnames
+            And the client searches up to 4 targets concurrently
+        When I execute process_shodan_search
+        Then the rate limiter is entered once per search request
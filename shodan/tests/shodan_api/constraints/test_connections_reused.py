@@ -0,0 +1,208 @@
+"""Essential tests for connection reuse - Gherkin GWT Format."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import requests
+
+from shodan.models.normalize_input_data import (
+    DomainDiscovery,
+    NormalizeInputData,
+    TargetsType,
+)
+from shodan.services.client_api import ShodanClientAPI
+
+HOSTNAMES = [f"host{i}.filigran.io" for i in range(5)]
+
+# --------
+# Scenarios
+# --------
+
+
+# Scenario: Successive searches share one connection
+def test_successive_searches_share_one_connection(shodan_client_factory):
+    """Scenario: Successive searches share one connection"""
+    # Given a Shodan API answering with keep-alive
+    server, connections = _given_stub_shodan_api()
+    try:
+        # And I have a valid inject_content with 5 hostnames
+        normalize_input_data = _given_domain_discovery_normalize_input_data(HOSTNAMES)
+        client = _given_client(
+            shodan_client_factory, f"http://127.0.0.1:{server.server_port}/"
+        )
+
+        # When I execute process_shodan_search twice
+        runs = [
+            client.process_shodan_search(normalize_input_data=normalize_input_data)
+            for _ in range(2)
+        ]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # Then every search and quota request is answered
+    for results, credit_user in runs:
+        assert [entry["result"]["total"] for entry in results["data"]] == [0] * 5
+        assert credit_user == {"plan": "basic"}
+    # And the Shodan API saw a single connection
+    assert len(connections) == 1
+
+
+# Scenario: Every request is bounded by the connect and read timeouts
+def test_requests_are_bounded_by_the_timeouts(shodan_client_factory):
+    """Scenario: Every request is bounded by the connect and read timeouts"""
+    # Given a client with a 10 seconds connect timeout and a 60 seconds read timeout
+    client = _given_client(shodan_client_factory, "https://api.shodan.io")
+
+    # When I execute a request
+    response = Mock()
+    response.json.return_value = {"plan": "basic"}
+    with patch.object(client.session, "request", return_value=response) as mock_request:
+        client._get_user_info()
+
+    # Then the request is sent through the client session with both timeouts
+    assert mock_request.call_args.kwargs["timeout"] == (10, 60)
+
+
+# Scenario: A search timing out is reported as a failed call of its own target
+def test_timed_out_search_is_reported_as_a_failed_call(shodan_client_factory):
+    """Scenario: A search timing out is reported as a failed call of its own target"""
+    # Given I have a valid inject_content with 5 hostnames
+    normalize_input_data = _given_domain_discovery_normalize_input_data(HOSTNAMES)
+    client = _given_client(
+        shodan_client_factory, "https://api.shodan.io", api_max_concurrent_requests=4
+    )
+    # And a Shodan API timing out on the search of one hostname
+    timed_out = HOSTNAMES[2]
+
+    def mock_request(method, url, timeout):
+        if f"hostname:{timed_out}," in url:
+            raise requests.ReadTimeout("Read timed out. (read timeout=60)")
+        response = Mock()
+        response.json.return_value = (
+            {"plan": "basic"} if "api-info" in url else {"matches": [], "total": 0}
+        )
+        return response
+
+    # When I execute process_shodan_search
+    with patch.object(client.session, "request", side_effect=mock_request):
+        results, _ = client.process_shodan_search(
+            normalize_input_data=normalize_input_data
+        )
+
+    # Then the timed-out hostname is reported as a failed call with no status code
+    entries = {entry["target"]: entry for entry in results["data"]}
+    assert entries[timed_out]["is_error"] is True
+    assert entries[timed_out]["response"] == {
+        "status_code": None,
+        "reason": "ReadTimeout",
+        "error": "Read timed out. (read timeout=60)",
+    }
+    # And the other hostnames keep their results
+    assert [entry["target"] for entry in results["data"]] == HOSTNAMES
+    for hostname in HOSTNAMES:
+        if hostname != timed_out:
+            assert entries[hostname]["result"]["total"] == 0
+
+
+# --------
+# Given Methods
+# --------
+
+
+def _given_stub_shodan_api() -> tuple[ThreadingHTTPServer, set]:
+    """Start a local HTTP/1.1 server answering like the Shodan API.
+
+    Returns:
+        The running server, and the set of client addresses it accepted a connection from.
+
+    """
+    connections = set()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        wbufsize = 1 << 16
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            connections.add(self.client_address)
+            body = json.dumps(
+                {"plan": "basic"}
+                if self.path.startswith("/api-info")
+                else {"matches": [], "total": 0}
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, connections
+
+
+def _given_client(client_factory, base_url: str, **overrides) -> ShodanClientAPI:
+    """Create a ShodanClientAPI sending its requests to base_url.
+
+    Args:
+        client_factory: The shodan_client_factory fixture.
+        base_url: The base URL of the Shodan API.
+        **overrides: Other Shodan settings of the client.
+
+    Returns:
+        A ShodanClientAPI with mocked config and helper.
+
+    """
+    return client_factory(
+        base_url=base_url,
+        search_page_budget=10,
+        search_credit_budget=10,
+        **overrides,
+    )
+
+
+def _given_domain_discovery_normalize_input_data(
+    hostnames: list[str],
+) -> NormalizeInputData:
+    """Create NormalizeInputData for the Domain Discovery contract.
+
+    Args:
+        hostnames: The hostnames to search for.
+
+    Returns:
+        A fully constructed NormalizeInputData instance ready to be
+        passed to process_shodan_search in tests.
+
+    """
+    inject_content = DomainDiscovery(
+        contract="domain_discovery",
+        expectations=[],
+        target_selector="manual",
+        target_property_selector="automatic",
+        auto_create_assets=False,
+        hostname=",".join(hostnames),
+        organization=None,
+    )
+
+    targets = TargetsType(
+        selector_key="manual",
+        asset_ids=[],
+        hostnames=[],
+        ips=[],
+        seen_ips=[],
+        assets=[],
+    )
+
+    return NormalizeInputData(
+        contract_name="domain_discovery",
+        contract_id="test_contract_id",
+        inject_content=inject_content,
+        targets=targets,
+    )
@@ -0,0 +1,314 @@
+"""Essential tests for the hostname resolution pre-stage - Gherkin GWT Format."""
+
+from unittest.mock import Mock, patch
+from urllib.parse import parse_qs, urlparse
+
+from shodan.models.normalize_input_data import (
+    CriticalPortsAndExposedAdminInterface,
+    CVEEnumeration,
+    DomainDiscovery,
+    NormalizeInputData,
+    TargetsType,
+)
+from shodan.services.client_api import ShodanClientAPI
+
+RESOLUTIONS = {
+    "a.filigran.io": "1.1.1.1",
+    "b.filigran.io": "2.2.2.2",
+    "c.filigran.io": "2.2.2.2",
+    "d.filigran.io": "3.3.3.3",
+    "unknown.filigran.io": None,
+}
+
+# --------
+# Scenarios
+# --------
+
+
+# Scenario: Hostnames are resolved in bulk and searched by IP
+def test_hostnames_are_resolved_in_bulk_and_searched_by_ip(shodan_client_factory):
+    """Scenario: Hostnames are resolved in bulk and searched by IP"""
+    # Given a client combining up to 10 targets per search
+    client = _given_client(shodan_client_factory)
+    # And I have a valid inject_content with 4 hostnames to resolve first, 2 of them on the same IP
+    hostnames = ["a.filigran.io", "b.filigran.io", "c.filigran.io", "d.filigran.io"]
+    normalize_input_data = _given_domain_discovery_normalize_input_data(hostnames)
+
+    # When I execute process_shodan_search
+    mock_request, (results, _) = _when_process_shodan_search(
+        client, normalize_input_data
+    )
+
+    # Then the hostnames are resolved in one DNS call
+    assert len(_dns_calls(mock_request)) == 1
+    assert results["dns"] == {"resolved": 4, "unresolved": 0, "calls": 1, "cached": 0}
+    # And their 3 IPs are searched in one search, with the ip filter instead of the hostname and org filters
+    assert _search_queries(mock_request) == ["ip:1.1.1.1,2.2.2.2,3.3.3.3"]
+    # And each hostname gets the matches of its IP, in target order
+    assert [entry["target"] for entry in results["data"]] == hostnames
+    assert [entry["resolved_ip"] for entry in results["data"]] == [
+        "1.1.1.1",
+        "2.2.2.2",
+        "2.2.2.2",
+        "3.3.3.3",
+    ]
+    assert [
+        [match["ip_str"] for match in entry["result"]["matches"]]
+        for entry in results["data"]
+    ] == [["1.1.1.1"], ["2.2.2.2"], ["2.2.2.2"], ["3.3.3.3"]]
+
+
+# Scenario: Unresolved hostnames are searched as hostnames
+def test_unresolved_hostnames_are_searched_as_hostnames(shodan_client_factory):
+    """Scenario: Unresolved hostnames are searched as hostnames"""
+    # Given a client combining up to 10 targets per search
+    client = _given_client(shodan_client_factory)
+    # And I have a valid inject_content with 2 hostnames to resolve first, 1 of them unresolved
+    hostnames = ["unknown.filigran.io", "a.filigran.io"]
+    normalize_input_data = _given_domain_discovery_normalize_input_data(hostnames)
+
+    # When I execute process_shodan_search
+    mock_request, (results, _) = _when_process_shodan_search(
+        client, normalize_input_data
+    )
+
+    # Then the resolved hostname is searched by IP
+    # And the unresolved hostname is searched by hostname
+    assert _search_queries(mock_request) == [
+        "ip:1.1.1.1",
+        "hostname:unknown.filigran.io,*.unknown.filigran.io,org:unknown.filigran.io",
+    ]
+    assert results["dns"]["unresolved"] == 1
+    assert [entry["target"] for entry in results["data"]] == hostnames
+    assert "resolved_ip" not in results["data"][0]
+
+
+# Scenario: The contract filters are kept in the IP searches
+def test_contract_filters_are_kept_in_the_ip_searches(shodan_client_factory):
+    """Scenario: The contract filters are kept in the IP searches"""
+    # Given a client combining up to 10 targets per search
+    client = _given_client(shodan_client_factory)
+    # And I have a valid cve_enumeration inject_content with 2 hostnames to resolve first
+    normalize_input_data = _given_resolving_normalize_input_data(
+        CVEEnumeration,
+        contract="cve_enumeration",
+        hostname="a.filigran.io,b.filigran.io",
+        organization=None,
+    )
+
+    # When I execute process_shodan_search
+    mock_request, (results, _) = _when_process_shodan_search(
+        client, normalize_input_data
+    )
+
+    # Then their IPs are searched with the has_vuln filter of the contract
+    assert _search_queries(mock_request) == ["has_vuln:true ip:1.1.1.1,2.2.2.2"]
+    assert [entry["resolved_ip"] for entry in results["data"]] == [
+        "1.1.1.1",
+        "2.2.2.2",
+    ]
+
+
+# Scenario: A given organization is kept in the IP searches
+def test_given_organization_is_kept_in_the_ip_searches(shodan_client_factory):
+    """Scenario: A given organization is kept in the IP searches"""
+    # Given a client combining up to 10 targets per search
+    client = _given_client(shodan_client_factory)
+    # And I have a valid critical_ports inject_content with an organization and 2 hostnames to resolve first
+    normalize_input_data = _given_resolving_normalize_input_data(
+        CriticalPortsAndExposedAdminInterface,
+        contract="critical_ports_and_exposed_admin_interface",
+        hostname="a.filigran.io,d.filigran.io",
+        organization="Filigran",
+        port="22,3389",
+    )
+
+    # When I execute process_shodan_search
+    mock_request, _ = _when_process_shodan_search(client, normalize_input_data)
+
+    # Then their IPs are searched with the port and organization filters
+    assert _search_queries(mock_request) == [
+        "port:22,3389 org:Filigran ip:1.1.1.1,3.3.3.3"
+    ]
+
+
+# Scenario: Resolutions are cached between injects
+def test_resolutions_are_cached_between_injects(tmp_path, shodan_client_factory):
+    """Scenario: Resolutions are cached between injects"""
+    # Given a client combining up to 10 targets per search, with the response cache enabled
+    client = _given_client(shodan_client_factory, cache_path=tmp_path)
+    # And I have a valid inject_content with 4 hostnames to resolve first, 2 of them on the same IP
+    hostnames = ["a.filigran.io", "b.filigran.io", "c.filigran.io", "d.filigran.io"]
+    normalize_input_data = _given_domain_discovery_normalize_input_data(hostnames)
+
+    # When I execute process_shodan_search twice
+    mock_request, _ = _when_process_shodan_search(client, normalize_input_data)
+    _, (results, _) = _when_process_shodan_search(client, normalize_input_data)
+
+    # Then the hostnames are resolved in one DNS call
+    assert len(_dns_calls(mock_request)) == 1
+    # And the second run reports 4 resolutions served from the cache
+    assert results["dns"] == {"resolved": 4, "unresolved": 0, "calls": 0, "cached": 4}
+
+
+# --------
+# Given Methods
+# --------
+
+
+def _given_client(client_factory, cache_path=None) -> ShodanClientAPI:
+    """Create a ShodanClientAPI combining up to 10 targets per search.
+
+    Args:
+        client_factory: The shodan_client_factory fixture.
+        cache_path: The directory of the response cache, or None to disable it.
+
+    Returns:
+        A ShodanClientAPI with mocked config and helper.
+
+    """
+    if cache_path is None:
+        return client_factory(api_max_targets_per_query=10)
+    return client_factory(
+        api_max_targets_per_query=10,
+        cache_enabled=True,
+        cache_path=str(cache_path / "responses.sqlite"),
+    )
+
+
+def _given_domain_discovery_normalize_input_data(
+    hostnames: list[str],
+) -> NormalizeInputData:
+    """Create NormalizeInputData for the Domain Discovery contract, resolving its hostnames first.
+
+    Args:
+        hostnames: The hostnames to search for.
+
+    Returns:
+        A fully constructed NormalizeInputData instance ready to be
+        passed to process_shodan_search in tests.
+
+    """
+    return _given_resolving_normalize_input_data(
+        DomainDiscovery,
+        contract="domain_discovery",
+        hostname=",".join(hostnames),
+        organization=None,
+    )
+
+
+def _given_resolving_normalize_input_data(
+    contract_cls: type, **contract_fields
+) -> NormalizeInputData:
+    """Create NormalizeInputData for a hostname contract, resolving its hostnames first.
+
+    Args:
+        contract_cls: The inject content model of the contract.
+        contract_fields: The contract name and fields of the inject content.
+
+    Returns:
+        A fully constructed NormalizeInputData instance ready to be
+        passed to process_shodan_search in tests.
+
+    """
+    inject_content = contract_cls(
+        expectations=[],
+        target_selector="manual",
+        target_property_selector="automatic",
+        auto_create_assets=False,
+        resolve_hostnames=True,
+        **contract_fields,
+    )
+
+    targets = TargetsType(
+        selector_key="manual",
+        asset_ids=[],
+        hostnames=[],
+        ips=[],
+        seen_ips=[],
+        assets=[],
+    )
+
+    return NormalizeInputData(
+        contract_name=contract_fields["contract"],
+        contract_id="test_contract_id",
+        inject_content=inject_content,
+        targets=targets,
+    )
+
+
+# --------
+# When Methods
+# --------
+
+
+def _when_process_shodan_search(
+    client: ShodanClientAPI, normalize_input_data: NormalizeInputData
+) -> tuple[Mock, tuple]:
+    """Run process_shodan_search against a mocked Shodan API.
+
+    The DNS resolve endpoint answers from RESOLUTIONS, and a search by IP
+    returns one match per IP searched.
+
+    Args:
+        client: The client to run the searches with.
+        normalize_input_data: The inject to run.
+
+    Returns:
+        The mocked session request, and the results and user info.
+
+    """
+
+    def answer(method, url, timeout):
+        response = Mock()
+        params = parse_qs(urlparse(url).query)
+        if "dns/resolve" in url:
+            response.json.return_value = {
+                hostname: RESOLUTIONS.get(hostname)
+                for hostname in params["hostnames"][0].split(",")
+            }
+        elif "api-info" in url:
+            response.json.return_value = {"plan": "dev"}
+        else:
+            query = params["query"][0]
+            ips = next(
+                (
+                    term[len("ip:") :].split(",")
+                    for term in query.split()
+                    if term.startswith("ip:")
+                ),
+                [],
+            )
+            response.json.return_value = {
+                "matches": [{"ip_str": ip} for ip in ips],
+                "total": len(ips),
+            }
+        return response
+
+    with patch.object(client.session, "request", side_effect=answer) as mock_request:
+        return mock_request, client.process_shodan_search(
+            normalize_input_data=normalize_input_data
+        )
+
+
+# --------
+# Then Methods
+# --------
+
+
+def _dns_calls(mock_request: Mock) -> list[str]:
+    """The URLs of the calls to the DNS resolve endpoint."""
+    return [
+        call.kwargs["url"]
+        for call in mock_request.call_args_list
+        if "dns/resolve" in call.kwargs["url"]
+    ]
+
+
+def _search_queries(mock_request: Mock) -> list[str]:
+    """The queries of the search requests sent to the Shodan API, in order."""
+    return [
+        parse_qs(urlparse(call.kwargs["url"]).query)["query"][0]
+        for call in mock_request.call_args_list
+        if "/shodan/host/search" in call.kwargs["url"]
+    ]
@@ -0,0 +1,193 @@
+"""Essential tests for the quota snapshot - Gherkin GWT Format."""
+
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from shodan.models.normalize_input_data import (
+    DomainDiscovery,
+    NormalizeInputData,
+    TargetsType,
+)
+from shodan.services.client_api import ShodanClientAPI
+from shodan.services.quota_snapshot import ShodanQuotaSnapshot
+
+HOSTNAMES = ["a.filigran.io", "b.filigran.io", "c.filigran.io"]
+USER_INFO = {
+    "plan": "dev",
+    "query_credits": 100,
+    "scan_credits": 100,
+    "usage_limits": {"query_credits": 100, "scan_credits": 100},
+}
+
+# --------
+# Scenarios
+# --------
+
+
+# Scenario: The quota is retrieved once within its TTL
+def test_quota_is_retrieved_once_within_its_ttl(shodan_client_factory):
+    """Scenario: The quota is retrieved once within its TTL"""
+    # Given a client with a quota snapshot TTL of 5 minutes
+    client, clock = _given_client(shodan_client_factory, ttl_seconds=300)
+    # And I have a valid inject_content with 3 hostnames
+    normalize_input_data = _given_domain_discovery_normalize_input_data(HOSTNAMES)
+
+    # When I execute process_shodan_search twice
+    mock_request, runs = _when_process_shodan_search_twice(
+        client, normalize_input_data, clock
+    )
+
+    # Then the Shodan account information is retrieved once
+    assert _quota_request_count(mock_request) == 1
+    (first_results, first_user_info), (second_results, second_user_info) = runs
+    assert first_user_info == USER_INFO
+    # And the second run deducts the 3 query credits spent by the first one
+    assert second_user_info["query_credits"] == 97
+    assert second_user_info["usage_limits"] == USER_INFO["usage_limits"]
+    # And the second run reports the age of the quota snapshot
+    assert first_results["quota"] == {"snapshot_age": 0}
+    assert second_results["quota"] == {"snapshot_age": 60}
+
+
+# Scenario: A zero TTL retrieves the quota on every inject
+def test_zero_ttl_retrieves_the_quota_on_every_inject(shodan_client_factory):
+    """Scenario: A zero TTL retrieves the quota on every inject"""
+    # Given a client with a quota snapshot TTL of 0
+    client, clock = _given_client(shodan_client_factory, ttl_seconds=0)
+    # And I have a valid inject_content with 3 hostnames
+    normalize_input_data = _given_domain_discovery_normalize_input_data(HOSTNAMES)
+
+    # When I execute process_shodan_search twice
+    mock_request, runs = _when_process_shodan_search_twice(
+        client, normalize_input_data, clock
+    )
+
+    # Then the Shodan account information is retrieved twice
+    assert _quota_request_count(mock_request) == 2
+    # And no run deducts query credits
+    assert all(user_info == USER_INFO for _, user_info in runs)
+    assert all(results["quota"] == {"snapshot_age": 0} for results, _ in runs)
+
+
+# --------
+# Given Methods
+# --------
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _given_client(
+    client_factory, ttl_seconds: float
+) -> tuple[ShodanClientAPI, FakeClock]:
+    """Create a ShodanClientAPI whose quota snapshot follows a fake clock.
+
+    Args:
+        client_factory: The shodan_client_factory fixture.
+        ttl_seconds: The TTL of the quota snapshot.
+
+    Returns:
+        A ShodanClientAPI with mocked config and helper, and the clock of its quota snapshot.
+
+    """
+    client = client_factory(quota_snapshot_ttl=timedelta(seconds=ttl_seconds))
+
+    clock = FakeClock()
+    client.quota_snapshot = ShodanQuotaSnapshot(ttl_seconds=ttl_seconds, clock=clock)
+    return client, clock
+
+
+def _given_domain_discovery_normalize_input_data(
+    hostnames: list[str],
+) -> NormalizeInputData:
+    """Create NormalizeInputData for the Domain Discovery contract.
+
+    Args:
+        hostnames: The hostnames to search for.
+
+    Returns:
+        A fully constructed NormalizeInputData instance ready to be
+        passed to process_shodan_search in tests.
+
+    """
+    inject_content = DomainDiscovery(
+        contract="domain_discovery",
+        expectations=[],
+        target_selector="manual",
+        target_property_selector="automatic",
+        auto_create_assets=False,
+        hostname=",".join(hostnames),
+        organization=None,
+    )
+
+    targets = TargetsType(
+        selector_key="manual",
+        asset_ids=[],
+        hostnames=[],
+        ips=[],
+        seen_ips=[],
+        assets=[],
+    )
+
+    return NormalizeInputData(
+        contract_name="domain_discovery",
+        contract_id="test_contract_id",
+        inject_content=inject_content,
+        targets=targets,
+    )
+
+
+# --------
+# When Methods
+# --------
+
+
+def _when_process_shodan_search_twice(
+    client: ShodanClientAPI,
+    normalize_input_data: NormalizeInputData,
+    clock: FakeClock,
+) -> tuple[Mock, list]:
+    """Run process_shodan_search twice, a minute apart, against a mocked Shodan API.
+
+    Args:
+        client: The client to run the searches with.
+        normalize_input_data: The inject to run.
+        clock: The clock of the client's quota snapshot.
+
+    Returns:
+        The mocked session request, and the results and user info of both runs.
+
+    """
+
+    def answer(method, url, timeout):
+        response = Mock()
+        response.json.return_value = (
+            dict(USER_INFO)
+            if "api-info" in url
+            else {"matches": [{"ip_str": "1.1.1.1"}], "total": 1}
+        )
+        return response
+
+    runs = []
+    with patch.object(client.session, "request", side_effect=answer) as mock_request:
+        for _ in range(2):
+            runs.append(
+                client.process_shodan_search(normalize_input_data=normalize_input_data)
+            )
+            clock.now += 60
+    return mock_request, runs
+
+
+# --------
+# Then Methods
+# --------
+
+
+def _quota_request_count(mock_request: Mock) -> int:
+    """Count the account information requests sent to the Shodan API."""
+    return sum("api-info" in call.kwargs["url"] for call in mock_request.call_args_list)
@@ -0,0 +1,204 @@
+"""Essential tests for the response cache - Gherkin GWT Format."""
+
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from shodan.models.normalize_input_data import (
+    DomainDiscovery,
+    NormalizeInputData,
+    TargetsType,
+)
+from shodan.services.client_api import ShodanClientAPI
+
+HOSTNAMES = ["a.filigran.io", "b.filigran.io", "c.filigran.io"]
+
+# --------
+# Scenarios
+# --------
+
+
+# Scenario: A repeated search is answered from the cache
+def test_repeated_search_is_answered_from_the_cache(tmp_path, shodan_client_factory):
+    """Scenario: A repeated search is answered from the cache"""
+    # Given a client with the response cache enabled
+    client = _given_client(shodan_client_factory, tmp_path)
+    # And I have a valid inject_content with 3 hostnames
+    normalize_input_data = _given_domain_discovery_normalize_input_data(HOSTNAMES)
+
+    # When I execute process_shodan_search twice
+    mock_request, runs = _when_process_shodan_search_twice(client, normalize_input_data)
+
+    # Then the Shodan API is searched once per hostname
+    assert _search_count(mock_request) == len(HOSTNAMES)
+    # And the second run reports 3 cache hits and no miss
+    (first, _), (second, _) = runs
+    assert first["cache"] == {"hits": 0, "misses": 3}
+    assert second["cache"] == {"hits": 3, "misses": 0}
+    assert [entry["result"] for entry in second["data"]] == [
+        entry["result"] for entry in first["data"]
+    ]
+    assert all(entry.get("cached") for entry in second["data"])
+    # And the API key is not part of any cache key
+    keys = [
+        key
+        for (key,) in client.response_cache._connection.execute(
+            "SELECT key FROM responses"
+        )
+    ]
+    assert len(keys) == 3
+    assert not any("test-api-key" in key for key in keys)
+
+
+# Scenario: The inject bypasses the cache
+def test_inject_bypasses_the_cache(tmp_path, shodan_client_factory):
+    """Scenario: The inject bypasses the cache"""
+    # Given a client with the response cache enabled
+    client = _given_client(shodan_client_factory, tmp_path)
+    # And I have a valid inject_content with 3 hostnames bypassing the cache
+    normalize_input_data = _given_domain_discovery_normalize_input_data(
+        HOSTNAMES, bypass_cache=True
+    )
+
+    # When I execute process_shodan_search twice
+    mock_request, runs = _when_process_shodan_search_twice(client, normalize_input_data)
+
+    # Then the Shodan API is searched twice per hostname
+    assert _search_count(mock_request) == 2 * len(HOSTNAMES)
+    # And no run reports a cache hit
+    assert all(results["cache"]["hits"] == 0 for results, _ in runs)
+
+
+# Scenario: A zero TTL disables the cache for the contract
+def test_zero_ttl_disables_the_cache_for_the_contract(tmp_path, shodan_client_factory):
+    """Scenario: A zero TTL disables the cache for the contract"""
+    # Given a client with a zero TTL for the domain_discovery contract
+    client = _given_client(
+        shodan_client_factory, tmp_path, cache_ttls={"domain_discovery": timedelta(0)}
+    )
+    # And I have a valid inject_content with 3 hostnames
+    normalize_input_data = _given_domain_discovery_normalize_input_data(HOSTNAMES)
+
+    # When I execute process_shodan_search twice
+    mock_request, _ = _when_process_shodan_search_twice(client, normalize_input_data)
+
+    # Then the Shodan API is searched twice per hostname
+    assert _search_count(mock_request) == 2 * len(HOSTNAMES)
+
+
+# --------
+# Given Methods
+# --------
+
+
+def _given_client(
+    client_factory, tmp_path, cache_ttls: dict | None = None
+) -> ShodanClientAPI:
+    """Create a ShodanClientAPI caching its responses under tmp_path.
+
+    Args:
+        client_factory: The shodan_client_factory fixture.
+        tmp_path: The directory of the cache database.
+        cache_ttls: The TTLs per contract name.
+
+    Returns:
+        A ShodanClientAPI with mocked config and helper.
+
+    """
+    return client_factory(
+        search_page_budget=10,
+        search_credit_budget=10,
+        cache_enabled=True,
+        cache_path=str(tmp_path / "responses.sqlite"),
+        cache_ttls=cache_ttls or {},
+    )
+
+
+def _given_domain_discovery_normalize_input_data(
+    hostnames: list[str], bypass_cache: bool = False
+) -> NormalizeInputData:
+    """Create NormalizeInputData for the Domain Discovery contract.
+
+    Args:
+        hostnames: The hostnames to search for.
+        bypass_cache: Whether the inject bypasses the response cache.
+
+    Returns:
+        A fully constructed NormalizeInputData instance ready to be
+        passed to process_shodan_search in tests.
+
+    """
+    inject_content = DomainDiscovery(
+        contract="domain_discovery",
+        expectations=[],
+        target_selector="manual",
+        target_property_selector="automatic",
+        auto_create_assets=False,
+        bypass_cache=bypass_cache,
+        hostname=",".join(hostnames),
+        organization=None,
+    )
+
+    targets = TargetsType(
+        selector_key="manual",
+        asset_ids=[],
+        hostnames=[],
+        ips=[],
+        seen_ips=[],
+        assets=[],
+    )
+
+    return NormalizeInputData(
+        contract_name="domain_discovery",
+        contract_id="test_contract_id",
+        inject_content=inject_content,
+        targets=targets,
+    )
+
+
+# --------
+# When Methods
+# --------
+
+
+def _when_process_shodan_search_twice(
+    client: ShodanClientAPI, normalize_input_data: NormalizeInputData
+) -> tuple[Mock, list]:
+    """Run process_shodan_search twice against a mocked Shodan API.
+
+    Args:
+        client: The client to run the searches with.
+        normalize_input_data: The inject to run.
+
+    Returns:
+        The mocked session request, and the results of both runs.
+
+    """
+
+    def answer(method, url, timeout):
+        response = Mock()
+        response.json.return_value = (
+            {"plan": "basic"}
+            if "api-info" in url
+            else {"matches": [{"ip_str": url.split("hostname:")[1][:13]}], "total": 1}
+        )
+        return response
+
+    with patch.object(client.session, "request", side_effect=answer) as mock_request:
+        runs = [
+            client.process_shodan_search(normalize_input_data=normalize_input_data)
+            for _ in range(2)
+        ]
+    return mock_request, runs
+
+
+# --------
+# Then Methods
+# --------
+
+
+def _search_count(mock_request: Mock) -> int:
+    """Count the search requests sent to the Shodan API, quota requests aside."""
+    return sum(
+        "/shodan/host/search" in call.kwargs["url"]
+        for call in mock_request.call_args_list
+    )
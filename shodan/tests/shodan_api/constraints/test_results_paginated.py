@@ -0,0 +1,291 @@
+"""Essential tests for result pagination - Gherkin GWT Format."""
+
+import re
+from unittest.mock import Mock, patch
+
+from shodan.injector.openaev_shodan import ShodanInjector
+from shodan.models.normalize_input_data import (
+    DomainDiscovery,
+    NormalizeInputData,
+    TargetsType,
+)
+from shodan.services.client_api import ShodanClientAPI
+
+PAGES = {
+    1: {
+        "matches": [
+            {
+                "hostnames": ["www.filigran.io"],
+                "ip_str": "10.0.0.1",
+                "port": 443,
+                "transport": "tcp",
+                "product": "nginx",
+            },
+            {"hostnames": ["mail.filigran.io"], "ip_str": "10.0.0.2", "port": 25},
+        ],
+        "total": 6,
+    },
+    2: {
+        "matches": [
+            {"hostnames": ["www.filigran.io"], "ip_str": "10.0.0.1", "port": 80},
+            {"hostnames": ["www.filigran.io"], "ip_str": "10.0.0.3", "port": 443},
+        ],
+        "total": 6,
+    },
+    3: {
+        "matches": [
+            {
+                "hostnames": ["www.filigran.io"],
+                "ip_str": "10.0.0.1",
+                "port": 443,
+                "transport": "tcp",
+                "vulns": {"CVE-2021-1": {"cvss": 9.8}},
+            },
+            {"hostnames": ["vpn.filigran.io"], "ip_str": "10.0.0.4", "port": 443},
+        ],
+        "total": 6,
+    },
+}
+
+# --------
+# Scenarios
+# --------
+
+
+# Scenario: Every page of a search is read and folded per service
+def test_every_page_of_a_search_is_read_and_folded_per_service(shodan_client_factory):
+    """Scenario: Every page of a search is read and folded per service"""
+    # Given a client with a budget of 10 pages and 10 credits
+    client = _given_client(shodan_client_factory, max_pages=10, max_credits=10)
+    # And I have a valid inject_content with 1 hostname
+    normalize_input_data = _given_domain_discovery_normalize_input_data()
+
+    # And its search has 3 pages
+    # When I execute process_shodan_search
+    mock_request, runs = _when_process_shodan_search(client, normalize_input_data)
+
+    # Then the Shodan API is searched for pages 1, 2 and 3
+    assert _pages_searched(mock_request) == [1, 2, 3]
+    # And a service listed on several pages is folded into one match of Shodan's shape
+    (results,) = runs
+    result = results["data"][0]["result"]
+    assert [(match["ip_str"], match["port"]) for match in result["matches"]] == [
+        ("10.0.0.1", 443),
+        ("10.0.0.2", 25),
+        ("10.0.0.1", 80),
+        ("10.0.0.3", 443),
+        ("10.0.0.4", 443),
+    ]
+    assert result["matches"][0]["product"] == "nginx"
+    assert result["matches"][0]["vulns"] == {"CVE-2021-1": {"cvss": 9.8}}
+    assert result["total"] == 6
+    assert result["pages"] == 3
+    # And 2 additional pages and 2 query credits are reported
+    assert results["pagination"] == {
+        "additional_pages": 2,
+        "credits": 2,
+        "truncated_targets": 0,
+    }
+
+
+# Scenario: The page budget ends the reading
+def test_page_budget_ends_the_reading(shodan_client_factory):
+    """Scenario: The page budget ends the reading"""
+    # Given a client with a budget of 1 page and 10 credits
+    client = _given_client(shodan_client_factory, max_pages=1, max_credits=10)
+    # And I have a valid inject_content with 1 hostname
+    normalize_input_data = _given_domain_discovery_normalize_input_data()
+
+    # And its search has 3 pages
+    # When I execute process_shodan_search
+    mock_request, runs = _when_process_shodan_search(client, normalize_input_data)
+
+    # Then the Shodan API is searched for pages 1 and 2
+    assert _pages_searched(mock_request) == [1, 2]
+    # And the search is reported as truncated
+    (results,) = runs
+    assert len(results["data"][0]["result"]["matches"]) == 4
+    assert results["pagination"]["truncated_targets"] == 1
+
+
+# Scenario: Cached pages spend no credit
+def test_cached_pages_spend_no_credit(tmp_path, shodan_client_factory):
+    """Scenario: Cached pages spend no credit"""
+    # Given a client with the response cache enabled and a budget of 10 pages and 1 credit
+    client = _given_client(
+        shodan_client_factory, max_pages=10, max_credits=1, cache_path=tmp_path
+    )
+    # And I have a valid inject_content with 1 hostname
+    normalize_input_data = _given_domain_discovery_normalize_input_data()
+
+    # And its search has 2 pages
+    pages = {
+        1: {**PAGES[1], "total": 4},
+        2: {**PAGES[2], "total": 4},
+    }
+    # When I execute process_shodan_search twice
+    mock_request, runs = _when_process_shodan_search(
+        client, normalize_input_data, pages=pages, times=2
+    )
+
+    # Then the Shodan API is searched for pages 1 and 2 once
+    assert _pages_searched(mock_request) == [1, 2]
+    # And the second run reports 1 additional page and no query credit
+    assert runs[1]["pagination"]["additional_pages"] == 1
+    assert runs[1]["pagination"]["credits"] == 0
+    assert runs[1]["data"][0]["result"] == runs[0]["data"][0]["result"]
+
+
+# Scenario: Assets are aggregated from every page
+def test_assets_are_aggregated_from_every_page(
+    shodan_injector: ShodanInjector, shodan_client_factory
+):
+    """Scenario: Assets are aggregated from every page"""
+    # Given a client with a budget of 10 pages and 10 credits
+    client = _given_client(shodan_client_factory, max_pages=10, max_credits=10)
+    # And I have a valid inject_content with 1 hostname
+    normalize_input_data = _given_domain_discovery_normalize_input_data()
+
+    # And its search has 3 pages
+    _, (results,) = _when_process_shodan_search(client, normalize_input_data)
+    # When I prepare the structured output of the search
+    output_structured = shodan_injector._prepare_output_structured(results)
+
+    # Then one asset per hostname is created, with the IPs of every page
+    ips_by_hostname = {
+        asset["name"]: sorted(asset["extended_attributes"]["ip_addresses"])
+        for asset in output_structured["found_assets"]
+    }
+    assert ips_by_hostname == {
+        "www.filigran.io": ["10.0.0.1", "10.0.0.3"],
+        "mail.filigran.io": ["10.0.0.2"],
+        "vpn.filigran.io": ["10.0.0.4"],
+    }
+
+
+# --------
+# Given Methods
+# --------
+
+
+def _given_client(
+    client_factory,
+    max_pages: int,
+    max_credits: int,
+    cache_path=None,
+) -> ShodanClientAPI:
+    """Create a ShodanClientAPI reading result pages within a budget.
+
+    Args:
+        client_factory: The shodan_client_factory fixture.
+        max_pages: The additional pages budget of an inject.
+        max_credits: The query credits budget of an inject.
+        cache_path: The directory of the response cache, or None to disable it.
+
+    Returns:
+        A ShodanClientAPI with mocked config and helper.
+
+    """
+    if cache_path is None:
+        return client_factory(
+            search_page_budget=max_pages, search_credit_budget=max_credits
+        )
+    return client_factory(
+        search_page_budget=max_pages,
+        search_credit_budget=max_credits,
+        cache_enabled=True,
+        cache_path=str(cache_path / "responses.sqlite"),
+    )
+
+
+def _given_domain_discovery_normalize_input_data() -> NormalizeInputData:
+    """Create NormalizeInputData for the Domain Discovery contract on filigran.io.
+
+    Returns:
+        A fully constructed NormalizeInputData instance ready to be
+        passed to process_shodan_search in tests.
+
+    """
+    inject_content = DomainDiscovery(
+        contract="domain_discovery",
+        expectations=[],
+        target_selector="manual",
+        target_property_selector="automatic",
+        auto_create_assets=True,
+        hostname="filigran.io",
+        organization=None,
+    )
+
+    targets = TargetsType(
+        selector_key="manual",
+        asset_ids=[],
+        hostnames=[],
+        ips=[],
+        seen_ips=[],
+        assets=[],
+    )
+
+    return NormalizeInputData(
+        contract_name="domain_discovery",
+        contract_id="test_contract_id",
+        inject_content=inject_content,
+        targets=targets,
+    )
+
+
+# --------
+# When Methods
+# --------
+
+
+def _when_process_shodan_search(
+    client: ShodanClientAPI,
+    normalize_input_data: NormalizeInputData,
+    pages: dict[int, dict] = None,
+    times: int = 1,
+) -> tuple[Mock, list[dict]]:
+    """Run process_shodan_search against a mocked Shodan API serving result pages.
+
+    Args:
+        client: The client to run the searches with.
+        normalize_input_data: The inject to run.
+        pages: The response of each page number.
+        times: The number of runs.
+
+    Returns:
+        The mocked session request, and the results of each run.
+
+    """
+    pages = pages or PAGES
+
+    def answer(method, url, timeout):
+        response = Mock()
+        if "api-info" in url:
+            response.json.return_value = {"plan": "basic"}
+        else:
+            page = re.search(r"&page=(\d+)", url)
+            response.json.return_value = pages[int(page.group(1)) if page else 1]
+        return response
+
+    with patch.object(client.session, "request", side_effect=answer) as mock_request:
+        runs = [
+            client.process_shodan_search(normalize_input_data=normalize_input_data)[0]
+            for _ in range(times)
+        ]
+    return mock_request, runs
+
+
+# --------
+# Then Methods
+# --------
+
+
+def _pages_searched(mock_request: Mock) -> list[int]:
+    """Return the page number of each search request, quota requests aside."""
+    pages = []
+    for call in mock_request.call_args_list:
+        url = call.kwargs["url"]
+        if "/shodan/host/search" in url:
+            page = re.search(r"&page=(\d+)", url)
+            pages.append(int(page.group(1)) if page else 1)
+    return pages
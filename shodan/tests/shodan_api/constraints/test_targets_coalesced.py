@@ -0,0 +1,381 @@
+"""Essential tests for query coalescing - Gherkin GWT Format."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from shodan.models.normalize_input_data import (
+    DomainDiscovery,
+    IPEnumeration,
+    NormalizeInputData,
+    TargetsType,
+)
+from shodan.services.client_api import ShodanClientAPI
+
+HOSTNAMES = ["a.filigran.io", "b.filigran.io", "c.filigran.io"]
+IPS = ["1.2.3.4", "5.6.7.8"]
+
+# --------
+# Scenarios
+# --------
+
+
+# Scenario: Hostnames are searched with one combined query
+def test_hostnames_are_searched_with_one_combined_query(shodan_client_factory):
+    """Scenario: Hostnames are searched with one combined query"""
+    # Given a client combining up to 10 targets per query
+    client = _given_client(shodan_client_factory, max_targets=10)
+    # And I have a valid inject_content with 3 hostnames
+    normalize_input_data = _given_domain_discovery_normalize_input_data(HOSTNAMES)
+    search_response = {
+        "matches": [
+            {"hostnames": ["www.a.filigran.io"], "ip_str": "10.0.0.1"},
+            {"hostnames": ["mail.c.filigran.io"], "ip_str": "10.0.0.3"},
+            {"hostnames": ["b.filigran.io"], "ip_str": "10.0.0.2"},
+            {"hostnames": ["www.a.filigran.io"], "ip_str": "10.0.0.4"},
+        ],
+        "total": 4,
+    }
+
+    # When I execute process_shodan_search
+    mock_request, results = _when_process_shodan_search(
+        client, normalize_input_data, [search_response]
+    )
+
+    # Then the Shodan API is searched once, for every hostname
+    urls = _search_urls(mock_request)
+    assert len(urls) == 1
+    assert (
+        "hostname:a.filigran.io,*.a.filigran.io,b.filigran.io,*.b.filigran.io"
+        in urls[0]
+    )
+    assert "org:a.filigran.io,b.filigran.io,c.filigran.io" in urls[0]
+    # And each hostname gets the matches of its own domain
+    assert [entry["target"] for entry in results["data"]] == HOSTNAMES
+    assert _ips_per_target(results) == [
+        ["10.0.0.1", "10.0.0.4"],
+        ["10.0.0.2"],
+        ["10.0.0.3"],
+    ]
+    assert [entry["result"]["total"] for entry in results["data"]] == [2, 1, 1]
+
+
+# Scenario: IPs are split back by ip_str
+def test_ips_are_split_back_by_ip_str(shodan_client_factory):
+    """Scenario: IPs are split back by ip_str"""
+    # Given a client combining up to 10 targets per query
+    client = _given_client(shodan_client_factory, max_targets=10)
+    # And I have a valid inject_content with 2 IPs
+    normalize_input_data = _given_ip_enumeration_normalize_input_data(IPS)
+    search_response = {
+        "matches": [
+            {"ip_str": "5.6.7.8", "port": 22},
+            {"ip_str": "1.2.3.4", "port": 443},
+            {"ip_str": "5.6.7.8", "port": 80},
+        ],
+        "total": 3,
+    }
+
+    # When I execute process_shodan_search
+    mock_request, results = _when_process_shodan_search(
+        client, normalize_input_data, [search_response]
+    )
+
+    # Then the Shodan API is searched once, for every IP
+    urls = _search_urls(mock_request)
+    assert len(urls) == 1
+    assert "ip:1.2.3.4,5.6.7.8" in urls[0]
+    # And each IP gets the matches of its own address
+    assert _ips_per_target(results) == [["1.2.3.4"], ["5.6.7.8", "5.6.7.8"]]
+
+
+# Scenario Outline: Combined searches stay within the query limits
+@pytest.mark.parametrize(
+    "max_targets, max_url_length, searches",
+    [(2, 2000, 3), (10, 2000, 1), (10, 160, 5)],
+    ids=["max_targets", "all_in_one", "max_url_length"],
+)
+def test_combined_searches_stay_within_the_query_limits(
+    max_targets: int, max_url_length: int, searches: int, shodan_client_factory
+):
+    """Scenario Outline: Combined searches stay within the query limits"""
+    # Given a client combining up to <max_targets> targets per query in URLs of up to <max_url_length> characters
+    client = _given_client(
+        shodan_client_factory, max_targets=max_targets, max_url_length=max_url_length
+    )
+    # And I have a valid inject_content with 5 hostnames
+    hostnames = [f"host{i}.filigran.io" for i in range(5)]
+    normalize_input_data = _given_domain_discovery_normalize_input_data(hostnames)
+
+    # When I execute process_shodan_search
+    mock_request, results = _when_process_shodan_search(
+        client, normalize_input_data, [{"matches": [], "total": 0}] * 5
+    )
+
+    # Then the Shodan API is searched <searches> times
+    urls = _search_urls(mock_request)
+    assert len(urls) == searches
+    assert all(len(url.split(" ", 1)[1]) <= max_url_length for url in urls)
+    assert [entry["target"] for entry in results["data"]] == hostnames
+
+
+# Scenario: A combined search with more matches than one page falls back to one search per target
+def test_truncated_combined_search_falls_back_to_one_search_per_target(
+    shodan_client_factory,
+):
+    """Scenario: A combined search with more matches than one page falls back to one search per target"""
+    # Given a client combining up to 10 targets per query
+    client = _given_client(shodan_client_factory, max_targets=10)
+    # And I have a valid inject_content with 3 hostnames
+    normalize_input_data = _given_domain_discovery_normalize_input_data(HOSTNAMES)
+    # And the combined search has more matches than its first page
+    search_responses = [
+        {
+            "matches": [{"hostnames": ["a.filigran.io"], "ip_str": "10.0.0.1"}],
+            "total": 250,
+        },
+        *(
+            {"matches": [{"hostnames": [hostname], "ip_str": ip}], "total": 1}
+            for hostname, ip in zip(HOSTNAMES, ["10.0.0.1", "10.0.0.2", "10.0.0.3"])
+        ),
+    ]
+
+    # When I execute process_shodan_search
+    mock_request, results = _when_process_shodan_search(
+        client, normalize_input_data, search_responses
+    )
+
+    # Then the Shodan API is searched once combined, then once per hostname
+    urls = _search_urls(mock_request)
+    assert len(urls) == 4
+    for url, hostname in zip(urls[1:], HOSTNAMES):
+        assert f"org:{hostname}&" in url
+    # And each hostname gets the matches of its own search
+    assert _ips_per_target(results) == [["10.0.0.1"], ["10.0.0.2"], ["10.0.0.3"]]
+    # And the combined search is counted with the searches of the hostnames
+    assert results["cache"] == {"hits": 0, "misses": 4}
+    assert ShodanClientAPI._count_query_credits_spent(results) == 4
+
+
+# Scenario: A combined search with a match of no known target falls back to one search per target
+def test_unattributed_match_falls_back_to_one_search_per_target(shodan_client_factory):
+    """Scenario: A combined search with a match of no known target falls back to one search per target"""
+    # Given a client combining up to 10 targets per query
+    client = _given_client(shodan_client_factory, max_targets=10)
+    # And I have a valid inject_content with 3 hostnames
+    normalize_input_data = _given_domain_discovery_normalize_input_data(HOSTNAMES)
+    # And the combined search has a match of none of the hostnames
+    search_responses = [
+        {
+            "matches": [
+                {"hostnames": ["a.filigran.io"], "ip_str": "10.0.0.1"},
+                {"hostnames": ["unrelated.example"], "ip_str": "10.0.0.9"},
+            ],
+            "total": 2,
+        },
+        {
+            "matches": [{"hostnames": ["a.filigran.io"], "ip_str": "10.0.0.1"}],
+            "total": 1,
+        },
+        {
+            "matches": [{"hostnames": ["unrelated.example"], "ip_str": "10.0.0.9"}],
+            "total": 1,
+        },
+        {"matches": [], "total": 0},
+    ]
+
+    # When I execute process_shodan_search
+    mock_request, results = _when_process_shodan_search(
+        client, normalize_input_data, search_responses
+    )
+
+    # Then the Shodan API is searched once combined, then once per hostname
+    urls = _search_urls(mock_request)
+    assert len(urls) == 4
+    for url, hostname in zip(urls[1:], HOSTNAMES):
+        assert f"org:{hostname}&" in url
+    # And each hostname gets the matches of its own search only
+    assert _ips_per_target(results) == [["10.0.0.1"], ["10.0.0.9"], []]
+
+
+# Scenario: A failed combined search fails every target
+def test_failed_combined_search_fails_every_target(shodan_client_factory):
+    """Scenario: A failed combined search fails every target"""
+    # Given a client combining up to 10 targets per query
+    client = _given_client(shodan_client_factory, max_targets=10)
+    # And I have a valid inject_content with 3 hostnames
+    normalize_input_data = _given_domain_discovery_normalize_input_data(HOSTNAMES)
+    # And the Shodan API fails the search
+    failure = Mock(status_code=401, reason="Unauthorized", text="Invalid API key")
+    failure.raise_for_status.side_effect = requests.HTTPError(
+        request=Mock(method="GET"), response=failure
+    )
+
+    # When I execute process_shodan_search
+    _, results = _when_process_shodan_search(client, normalize_input_data, [failure])
+
+    # Then every hostname is reported as an error of the same request
+    assert [entry["target"] for entry in results["data"]] == HOSTNAMES
+    assert all(entry.get("is_error") for entry in results["data"])
+    assert len({entry["request"]["url"] for entry in results["data"]}) == 1
+    assert results["cache"] == {"hits": 0, "misses": 1}
+
+
+# --------
+# Given Methods
+# --------
+
+
+def _given_client(
+    client_factory, max_targets: int, max_url_length: int = 2000
+) -> ShodanClientAPI:
+    """Create a ShodanClientAPI combining up to max_targets targets per query.
+
+    Args:
+        client_factory: The shodan_client_factory fixture.
+        max_targets: The maximum number of targets per query.
+        max_url_length: The maximum length of a search URL.
+
+    Returns:
+        A ShodanClientAPI with mocked config and helper.
+
+    """
+    return client_factory(
+        api_max_targets_per_query=max_targets,
+        api_max_query_url_length=max_url_length,
+        search_page_budget=10,
+        search_credit_budget=10,
+    )
+
+
+def _given_targets() -> TargetsType:
+    """Create the targets of a manual inject."""
+    return TargetsType(
+        selector_key="manual",
+        asset_ids=[],
+        hostnames=[],
+        ips=[],
+        seen_ips=[],
+        assets=[],
+    )
+
+
+def _given_domain_discovery_normalize_input_data(
+    hostnames: list[str],
+) -> NormalizeInputData:
+    """Create NormalizeInputData for the Domain Discovery contract.
+
+    Args:
+        hostnames: The hostnames to search for.
+
+    Returns:
+        A fully constructed NormalizeInputData instance ready to be
+        passed to process_shodan_search in tests.
+
+    """
+    inject_content = DomainDiscovery(
+        contract="domain_discovery",
+        expectations=[],
+        target_selector="manual",
+        target_property_selector="automatic",
+        auto_create_assets=False,
+        hostname=",".join(hostnames),
+        organization=None,
+    )
+    return NormalizeInputData(
+        contract_name="domain_discovery",
+        contract_id="test_contract_id",
+        inject_content=inject_content,
+        targets=_given_targets(),
+    )
+
+
+def _given_ip_enumeration_normalize_input_data(ips: list[str]) -> NormalizeInputData:
+    """Create NormalizeInputData for the IP Enumeration contract.
+
+    Args:
+        ips: The IPs to search for.
+
+    Returns:
+        A fully constructed NormalizeInputData instance ready to be
+        passed to process_shodan_search in tests.
+
+    """
+    inject_content = IPEnumeration(
+        contract="ip_enumeration",
+        expectations=[],
+        target_selector="manual",
+        target_property_selector="automatic",
+        auto_create_assets=False,
+        ip=",".join(ips),
+    )
+    return NormalizeInputData(
+        contract_name="ip_enumeration",
+        contract_id="test_contract_id",
+        inject_content=inject_content,
+        targets=_given_targets(),
+    )
+
+
+# --------
+# When Methods
+# --------
+
+
+def _when_process_shodan_search(
+    client: ShodanClientAPI,
+    normalize_input_data: NormalizeInputData,
+    search_responses: list,
+) -> tuple[Mock, dict]:
+    """Run process_shodan_search against a mocked Shodan API.
+
+    Args:
+        client: The client to run the search with.
+        normalize_input_data: The inject to run.
+        search_responses: The search responses, in call order (mocks are sent as is).
+
+    Returns:
+        The mocked session request, and the results of the search.
+
+    """
+    responses = iter(search_responses)
+
+    def answer(method, url, timeout):
+        if "api-info" in url:
+            payload = {"plan": "basic"}
+        else:
+            payload = next(responses)
+            if isinstance(payload, Mock):
+                return payload
+        response = Mock()
+        response.json.return_value = payload
+        return response
+
+    with patch.object(client.session, "request", side_effect=answer) as mock_request:
+        results, _ = client.process_shodan_search(
+            normalize_input_data=normalize_input_data
+        )
+    return mock_request, results
+
+
+# --------
+# Then Methods
+# --------
+
+
+def _search_urls(mock_request: Mock) -> list[str]:
+    """Return the search URLs sent to the Shodan API, quota requests aside."""
+    return [
+        f"GET {call.kwargs['url']}"
+        for call in mock_request.call_args_list
+        if "/shodan/host/search" in call.kwargs["url"]
+    ]
+
+
+def _ips_per_target(results: dict) -> list[list[str]]:
+    """Return the ip_str of the matches of each target, in target order."""
+    return [
+        [match["ip_str"] for match in entry["result"]["matches"]]
+        for entry in results["data"]
+    ]
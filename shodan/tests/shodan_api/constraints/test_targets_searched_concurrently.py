@@ -0,0 +1,145 @@
+"""Essential tests for concurrent target searches - Gherkin GWT Format."""
+
+import threading
+import time
+from unittest.mock import MagicMock, Mock, patch
+
+from shodan.models.normalize_input_data import (
+    DomainDiscovery,
+    NormalizeInputData,
+    TargetsType,
+)
+from shodan.services.client_api import ShodanClientAPI
+
+HOSTNAMES = [f"host{i}.filigran.io" for i in range(8)]
+MAX_CONCURRENT_REQUESTS = 4
+
+# --------
+# Scenarios
+# --------
+
+
+# Scenario: Results are reported in target order whatever order the searches complete in
+def test_results_are_reported_in_target_order(shodan_client_factory):
+    """Scenario: Results are reported in target order whatever order the searches complete in"""
+    # Given I have a valid inject_content with 8 hostnames
+    normalize_input_data = _given_domain_discovery_normalize_input_data(HOSTNAMES)
+    # And the client searches up to 4 targets concurrently
+    client = _given_client(shodan_client_factory, MAX_CONCURRENT_REQUESTS)
+
+    # When I execute process_shodan_search
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def mock_request_data(method, url):
+        nonlocal in_flight, peak
+        if "api-info" in url:
+            return {"plan": "basic"}
+        hostname = next(h for h in HOSTNAMES if f"hostname:{h}," in url)
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        # Later targets complete first.
+        time.sleep(0.01 * (len(HOSTNAMES) - HOSTNAMES.index(hostname)))
+        with lock:
+            in_flight -= 1
+        return {"matches": [{"hostnames": [hostname]}], "total": 1}
+
+    with patch.object(client, "_request_data", side_effect=mock_request_data):
+        results, _ = client.process_shodan_search(
+            normalize_input_data=normalize_input_data
+        )
+
+    # Then several searches are in flight at once, never more than 4
+    assert 1 < peak <= MAX_CONCURRENT_REQUESTS
+    # And each result is reported under its own target, in target order
+    assert results["targets"] == HOSTNAMES
+    assert [entry["target"] for entry in results["data"]] == HOSTNAMES
+    assert [
+        entry["result"]["matches"][0]["hostnames"][0] for entry in results["data"]
+    ] == HOSTNAMES
+
+
+# Scenario: Every concurrent search goes through the rate limiter
+def test_every_search_goes_through_the_rate_limiter(shodan_client_factory):
+    """Scenario: Every concurrent search goes through the rate limiter"""
+    # Given I have a valid inject_content with 8 hostnames
+    normalize_input_data = _given_domain_discovery_normalize_input_data(HOSTNAMES)
+    # And the client searches up to 4 targets concurrently
+    client = _given_client(shodan_client_factory, MAX_CONCURRENT_REQUESTS)
+    client.rate_limiter = MagicMock()
+
+    # When I execute process_shodan_search
+    response = Mock()
+    response.json.return_value = {"matches": [], "total": 0}
+    with patch.object(client.session, "request", return_value=response) as mock_request:
+        client.process_shodan_search(normalize_input_data=normalize_input_data)
+
+    # Then the rate limiter is entered once per search request
+    # (the searches, then the quota recovery)
+    assert mock_request.call_count == len(HOSTNAMES) + 1
+    assert client.rate_limiter.__enter__.call_count == len(HOSTNAMES) + 1
+
+
+# --------
+# Given Methods
+# --------
+
+
+def _given_client(client_factory, max_concurrent_requests: int) -> ShodanClientAPI:
+    """Create a ShodanClientAPI searching up to max_concurrent_requests targets at once.
+
+    Args:
+        client_factory: The shodan_client_factory fixture.
+        max_concurrent_requests: The number of targets searched concurrently.
+
+    Returns:
+        A ShodanClientAPI with mocked config and helper.
+
+    """
+    return client_factory(
+        api_max_concurrent_requests=max_concurrent_requests,
+        search_page_budget=10,
+        search_credit_budget=10,
+    )
+
+
+def _given_domain_discovery_normalize_input_data(
+    hostnames: list[str],
+) -> NormalizeInputData:
+    """Create NormalizeInputData for the Domain Discovery contract.
+
+    Args:
+        hostnames: The hostnames to search for.
+
+    Returns:
+        A fully constructed NormalizeInputData instance ready to be
+        passed to process_shodan_search in tests.
+
+    """
+    inject_content = DomainDiscovery(
+        contract="domain_discovery",
+        expectations=[],
+        target_selector="manual",
+        target_property_selector="automatic",
+        auto_create_assets=False,
+        hostname=",".join(hostnames),
+        organization=None,
+    )
+
+    targets = TargetsType(
+        selector_key="manual",
+        asset_ids=[],
+        hostnames=[],
+        ips=[],
+        seen_ips=[],
+        assets=[],
+    )
+
+    return NormalizeInputData(
+        contract_name="domain_discovery",
+        contract_id="test_contract_id",
+        inject_content=inject_content,
+        targets=targets,
+    )
@@ -211,3 +211,102 @@ class TestShodanInjector(unittest.TestCase):
                 },
             ],
         )
+
+    def test_shodaninjector_process_message_sends_split_output_as_traces(self, m_api):
+        config = MagicMock()
+        helper = MagicMock()
+
+        injector = module.ShodanInjector(config=config, helper=helper)
+        data = {"injection": {"inject_id": "inject-id"}}
+
+        with patch.object(
+            injector,
+            "_shodan_execution",
+            return_value=({"found_assets": []}, ["part 1", "part 2", "part 3"]),
+        ):
+            injector.process_message(data)
+
+        callbacks = [
+            call.kwargs["data"]
+            for call in helper.api.inject.execution_callback.call_args_list
+        ]
+        self.assertEqual(
+            [
+                (c["execution_message"], c["execution_status"], c["execution_action"])
+                for c in callbacks
+            ],
+            [
+                ("part 1", "INFO", "command_execution"),
+                ("part 2", "INFO", "command_execution"),
+                ("part 3", "SUCCESS", "complete"),
+            ],
+        )
+        self.assertEqual(
+            callbacks[-1]["execution_output_structured"], '{"found_assets": []}'
+        )
+
+    def test_shodaninjector_deduplicate_keeps_first_occurrences(self, m_api):
+        injector = module.ShodanInjector(config=MagicMock(), helper=MagicMock())
+
+        self.assertEqual(
+            injector._deduplicate("ips", ["1.2.3.4", "5.6.7.8", "1.2.3.4", "9.9.9.9"]),
+            ["1.2.3.4", "5.6.7.8", "9.9.9.9"],
+        )
+
+    def test_shodaninjector_aggregate_assets_merges_by_hostname_and_platform(
+        self, m_api
+    ):
+        injector = module.ShodanInjector(config=MagicMock(), helper=MagicMock())
+        results = [
+            {
+                "target": "filigran.io",
+                "url": "GET https://api.shodan.io/shodan/host/search?query=hostname:filigran.io",
+                "result": {
+                    "matches": [
+                        {
+                            "ip_str": "1.2.3.4",
+                            "hostnames": ["www.filigran.io", "filigran.io"],
+                            "os": "Linux",
+                        },
+                        {"ip_str": "5.6.7.8", "hostnames": ["www.filigran.io"]},
+                        {"ip_str": "9.9.9.9", "hostnames": []},
+                    ]
+                },
+            },
+            {
+                "target": "other.io",
+                "url": "GET https://api.shodan.io/shodan/host/search?query=hostname:other.io",
+                "result": {
+                    "matches": [
+                        {
+                            "ip_str": "4.3.2.1",
+                            "hostnames": ["www.filigran.io"],
+                            "os": "linux",
+                        },
+                    ]
+                },
+            },
+        ]
+
+        assets = injector._aggregate_assets(results)
+
+        self.assertEqual(
+            [
+                (
+                    asset["name"],
+                    asset["extended_attributes"]["platform"],
+                    asset["extended_attributes"]["ip_addresses"],
+                )
+                for asset in assets
+            ],
+            [
+                ("www.filigran.io", "Linux", ["1.2.3.4", "4.3.2.1"]),
+                ("filigran.io", "Linux", ["1.2.3.4"]),
+                ("www.filigran.io", "Unknown", ["5.6.7.8"]),
+            ],
+        )
+        self.assertEqual(
+            assets[0]["description"],
+            "Asset automatically created by Shodan Injector. "
+            "(Source: https://www.shodan.io/search?query=hostname:filigran.io)",
+        )
@@ -0,0 +1,125 @@
+import copy
+import unittest
+
+from shodan.contracts import DomainDiscovery
+from shodan.services.utils import Utils
+
+
+def _results(matches: int) -> list[dict]:
+    return [
+        {
+            "target": "filigran.io",
+            "url": "GET https://api.shodan.io/shodan/host/search?query=hostname:filigran.io",
+            "result": {
+                "matches": [
+                    {
+                        "hostnames": [f"www{m}.filigran.io"],
+                        "ip_str": f"10.0.0.{m}",
+                        "port": 443,
+                        "vulns": {f"CVE-2024-{v:04d}": {"cvss": 7.5} for v in range(m)},
+                    }
+                    for m in range(matches)
+                ],
+                "total": matches,
+            },
+        },
+        {
+            "target": "google.com",
+            "is_error": True,
+            "request": {"method": "GET", "url": "GET https://api.shodan.io/..."},
+            "response": {
+                "status_code": 401,
+                "reason": "Unauthorized",
+                "error": '{"error": "Invalid API key"}',
+            },
+        },
+    ]
+
+
+class TestPlainTextRenderer(unittest.TestCase):
+    def setUp(self):
+        self.utils = Utils()
+        self.output_trace_config = copy.deepcopy(DomainDiscovery.output_trace_config())
+
+    def _render(self, matches: int) -> str:
+        return self.utils.generate_output_message(
+            output_trace_config=self.output_trace_config,
+            data_sections_config=[{"contract": "domain_discovery"}],
+            data_sections_info=[{"plan": "basic"}],
+            data_sections_external_api=_results(matches),
+            auto_create_assets=False,
+            renderer="plain",
+        )
+
+    def test_sections_are_rendered_as_plain_text(self):
+        lines = self._render(matches=2).splitlines()
+
+        self.assertIn("===== SHODAN - DOMAIN DISCOVERY =====", lines)
+        self.assertIn("  contract: domain_discovery", lines)
+        self.assertIn("  plan: basic", lines)
+        self.assertIn("      • filigran.io → 2 results", lines)
+        self.assertIn("        Error: Invalid API key (401 - Unauthorized)", lines)
+        self.assertIn("Hostnames | IP | Port | Vulnerabilities (score)", lines)
+        self.assertIn("www1.filigran.io | 10.0.0.1 | 443 | CVE-2024-0000 (7.5)", lines)
+
+    def test_rows_and_cells_are_capped(self):
+        options = self.output_trace_config["options"]["show_tables"]
+        options["max_rows_by_table"] = 4
+        options["max_display_by_cell"] = 2
+        options["max_cell_length"] = 40
+
+        lines = self._render(matches=5).splitlines()
+
+        header = lines.index("Hostnames | IP | Port | Vulnerabilities (score)")
+        self.assertEqual(
+            lines[header + 4 : header + 6],
+            [
+                "www3.filigran.io | 10.0.0.3 | 443 | CVE-2024-0000 (7.5), CVE-2024-0001 (7.5)…",
+                "...(+1 rows hidden)",
+            ],
+        )
+
+    def test_json_is_capped(self):
+        output_without_json = self._render(matches=50)
+        options = self.output_trace_config["options"]["show_json"]
+        options["is_active"] = True
+        options["max_size"] = 300
+
+        output = self._render(matches=50)
+
+        self.assertTrue(output.endswith("\n...(JSON truncated to 300 characters)"))
+        json_dump = output[len(output_without_json) :].split("\n...(JSON")[0]
+        self.assertLessEqual(len(json_dump.replace("\n", "")), 300)
+
+
+class TestSplitOutputMessage(unittest.TestCase):
+    def setUp(self):
+        self.utils = Utils()
+        self.output_trace_config = {
+            "options": {"split_output": {"is_active": True, "max_size": 10}}
+        }
+
+    def test_long_message_is_split_on_lines(self):
+        message = "\n".join(["aaaa", "bbbb", "cccc", "d" * 25, "ee"])
+
+        chunks = self.utils.split_output_message(self.output_trace_config, message)
+
+        self.assertEqual(
+            chunks, ["aaaa\nbbbb", "cccc", "d" * 10, "d" * 10, "ddddd\nee"]
+        )
+        self.assertTrue(all(len(chunk) <= 10 for chunk in chunks))
+        self.assertEqual("\n".join(chunks).replace("\n", ""), message.replace("\n", ""))
+
+    def test_short_or_unsplit_message_is_one_trace(self):
+        self.assertEqual(
+            self.utils.split_output_message(self.output_trace_config, "short"),
+            ["short"],
+        )
+        self.assertEqual(
+            self.utils.split_output_message({}, "a" * 100),
+            ["a" * 100],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from shodan.services.quota_snapshot import ShodanQuotaSnapshot
+
+USER_INFO = {
+    "plan": "dev",
+    "query_credits": 100,
+    "scan_credits": 50,
+    "usage_limits": {"query_credits": 100, "scan_credits": 100},
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestShodanQuotaSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def test_snapshot_is_served_until_its_ttl(self):
+        snapshot = ShodanQuotaSnapshot(ttl_seconds=300, clock=self.clock)
+        self.assertIsNone(snapshot.get())
+
+        snapshot.update(USER_INFO)
+        self.clock.now += 120
+        self.assertEqual(snapshot.get(), (USER_INFO, 120))
+
+        self.clock.now += 180
+        self.assertIsNone(snapshot.get())
+
+    def test_spent_query_credits_are_deducted(self):
+        snapshot = ShodanQuotaSnapshot(ttl_seconds=300, clock=self.clock)
+        snapshot.update(USER_INFO)
+
+        snapshot.spend_query_credits(3)
+        snapshot.spend_query_credits(200)
+
+        user_info, _ = snapshot.get()
+        self.assertEqual(user_info["query_credits"], 0)
+        self.assertEqual(user_info["scan_credits"], 50)
+        self.assertEqual(USER_INFO["query_credits"], 100)
+
+    def test_served_snapshot_is_a_copy(self):
+        snapshot = ShodanQuotaSnapshot(ttl_seconds=300, clock=self.clock)
+        snapshot.update(USER_INFO)
+
+        snapshot.get()[0]["usage_limits"]["query_credits"] = 0
+
+        self.assertEqual(snapshot.get()[0]["usage_limits"]["query_credits"], 100)
+
+    def test_zero_ttl_or_failed_retrieval_is_not_kept(self):
+        snapshot = ShodanQuotaSnapshot(ttl_seconds=0, clock=self.clock)
+        snapshot.update(USER_INFO)
+        self.assertIsNone(snapshot.get())
+
+        snapshot = ShodanQuotaSnapshot(ttl_seconds=300, clock=self.clock)
+        snapshot.update(None)
+        self.assertIsNone(snapshot.get())
+
+
+if __name__ == "__main__":
+    unittest.main()
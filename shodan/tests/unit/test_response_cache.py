@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+from shodan.services.response_cache import ShodanResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestShodanResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache", "responses.sqlite")
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _cache(self, max_size_bytes=1024 * 1024):
+        return ShodanResponseCache(self.path, max_size_bytes, clock=self.clock)
+
+    def test_build_key_normalizes_whitespace_and_endpoint(self):
+        self.assertEqual(
+            ShodanResponseCache.build_key(
+                "/shodan/host/search", "query=has_vuln:true  hostname:a.io"
+            ),
+            ShodanResponseCache.build_key(
+                "shodan/host/search", " query=has_vuln:true hostname:a.io "
+            ),
+        )
+
+    def test_response_is_served_until_its_ttl(self):
+        cache = self._cache()
+        cache.put("key", "cve_enumeration", {"matches": [], "total": 0})
+
+        self.clock.now += 59
+        self.assertEqual(cache.get("key", ttl_seconds=60), {"matches": [], "total": 0})
+        self.clock.now += 1
+        self.assertIsNone(cache.get("key", ttl_seconds=60))
+        self.assertIsNone(cache.get("missing", ttl_seconds=60))
+
+    def test_responses_persist_across_instances(self):
+        self._cache().put("key", "ip_enumeration", {"total": 1})
+
+        self.assertEqual(self._cache().get("key", ttl_seconds=60), {"total": 1})
+
+    def test_least_recently_used_responses_are_evicted_over_the_size_budget(self):
+        # Each response below is 11 bytes once serialized.
+        cache = self._cache(max_size_bytes=25)
+        cache.put("first", "ip_enumeration", {"total": 1})
+        self.clock.now += 1
+        cache.put("second", "ip_enumeration", {"total": 2})
+        self.clock.now += 1
+        cache.get("first", ttl_seconds=60)
+        self.clock.now += 1
+        cache.put("third", "ip_enumeration", {"total": 3})
+
+        self.assertEqual(cache.get("first", ttl_seconds=60), {"total": 1})
+        self.assertIsNone(cache.get("second", ttl_seconds=60))
+        self.assertEqual(cache.get("third", ttl_seconds=60), {"total": 3})
+
+    def test_response_over_the_size_budget_is_not_stored(self):
+        cache = self._cache(max_size_bytes=5)
+        cache.put("key", "ip_enumeration", {"total": 1})
+
+        self.assertIsNone(cache.get("key", ttl_seconds=60))
+
+
+if __name__ == "__main__":
+    unittest.main()
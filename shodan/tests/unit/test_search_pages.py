@@ -0,0 +1,94 @@
+import unittest
+
+from shodan.services.search_pages import MatchFolder, SearchPageBudget
+
+
+class TestMatchFolder(unittest.TestCase):
+    def test_matches_of_a_service_are_folded_across_pages(self):
+        folder = MatchFolder()
+        folder.add(
+            [
+                {
+                    "ip_str": "10.0.0.1",
+                    "port": 443,
+                    "transport": "tcp",
+                    "hostnames": ["a.filigran.io"],
+                    "data": "HTTP/1.1 200 OK",
+                    "vulns": {"CVE-2021-1": {"cvss": 5.0}},
+                },
+                {"ip_str": "10.0.0.2", "port": 22, "hostnames": []},
+            ]
+        )
+        folder.add(
+            [
+                {"ip_str": "10.0.0.1", "port": 80, "transport": "tcp"},
+                {
+                    "ip_str": "10.0.0.1",
+                    "port": 443,
+                    "transport": "tcp",
+                    "hostnames": ["a.filigran.io", "www.a.filigran.io"],
+                    "data": "HTTP/1.1 301 Moved",
+                    "vulns": {"CVE-2021-2": {"cvss": 9.8}},
+                },
+            ]
+        )
+
+        self.assertEqual(folder.read, 4)
+        self.assertEqual(
+            folder.matches,
+            [
+                {
+                    "ip_str": "10.0.0.1",
+                    "port": 443,
+                    "transport": "tcp",
+                    "hostnames": ["a.filigran.io", "www.a.filigran.io"],
+                    "data": "HTTP/1.1 200 OK",
+                    "vulns": {
+                        "CVE-2021-1": {"cvss": 5.0},
+                        "CVE-2021-2": {"cvss": 9.8},
+                    },
+                },
+                {"ip_str": "10.0.0.2", "port": 22, "hostnames": []},
+                {"ip_str": "10.0.0.1", "port": 80, "transport": "tcp"},
+            ],
+        )
+
+    def test_single_page_matches_are_kept_as_read(self):
+        matches = [
+            {"ip_str": "10.0.0.1", "port": 443, "data": "banner", "http": {}},
+            {"ip_str": "10.0.0.1", "port": 80, "product": "nginx"},
+        ]
+        folder = MatchFolder()
+        folder.add(matches)
+
+        self.assertEqual(folder.matches, matches)
+
+    def test_matches_without_ip_are_kept_apart(self):
+        folder = MatchFolder()
+        folder.add([{"port": 80}, {"port": 80}])
+
+        self.assertEqual(len(folder.matches), 2)
+
+
+class TestSearchPageBudget(unittest.TestCase):
+    def test_pages_are_reserved_within_the_page_budget(self):
+        budget = SearchPageBudget(max_pages=2, max_credits=10)
+
+        self.assertEqual([budget.reserve() for _ in range(3)], [True, True, False])
+        self.assertEqual(budget.summary()["additional_pages"], 2)
+
+    def test_cached_pages_spend_no_credit(self):
+        budget = SearchPageBudget(max_pages=10, max_credits=1)
+        self.assertTrue(budget.reserve())
+        budget.refund_credit()
+        self.assertTrue(budget.reserve())
+        self.assertFalse(budget.reserve())
+
+        self.assertEqual(
+            budget.summary(),
+            {"additional_pages": 2, "credits": 1, "truncated_targets": 0},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()